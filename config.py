@@ -39,6 +39,13 @@ MODEL_CONFIG = {
             "mu": float(os.getenv("BVAR_MU", "0.0")),
             "sigma": float(os.getenv("BVAR_SIGMA", "1.0"))
         }
+    },
+    # Multiplicador da incerteza preditiva por regime (regime_hint)
+    "regime_uncertainty_scale": {
+        "normal": float(os.getenv("REGIME_SCALE_NORMAL", "1.0")),
+        "stress": float(os.getenv("REGIME_SCALE_STRESS", "1.5")),
+        "crisis": float(os.getenv("REGIME_SCALE_CRISIS", "2.0")),
+        "recovery": float(os.getenv("REGIME_SCALE_RECOVERY", "1.25"))
     }
 }
 
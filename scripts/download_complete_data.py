@@ -14,6 +14,9 @@ import json
 import warnings
 import yfinance as yf
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.services.columnar_snapshot import write_snapshot
+
 warnings.filterwarnings('ignore')
 
 def download_selic_yahoo():
@@ -277,11 +280,15 @@ def combine_and_save_data(fed_data, selic_data):
     print(f"   Spillover médio: {combined['spillover'].mean():.2f}%")
     
     # Salvar dados
-    os.makedirs('data', exist_ok=True)
+    os.makedirs('data/raw', exist_ok=True)
+    
+    # CSV (em data/raw, onde os serviços de dados leem)
+    combined.to_csv('data/raw/fed_selic_combined.csv')
+    print("✅ CSV salvo: data/raw/fed_selic_combined.csv")
     
-    # CSV
-    combined.to_csv('data/fed_selic_combined.csv')
-    print("✅ CSV salvo: data/fed_selic_combined.csv")
+    # Snapshot colunar (cold start rápido da API)
+    if write_snapshot(combined, 'data/raw/fed_selic_combined.csv'):
+        print("✅ Snapshot colunar salvo: data/raw/fed_selic_combined.columns/")
     
     # JSON
     json_data = {
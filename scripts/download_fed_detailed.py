@@ -13,6 +13,9 @@ import requests
 import json
 import warnings
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.services.columnar_snapshot import write_snapshot
+
 warnings.filterwarnings('ignore')
 
 # Configuração da API FRED
@@ -224,6 +227,10 @@ def save_fed_data(df, metadata):
     df.to_csv('data/raw/fed_detailed_data.csv')
     print("✅ CSV salvo: data/raw/fed_detailed_data.csv")
     
+    # Snapshot colunar (cold start rápido da API)
+    if write_snapshot(df, 'data/raw/fed_detailed_data.csv'):
+        print("✅ Snapshot colunar salvo: data/raw/fed_detailed_data.columns/")
+    
     # Salvar JSON com metadados
     json_data = {
         'metadata': metadata,
@@ -51,6 +51,7 @@ class HealthController:
                     uptime_seconds=health_metrics.get("uptime_seconds", 0),
                     latency_p50_ms=health_metrics.get("latency", {}).get("p50_ms"),
                     latency_p95_ms=health_metrics.get("latency", {}).get("p95_ms"),
+                    latency_p99_ms=health_metrics.get("latency", {}).get("p99_ms"),
                     requests_per_minute=health_metrics.get("throughput", {}).get("requests_per_minute")
                 )
                 
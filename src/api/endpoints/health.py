@@ -2,7 +2,7 @@
 Endpoints de health check
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from typing import Dict, Any, Optional
 import time
@@ -13,14 +13,20 @@ from datetime import datetime
 from ...api.schemas import HealthResponse, StandardErrorResponse, ErrorCodes
 from ...core.config import get_settings
 from ...services.health_service import HealthService
+from ...factories.service_factory import get_service_factory
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Dependência para obter serviço de health
-def get_health_service() -> HealthService:
-    """Obter serviço de health check"""
-    return HealthService()
+async def get_health_service(request: Request) -> HealthService:
+    """Obter serviço de health check (compartilhado pela aplicação)"""
+    health_service = getattr(request.app.state, "health_service", None)
+    if health_service is None:
+        factory = await get_service_factory()
+        health_service = await factory.create_health_service()
+        request.app.state.health_service = health_service
+    return health_service
 
 @router.get(
     "/",
@@ -2,7 +2,7 @@
 Endpoints de gerenciamento de modelos
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from fastapi.responses import JSONResponse
 from typing import List, Optional, Dict, Any
 import logging
@@ -10,15 +10,36 @@ from datetime import datetime
 
 from ...api.schemas import ModelVersion, StandardErrorResponse, ErrorCodes
 from ...core.config import get_settings
+from ...core.exceptions import CacheError
 from ...services.model_service import ModelService
+from ...services.cache_service import RedisCacheService
+from ...services.cache_warmup import CacheWarmupService
+from ...factories.service_factory import get_service_factory
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Dependência para obter serviço de modelos
-def get_model_service() -> ModelService:
-    """Obter serviço de modelos"""
-    return ModelService()
+async def get_model_service(request: Request) -> ModelService:
+    """Obter serviço de modelos (registro compartilhado pela aplicação)"""
+    model_service = getattr(request.app.state, "model_service", None)
+    if model_service is None:
+        factory = await get_service_factory()
+        model_service = await factory.create_model_registry()
+        request.app.state.model_service = model_service
+    return model_service
+
+# Dependência para obter serviço de cache
+async def get_cache_service(request: Request) -> RedisCacheService:
+    """Obter serviço de cache (compartilhado com as previsões)"""
+    factory = getattr(request.app.state, "service_factory", None) or await get_service_factory()
+    return await factory.create_cache_service()
+
+# Dependência para obter serviço de aquecimento do cache
+async def get_cache_warmup_service(request: Request) -> CacheWarmupService:
+    """Obter serviço de aquecimento do cache"""
+    factory = getattr(request.app.state, "service_factory", None) or await get_service_factory()
+    return await factory.create_cache_warmup_service()
 
 @router.get(
     "/versions",
@@ -149,12 +170,17 @@ async def get_active_model(
 )
 async def activate_model_version(
     version: str,
-    model_service: ModelService = Depends(get_model_service)
+    model_service: ModelService = Depends(get_model_service),
+    cache_service: RedisCacheService = Depends(get_cache_service),
+    warmup_service: CacheWarmupService = Depends(get_cache_warmup_service)
 ):
     """
     Ativar uma versão específica do modelo.
     
     - **version**: Versão do modelo para ativar
+    
+    O cache da versão é aquecido em segundo plano (grade canônica de cenários);
+    o progresso fica em `/models/versions/{version}/warmup`.
     """
     try:
         success = await model_service.activate_version(version)
@@ -169,10 +195,22 @@ async def activate_model_version(
                 }
             )
         
+        # Workers descartam do L1 as previsões das demais versões
+        try:
+            await cache_service.notify_model_activation(version)
+        except CacheError as e:
+            logger.warning(f"Ativação de {version} não propagada ao cache: {e.message}")
+        
+        # Aquecer o cache antes da primeira rajada de requests da versão
+        warmup = None
+        if get_settings().CACHE_WARMUP_ENABLED:
+            warmup = await warmup_service.start(version)
+        
         return {
             "message": f"Versão {version} ativada com sucesso",
             "version": version,
-            "activated_at": datetime.utcnow().isoformat()
+            "activated_at": datetime.utcnow().isoformat(),
+            "warmup": warmup
         }
         
     except HTTPException:
@@ -191,6 +229,33 @@ async def activate_model_version(
             detail=error_response.dict()
         )
 
+@router.get(
+    "/versions/{version}/warmup",
+    summary="Progresso do aquecimento do cache",
+    description="Progresso e duração do aquecimento do cache da versão"
+)
+async def get_cache_warmup_status(
+    version: str,
+    warmup_service: CacheWarmupService = Depends(get_cache_warmup_service)
+):
+    """
+    Obter progresso e duração do último aquecimento do cache da versão.
+    
+    - **version**: Versão do modelo
+    """
+    warmup = warmup_service.get_status(version)
+    if warmup is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error_code": ErrorCodes.MODEL_UNAVAILABLE,
+                "message": f"Nenhum aquecimento do cache para a versão {version}",
+                "details": {"requested_version": version}
+            }
+        )
+    
+    return warmup
+
 @router.get(
     "/performance",
     summary="Métricas de performance",
@@ -2,7 +2,7 @@
 Endpoints de previsão da Selic
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, status
 from fastapi.responses import JSONResponse
 from typing import List, Dict, Any
 import time
@@ -14,15 +14,33 @@ from ...api.schemas import (
     StandardErrorResponse, ErrorCodes, CopomMeeting, DistributionPoint, ModelMetadata
 )
 from ...core.config import get_settings
+from ...core.exceptions import ModelVersionNotFoundError
 from ...services.prediction_service import PredictionService
+from ...services.logging_service import LoggingService
+from ...factories.service_factory import get_service_factory
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Dependência para obter serviço de previsão
-def get_prediction_service() -> PredictionService:
-    """Obter serviço de previsão"""
-    return PredictionService()
+async def get_prediction_service(request: Request) -> PredictionService:
+    """Obter serviço de previsão (singleton criado no lifespan da aplicação)"""
+    prediction_service = getattr(request.app.state, "prediction_service", None)
+    if prediction_service is None:
+        factory = await get_service_factory()
+        prediction_service = await factory.create_prediction_service()
+        request.app.state.prediction_service = prediction_service
+    return prediction_service
+
+# Dependência para obter serviço de logging
+async def get_logging_service(request: Request) -> LoggingService:
+    """Obter serviço de logging (singleton criado no lifespan da aplicação)"""
+    logging_service = getattr(request.app.state, "logging_service", None)
+    if logging_service is None:
+        factory = await get_service_factory()
+        logging_service = await factory.create_logging_service()
+        request.app.state.logging_service = logging_service
+    return logging_service
 
 @router.post(
     "/selic-from-fed",
@@ -32,7 +50,9 @@ def get_prediction_service() -> PredictionService:
 )
 async def predict_selic_from_fed(
     request: PredictionRequest,
-    prediction_service: PredictionService = Depends(get_prediction_service)
+    http_request: Request,
+    prediction_service: PredictionService = Depends(get_prediction_service),
+    logging_service: LoggingService = Depends(get_logging_service)
 ):
     """
     Prever movimento da Selic baseado em um movimento do Fed.
@@ -45,9 +65,13 @@ async def predict_selic_from_fed(
     - **model_version**: Versão do modelo (opcional)
     - **regime_hint**: Dica de regime econômico (opcional)
     """
+    request_id = getattr(http_request.state, 'request_id', None)
     try:
         start_time = time.time()
         
+        # Log do request (amostrado pelo request ID: gravado agora ou só se o request falhar/ficar lento)
+        await logging_service.log_prediction_request(request_id, request)
+        
         # Validar request
         validation_result = await prediction_service.validate_request(request)
         if not validation_result["valid"]:
@@ -66,25 +90,35 @@ async def predict_selic_from_fed(
         # Calcular tempo de processamento
         processing_time = time.time() - start_time
         
-        # Log da previsão
-        logger.info(
-            f"Previsão realizada: Fed {request.fed_move_bps}bps em {request.fed_decision_date}, "
-            f"Selic esperada: {prediction.expected_move_bps}bps, "
-            f"tempo: {processing_time:.3f}s"
+        # Log da previsão (amostrado como o request)
+        await logging_service.log_prediction_response(request_id, prediction)
+        logger.debug(
+            "Previsão realizada: Fed %sbps em %s, Selic esperada: %sbps, tempo: %.3fs",
+            request.fed_move_bps, request.fed_decision_date, prediction.expected_move_bps, processing_time
         )
         
         return prediction
         
     except HTTPException:
         raise
+    except ModelVersionNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error_code": ErrorCodes.MODEL_UNAVAILABLE,
+                "message": e.message,
+                "details": {"requested_version": request.model_version}
+            }
+        )
     except Exception as e:
         logger.error(f"Erro na previsão: {str(e)}", exc_info=True)
+        await logging_service.log_error(request_id, e)
         
         error_response = StandardErrorResponse(
             error_code=ErrorCodes.INTERNAL_ERROR,
             message="Erro interno durante a previsão",
             details={"error": str(e)},
-            request_id=getattr(request, 'request_id', None)
+            request_id=request_id
         )
         
         raise HTTPException(
@@ -123,32 +157,16 @@ async def predict_selic_batch(
                 }
             )
         
-        # Processar previsões
+        # Processar previsões no executor limitado (ordem e erros por cenário preservados)
         predictions = []
         errors = []
         
-        for i, scenario in enumerate(request.scenarios):
-            try:
-                # Validar cenário
-                validation_result = await prediction_service.validate_request(scenario)
-                if not validation_result["valid"]:
-                    errors.append({
-                        "index": i,
-                        "error": validation_result["message"],
-                        "details": validation_result.get("details")
-                    })
-                    continue
-                
-                # Fazer previsão
-                prediction = await prediction_service.predict_selic(scenario)
-                predictions.append(prediction)
-                
-            except Exception as e:
-                errors.append({
-                    "index": i,
-                    "error": str(e),
-                    "details": {"exception_type": type(e).__name__}
-                })
+        results = await prediction_service.predict_batch(request.scenarios)
+        for i, result in enumerate(results):
+            if isinstance(result, PredictionResponse):
+                predictions.append(result)
+            else:
+                errors.append({"index": i, **result})
         
         # Calcular tempo de processamento
         processing_time = time.time() - start_time
@@ -159,6 +177,7 @@ async def predict_selic_batch(
             "total_scenarios": len(request.scenarios),
             "successful_predictions": len(predictions),
             "errors": len(errors),
+            "error_details": errors,
             "processing_time_ms": round(processing_time * 1000, 2),
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -5,7 +5,8 @@ API principal para previsão da Selic condicionada ao Fed
 from fastapi import FastAPI, HTTPException, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from fastapi.encoders import jsonable_encoder
 from contextlib import asynccontextmanager
 import time
 import uuid
@@ -24,6 +25,8 @@ from .middleware import (
 )
 from .endpoints import prediction, health, models
 from ..core.config import get_settings
+from ..factories.service_factory import get_service_factory, cleanup_global_factory
+from ..services.tracing import get_tracer
 
 # Configurações
 settings = get_settings()
@@ -36,13 +39,28 @@ async def lifespan(app: FastAPI):
     app.state.start_time = time.time()
     app.state.request_count = 0
     
+    # Container de serviços: instâncias (modelos, tabelas, dados) vivem entre requests
+    factory = await get_service_factory()
+    app.state.service_factory = factory
+    app.state.logging_service = await factory.create_logging_service()
+    app.state.tracer = await factory.create_tracer()
+    app.state.prediction_service = await factory.create_prediction_service()
+    app.state.model_service = await factory.create_model_registry()
+    app.state.health_service = await factory.create_health_service()
+    app.state.metrics_service = await factory.create_metrics_service()
+    
     # Inicializar modelos
-    # TODO: Carregar modelos ML aqui
+    try:
+        await app.state.prediction_service.preload_model()
+    except Exception as e:
+        # Sem modelo/dados na inicialização: a tabela é compilada na primeira previsão
+        print(f"⚠️ Modelo não carregado na inicialização: {e}")
     
     yield
     
     # Shutdown
     print("🛑 Finalizando API FED-Selic...")
+    await cleanup_global_factory()
 
 # Criar aplicação FastAPI
 app = FastAPI(
@@ -74,15 +92,26 @@ app.add_middleware(AuthenticationMiddleware)
 app.add_middleware(ErrorHandlingMiddleware)
 
 # Incluir routers
-app.include_router(prediction.router, prefix="/predict", tags=["Prediction"])
-app.include_router(health.router, prefix="/health", tags=["Health"])
-app.include_router(models.router, prefix="/models", tags=["Models"])
+ROUTERS = [
+    (prediction.router, "/predict", "Prediction"),
+    (health.router, "/health", "Health"),
+    (models.router, "/models", "Models")
+]
+for router, prefix, tag in ROUTERS:
+    app.include_router(router, prefix=prefix, tags=[tag])
+
+# scope["route"] é a rota original do router, com path relativo: o prefixo vem daqui
+ROUTE_PREFIXES = {id(route): prefix for router, prefix, _ in ROUTERS for route in router.routes}
+
+def route_span_name(method: str, route: Any) -> str:
+    """Nome do span pelo template completo da rota (ex.: "POST /predict/selic-from-fed/batch")"""
+    return f"{method} {ROUTE_PREFIXES.get(id(route), '')}{route.path}"
 
 # Middleware para adicionar request ID
 @app.middleware("http")
 async def add_request_id(request: Request, call_next):
-    """Adicionar ID único para cada requisição"""
-    request_id = str(uuid.uuid4())
+    """Adicionar ID único para cada requisição (reaproveita o X-Request-ID recebido: decisões de amostragem iguais entre serviços)"""
+    request_id = request.headers.get("X-Request-ID", "")[:128] or str(uuid.uuid4())
     request.state.request_id = request_id
     
     response = await call_next(request)
@@ -93,10 +122,18 @@ async def add_request_id(request: Request, call_next):
 # Middleware para métricas básicas
 @app.middleware("http")
 async def track_metrics(request: Request, call_next):
-    """Rastrear métricas básicas"""
+    """Rastrear métricas básicas (e o span raiz do trace do request)"""
     start_time = time.time()
     
-    response = await call_next(request)
+    with get_tracer().span(request.method, **{"http.method": request.method,
+                                              "http.target": request.url.path}) as span:
+        response = await call_next(request)
+        
+        # Nome pelo template da rota, com o prefixo do router e sem ids de path
+        route = request.scope.get("route")
+        if route is not None:
+            span.update_name(route_span_name(request.method, route))
+        span.set_attribute("http.status_code", response.status_code)
     
     # Calcular latência
     latency = time.time() - start_time
@@ -107,6 +144,8 @@ async def track_metrics(request: Request, call_next):
     # Adicionar headers de métricas
     response.headers["X-Response-Time"] = f"{latency:.3f}s"
     response.headers["X-Request-Count"] = str(app.state.request_count)
+    if span.trace_id:
+        response.headers["X-Trace-ID"] = span.trace_id
     
     return response
 
@@ -125,7 +164,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     
     return JSONResponse(
         status_code=exc.status_code,
-        content=error_response.dict()
+        content=jsonable_encoder(error_response)
     )
 
 @app.exception_handler(Exception)
@@ -142,7 +181,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=error_response.dict()
+        content=jsonable_encoder(error_response)
     )
 
 # Endpoint raiz
@@ -158,6 +197,20 @@ async def root():
         "health": "/health"
     }
 
+# Exposição Prometheus
+@app.get("/metrics", tags=["Metrics"], include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """Métricas no formato texto do Prometheus (todos os workers em modo multiprocesso)"""
+    metrics_service = getattr(request.app.state, "metrics_service", None)
+    exposition = metrics_service.render_prometheus() if metrics_service is not None else None
+    if exposition is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error_code": "metrics_disabled", "message": "Backend de métricas Prometheus desativado"}
+        )
+    body, content_type = exposition
+    return Response(content=body, headers={"Content-Type": content_type})
+
 # Endpoint de informações da API
 @app.get("/info", tags=["Info"])
 async def api_info():
@@ -179,6 +232,7 @@ async def api_info():
             "prediction": "/predict/selic-from-fed",
             "batch_prediction": "/predict/selic-from-fed/batch",
             "health": "/health",
+            "metrics": "/metrics",
             "models": "/models/versions",
             "docs": "/docs"
         },
@@ -8,114 +8,153 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 import time
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import Any, Optional
+from datetime import datetime
 import hashlib
 
 from ..core.config import get_settings
+from ..services.rate_limiter import RateLimitConfig, ShardedRateLimiter
+from ..services.tracing import get_tracer
 from .schemas import StandardErrorResponse, ErrorCodes
 
 logger = logging.getLogger(__name__)
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware para logging de requisições"""
+    """
+    Middleware para logging de requisições
+    
+    Um registro estruturado por request, gravado pelo pipeline assíncrono.
+    Com o LoggingService da aplicação, a decisão de amostragem é tomada na
+    entrada pelo request ID (a mesma que os endpoints consultam) e revista
+    na saída para erros e requests lentos; o header X-Log-Sampled informa
+    se o request foi registrado.
+    """
     
     async def dispatch(self, request: Request, call_next):
         """Processar requisição e log"""
         start_time = time.time()
         request_id = getattr(request.state, 'request_id', 'unknown')
-        
-        # Log da requisição
-        logger.info(
-            f"Request {request_id}: {request.method} {request.url.path} "
-            f"from {request.client.host if request.client else 'unknown'}"
-        )
+        logging_service = getattr(request.app.state, "logging_service", None)
+        if logging_service is not None:
+            logging_service.start_request(request_id)
         
         # Processar requisição
-        response = await call_next(request)
-        
-        # Calcular latência
-        latency = time.time() - start_time
+        try:
+            response = await call_next(request)
+        except Exception:
+            if logging_service is not None:
+                await self._finish(logging_service, request, request_id, 500, start_time, error=True)
+            raise
         
-        # Log da resposta
-        logger.info(
-            f"Response {request_id}: {response.status_code} "
-            f"in {latency:.3f}s"
-        )
+        if logging_service is not None:
+            sampled = await self._finish(logging_service, request, request_id, response.status_code, start_time)
+            response.headers["X-Log-Sampled"] = "1" if sampled else "0"
+        elif logger.isEnabledFor(logging.INFO):
+            # Sem o serviço (ex.: app sem lifespan): só enfileira o dict; a codificação fica no pipeline
+            logger.info({
+                "timestamp": datetime.now().isoformat(),
+                "event_type": "http_request",
+                "request_id": request_id,
+                "level": "INFO",
+                "data": {
+                    "method": request.method,
+                    "path": request.url.path,
+                    "client_ip": request.client.host if request.client else None,
+                    "status_code": response.status_code,
+                    "processing_time_ms": round((time.time() - start_time) * 1000, 3)
+                }
+            })
         
         return response
+    
+    async def _finish(self, logging_service, request: Request, request_id: str, status_code: int,
+                      start_time: float, error: bool = False) -> bool:
+        span = get_tracer().current_span()
+        return await logging_service.finish_request(
+            request_id,
+            request.method,
+            request.url.path,
+            status_code,
+            (time.time() - start_time) * 1000,
+            client_ip=request.client.host if request.client else None,
+            trace_id=span.trace_id if span is not None else None,
+            error=error
+        )
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware para rate limiting"""
+    """Middleware para rate limiting (GCRA por chave API, limites do tier da chave)"""
+    
+    WINDOW_LABELS = {"minute": "minuto", "day": "dia"}
     
-    def __init__(self, app, requests_per_hour: int = 100):
+    # Coleta do Prometheus não consome cota (o intervalo de scrape excede o tier free)
+    EXEMPT_PATHS = {"/metrics"}
+    
+    def __init__(self, app, limiter: Optional[ShardedRateLimiter] = None):
         super().__init__(app)
-        self.requests_per_hour = requests_per_hour
-        self.requests: Dict[str, list] = {}
+        settings = get_settings()
+        self.api_key_header = settings.API_KEY_HEADER
+        self.limiter = limiter or ShardedRateLimiter(
+            RateLimitConfig(),
+            n_shards=settings.RATE_LIMIT_SHARDS,
+            sweep_interval=settings.RATE_LIMIT_SWEEP_SECONDS
+        )
     
     def _get_client_id(self, request: Request) -> str:
-        """Obter ID único do cliente"""
-        # Usar IP + User-Agent para identificar cliente
+        """Obter ID único do cliente: chave API ou, sem ela, IP + User-Agent"""
+        api_key = request.headers.get(self.api_key_header)
+        if api_key:
+            return api_key
+        
         client_ip = request.client.host if request.client else "unknown"
         user_agent = request.headers.get("user-agent", "")
-        return hashlib.md5(f"{client_ip}:{user_agent}".encode()).hexdigest()
-    
-    def _is_rate_limited(self, client_id: str) -> bool:
-        """Verificar se cliente está rate limited"""
-        now = time.time()
-        hour_ago = now - 3600  # 1 hora atrás
-        
-        # Limpar requisições antigas
-        if client_id in self.requests:
-            self.requests[client_id] = [
-                req_time for req_time in self.requests[client_id] 
-                if req_time > hour_ago
-            ]
-        else:
-            self.requests[client_id] = []
-        
-        # Verificar limite
-        return len(self.requests[client_id]) >= self.requests_per_hour
-    
-    def _record_request(self, client_id: str):
-        """Registrar requisição"""
-        if client_id not in self.requests:
-            self.requests[client_id] = []
-        self.requests[client_id].append(time.time())
+        return "anonymous:" + hashlib.md5(f"{client_ip}:{user_agent}".encode()).hexdigest()
     
     async def dispatch(self, request: Request, call_next):
         """Processar rate limiting"""
+        if request.url.path in self.EXEMPT_PATHS:
+            return await call_next(request)
+        
         client_id = self._get_client_id(request)
+        decision = self.limiter.check(client_id)
+        reset_at = int(time.time() + decision.reset_after)
         
-        # Verificar rate limit
-        if self._is_rate_limited(client_id):
+        if not decision.allowed:
+            metrics_service = getattr(request.app.state, "metrics_service", None)
+            if metrics_service is not None:
+                await metrics_service.record_rate_limit_rejection(
+                    self.limiter.config.get_tier_for_key(client_id), decision.window
+                )
+            retry_after = max(int(decision.retry_after + 0.999), 1)
             error_response = StandardErrorResponse(
                 error_code=ErrorCodes.RATE_LIMITED,
-                message=f"Rate limit excedido. Máximo {self.requests_per_hour} requests por hora.",
+                message=f"Rate limit excedido. Máximo {decision.limit} requests por {self.WINDOW_LABELS[decision.window]}.",
                 details={
-                    "limit": self.requests_per_hour,
-                    "window": "1 hour",
-                    "reset_time": datetime.utcnow() + timedelta(hours=1)
+                    "limit": decision.limit,
+                    "window": decision.window,
+                    "retry_after": retry_after,
+                    "reset_time": datetime.utcfromtimestamp(reset_at)
                 },
                 request_id=getattr(request.state, 'request_id', None)
             )
             
             return JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                content=error_response.dict()
+                content=error_response.model_dump(mode="json"),
+                headers={
+                    "X-RateLimit-Limit": str(decision.limit),
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": str(reset_at),
+                    "Retry-After": str(retry_after)
+                }
             )
         
-        # Registrar requisição
-        self._record_request(client_id)
-        
         # Processar requisição
         response = await call_next(request)
         
         # Adicionar headers de rate limit
-        remaining = self.requests_per_hour - len(self.requests[client_id])
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_hour)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(time.time() + 3600))
+        response.headers["X-RateLimit-Limit"] = str(decision.limit)
+        response.headers["X-RateLimit-Remaining"] = str(decision.remaining)
+        response.headers["X-RateLimit-Reset"] = str(reset_at)
         
         return response
 
@@ -130,7 +169,7 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         """Processar autenticação"""
         # Pular autenticação para endpoints públicos
-        if request.url.path in ["/", "/info", "/health", "/docs", "/redoc", "/openapi.json"]:
+        if request.url.path in ["/", "/info", "/health", "/metrics", "/docs", "/redoc", "/openapi.json"]:
             return await call_next(request)
         
         # Verificar chave API
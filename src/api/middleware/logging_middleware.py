@@ -8,8 +8,11 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from typing import Dict, Any
 import time
 import uuid
+import logging
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 class LoggingMiddleware(BaseHTTPMiddleware):
     """
     Middleware de logging
@@ -79,8 +82,8 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             "api_key": request.headers.get("X-API-Key", "N/A")[:8] + "..." if request.headers.get("X-API-Key") else "N/A"
         }
         
-        # Log estruturado
-        print(f"REQUEST: {request_id} - {request.method} {request.url.path}")
+        # Log estruturado (enfileirado; codificado e gravado pelo pipeline assíncrono)
+        logger.info(log_data)
     
     async def _log_response(self, request: Request, response: Response, 
                           request_id: str, processing_time: float):
@@ -97,8 +100,8 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             "api_key": request.headers.get("X-API-Key", "N/A")[:8] + "..." if request.headers.get("X-API-Key") else "N/A"
         }
         
-        # Log estruturado
-        print(f"RESPONSE: {request_id} - {response.status_code} - {processing_time:.2f}ms")
+        # Log estruturado (enfileirado; codificado e gravado pelo pipeline assíncrono)
+        logger.info(log_data)
     
     async def _log_error(self, request: Request, error: Exception, 
                         request_id: str, processing_time: float):
@@ -115,8 +118,8 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             "api_key": request.headers.get("X-API-Key", "N/A")[:8] + "..." if request.headers.get("X-API-Key") else "N/A"
         }
         
-        # Log estruturado
-        print(f"ERROR: {request_id} - {type(error).__name__} - {str(error)}")
+        # Log estruturado (enfileirado; codificado e gravado pelo pipeline assíncrono)
+        logger.error(log_data)
 
 class RequestTracer:
     """Rastreador de requests para auditoria"""
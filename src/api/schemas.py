@@ -274,9 +274,13 @@ class BatchPredictionRequest(BaseModel):
     
     scenarios: List[PredictionRequest] = Field(
         ...,
-        description="Lista de cenários para previsão",
-        min_items=1,
-        max_items=10
+        description="Lista de cenários para previsão (máximo: MAX_BATCH_SIZE)",
+        min_items=1
+    )
+    
+    batch_id: Optional[str] = Field(
+        None,
+        description="ID do lote para rastreamento"
     )
 
 class BatchPredictionResponse(BaseModel):
@@ -336,6 +340,12 @@ class ModelVersion(BaseModel):
         example=0.65
     )
     
+    is_active: bool = Field(
+        False,
+        description="Indica se é a versão ativa",
+        example=True
+    )
+    
     backtest_metrics: Optional[Dict[str, float]] = Field(
         None,
         description="Métricas de backtest",
@@ -385,6 +395,12 @@ class HealthResponse(BaseModel):
         example=120.5
     )
     
+    latency_p99_ms: Optional[float] = Field(
+        None,
+        description="Latência P99 em milissegundos",
+        example=210.0
+    )
+    
     requests_per_minute: Optional[float] = Field(
         None,
         description="Requests por minuto",
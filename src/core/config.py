@@ -4,7 +4,7 @@ Configurações da aplicação
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 
 class Settings(BaseSettings):
@@ -40,6 +40,10 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_REQUESTS: int = Field(default=100, env="RATE_LIMIT_REQUESTS")
     RATE_LIMIT_WINDOW: int = Field(default=3600, env="RATE_LIMIT_WINDOW")  # 1 hora
+    RATE_LIMIT_KEY_TIERS: Dict[str, str] = Field(default={}, env="RATE_LIMIT_KEY_TIERS")  # chave API -> tier
+    RATE_LIMIT_DEFAULT_TIER: str = Field(default="premium", env="RATE_LIMIT_DEFAULT_TIER")
+    RATE_LIMIT_SHARDS: int = Field(default=64, env="RATE_LIMIT_SHARDS")
+    RATE_LIMIT_SWEEP_SECONDS: float = Field(default=60.0, env="RATE_LIMIT_SWEEP_SECONDS")
     
     # Modelos
     DEFAULT_MODEL_VERSION: str = "v1.0.0"
@@ -49,25 +53,62 @@ class Settings(BaseSettings):
     DATA_DIR: str = Field(default="data", env="DATA_DIR")
     FED_SELIC_DATA_PATH: str = "raw/fed_selic_combined.csv"
     FED_DETAILED_DATA_PATH: str = "raw/fed_detailed_data.csv"
+    COPOM_CALENDAR_PATH: str = Field(default="raw/copom_calendar.csv", env="COPOM_CALENDAR_PATH")
+    DATA_CACHE_REVALIDATE_SECONDS: float = Field(default=1.0, env="DATA_CACHE_REVALIDATE_SECONDS")
     
     # Logging
     LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    LOG_OUTPUT: str = Field(default="json", env="LOG_OUTPUT")  # json ou text
+    LOG_FILE: Optional[str] = Field(default=None, env="LOG_FILE")  # None: stderr
+    LOG_QUEUE_SIZE: int = Field(default=10000, env="LOG_QUEUE_SIZE")  # registros pendentes na fila
+    LOG_QUEUE_POLICY: str = Field(default="drop", env="LOG_QUEUE_POLICY")  # fila cheia: drop (descarta) ou block
+    LOG_QUEUE_BLOCK_MS: float = Field(default=50.0, env="LOG_QUEUE_BLOCK_MS")  # espera máxima com policy=block
+    LOG_BATCH_SIZE: int = Field(default=256, env="LOG_BATCH_SIZE")  # registros por escrita
+    LOG_SAMPLING: bool = Field(default=True, env="LOG_SAMPLING")  # False: todos os requests registrados
+    LOG_SAMPLE_RATE: float = Field(default=1.0, env="LOG_SAMPLE_RATE")  # fração amostrada na entrada (hash do request ID)
+    LOG_SAMPLE_MAX_PER_SECOND: float = Field(default=100.0, env="LOG_SAMPLE_MAX_PER_SECOND")  # teto da amostragem na entrada
+    LOG_SAMPLE_SLOW_QUANTILE: float = Field(default=0.99, env="LOG_SAMPLE_SLOW_QUANTILE")  # acima dele o request é registrado
+    LOG_SAMPLE_ERROR_STATUS: int = Field(default=500, env="LOG_SAMPLE_ERROR_STATUS")  # status a partir do qual sempre registra
     
     # Observabilidade
     ENABLE_METRICS: bool = Field(default=True, env="ENABLE_METRICS")
     ENABLE_TRACING: bool = Field(default=True, env="ENABLE_TRACING")
+    TRACING_EXPORT_PATH: Optional[str] = Field(default=None, env="TRACING_EXPORT_PATH")  # OTLP/JSON; None: só em memória
+    TRACING_SAMPLE_RATE: float = Field(default=1.0, env="TRACING_SAMPLE_RATE")  # traces exportados; métricas por etapa sempre
+    TRACING_MAX_TRACES: int = Field(default=256, env="TRACING_MAX_TRACES")  # traces recentes no coletor em memória
     
     # Redis (para cache e rate limiting)
     REDIS_URL: Optional[str] = Field(default=None, env="REDIS_URL")
     REDIS_HOST: str = Field(default="localhost", env="REDIS_HOST")
     REDIS_PORT: int = Field(default=6379, env="REDIS_PORT")
     REDIS_DB: int = Field(default=0, env="REDIS_DB")
+    REDIS_MAX_CONNECTIONS: int = Field(default=50, env="REDIS_MAX_CONNECTIONS")  # pool compartilhado (asyncio)
+    CACHE_MEMORY_MAX_ENTRIES: int = Field(default=10000, env="CACHE_MEMORY_MAX_ENTRIES")
+    CACHE_MEMORY_MAX_BYTES: int = Field(default=64 * 1024 * 1024, env="CACHE_MEMORY_MAX_BYTES")
+    CACHE_CODEC: str = Field(default="orjson", env="CACHE_CODEC")  # json | orjson | msgpack | packed
+    CACHE_COMPRESSION: str = Field(default="zlib", env="CACHE_COMPRESSION")  # none | zlib | zstd
+    CACHE_COMPRESS_MIN_BYTES: int = Field(default=512, env="CACHE_COMPRESS_MIN_BYTES")  # previsões: ~1.3-1.7KB em orjson
+    CACHE_L1_MAX_ENTRIES: int = Field(default=2048, env="CACHE_L1_MAX_ENTRIES")  # 0 desativa o L1
+    CACHE_L1_MAX_BYTES: int = Field(default=8 * 1024 * 1024, env="CACHE_L1_MAX_BYTES")
+    CACHE_L1_TTL_SECONDS: int = Field(default=60, env="CACHE_L1_TTL_SECONDS")
+    CACHE_NEGATIVE_TTL_SECONDS: int = Field(default=30, env="CACHE_NEGATIVE_TTL_SECONDS")
+    CACHE_WARMUP_ENABLED: bool = Field(default=True, env="CACHE_WARMUP_ENABLED")  # aquecer na ativação
+    CACHE_WARMUP_CONCURRENCY: int = Field(default=4, env="CACHE_WARMUP_CONCURRENCY")  # blocos em andamento
+    CACHE_WARMUP_CHUNK_SIZE: int = Field(default=32, env="CACHE_WARMUP_CHUNK_SIZE")
+    # Vazio: próximas CACHE_WARMUP_COPOM_WINDOWS reuniões do Copom. A chave do cache usa a próxima
+    # reunião após a decisão do Fed, então cada data aquece a janela inteira até a reunião
+    CACHE_WARMUP_FED_DATES: List[str] = Field(default=[], env="CACHE_WARMUP_FED_DATES")
+    CACHE_WARMUP_COPOM_WINDOWS: int = Field(default=2, env="CACHE_WARMUP_COPOM_WINDOWS")
     
     # Validação
     MAX_BATCH_SIZE: int = Field(default=100, env="MAX_BATCH_SIZE")
+    BATCH_EXECUTOR: str = Field(default="thread", env="BATCH_EXECUTOR")  # thread | process
+    BATCH_MAX_WORKERS: Optional[int] = Field(default=None, env="BATCH_MAX_WORKERS")  # None: núcleos disponíveis
     MAX_HORIZONS: int = Field(default=12, env="MAX_HORIZONS")
     MIN_HORIZONS: int = Field(default=1, env="MIN_HORIZONS")
+    MIN_FED_MOVE_BPS: int = Field(default=-200, env="MIN_FED_MOVE_BPS")
+    MAX_FED_MOVE_BPS: int = Field(default=200, env="MAX_FED_MOVE_BPS")
     
     # Modelo ML
     DEFAULT_METHODOLOGY: str = "LP primary, BVAR fallback"
@@ -112,6 +112,15 @@ class ModelVersionNotFoundError(QuantumXException):
             details={"version": version}
         )
 
+class ModelVersionExistsError(QuantumXException):
+    """Versão do modelo já registrada"""
+    def __init__(self, message: str, version: str = None):
+        super().__init__(
+            message=message,
+            error_code="MODEL_VERSION_EXISTS",
+            details={"version": version}
+        )
+
 class InsufficientDataError(QuantumXException):
     """Dados insuficientes"""
     def __init__(self, message: str, required: int = None, available: int = None):
@@ -4,7 +4,8 @@ Definições abstratas para inversão de dependência
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
@@ -73,6 +74,22 @@ class IProbabilityEngine(ABC):
                                  step: int = 25) -> List[Dict[str, Any]]:
         """Discretizar movimentos em múltiplos de 25 bps"""
         pass
+    
+    @abstractmethod
+    async def convert_draws(self,
+                            draws: np.ndarray,
+                            horizons: Sequence[int],
+                            copom_calendar: pd.DataFrame) -> Dict[str, Any]:
+        """Converter draws (n_draws x n_horizons) em probabilidades"""
+        pass
+    
+    @abstractmethod
+    async def convert_paths(self,
+                            paths: Any,
+                            horizons: Sequence[int],
+                            copom_calendar: pd.DataFrame) -> Dict[str, Any]:
+        """Converter caminhos simulados (array ou blocos) em probabilidades com memória limitada"""
+        pass
 
 class IValidationService(ABC):
     """Interface para validação de dados"""
@@ -114,8 +131,10 @@ class IMetricsService(ABC):
     """Interface para métricas"""
     
     @abstractmethod
-    async def record_prediction_latency(self, request_id: str, latency_ms: float) -> None:
-        """Registrar latência de previsão"""
+    async def record_prediction_latency(self, request_id: str, latency_ms: float,
+                                        endpoint: str = "predict_selic",
+                                        model_version: Optional[str] = None) -> None:
+        """Registrar latência de previsão por endpoint e versão do modelo"""
         pass
     
     @abstractmethod
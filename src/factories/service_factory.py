@@ -5,6 +5,7 @@ Factory para criar e injetar dependências
 
 from typing import Dict, Any, Optional
 import asyncio
+import os
 from datetime import datetime
 
 from src.core.interfaces import (
@@ -15,16 +16,24 @@ from src.core.interfaces import (
 )
 from src.core.models import ModelConfiguration, APIConfiguration, DataConfiguration
 from src.core.exceptions import ConfigurationError
+from src.core.config import get_settings
 
 # Importações das implementações (serão criadas)
 from src.services.prediction_service import PredictionService
 from src.repositories.data_repository import CompositeDataRepository, FedDataRepository, SelicDataRepository
-from src.services.model_service import LocalProjectionsModelService, BVARMinnesotaModelService
+from src.services.model_service import ModelService, LocalProjectionsModelService, BVARMinnesotaModelService
+from src.services.data_service import DataService
+from src.services.health_service import HealthService
+from src.services.batch_executor import BatchExecutor
 from src.services.probability_engine import ProbabilityEngineService
 from src.services.validation_service import ValidationService
 from src.services.logging_service import LoggingService
+from src.services.log_sampler import LogSampler
 from src.services.metrics_service import MetricsService
+from src.services.tracing import Tracer, InMemorySpanExporter, JsonFileSpanExporter, set_tracer
 from src.services.cache_service import RedisCacheService
+from src.services.cache_warmup import CacheWarmupService
+from src.services.copom_calendar import CopomCalendarService
 from src.services.error_handler import ErrorHandlerService
 from src.services.stationarity_service import StationarityService
 from src.services.data_processor import DataProcessorService
@@ -47,31 +56,83 @@ class ServiceFactory:
     
     async def create_prediction_service(self) -> PredictionService:
         """Criar PredictionService com todas as dependências"""
+        if 'prediction_service' not in self._instances:
+            # Criar dependências antes de adquirir o lock (asyncio.Lock não é reentrante)
+            model_registry = await self.create_model_registry()
+            data_service = await self.create_data_service()
+            batch_executor = await self.create_batch_executor()
+            cache_service = await self.create_cache_service()
+            metrics_service = await self.create_metrics_service()
+            copom_calendar = await self.create_copom_calendar()
+            
+            async with self._lock:
+                if 'prediction_service' not in self._instances:
+                    self._instances['prediction_service'] = PredictionService(
+                        model_service=model_registry,
+                        data_service=data_service,
+                        batch_executor=batch_executor,
+                        cache_service=cache_service,
+                        metrics_service=metrics_service,
+                        copom_calendar=copom_calendar
+                    )
+        
+        return self._instances['prediction_service']
+    
+    async def create_health_service(self) -> HealthService:
+        """Criar serviço de health check (compartilha registro e dados com as previsões)"""
+        if 'health_service' not in self._instances:
+            model_registry = await self.create_model_registry()
+            data_service = await self.create_data_service()
+            metrics_service = await self.create_metrics_service()
+            
+            async with self._lock:
+                if 'health_service' not in self._instances:
+                    self._instances['health_service'] = HealthService(
+                        model_service=model_registry,
+                        data_service=data_service,
+                        metrics_service=metrics_service
+                    )
+        
+        return self._instances['health_service']
+    
+    async def create_model_registry(self) -> ModelService:
+        """Criar registro de versões de modelos"""
         async with self._lock:
-            if 'prediction_service' not in self._instances:
-                # Criar dependências
-                model_service = await self.create_model_service()
-                data_repository = await self.create_data_repository()
-                probability_engine = await self.create_probability_engine()
-                validation_service = await self.create_validation_service()
-                logging_service = await self.create_logging_service()
-                metrics_service = await self.create_metrics_service()
-                cache_service = await self.create_cache_service()
-                error_handler = await self.create_error_handler()
-                
-                # Criar PredictionService
-                self._instances['prediction_service'] = PredictionService(
-                    model_service=model_service,
-                    data_repository=data_repository,
-                    probability_engine=probability_engine,
-                    validation_service=validation_service,
-                    logging_service=logging_service,
-                    metrics_service=metrics_service,
-                    cache_service=cache_service,
-                    error_handler=error_handler
+            if 'model_registry' not in self._instances:
+                self._instances['model_registry'] = ModelService()
+            
+            return self._instances['model_registry']
+    
+    async def create_data_service(self) -> DataService:
+        """Criar serviço de dados (mantém os dados carregados entre requests)"""
+        async with self._lock:
+            if 'data_service' not in self._instances:
+                self._instances['data_service'] = DataService()
+            
+            return self._instances['data_service']
+    
+    async def create_copom_calendar(self) -> CopomCalendarService:
+        """Criar calendário do Copom (arquivo em DATA_DIR ou datas geradas; carregado uma vez)"""
+        async with self._lock:
+            if 'copom_calendar' not in self._instances:
+                settings = get_settings()
+                self._instances['copom_calendar'] = CopomCalendarService(
+                    calendar_path=os.path.join(settings.DATA_DIR, settings.COPOM_CALENDAR_PATH)
                 )
             
-            return self._instances['prediction_service']
+            return self._instances['copom_calendar']
+    
+    async def create_batch_executor(self) -> BatchExecutor:
+        """Criar pool limitado de workers para previsões em lote"""
+        async with self._lock:
+            if 'batch_executor' not in self._instances:
+                settings = get_settings()
+                self._instances['batch_executor'] = BatchExecutor(
+                    kind=settings.BATCH_EXECUTOR,
+                    max_workers=settings.BATCH_MAX_WORKERS
+                )
+            
+            return self._instances['batch_executor']
     
     async def create_model_service(self, model_type: str = "local_projections") -> IModelService:
         """Criar serviço de modelo"""
@@ -101,6 +162,8 @@ class ServiceFactory:
     
     async def create_data_repository(self) -> IDataRepository:
         """Criar repositório de dados"""
+        copom_calendar = await self.create_copom_calendar()
+        
         async with self._lock:
             if 'data_repository' not in self._instances:
                 data_config = self.config.get('data', {})
@@ -111,7 +174,8 @@ class ServiceFactory:
                 )
                 
                 selic_repo = SelicDataRepository(
-                    bcb_api_url=data_config.get('bcb_api_url', '')
+                    bcb_api_url=data_config.get('bcb_api_url', ''),
+                    copom_calendar=copom_calendar
                 )
                 
                 # Criar repositório composto
@@ -128,7 +192,9 @@ class ServiceFactory:
             if 'probability_engine' not in self._instances:
                 self._instances['probability_engine'] = ProbabilityEngineService(
                     discretization_step=self.config.get('probability', {}).get('step', 25),
-                    confidence_levels=self.config.get('probability', {}).get('confidence_levels', [0.8, 0.95])
+                    confidence_levels=self.config.get('probability', {}).get('confidence_levels', [0.8, 0.95]),
+                    max_move_bps=self.config.get('probability', {}).get('max_move_bps', 2000),
+                    chunk_size=self.config.get('probability', {}).get('chunk_size', 65536)
                 )
             
             return self._instances['probability_engine']
@@ -148,10 +214,21 @@ class ServiceFactory:
         async with self._lock:
             if 'logging_service' not in self._instances:
                 logging_config = self.config.get('logging', {})
+                settings = get_settings()
                 self._instances['logging_service'] = LoggingService(
-                    log_level=logging_config.get('level', 'INFO'),
-                    log_format=logging_config.get('format', 'json'),
-                    log_file=logging_config.get('file', None)
+                    log_level=logging_config.get('level', settings.LOG_LEVEL),
+                    log_format=logging_config.get('format', settings.LOG_OUTPUT),
+                    log_file=logging_config.get('file', settings.LOG_FILE),
+                    queue_size=logging_config.get('queue_size', settings.LOG_QUEUE_SIZE),
+                    queue_policy=logging_config.get('queue_policy', settings.LOG_QUEUE_POLICY),
+                    block_timeout_ms=logging_config.get('block_timeout_ms', settings.LOG_QUEUE_BLOCK_MS),
+                    batch_size=logging_config.get('batch_size', settings.LOG_BATCH_SIZE),
+                    sampler=LogSampler(
+                        sample_rate=logging_config.get('sample_rate', settings.LOG_SAMPLE_RATE),
+                        max_per_second=logging_config.get('sample_max_per_second', settings.LOG_SAMPLE_MAX_PER_SECOND),
+                        slow_quantile=logging_config.get('sample_slow_quantile', settings.LOG_SAMPLE_SLOW_QUANTILE),
+                        error_status=logging_config.get('sample_error_status', settings.LOG_SAMPLE_ERROR_STATUS)
+                    ) if logging_config.get('sampling', settings.LOG_SAMPLING) else None
                 )
             
             return self._instances['logging_service']
@@ -168,18 +245,76 @@ class ServiceFactory:
             
             return self._instances['metrics_service']
     
+    async def create_tracer(self) -> Tracer:
+        """Criar tracer da aplicação (spans resumidos por etapa no serviço de métricas)"""
+        if 'tracer' not in self._instances:
+            # Criar dependências antes de adquirir o lock (asyncio.Lock não é reentrante)
+            metrics_service = await self.create_metrics_service()
+            
+            async with self._lock:
+                if 'tracer' not in self._instances:
+                    settings = get_settings()
+                    exporters = [InMemorySpanExporter(max_traces=settings.TRACING_MAX_TRACES)]
+                    if settings.TRACING_EXPORT_PATH:
+                        exporters.append(JsonFileSpanExporter(
+                            os.path.join(settings.DATA_DIR, settings.TRACING_EXPORT_PATH)
+                            if not os.path.isabs(settings.TRACING_EXPORT_PATH) else settings.TRACING_EXPORT_PATH,
+                            service_name=settings.API_TITLE
+                        ))
+                    tracer = Tracer(
+                        service_name=settings.API_TITLE,
+                        exporters=exporters,
+                        sample_rate=settings.TRACING_SAMPLE_RATE,
+                        enabled=settings.ENABLE_TRACING
+                    )
+                    tracer.add_listener(metrics_service.observe_span)
+                    set_tracer(tracer)
+                    self._instances['tracer'] = tracer
+        
+        return self._instances['tracer']
+    
     async def create_cache_service(self) -> ICacheService:
         """Criar serviço de cache"""
         async with self._lock:
             if 'cache_service' not in self._instances:
                 cache_config = self.config.get('cache', {})
+                settings = get_settings()
                 self._instances['cache_service'] = RedisCacheService(
                     redis_url=cache_config.get('redis_url', 'redis://localhost:6379'),
-                    default_ttl=cache_config.get('default_ttl', 3600)
+                    default_ttl=cache_config.get('default_ttl', 3600),
+                    memory_max_entries=cache_config.get('memory_max_entries', settings.CACHE_MEMORY_MAX_ENTRIES),
+                    memory_max_bytes=cache_config.get('memory_max_bytes', settings.CACHE_MEMORY_MAX_BYTES),
+                    max_connections=cache_config.get('max_connections', settings.REDIS_MAX_CONNECTIONS),
+                    codec=cache_config.get('codec', settings.CACHE_CODEC),
+                    compression=cache_config.get('compression', settings.CACHE_COMPRESSION),
+                    compress_min_bytes=cache_config.get('compress_min_bytes', settings.CACHE_COMPRESS_MIN_BYTES),
+                    l1_max_entries=cache_config.get('l1_max_entries', settings.CACHE_L1_MAX_ENTRIES),
+                    l1_max_bytes=cache_config.get('l1_max_bytes', settings.CACHE_L1_MAX_BYTES),
+                    l1_ttl=cache_config.get('l1_ttl', settings.CACHE_L1_TTL_SECONDS),
+                    negative_ttl=cache_config.get('negative_ttl', settings.CACHE_NEGATIVE_TTL_SECONDS)
                 )
             
             return self._instances['cache_service']
     
+    async def create_cache_warmup_service(self) -> CacheWarmupService:
+        """Criar serviço de aquecimento do cache (grava pelo serviço de previsão)"""
+        if 'cache_warmup_service' not in self._instances:
+            prediction_service = await self.create_prediction_service()
+            
+            async with self._lock:
+                if 'cache_warmup_service' not in self._instances:
+                    warmup_config = self.config.get('cache_warmup', {})
+                    settings = get_settings()
+                    self._instances['cache_warmup_service'] = CacheWarmupService(
+                        prediction_service=prediction_service,
+                        concurrency=warmup_config.get('concurrency', settings.CACHE_WARMUP_CONCURRENCY),
+                        chunk_size=warmup_config.get('chunk_size', settings.CACHE_WARMUP_CHUNK_SIZE),
+                        fed_decision_dates=warmup_config.get('fed_decision_dates', settings.CACHE_WARMUP_FED_DATES),
+                        copom_windows=warmup_config.get('copom_windows', settings.CACHE_WARMUP_COPOM_WINDOWS)
+                    )
+        
+        return self._instances['cache_warmup_service']
+    
     async def create_error_handler(self) -> IErrorHandler:
         """Criar handler de erros"""
         async with self._lock:
@@ -231,6 +366,10 @@ class ServiceFactory:
         # Verificar status de cada serviço
         services_to_check = [
             'prediction_service',
+            'model_registry',
+            'data_service',
+            'copom_calendar',
+            'batch_executor',
             'data_repository',
             'model_service_local_projections',
             'model_service_bvar_minnesota',
@@ -238,7 +377,9 @@ class ServiceFactory:
             'validation_service',
             'logging_service',
             'metrics_service',
+            'tracer',
             'cache_service',
+            'cache_warmup_service',
             'error_handler'
         ]
         
@@ -264,7 +405,8 @@ class ServiceFactory:
     async def cleanup(self):
         """Limpar instâncias (útil para testes)"""
         async with self._lock:
-            for service in self._instances.values():
+            # Ordem inversa de criação: dependentes (ex.: aquecimento) antes de suas dependências
+            for service in reversed(list(self._instances.values())):
                 if hasattr(service, 'cleanup'):
                     await service.cleanup()
             self._instances.clear()
@@ -312,10 +454,7 @@ async def get_service_factory(config: Dict[str, Any] = None) -> ServiceFactory:
                     'redis_url': 'redis://localhost:6379',
                     'default_ttl': 3600
                 },
-                'logging': {
-                    'level': 'INFO',
-                    'format': 'json'
-                },
+                'logging': {},  # LOG_* das settings
                 'metrics': {
                     'backend': 'prometheus',
                     'port': 9090
@@ -6,7 +6,7 @@ Repositório para acesso a dados FED-Selic
 import pandas as pd
 import asyncio
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import yfinance as yf
 from fredapi import Fred
 import requests
@@ -15,6 +15,7 @@ import logging
 from src.core.interfaces import IDataRepository
 from src.core.exceptions import DataRepositoryError, ExternalServiceError
 from src.core.models import DataQuality
+from src.services.copom_calendar import CopomCalendarService
 
 logger = logging.getLogger(__name__)
 
@@ -142,9 +143,11 @@ class SelicDataRepository(IDataRepository):
     - Processar dados históricos
     """
     
-    def __init__(self, bcb_api_url: str = "https://api.bcb.gov.br/dados/serie/bcdata.sgs.11/dados"):
+    def __init__(self, bcb_api_url: str = "https://api.bcb.gov.br/dados/serie/bcdata.sgs.11/dados",
+                 copom_calendar: Optional[CopomCalendarService] = None):
         self.bcb_api_url = bcb_api_url
         self.selic_series_code = "11"  # Código da Selic no BCB
+        self.copom_calendar = copom_calendar or CopomCalendarService()
     
     async def get_fed_data(self, start_date: datetime, end_date: datetime) -> pd.DataFrame:
         """Implementação vazia - delegada para FedDataRepository"""
@@ -196,17 +199,8 @@ class SelicDataRepository(IDataRepository):
     async def get_copom_calendar(self, start_date: datetime, end_date: datetime) -> pd.DataFrame:
         """Obter calendário do Copom"""
         try:
-            # Calendário do Copom é fixo (8 reuniões por ano)
-            # Implementação simplificada - em produção, usar API oficial
-            copom_dates = self._generate_copom_dates(start_date, end_date)
-            
-            df = pd.DataFrame({
-                'date': copom_dates,
-                'meeting_number': range(1, len(copom_dates) + 1),
-                'is_meeting': True
-            })
-            
-            return df
+            # Lista oficial em arquivo ou datas geradas, indexadas uma vez (CopomCalendarService)
+            return self.copom_calendar.to_frame(start_date, end_date)
             
         except Exception as e:
             raise DataRepositoryError(f"Erro ao obter calendário do Copom: {str(e)}")
@@ -219,29 +213,6 @@ class SelicDataRepository(IDataRepository):
             moves.append(move_bps)
         return moves
     
-    def _generate_copom_dates(self, start_date: datetime, end_date: datetime) -> List[datetime]:
-        """Gerar datas das reuniões do Copom"""
-        # Datas aproximadas das reuniões do Copom (terceira quarta-feira do mês)
-        copom_dates = []
-        current_date = start_date.replace(day=1)
-        
-        while current_date <= end_date:
-            # Terceira quarta-feira do mês
-            first_day = current_date.replace(day=1)
-            first_wednesday = first_day + timedelta(days=(2 - first_day.weekday()) % 7)
-            third_wednesday = first_wednesday + timedelta(weeks=2)
-            
-            if start_date <= third_wednesday <= end_date:
-                copom_dates.append(third_wednesday)
-            
-            # Próximo mês
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
-        
-        return copom_dates
-    
     async def _assess_data_quality(self, data: pd.DataFrame, source: str) -> DataQuality:
         """Avaliar qualidade dos dados"""
         n_total = len(data)
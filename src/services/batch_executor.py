@@ -0,0 +1,83 @@
+"""
+Executor limitado para previsões em lote (pool de threads ou de processos)
+"""
+
+import os
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+class BatchExecutor:
+    """
+    Pool de workers compartilhado pelos lotes de previsão
+
+    Responsabilidades:
+    - Limitar a concorrência a max_workers, independente do tamanho do lote
+    - Threads para trabalho que libera o GIL (indexação da tabela, NumPy)
+    - Processos para simulação BVAR fora da grade (CPU-bound em Python)
+    - Dividir o lote em blocos, um por worker, para amortizar o custo de IPC
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: Optional[int] = None):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Tipo de executor inválido: {kind} (esperado: {', '.join(EXECUTOR_KINDS)})")
+
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        """Criar o pool sob demanda (processos só sobem no primeiro lote)"""
+        if self._executor is None:
+            if self.kind == "process":
+                # spawn: fork de um processo com event loop e threads não é seguro
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="batch-predict"
+                )
+            logger.info(f"Executor de lotes iniciado: {self.kind} com {self.max_workers} workers")
+        return self._executor
+
+    def chunk(self, items: Sequence[Any]) -> List[Sequence[Any]]:
+        """Dividir itens em até max_workers blocos contíguos (ordem preservada)"""
+        n_chunks = min(self.max_workers, len(items))
+        if n_chunks == 0:
+            return []
+        size, remainder = divmod(len(items), n_chunks)
+        chunks, start = [], 0
+        for i in range(n_chunks):
+            end = start + size + (1 if i < remainder else 0)
+            chunks.append(items[start:end])
+            start = end
+        return chunks
+
+    async def map_chunks(self, fn: Callable[[Sequence[Any]], List[Any]],
+                         items: Sequence[Any]) -> List[Any]:
+        """Aplicar fn a blocos de itens nos workers e concatenar os resultados na ordem original"""
+        if not items:
+            return []
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(executor, fn, chunk) for chunk in self.chunk(items)
+        ))
+        return [item for chunk_result in results for item in chunk_result]
+
+    async def cleanup(self):
+        """Encerrar o pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
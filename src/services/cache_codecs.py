@@ -0,0 +1,211 @@
+"""
+Codecs de serialização do cache de previsões (JSON, orjson, msgpack, float32 empacotado)
+"""
+
+import json
+import zlib
+import importlib.util
+import struct
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.exceptions import CacheError
+
+logger = logging.getLogger(__name__)
+
+# Quadro: MAGIC | id do codec | id da compressão | corpo
+FRAME_MAGIC = 0xC5
+FRAME_HEADER = struct.Struct("<BBB")
+
+# Corpo empacotado: n distribuição | n reuniões | bytes do esqueleto
+PACKED_HEADER = struct.Struct("<HHI")
+# Probabilidades da API têm até 3 casas: float32 arredondado em 6 casas reconstrói o valor
+PROBABILITY_DECIMALS = 6
+
+CODEC_IDS = {"json": 1, "orjson": 2, "msgpack": 3, "packed": 4}
+CODEC_NAMES = {codec_id: name for name, codec_id in CODEC_IDS.items()}
+COMPRESSION_IDS = {"none": 0, "zlib": 1, "zstd": 2}
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, default=str).encode()
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    import orjson
+    return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+def _orjson_loads(data: bytes) -> Any:
+    import orjson
+    return orjson.loads(data)
+
+
+def _msgpack_dumps(obj: Any) -> bytes:
+    import msgpack
+    return msgpack.packb(obj, default=str, use_bin_type=True)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    import msgpack
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def _extract_records(records: Any, fields: Tuple[str, ...]) -> Optional[List[list]]:
+    """Colunas de uma lista de dicts com exatamente os campos dados (None: fica no esqueleto)"""
+    if not isinstance(records, list) or len(records) >= 0xFFFF:
+        return None
+    try:
+        # Todos os campos presentes e a contagem total batendo: nenhum campo extra
+        if sum(map(len, records)) != len(fields) * len(records):
+            return None
+        return [[r[f] for r in records] for f in fields]
+    except (KeyError, TypeError):
+        return None
+
+
+def _packed_dumps(obj: Any) -> bytes:
+    """Esqueleto orjson + arrays int32 (delta_bps) e float32 (probability)"""
+    if not isinstance(obj, dict):
+        return PACKED_HEADER.pack(0, 0, 0) + _orjson_dumps(obj)
+
+    skeleton = dict(obj)
+    packed, deltas, probs = [], [], []
+    distribution = _extract_records(skeleton.get("distribution"), ("delta_bps", "probability"))
+    if distribution is not None:
+        del skeleton["distribution"]
+        packed.append("distribution")
+        deltas += distribution[0]
+        probs += distribution[1]
+    meetings = _extract_records(skeleton.get("per_meeting"), ("copom_date", "delta_bps", "probability"))
+    if meetings is not None:
+        del skeleton["per_meeting"]
+        skeleton["__copom_dates__"] = meetings[0]
+        packed.append("per_meeting")
+        deltas += meetings[1]
+        probs += meetings[2]
+    skeleton["__packed__"] = packed
+
+    head = _orjson_dumps(skeleton)
+    n_dist = len(distribution[0]) if distribution is not None else 0
+    n_meet = len(meetings[0]) if meetings is not None else 0
+    # Arrays curtos (~10-20 pontos): struct evita o custo fixo de criar arrays NumPy
+    arrays = struct.pack(f"<{len(deltas)}i{len(probs)}f", *deltas, *probs)
+    return PACKED_HEADER.pack(n_dist, n_meet, len(head)) + head + arrays
+
+
+def _packed_loads(data: bytes) -> Any:
+    n_dist, n_meet, head_len = PACKED_HEADER.unpack_from(data)
+    offset = PACKED_HEADER.size
+    if head_len == 0:
+        return _orjson_loads(data[offset:])
+
+    obj = _orjson_loads(data[offset:offset + head_len])
+    offset += head_len
+    n = n_dist + n_meet
+    deltas = struct.unpack_from(f"<{n}i", data, offset)
+    # Arredondamento vetorizado: round() por elemento custaria mais que o parse do esqueleto
+    probs = np.frombuffer(data, dtype="<f4", count=n, offset=offset + 4 * n).astype(np.float64)
+    probs = probs.round(PROBABILITY_DECIMALS).tolist()
+
+    packed = obj.pop("__packed__")
+    if "distribution" in packed:
+        obj["distribution"] = [
+            {"delta_bps": d, "probability": p} for d, p in zip(deltas[:n_dist], probs[:n_dist])
+        ]
+    if "per_meeting" in packed:
+        obj["per_meeting"] = [
+            {"copom_date": date, "delta_bps": d, "probability": p}
+            for date, d, p in zip(obj.pop("__copom_dates__"), deltas[n_dist:], probs[n_dist:])
+        ]
+    return obj
+
+
+CODECS: Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    "json": (_json_dumps, json.loads),
+    "orjson": (_orjson_dumps, _orjson_loads),
+    "msgpack": (_msgpack_dumps, _msgpack_loads),
+    "packed": (_packed_dumps, _packed_loads),
+}
+
+
+def _zstd():
+    """Módulo zstandard (dependência opcional)"""
+    import zstandard
+    return zstandard
+
+
+class CacheSerializer:
+    """
+    Serialização de previsões para o cache
+
+    Responsabilidades:
+    - Codec configurável: json (legado), orjson (padrão), msgpack ou packed
+      (esqueleto orjson + distribution/per_meeting em arrays int32/float32)
+    - Compressão zlib/zstd só acima de compress_min_bytes; o padrão (512) fica
+      abaixo das previsões em orjson (~1.3-1.7KB), que o zlib reduz a ~40%
+    - Quadro com ids do codec e da compressão: a leitura independe da
+      configuração atual, e entradas JSON antigas (sem quadro) continuam legíveis
+    """
+
+    def __init__(self, codec: str = "orjson", compression: str = "zlib", compress_min_bytes: int = 512):
+        if codec not in CODECS:
+            raise ValueError(f"Codec de cache inválido: {codec} (esperado: {', '.join(CODECS)})")
+        if compression not in COMPRESSION_IDS:
+            raise ValueError(f"Compressão de cache inválida: {compression} (esperado: {', '.join(COMPRESSION_IDS)})")
+
+        if codec == "msgpack" and importlib.util.find_spec("msgpack") is None:
+            logger.warning("msgpack não instalado, usando orjson no cache")
+            codec = "orjson"
+        if codec in ("orjson", "packed") and importlib.util.find_spec("orjson") is None:
+            logger.warning("orjson não instalado, usando json no cache")
+            codec = "json"
+        if compression == "zstd":
+            try:
+                self._zstd_compressor = _zstd().ZstdCompressor(level=3)
+            except ImportError:
+                logger.warning("zstandard não instalado, usando zlib no cache")
+                compression = "zlib"
+
+        self.codec = codec
+        self.compression = compression
+        self.compress_min_bytes = compress_min_bytes
+        self._dumps = CODECS[codec][0]
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serializar (e comprimir acima do limiar)"""
+        body = self._dumps(obj)
+        compression = "none"
+        if self.compression != "none" and len(body) >= self.compress_min_bytes:
+            if self.compression == "zstd":
+                compressed = self._zstd_compressor.compress(body)
+            else:
+                compressed = zlib.compress(body, 6)
+            # Só vale a pena se reduzir o tamanho
+            if len(compressed) < len(body):
+                body, compression = compressed, self.compression
+        return FRAME_HEADER.pack(FRAME_MAGIC, CODEC_IDS[self.codec], COMPRESSION_IDS[compression]) + body
+
+    def loads(self, data: Optional[bytes]) -> Any:
+        """Desserializar qualquer quadro conhecido (ou JSON legado sem quadro)"""
+        if isinstance(data, str):
+            data = data.encode()
+        if not data or data[0] != FRAME_MAGIC:
+            return json.loads(data)
+
+        _, codec_id, compression_id = FRAME_HEADER.unpack_from(data)
+        body = data[FRAME_HEADER.size:]
+        if compression_id == COMPRESSION_IDS["zlib"]:
+            body = zlib.decompress(body)
+        elif compression_id == COMPRESSION_IDS["zstd"]:
+            try:
+                body = _zstd().ZstdDecompressor().decompress(body)
+            except ImportError:
+                raise CacheError("Entrada do cache comprimida com zstd, mas zstandard não está instalado",
+                                 operation="decode")
+
+        if codec_id not in CODEC_NAMES:
+            raise CacheError(f"Codec de cache desconhecido: {codec_id}", operation="decode")
+        return CODECS[CODEC_NAMES[codec_id]][1](body)
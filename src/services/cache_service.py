@@ -3,13 +3,22 @@ Cache Service - Single Responsibility Principle
 Serviço responsável por cache de previsões e dados
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence
 import json
+import uuid
+import asyncio
 import hashlib
-from datetime import datetime, timedelta
+import logging
 
 from src.core.interfaces import ICacheService
 from src.core.exceptions import CacheError
+from src.services.memory_cache import LRUMemoryCache
+from src.services.cache_codecs import CacheSerializer
+
+logger = logging.getLogger(__name__)
+
+# Tamanho contabilizado de um resultado de validação no cache negativo (dict pequeno, não serializado)
+NEGATIVE_ENTRY_BYTES = 512
 
 class RedisCacheService(ICacheService):
     """
@@ -19,151 +28,397 @@ class RedisCacheService(ICacheService):
     - Cache de previsões
     - Cache de modelos
     - Invalidação de cache
+    
+    Usa o cliente asyncio do Redis sobre um pool de conexões compartilhado, então
+    nenhuma chamada bloqueia o event loop; a conexão é aberta na primeira operação.
+    Sem Redis, usa um LRUMemoryCache limitado em entradas e bytes, com
+    expiração preguiçosa por TTL. Os valores passam pelo CacheSerializer
+    (codec configurável, distribuições em float32, compressão acima de um limiar).
+    
+    Chaves levam a versão do modelo em texto (prediction:<versão>:<hash>) e cada
+    versão tem um conjunto com suas chaves (prediction:index:<versão>), então a
+    invalidação remove só as chaves da versão, sem KEYS/SCAN no keyspace.
+    
+    Com Redis, cada worker mantém um L1 (LRU em processo, TTL curto) na frente
+    do Redis (L2), com escrita nos dois níveis: chaves quentes são servidas sem
+    ida à rede. Invalidações e ativações de modelo são publicadas no canal
+    prediction:invalidation e aplicadas ao L1 de todos os workers. Falhas de
+    validação ficam em um cache negativo local de TTL curto.
     """
     
-    def __init__(self, redis_url: str = "redis://localhost:6379", default_ttl: int = 3600):
+    KEY_PREFIX = "prediction"
+    INDEX_PREFIX = "prediction:index"
+    INVALIDATION_CHANNEL = "prediction:invalidation"
+    
+    def __init__(self,
+                 redis_url: str = "redis://localhost:6379",
+                 default_ttl: int = 3600,
+                 memory_max_entries: int = 10000,
+                 memory_max_bytes: int = 64 * 1024 * 1024,
+                 max_connections: int = 50,
+                 codec: str = "orjson",
+                 compression: str = "zlib",
+                 compress_min_bytes: int = 512,
+                 l1_max_entries: int = 2048,
+                 l1_max_bytes: int = 8 * 1024 * 1024,
+                 l1_ttl: int = 60,
+                 negative_ttl: int = 30,
+                 redis_client: Optional[Any] = None):
         self.redis_url = redis_url
         self.default_ttl = default_ttl
-        self.redis_client = None
-        self._initialize_redis()
+        self.max_connections = max_connections
+        self.redis_client = redis_client
+        self._connection_pool = None
+        self._redis_checked = redis_client is not None
+        self._init_lock = asyncio.Lock()
+        # Limita comandos simultâneos ao tamanho do pool: excedentes esperam uma conexão livre
+        self._connection_slots = asyncio.Semaphore(max_connections)
+        self._memory_cache = LRUMemoryCache(max_entries=memory_max_entries, max_bytes=memory_max_bytes)
+        self._serializer = CacheSerializer(codec=codec, compression=compression,
+                                           compress_min_bytes=compress_min_bytes)
+        
+        # L1 por worker na frente do Redis (sem Redis, _memory_cache já é local)
+        self.l1_ttl = l1_ttl
+        self._l1 = LRUMemoryCache(max_entries=l1_max_entries, max_bytes=l1_max_bytes) if l1_max_entries > 0 else None
+        self._listener_task: Optional[asyncio.Task] = None
+        
+        # Falhas de validação: só locais (recalcular custa menos que uma ida ao Redis)
+        self.negative_ttl = negative_ttl
+        # Guarda o dict do resultado sem serializar: um hit deve custar menos que revalidar
+        self._negative_cache = LRUMemoryCache(max_entries=1024, max_bytes=1024 * 1024)
     
-    def _initialize_redis(self):
-        """Inicializar cliente Redis"""
+    async def _initialize_redis(self):
+        """Inicializar cliente Redis assíncrono com pool de conexões"""
         try:
-            import redis
-            self.redis_client = redis.from_url(self.redis_url)
+            from redis import asyncio as aioredis
+            # BlockingConnectionPool (redis 5.0.1) trava até o timeout se a conexão falhar;
+            # a espera por conexão livre fica no semáforo _connection_slots.
+            # Com L1, uma conexão extra fica reservada ao canal de invalidação
+            reserved = 1 if self._l1 is not None else 0
+            self._connection_pool = aioredis.ConnectionPool.from_url(
+                self.redis_url, max_connections=self.max_connections + reserved
+            )
+            self.redis_client = aioredis.Redis(connection_pool=self._connection_pool)
             # Testar conexão
-            self.redis_client.ping()
+            await self.redis_client.ping()
         except ImportError:
             # Fallback para cache em memória se Redis não disponível
             self.redis_client = None
-            self._memory_cache = {}
         except Exception as e:
             print(f"⚠️  Redis não disponível, usando cache em memória: {e}")
-            self.redis_client = None
-            self._memory_cache = {}
+            await self._close_redis()
+    
+    async def _get_client(self) -> Optional[Any]:
+        """Cliente Redis (conectado na primeira chamada); None no fallback em memória"""
+        if not self._redis_checked:
+            async with self._init_lock:
+                if not self._redis_checked:
+                    await self._initialize_redis()
+                    self._redis_checked = True
+        if self.redis_client is not None and self._l1 is not None and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen_invalidations())
+        return self.redis_client
+    
+    async def _listen_invalidations(self):
+        """Aplicar ao L1 as invalidações publicadas por qualquer worker"""
+        while True:
+            pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    self._apply_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Sem o canal, o L1 pode ter perdido invalidações: descartar e reconectar
+                logger.warning(f"Canal de invalidação do cache interrompido: {str(e)}")
+                self._l1.clear()
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.aclose()
+    
+    def _apply_invalidation(self, data: Any) -> None:
+        """Remover do L1 a versão invalidada, ou as versões diferentes da ativada"""
+        event = json.loads(data)
+        if event["event"] == "invalidate":
+            self._l1.delete_tag(event["version"])
+        elif event["event"] == "activate":
+            for version in self._l1.tags():
+                if version != event["version"]:
+                    self._l1.delete_tag(version)
+    
+    async def _publish_invalidation(self, client: Any, event: str, model_version: str) -> None:
+        """Aplicar no L1 local e publicar para os demais workers"""
+        data = json.dumps({"event": event, "version": model_version})
+        if self._l1 is not None:
+            self._apply_invalidation(data)
+        async with self._connection_slots:
+            await client.publish(self.INVALIDATION_CHANNEL, data)
     
     async def get_cached_prediction(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Obter previsão do cache"""
         try:
-            if self.redis_client:
-                cached_data = self.redis_client.get(cache_key)
-                if cached_data:
-                    return json.loads(cached_data)
+            client = await self._get_client()
+            if client:
+                cached_data = self._l1.get(cache_key) if self._l1 is not None else None
+                if cached_data is None:
+                    async with self._connection_slots:
+                        cached_data = await client.get(cache_key)
+                    if cached_data and self._l1 is not None:
+                        self._l1.set(cache_key, cached_data, self.l1_ttl, tag=self._version_of(cache_key))
             else:
-                # Cache em memória
-                return self._memory_cache.get(cache_key)
+                # Cache em memória (entradas expiradas são descartadas na leitura)
+                cached_data = self._memory_cache.get(cache_key)
             
-            return None
+            if cached_data:
+                return self._serializer.loads(cached_data)
             
+            return None
+        
         except Exception as e:
             raise CacheError(f"Erro ao obter cache: {str(e)}", operation="get", key=cache_key)
     
-    async def cache_prediction(self, 
-                             cache_key: str, 
-                             prediction: Dict[str, Any], 
+    async def get_many(self, cache_keys: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+        """Obter várias previsões em uma única ida ao Redis (MGET), na ordem das chaves"""
+        if not cache_keys:
+            return []
+        
+        try:
+            client = await self._get_client()
+            if client:
+                values = [self._l1.get(key) for key in cache_keys] if self._l1 is not None else [None] * len(cache_keys)
+                missing = [i for i, value in enumerate(values) if value is None]
+                if missing:
+                    async with self._connection_slots:
+                        fetched = await client.mget([cache_keys[i] for i in missing])
+                    for i, value in zip(missing, fetched):
+                        values[i] = value
+                        if value and self._l1 is not None:
+                            self._l1.set(cache_keys[i], value, self.l1_ttl, tag=self._version_of(cache_keys[i]))
+            else:
+                values = [self._memory_cache.get(key) for key in cache_keys]
+            
+            return [self._serializer.loads(value) if value else None for value in values]
+        
+        except Exception as e:
+            raise CacheError(f"Erro ao obter cache em lote: {str(e)}", operation="get_many")
+    
+    async def cache_prediction(self,
+                             cache_key: str,
+                             prediction: Dict[str, Any],
                              ttl_seconds: int) -> None:
         """Cachear previsão"""
+        await self.set_many({cache_key: prediction}, ttl_seconds)
+    
+    async def set_many(self, predictions: Dict[str, Dict[str, Any]], ttl_seconds: int) -> None:
+        """Cachear várias previsões em um único pipeline (SETEX + índice da versão)"""
+        if not predictions:
+            return
+        
         try:
             # Serializar dados
-            serialized_data = json.dumps(prediction, default=str)
+            serialized = {key: self._serializer.dumps(prediction) for key, prediction in predictions.items()}
             
-            if self.redis_client:
-                self.redis_client.setex(cache_key, ttl_seconds, serialized_data)
+            client = await self._get_client()
+            if client:
+                index_keys = set()
+                async with self._connection_slots, client.pipeline(transaction=False) as pipe:
+                    for cache_key, serialized_data in serialized.items():
+                        pipe.setex(cache_key, ttl_seconds, serialized_data)
+                        version = self._version_of(cache_key)
+                        if version is not None:
+                            index_key = self._index_key(version)
+                            pipe.sadd(index_key, cache_key)
+                            index_keys.add(index_key)
+                    # Índice da versão vive ao menos tanto quanto as entradas com TTL padrão
+                    for index_key in index_keys:
+                        pipe.expire(index_key, max(ttl_seconds, self.default_ttl))
+                    await pipe.execute()
+                
+                # Escrita nos dois níveis: o worker que calculou serve as próximas leituras do L1
+                if self._l1 is not None:
+                    for cache_key, serialized_data in serialized.items():
+                        self._l1.set(cache_key, serialized_data, min(ttl_seconds, self.l1_ttl),
+                                     tag=self._version_of(cache_key))
             else:
-                # Cache em memória com TTL simplificado
-                self._memory_cache[cache_key] = {
-                    'data': prediction,
-                    'expires_at': datetime.now() + timedelta(seconds=ttl_seconds)
-                }
-            
+                # Cache em memória limitado (LRU + TTL + orçamento de bytes)
+                for cache_key, serialized_data in serialized.items():
+                    self._memory_cache.set(cache_key, serialized_data, ttl_seconds,
+                                           tag=self._version_of(cache_key))
+        
         except Exception as e:
-            raise CacheError(f"Erro ao cachear: {str(e)}", operation="set", key=cache_key)
+            key = next(iter(predictions)) if len(predictions) == 1 else None
+            raise CacheError(f"Erro ao cachear: {str(e)}", operation="set", key=key)
     
-    async def invalidate_model_cache(self, model_version: str) -> None:
-        """Invalidar cache do modelo"""
+    async def invalidate_model_cache(self, model_version: str) -> int:
+        """Invalidar cache do modelo (apenas as chaves indexadas da versão)"""
         try:
-            pattern = f"prediction:*model_version:{model_version}*"
-            
-            if self.redis_client:
-                # Buscar chaves que correspondem ao padrão
-                keys = self.redis_client.keys(pattern)
-                if keys:
-                    self.redis_client.delete(*keys)
+            client = await self._get_client()
+            if client:
+                async with self._connection_slots:
+                    index_key = self._index_key(model_version)
+                    
+                    # Renomear o índice isola as chaves atuais de escritas concorrentes
+                    detached_key = f"{index_key}:invalidating:{uuid.uuid4().hex}"
+                    try:
+                        await client.rename(index_key, detached_key)
+                    except Exception as e:
+                        if "no such key" not in str(e).lower():
+                            raise
+                        detached_key = None
+                    
+                    keys = list(await client.smembers(detached_key)) if detached_key else []
+                    if keys:
+                        async with client.pipeline(transaction=False) as pipe:
+                            for start in range(0, len(keys), 1000):
+                                pipe.unlink(*keys[start:start + 1000])
+                            pipe.unlink(detached_key)
+                            await pipe.execute()
+                
+                # Outros workers podem ter a versão no L1 mesmo sem chaves no índice
+                await self._publish_invalidation(client, "invalidate", model_version)
+                return len(keys)
             else:
-                # Cache em memória - remover chaves que contêm a versão
-                keys_to_remove = [k for k in self._memory_cache.keys() if model_version in k]
-                for key in keys_to_remove:
-                    del self._memory_cache[key]
-            
+                return self._memory_cache.delete_tag(model_version)
+        
         except Exception as e:
             raise CacheError(f"Erro ao invalidar cache: {str(e)}", operation="invalidate")
     
+    async def notify_model_activation(self, model_version: str) -> None:
+        """Descartar do L1 de todos os workers as versões diferentes da ativada"""
+        try:
+            client = await self._get_client()
+            if client:
+                await self._publish_invalidation(client, "activate", model_version)
+        
+        except Exception as e:
+            raise CacheError(f"Erro ao notificar ativação: {str(e)}", operation="activate")
+    
+    def get_validation_failure(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Falha de validação cacheada (cache negativo local; o mesmo dict, não alterar)"""
+        return self._negative_cache.get(cache_key)
+    
+    def cache_validation_failure(self, cache_key: str, result: Dict[str, Any]) -> None:
+        """Cachear falha de validação por negative_ttl segundos"""
+        self._negative_cache.set(cache_key, result, self.negative_ttl, size=NEGATIVE_ENTRY_BYTES)
+    
+    def _index_key(self, model_version: str) -> str:
+        """Conjunto de chaves da versão"""
+        return f"{self.INDEX_PREFIX}:{model_version}"
+    
+    def _version_of(self, cache_key: str) -> Optional[str]:
+        """Versão embutida na chave (None para chaves fora do formato de previsão)"""
+        parts = cache_key.split(":")
+        if len(parts) == 3 and parts[0] == self.KEY_PREFIX:
+            return parts[1]
+        return None
+    
     def generate_cache_key(self, 
                           fed_decision_date: str, 
                           fed_move_bps: int, 
                           horizons_months: list, 
-                          model_version: str) -> str:
-        """Gerar chave de cache"""
-        key_data = {
-            "fed_decision_date": fed_decision_date,
-            "fed_move_bps": fed_move_bps,
-            "horizons_months": sorted(horizons_months),
-            "model_version": model_version
-        }
-        
-        key_string = json.dumps(key_data, sort_keys=True)
-        key_hash = hashlib.md5(key_string.encode()).hexdigest()
-        
-        return f"prediction:{key_hash}"
+                          model_version: str,
+                          fed_surprise_bps: Optional[int] = None,
+                          regime_hint: Optional[str] = None) -> str:
+        """Gerar chave de cache (model_version já resolvida, não 'latest')"""
+        return generate_cache_key(fed_decision_date, fed_move_bps, horizons_months, model_version,
+                                  fed_surprise_bps=fed_surprise_bps, regime_hint=regime_hint)
     
     async def cleanup_expired(self) -> int:
         """Limpar entradas expiradas (apenas para cache em memória)"""
-        if self.redis_client:
+        if await self._get_client():
             return 0  # Redis gerencia TTL automaticamente
         
-        # Limpar cache em memória
-        now = datetime.now()
-        expired_keys = []
-        
-        for key, value in self._memory_cache.items():
-            if isinstance(value, dict) and 'expires_at' in value:
-                if value['expires_at'] < now:
-                    expired_keys.append(key)
-        
-        for key in expired_keys:
-            del self._memory_cache[key]
-        
-        return len(expired_keys)
+        # Varredura completa; no caminho normal a expiração é preguiçosa (na leitura)
+        return self._memory_cache.purge_expired()
     
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Obter estatísticas do cache"""
         try:
-            if self.redis_client:
-                info = self.redis_client.info()
-                return {
+            client = await self._get_client()
+            if client:
+                async with self._connection_slots:
+                    info = await client.info()
+                stats = {
                     "backend": "redis",
                     "connected_clients": info.get("connected_clients", 0),
                     "used_memory": info.get("used_memory_human", "0B"),
                     "keyspace_hits": info.get("keyspace_hits", 0),
                     "keyspace_misses": info.get("keyspace_misses", 0)
                 }
+                if self._connection_pool is not None:
+                    stats["pool_max_connections"] = self._connection_pool.max_connections
+                    stats["pool_in_use"] = len(self._connection_pool._in_use_connections)
+                if self._l1 is not None:
+                    stats["l1"] = self._l1.get_stats()
+                stats["negative"] = self._negative_cache.get_stats()
+                return stats
             else:
+                stats = self._memory_cache.get_stats()
                 return {
                     "backend": "memory",
-                    "total_keys": len(self._memory_cache),
-                    "expired_keys": await self.cleanup_expired()
+                    "total_keys": stats.pop("entries"),
+                    **stats,
+                    "negative": self._negative_cache.get_stats()
                 }
-                
+        
         except Exception as e:
             return {
                 "backend": "unknown",
                 "error": str(e)
             }
     
+    async def _close_redis(self):
+        """Fechar cliente e pool de conexões"""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener_task = None
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+        if self._connection_pool is not None:
+            await self._connection_pool.disconnect()
+        self.redis_client = None
+        self._connection_pool = None
+    
     async def cleanup(self):
         """Cleanup do serviço"""
         if self.redis_client:
-            self.redis_client.close()
+            await self._close_redis()
+            self._redis_checked = False
+            if self._l1 is not None:
+                self._l1.clear()
         else:
             self._memory_cache.clear()
+        self._negative_cache.clear()
+
+def generate_cache_key(fed_decision_date: str,
+                       fed_move_bps: int,
+                       horizons_months: Optional[list],
+                       model_version: str,
+                       fed_surprise_bps: Optional[int] = None,
+                       regime_hint: Optional[str] = None) -> str:
+    """
+    Chave de uma previsão, com todas as entradas que alteram a resposta
+    
+    Horizontes são normalizados como na previsão: únicos, ordenados, com padrão
+    [1, 3, 6, 12]. Surpresa e regime só entram quando diferem do padrão.
+    """
+    key_data = {
+        "fed_decision_date": fed_decision_date,
+        "fed_move_bps": fed_move_bps,
+        "horizons_months": sorted(set(horizons_months or [1, 3, 6, 12])),
+        "model_version": model_version
+    }
+    if fed_surprise_bps:
+        key_data["fed_surprise_bps"] = fed_surprise_bps
+    if regime_hint and regime_hint != "normal":
+        key_data["regime_hint"] = regime_hint
+    
+    key_string = json.dumps(key_data, sort_keys=True)
+    key_hash = hashlib.md5(key_string.encode()).hexdigest()
+    
+    return f"{RedisCacheService.KEY_PREFIX}:{model_version}:{key_hash}"
@@ -0,0 +1,154 @@
+"""
+Aquecimento do cache de previsões na ativação de uma versão do modelo
+"""
+
+import time
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.api.schemas import PredictionRequest
+from src.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Horizontes padrão do PredictionRequest: a grade aquece as chaves dos requests sem horizons_months
+DEFAULT_HORIZONS = [1, 3, 6, 12]
+
+
+class CacheWarmupService:
+    """
+    Pré-cálculo da grade canônica de cenários em segundo plano
+
+    Responsabilidades:
+    - Montar a grade: datas de decisão x movimentos de 25 bps das capacidades
+      x regimes, com os horizontes padrão. Sem datas configuradas, uma data por
+      janela até cada uma das próximas `copom_windows` reuniões do Copom: a chave
+      do cache usa a próxima reunião, então a janela inteira (inclusive a data
+      do próximo FOMC) fica aquecida
+    - Gravar no cache as previsões ausentes em blocos, com no máximo
+      `concurrency` blocos em andamento
+    - Uma execução por vez: ativar outra versão cancela a anterior
+    - Progresso e duração por versão para os endpoints de modelos
+    """
+
+    def __init__(self,
+                 prediction_service: Any,
+                 concurrency: int = 4,
+                 chunk_size: int = 32,
+                 fed_decision_dates: Optional[Sequence[str]] = None,
+                 copom_windows: int = 2):
+        self.settings = get_settings()
+        self.prediction_service = prediction_service
+        self.concurrency = max(1, concurrency)
+        self.chunk_size = max(1, chunk_size)
+        self.fed_decision_dates = list(fed_decision_dates or [])
+        self.copom_windows = max(1, copom_windows)
+        self._task: Optional[asyncio.Task] = None
+        self._runs: Dict[str, Dict[str, Any]] = {}
+
+    def default_dates(self) -> List[str]:
+        """Próximas copom_windows reuniões a partir de hoje (cada uma representa sua janela)"""
+        meetings = self.prediction_service.copom_calendar.next_meetings(date.today(), self.copom_windows)[0]
+        return [str(meeting) for meeting in meetings if not np.isnat(meeting)] or [date.today().isoformat()]
+
+    async def build_grid(self, version: str, fed_decision_dates: Optional[Sequence[str]] = None) -> List[PredictionRequest]:
+        """Cenários canônicos da versão (sem data configurada: as próximas janelas do Copom)"""
+        capabilities = await self.prediction_service.model_service.get_capabilities()
+        dates = list(fed_decision_dates or self.fed_decision_dates or self.default_dates())
+        return [
+            PredictionRequest(
+                fed_decision_date=fed_date,
+                fed_move_bps=move,
+                horizons_months=DEFAULT_HORIZONS,
+                model_version=version,
+                regime_hint=regime
+            )
+            for fed_date in dates
+            for move in capabilities["supported_fed_moves"]
+            for regime in capabilities["supported_regimes"]
+        ]
+
+    async def start(self, version: str, fed_decision_dates: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Iniciar o aquecimento da versão em segundo plano (cancela o anterior)"""
+        await self.cancel()
+
+        grid = await self.build_grid(version, fed_decision_dates)
+        status = {
+            "version": version,
+            "status": "running",
+            "total": len(grid),
+            "completed": 0,
+            "computed": 0,
+            "cached": 0,
+            "failed": 0,
+            "started_at": datetime.utcnow().isoformat() + "Z",
+            "finished_at": None,
+            "duration_ms": None,
+            "error": None
+        }
+        self._runs[version] = status
+        self._task = asyncio.create_task(self._run(version, grid, status))
+        return dict(status)
+
+    async def _run(self, version: str, grid: List[PredictionRequest], status: Dict[str, Any]) -> None:
+        """Processar a grade em blocos com concorrência limitada"""
+        start = time.perf_counter()
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def warm_chunk(chunk: List[PredictionRequest]) -> None:
+            async with slots:
+                try:
+                    counts = await self.prediction_service.precompute(chunk, version)
+                    status["computed"] += counts["computed"]
+                    status["cached"] += counts["cached"]
+                except Exception as e:
+                    status["failed"] += len(chunk)
+                    status["error"] = str(e)
+                    logger.warning(f"Bloco do aquecimento de {version} falhou: {str(e)}")
+                status["completed"] += len(chunk)
+                # Ceder o loop entre blocos: requests reais não esperam a grade inteira
+                await asyncio.sleep(0)
+
+        try:
+            chunks = [grid[i:i + self.chunk_size] for i in range(0, len(grid), self.chunk_size)]
+            await asyncio.gather(*(warm_chunk(chunk) for chunk in chunks))
+            status["status"] = "failed" if status["failed"] == status["total"] and grid else "completed"
+        except asyncio.CancelledError:
+            status["status"] = "cancelled"
+            raise
+        finally:
+            status["finished_at"] = datetime.utcnow().isoformat() + "Z"
+            status["duration_ms"] = (time.perf_counter() - start) * 1000
+            logger.info(
+                f"Aquecimento do cache da versão {version} {status['status']}: "
+                f"{status['computed']} calculadas, {status['cached']} já em cache, "
+                f"{status['failed']} falhas em {status['duration_ms']:.0f}ms"
+            )
+
+    def get_status(self, version: str) -> Optional[Dict[str, Any]]:
+        """Progresso e duração do último aquecimento da versão"""
+        status = self._runs.get(version)
+        if status is None:
+            return None
+        progress = status["completed"] / status["total"] if status["total"] else 1.0
+        return {**status, "progress": round(progress, 4)}
+
+    async def wait(self) -> None:
+        """Aguardar o aquecimento em andamento (se houver)"""
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def cancel(self) -> None:
+        """Cancelar o aquecimento em andamento"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def cleanup(self):
+        """Cleanup do serviço"""
+        await self.cancel()
@@ -0,0 +1,114 @@
+"""
+Snapshot colunar binário dos datasets brutos (bundle .npy com índice de datas)
+"""
+
+import os
+import json
+import logging
+from datetime import datetime
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SUFFIX = ".columns"
+MANIFEST_FILE = "manifest.json"
+INDEX_FILE = "index.npy"
+VALUES_FILE = "values.npy"
+
+
+def snapshot_dir(csv_path: str) -> str:
+    """Diretório do snapshot ao lado do CSV (data/raw/x.csv -> data/raw/x.columns)"""
+    return os.path.splitext(csv_path)[0] + SNAPSHOT_SUFFIX
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    """(mtime_ns, tamanho) do arquivo"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def dataset_signature(csv_path: str) -> Tuple[int, int]:
+    """Assinatura do dataset: do CSV se existir, senão do manifest do snapshot"""
+    try:
+        return _file_signature(csv_path)
+    except FileNotFoundError:
+        return _file_signature(os.path.join(snapshot_dir(csv_path), MANIFEST_FILE))
+
+
+def write_snapshot(df: pd.DataFrame, csv_path: str) -> Optional[str]:
+    """
+    Gravar snapshot colunar do DataFrame já salvo em csv_path
+
+    Formato: index.npy (datetime64[ns]), values.npy (n x k float64) e
+    manifest.json com colunas e a assinatura do CSV de origem, usada para
+    descartar o snapshot se o CSV for alterado depois.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        logger.warning(f"Snapshot não gerado para {csv_path}: índice não é de datas")
+        return None
+    try:
+        values = df.to_numpy(dtype=np.float64)
+    except (TypeError, ValueError):
+        logger.warning(f"Snapshot não gerado para {csv_path}: colunas não numéricas")
+        return None
+
+    target = snapshot_dir(csv_path)
+    tmp_dir = f"{target}.tmp-{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    np.save(os.path.join(tmp_dir, INDEX_FILE), df.index.to_numpy(dtype="datetime64[ns]"))
+    np.save(os.path.join(tmp_dir, VALUES_FILE), np.ascontiguousarray(values))
+
+    manifest = {
+        "columns": [str(c) for c in df.columns],
+        "index_name": df.index.name,
+        "rows": len(df),
+        "source_csv": os.path.basename(csv_path),
+        "source_signature": list(_file_signature(csv_path)) if os.path.exists(csv_path) else None,
+        "created_at": datetime.now().isoformat()
+    }
+    with open(os.path.join(tmp_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Substituir snapshot anterior
+    if os.path.isdir(target):
+        for name in os.listdir(target):
+            os.remove(os.path.join(target, name))
+        os.rmdir(target)
+    os.rename(tmp_dir, target)
+
+    return target
+
+
+def read_snapshot(csv_path: str) -> Optional[pd.DataFrame]:
+    """Ler snapshot (None se inexistente ou desatualizado em relação ao CSV)"""
+    directory = snapshot_dir(csv_path)
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+
+    source_signature = manifest.get("source_signature")
+    if os.path.exists(csv_path) and (source_signature is None
+                                     or tuple(source_signature) != _file_signature(csv_path)):
+        logger.info(f"Snapshot de {csv_path} desatualizado; usando CSV")
+        return None
+
+    index = pd.DatetimeIndex(np.load(os.path.join(directory, INDEX_FILE)), name=manifest["index_name"])
+    values = np.load(os.path.join(directory, VALUES_FILE))
+    return pd.DataFrame(values, index=index, columns=manifest["columns"])
+
+
+def read_dataset(csv_path: str) -> pd.DataFrame:
+    """Ler dataset bruto: snapshot colunar primeiro, CSV como fallback"""
+    df = read_snapshot(csv_path)
+    if df is not None:
+        return df
+
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(csv_path)
+    return pd.read_csv(csv_path, index_col=0, parse_dates=True)
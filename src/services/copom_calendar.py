@@ -0,0 +1,150 @@
+"""
+Calendário do Copom indexado
+Datas das reuniões em datetime64 ordenado, com consultas por busca binária
+"""
+
+import os
+import logging
+from datetime import date, datetime
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..core.exceptions import DataRepositoryError
+
+logger = logging.getLogger(__name__)
+
+# Dias por mês de horizonte (mesma convenção do ProbabilityEngineService)
+DAYS_PER_MONTH = 30
+
+NAT = np.datetime64("NaT", "D")
+
+def generate_copom_dates(start_date: Any, end_date: Any) -> np.ndarray:
+    """Datas aproximadas das reuniões (terceira quarta-feira de cada mês) entre start_date e end_date"""
+    start, end = to_days(start_date), to_days(end_date)
+    months = np.arange(start.astype("datetime64[M]"), end.astype("datetime64[M]") + 1)
+    first_days = months.astype("datetime64[D]")
+
+    # 1970-01-01 foi quinta-feira: dia da semana com segunda = 0
+    weekdays = (first_days.astype(np.int64) + 3) % 7
+    third_wednesdays = first_days + ((2 - weekdays) % 7 + 14).astype("timedelta64[D]")
+    return third_wednesdays[(third_wednesdays >= start) & (third_wednesdays <= end)]
+
+def to_days(values: Any) -> np.ndarray:
+    """Datas (ISO-8601, datetime, date ou datetime64) em datetime64[D]; escalar ou array"""
+    if isinstance(values, (str, datetime, date, np.datetime64)):
+        return _parse_day(values)
+    return np.array([_parse_day(v) for v in values], dtype="datetime64[D]")
+
+def _parse_day(value: Any) -> np.datetime64:
+    if isinstance(value, str):
+        return np.datetime64(value[:10], "D")
+    if isinstance(value, datetime):
+        return np.datetime64(value.date(), "D")
+    return np.datetime64(value, "D")
+
+class CopomCalendarService:
+    """
+    Calendário do Copom
+
+    Responsabilidades:
+    - Carregar a lista oficial de reuniões de arquivo local (coluna 'date')
+    - Gerar as datas aproximadas quando o arquivo não existe
+    - Responder próxima reunião, janela de reuniões por horizonte e reuniões
+      em um intervalo por np.searchsorted, para uma data ou um lote
+
+    As datas são carregadas uma vez em um array datetime64[D] ordenado; cada
+    consulta custa O(log n) por data.
+    """
+
+    def __init__(self,
+                 calendar_path: Optional[str] = None,
+                 fallback_start: str = "2000-01-01",
+                 fallback_years_ahead: int = 5):
+        self.calendar_path = calendar_path
+        self.fallback_start = fallback_start
+        self.fallback_years_ahead = fallback_years_ahead
+        self.source: Optional[str] = None
+        self._dates: Optional[np.ndarray] = None
+
+    @property
+    def dates(self) -> np.ndarray:
+        """Reuniões em datetime64[D], ordenadas e sem repetição"""
+        if self._dates is None:
+            self._dates = self.load()
+        return self._dates
+
+    def load(self) -> np.ndarray:
+        """Ler o arquivo do calendário ou, na falta dele, gerar as datas"""
+        if self.calendar_path and os.path.exists(self.calendar_path):
+            try:
+                frame = pd.read_csv(self.calendar_path)
+                dates = pd.to_datetime(frame['date']).to_numpy().astype("datetime64[D]")
+            except Exception as e:
+                raise DataRepositoryError(f"Erro ao ler calendário do Copom {self.calendar_path}: {str(e)}")
+            self.source = "file"
+        else:
+            dates = generate_copom_dates(self.fallback_start, f"{datetime.now().year + self.fallback_years_ahead}-12-31")
+            self.source = "generated"
+
+        dates = np.unique(dates[~np.isnat(dates)])
+        logger.info(f"Calendário do Copom ({self.source}): {len(dates)} reuniões")
+        return dates
+
+    def next_meetings(self, dates: Any, count: int = 1, inclusive: bool = True) -> np.ndarray:
+        """
+        Próximas count reuniões a partir de cada data: array (n_datas, count), NaT além do calendário
+
+        inclusive: uma reunião na própria data conta como próxima.
+        """
+        calendar = self.dates
+        days = np.atleast_1d(to_days(dates))
+        start = np.searchsorted(calendar, days, side="left" if inclusive else "right")
+        idx = start[:, None] + np.arange(count)
+
+        meetings = np.full(idx.shape, NAT)
+        found = idx < len(calendar)
+        meetings[found] = calendar[idx[found]]
+        return meetings
+
+    def next_meeting(self, day: Any, inclusive: bool = True) -> Optional[datetime]:
+        """Próxima reunião a partir de uma data (None além do calendário)"""
+        meeting = self.next_meetings(day, 1, inclusive)[0, 0]
+        return None if np.isnat(meeting) else pd.Timestamp(meeting).to_pydatetime()
+
+    def horizon_windows(self, reference_dates: Any, horizons: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Janela de reuniões de cada horizonte: índices [início, fim) no calendário
+        das reuniões entre a data de referência (inclusive) e referência + h * 30
+        dias (inclusive); arrays (n_datas, n_horizons)
+        """
+        calendar = self.dates
+        days = np.atleast_1d(to_days(reference_dates))
+        ends = days[:, None] + (np.asarray(horizons, dtype=int) * DAYS_PER_MONTH).astype("timedelta64[D]")
+        start = np.searchsorted(calendar, days, side="left")
+        end = np.searchsorted(calendar, ends, side="right")
+        return np.broadcast_to(start[:, None], end.shape), end
+
+    def horizon_meetings(self, reference_date: Any, horizon: int) -> np.ndarray:
+        """Reuniões na janela do horizonte a partir de uma data"""
+        start, end = self.horizon_windows(reference_date, [horizon])
+        return self.dates[start[0, 0]:end[0, 0]]
+
+    def meetings_between(self, start_date: Any, end_date: Any) -> np.ndarray:
+        """Reuniões entre start_date e end_date (inclusive)"""
+        calendar = self.dates
+        start, end = to_days(start_date), to_days(end_date)
+        if self.source == "generated" and len(calendar) and (start < calendar[0] or end > calendar[-1]):
+            # Fora do intervalo pré-gerado: gerar sob demanda
+            return generate_copom_dates(start, end)
+        return calendar[np.searchsorted(calendar, start, side="left"):np.searchsorted(calendar, end, side="right")]
+
+    def to_frame(self, start_date: Any, end_date: Any) -> pd.DataFrame:
+        """Reuniões do intervalo no formato de IDataRepository.get_copom_calendar"""
+        meetings = self.meetings_between(start_date, end_date)
+        return pd.DataFrame({
+            'date': pd.to_datetime(meetings),
+            'meeting_number': range(1, len(meetings) + 1),
+            'is_meeting': True
+        })
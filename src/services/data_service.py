@@ -18,19 +18,14 @@ class DataService:
     
     def __init__(self):
         self.settings = get_settings()
-        self.interest_rate_service = InterestRateService()
-        self.selic_service = SelicService()
+        self.interest_rate_service = InterestRateService(data_dir=self.settings.DATA_DIR)
+        self.selic_service = SelicService(data_dir=self.settings.DATA_DIR)
     
     async def get_prediction_data(self) -> pd.DataFrame:
         """Obter dados para previsão"""
         try:
-            # Carregar dados combinados
-            combined_data = self.selic_service._load_combined_data()
-            
-            # Preparar dados para previsão
-            prediction_data = self._prepare_prediction_data(combined_data)
-            
-            return prediction_data
+            # Dados combinados + derivados, memoizados até o arquivo mudar
+            return self.selic_service.get_derived("prediction_data", self._prepare_prediction_data)
             
         except Exception as e:
             logger.error(f"Erro ao obter dados de previsão: {str(e)}", exc_info=True)
@@ -70,16 +65,20 @@ class DataService:
     async def get_data_summary(self) -> Dict[str, Any]:
         """Obter resumo dos dados"""
         try:
-            # Carregar dados
-            fed_data = self.interest_rate_service.load_all_interest_rate_data()
+            # Carregar dados (memoizados no cache de datasets)
+            try:
+                fed_data = self.interest_rate_service.load_data()
+            except FileNotFoundError as e:
+                logger.warning(f"Dados detalhados do Fed indisponíveis: {e}")
+                fed_data = None
             selic_data = self.selic_service.load_data()
             
             summary = {
                 "fed_data": {
-                    "observations": len(fed_data.fed_rates) if fed_data else 0,
-                    "start_date": fed_data.start_date.isoformat() if fed_data else None,
-                    "end_date": fed_data.end_date.isoformat() if fed_data else None,
-                    "columns": len(fed_data.fed_rates[0].__dict__) if fed_data and fed_data.fed_rates else 0
+                    "observations": len(fed_data.fed_funds) if fed_data else 0,
+                    "start_date": fed_data.fed_funds.index[0].isoformat() if fed_data and not fed_data.fed_funds.empty else None,
+                    "end_date": fed_data.fed_funds.index[-1].isoformat() if fed_data and not fed_data.fed_funds.empty else None,
+                    "columns": 1 + len(fed_data.treasury_rates) if fed_data else 0
                 },
                 "selic_data": {
                     "observations": len(selic_data.selic) if selic_data else 0,
@@ -0,0 +1,116 @@
+"""
+Cache de datasets em processo com detecção de mudança por (path, mtime, size)
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from ..core.config import get_settings
+from .columnar_snapshot import dataset_signature
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _DatasetEntry:
+    """Frame carregado de um arquivo e seus derivados"""
+    signature: Tuple[int, int]
+    frame: pd.DataFrame
+    checked_at: float
+    derived: Dict[str, Any] = field(default_factory=dict)
+
+
+class DatasetCache:
+    """
+    Cache compartilhado de datasets lidos do disco
+
+    Responsabilidades:
+    - Fazer um único parse por mudança do arquivo (mtime_ns, tamanho)
+    - Memoizar frames derivados (diferenças, spillover) junto ao frame de origem
+    - Evitar stat do arquivo dentro da janela de revalidação
+
+    Frames retornados são compartilhados entre chamadores e devem ser tratados
+    como somente leitura.
+    """
+
+    def __init__(self, revalidate_seconds: float = 1.0):
+        self.revalidate_seconds = revalidate_seconds
+        self._entries: Dict[str, _DatasetEntry] = {}
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "loads": 0, "reloads": 0, "derived_builds": 0}
+
+    def _signature(self, path: str) -> Tuple[int, int]:
+        """Assinatura do arquivo ou do seu snapshot colunar (FileNotFoundError se inexistente)"""
+        return dataset_signature(path)
+
+    def _entry(self, path: str, reader: Callable[[str], pd.DataFrame]) -> _DatasetEntry:
+        """Obter entrada válida, recarregando o arquivo se ele mudou"""
+        now = time.monotonic()
+        entry = self._entries.get(path)
+
+        if entry is not None and now - entry.checked_at < self.revalidate_seconds:
+            self._stats["hits"] += 1
+            return entry
+
+        signature = self._signature(path)
+        if entry is not None and entry.signature == signature:
+            entry.checked_at = now
+            self._stats["hits"] += 1
+            return entry
+
+        start = time.perf_counter()
+        frame = reader(path)
+        self._stats["reloads" if entry is not None else "loads"] += 1
+        logger.info(f"Dataset {path} carregado em {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        entry = _DatasetEntry(signature=signature, frame=frame, checked_at=now)
+        self._entries[path] = entry
+        return entry
+
+    def load(self, path: str, reader: Callable[[str], pd.DataFrame]) -> pd.DataFrame:
+        """Obter frame do arquivo"""
+        with self._lock:
+            return self._entry(path, reader).frame
+
+    def derive(self, path: str, name: str,
+               builder: Callable[[pd.DataFrame], Any],
+               reader: Callable[[str], pd.DataFrame]) -> Any:
+        """Obter derivado memoizado do frame (recalculado apenas quando o arquivo muda)"""
+        with self._lock:
+            entry = self._entry(path, reader)
+            if name not in entry.derived:
+                entry.derived[name] = builder(entry.frame)
+                self._stats["derived_builds"] += 1
+            return entry.derived[name]
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Descartar um dataset (ou todos)"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas do cache"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "derived": sum(len(e.derived) for e in self._entries.values()),
+                **self._stats
+            }
+
+
+_dataset_cache: Optional[DatasetCache] = None
+
+def get_dataset_cache() -> DatasetCache:
+    """Obter cache de datasets do processo (Singleton)"""
+    global _dataset_cache
+    if _dataset_cache is None:
+        _dataset_cache = DatasetCache(revalidate_seconds=get_settings().DATA_CACHE_REVALIDATE_SECONDS)
+    return _dataset_cache
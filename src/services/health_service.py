@@ -12,16 +12,21 @@ from ..api.schemas import HealthResponse
 from ..core.config import get_settings
 from .model_service import ModelService
 from .data_service import DataService
+from .metrics_service import MetricsService
 
 logger = logging.getLogger(__name__)
 
 class HealthService:
     """Serviço para health checks"""
     
-    def __init__(self):
+    def __init__(self,
+                 model_service: Optional[ModelService] = None,
+                 data_service: Optional[DataService] = None,
+                 metrics_service: Optional[MetricsService] = None):
         self.settings = get_settings()
-        self.model_service = ModelService()
-        self.data_service = DataService()
+        self.model_service = model_service or ModelService()
+        self.data_service = data_service or DataService()
+        self.metrics_service = metrics_service
         self.start_time = time.time()
     
     async def get_basic_health(self) -> HealthResponse:
@@ -50,8 +55,9 @@ class HealthService:
                 version=self.settings.API_VERSION,
                 model_version=model_version,
                 uptime_seconds=uptime,
-                latency_p50_ms=self._get_latency_p50(),
-                latency_p95_ms=self._get_latency_p95(),
+                latency_p50_ms=self._get_latency_quantile("p50_ms"),
+                latency_p95_ms=self._get_latency_quantile("p95_ms"),
+                latency_p99_ms=self._get_latency_quantile("p99_ms"),
                 requests_per_minute=self._get_requests_per_minute()
             )
             
@@ -65,6 +71,7 @@ class HealthService:
                 uptime_seconds=time.time() - self.start_time,
                 latency_p50_ms=None,
                 latency_p95_ms=None,
+                latency_p99_ms=None,
                 requests_per_minute=None
             )
     
@@ -206,6 +213,9 @@ class HealthService:
                     "active_version": active_model.version if active_model else None,
                     "is_loaded": active_model is not None
                 },
+                "coalescing": self.metrics_service.get_coalescing_metrics() if self.metrics_service else None,
+                "latency": self.metrics_service.get_latency_metrics() if self.metrics_service else None,
+                "stages": self.metrics_service.get_span_metrics() if self.metrics_service else None,
                 "api": {
                     "version": self.settings.API_VERSION,
                     "environment": "development"  # TODO: Obter do ambiente
@@ -364,17 +374,15 @@ class HealthService:
         else:
             return "healthy"
     
-    def _get_latency_p50(self) -> Optional[float]:
-        """Obter latência P50 (simulada)"""
-        # TODO: Implementar métricas reais
-        return 45.2
-    
-    def _get_latency_p95(self) -> Optional[float]:
-        """Obter latência P95 (simulada)"""
-        # TODO: Implementar métricas reais
-        return 120.5
+    def _get_latency_quantile(self, key: str) -> Optional[float]:
+        """Quantil da latência das previsões nos últimos 5 minutos (None sem métricas ou sem requests)"""
+        if self.metrics_service is None:
+            return None
+        latency = self.metrics_service.get_request_latency("5m")
+        return latency[key] if latency["count"] else None
     
     def _get_requests_per_minute(self) -> Optional[float]:
-        """Obter requests por minuto (simulado)"""
-        # TODO: Implementar métricas reais
-        return 15.3
+        """Requests no último minuto (None sem métricas)"""
+        if self.metrics_service is None:
+            return None
+        return float(self.metrics_service.get_request_latency("1m")["count"])
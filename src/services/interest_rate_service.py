@@ -13,6 +13,8 @@ from src.types.interest_rates import (
     InterestRateData, InterestRateAccessor, InterestRateType, 
     YieldCurve, YieldCurvePoint, RateMaturity
 )
+from src.services.dataset_cache import get_dataset_cache
+from src.services.columnar_snapshot import read_dataset
 
 class InterestRateService:
     """Serviço para gerenciar dados de taxas de juros"""
@@ -21,21 +23,24 @@ class InterestRateService:
         self.data_dir = data_dir
         self._data: Optional[InterestRateData] = None
         self._accessor: Optional[InterestRateAccessor] = None
+        self._sources: Optional[tuple] = None
     
     def load_data(self) -> InterestRateData:
-        """Carregar dados de taxas de juros"""
-        if self._data is not None:
-            return self._data
-        
-        print("📊 Carregando dados de taxas de juros...")
-        
+        """Carregar dados de taxas de juros (reorganizados apenas quando os arquivos mudam)"""
         # Carregar dados do Fed
         fed_data = self._load_fed_data()
         
         # Carregar dados da Selic
         selic_data = self._load_selic_data()
         
+        if self._data is not None and self._sources[0] is fed_data and self._sources[1] is selic_data:
+            return self._data
+        
+        print("📊 Carregando dados de taxas de juros...")
+        
         # Organizar dados
+        self._sources = (fed_data, selic_data)
+        self._accessor = None
         self._data = self._organize_data(fed_data, selic_data)
         
         print(f"✅ Dados carregados: {len(self._data.fed_funds)} observações")
@@ -45,21 +50,27 @@ class InterestRateService:
     
     def get_accessor(self) -> InterestRateAccessor:
         """Obter interface de acesso aos dados"""
+        data = self.load_data()
         if self._accessor is None:
-            data = self.load_data()
             self._accessor = InterestRateAccessor(data)
         
         return self._accessor
     
     def _load_fed_data(self) -> pd.DataFrame:
-        """Carregar dados do Fed"""
+        """Carregar dados do Fed (parse único por mudança do arquivo)"""
         fed_path = os.path.join(self.data_dir, "raw", "fed_detailed_data.csv")
         
-        if not os.path.exists(fed_path):
+        try:
+            return get_dataset_cache().derive(fed_path, "rate_columns", self._select_rate_columns, self._read_csv)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Dados do Fed não encontrados: {fed_path}")
-        
-        df = pd.read_csv(fed_path, index_col=0, parse_dates=True)
-        
+    
+    def _read_csv(self, path: str) -> pd.DataFrame:
+        """Ler dataset com índice de datas (snapshot colunar, com fallback para o CSV)"""
+        return read_dataset(path)
+    
+    def _select_rate_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Selecionar colunas de taxas de juros"""
         # Mapear colunas para tipos de taxa
         column_mapping = {
             'fedfunds': InterestRateType.FED_FUNDS,
@@ -83,14 +94,16 @@ class InterestRateService:
         return df[list(rate_columns.keys())]
     
     def _load_selic_data(self) -> pd.Series:
-        """Carregar dados da Selic"""
+        """Carregar dados da Selic (compartilhados com SelicService)"""
         selic_path = os.path.join(self.data_dir, "raw", "fed_selic_combined.csv")
         
-        if not os.path.exists(selic_path):
+        try:
+            return get_dataset_cache().derive(selic_path, "selic_series", self._select_selic, self._read_csv)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Dados da Selic não encontrados: {selic_path}")
-        
-        df = pd.read_csv(selic_path, index_col=0, parse_dates=True)
-        
+    
+    def _select_selic(self, df: pd.DataFrame) -> pd.Series:
+        """Selecionar série da Selic"""
         if 'selic' not in df.columns:
             raise ValueError("Coluna 'selic' não encontrada nos dados")
         
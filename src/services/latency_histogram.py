@@ -0,0 +1,204 @@
+"""
+Histogramas de latência log-lineares (estilo HDR)
+Memória fixa, registro O(1) e quantis O(buckets), com janelas rotativas por tempo
+"""
+
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Resolução do registro: 1 µs; latências acima de HIGHEST_MS caem no último bucket
+RESOLUTION_MS = 0.001
+HIGHEST_MS = 600_000.0
+
+# 2^SUB_BUCKET_BITS sub-buckets lineares por potência de 2: erro relativo <= 1/2^(bits-1)
+SUB_BUCKET_BITS = 6
+
+# Janelas agregadas por série: nome -> (duração em segundos, número de fatias rotativas)
+LATENCY_WINDOWS: Dict[str, Tuple[float, int]] = {
+    "1m": (60.0, 6),
+    "5m": (300.0, 5),
+    "1h": (3600.0, 12)
+}
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+class LogLinearHistogram:
+    """
+    Histograma log-linear de latências (ms)
+
+    Os valores, em unidades de RESOLUTION_MS, caem em buckets lineares até
+    2^bits e, acima disso, em 2^(bits-1) sub-buckets por potência de 2: a
+    largura do bucket é proporcional ao valor, então o erro relativo dos
+    quantis é limitado (~1.6% com bits=6) e o número de buckets cresce só com
+    log2(highest). count, soma, mínimo e máximo são exatos.
+
+    Os contadores ficam em um array('q'): o registro é um incremento de
+    Python e a soma de histogramas e os quantis operam sobre o mesmo buffer
+    via numpy, sem cópia.
+    """
+
+    __slots__ = ("bits", "half", "sub_bucket_count", "max_value", "counts",
+                 "count", "total", "min_ms", "max_ms")
+
+    def __init__(self, sub_bucket_bits: int = SUB_BUCKET_BITS, highest_ms: float = HIGHEST_MS):
+        self.bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half = self.sub_bucket_count >> 1
+        self.max_value = int(highest_ms / RESOLUTION_MS)
+        self.counts = array("q", bytes(8 * (self._index(self.max_value) + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.bits
+        return (shift + 1) * self.half + (value >> shift) - self.half
+
+    def _array(self) -> np.ndarray:
+        return np.frombuffer(self.counts, dtype=np.int64)
+
+    def bucket_bounds(self, index: int) -> Tuple[float, float]:
+        """Limites [inferior, superior) do bucket, em ms"""
+        if index < self.sub_bucket_count:
+            lower, width = index, 1
+        else:
+            shift = index // self.half - 1
+            lower, width = (self.half + index % self.half) << shift, 1 << shift
+        return lower * RESOLUTION_MS, (lower + width) * RESOLUTION_MS
+
+    def bucket_index(self, latency_ms: float) -> int:
+        """Bucket da latência (valores fora de [0, highest_ms] vão para os extremos)"""
+        value = int(latency_ms / RESOLUTION_MS)
+        if value > self.max_value:
+            value = self.max_value
+        elif value < 0:
+            value = 0
+        return self._index(value)
+
+    def record(self, latency_ms: float, index: Optional[int] = None) -> None:
+        """Registrar uma latência: O(1); index já calculado por bucket_index é reaproveitado"""
+        self.counts[self.bucket_index(latency_ms) if index is None else index] += 1
+        self.count += 1
+        self.total += latency_ms
+        if latency_ms < self.min_ms:
+            self.min_ms = latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+    def reset(self) -> None:
+        self._array()[:] = 0
+        self.count = 0
+        self.total = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+
+    def merge(self, other: "LogLinearHistogram") -> None:
+        """Somar outro histograma com a mesma configuração"""
+        if not other.count:
+            return
+        self._array()[:] += other._array()
+        self.count += other.count
+        self.total += other.total
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def quantiles(self, qs: Sequence[float] = DEFAULT_QUANTILES) -> List[float]:
+        """
+        Quantis por uma soma acumulada dos buckets
+
+        Mesmo posto do percentil por ordenação (sorted[int(n * q)]): o valor
+        devolvido é o ponto médio do bucket desse posto, limitado ao mínimo e
+        ao máximo observados.
+        """
+        if not self.count:
+            return [0.0] * len(qs)
+
+        ranks = [min(int(self.count * q), self.count - 1) for q in qs]
+        indexes = np.searchsorted(np.cumsum(self._array()), ranks, side="right")
+        values = []
+        for index in indexes:
+            lower, upper = self.bucket_bounds(int(index))
+            values.append(min(max((lower + upper) / 2, self.min_ms), self.max_ms))
+        return values
+
+    def summary(self, qs: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, float]:
+        """count, média, mínimo, máximo e quantis (chaves p50_ms, p95_ms, ...)"""
+        summary = {
+            "count": self.count,
+            "avg_ms": self.total / self.count if self.count else 0.0,
+            "min_ms": self.min_ms if self.count else 0.0,
+            "max_ms": self.max_ms
+        }
+        for q, value in zip(qs, self.quantiles(qs)):
+            summary[f"p{q * 100:g}_ms"] = value
+        return summary
+
+class RotatingHistogram:
+    """
+    Janela deslizante de latências em fatias de tempo
+
+    n_slots histogramas, cada um cobrindo window_seconds / n_slots segundos;
+    o registro vai para a fatia do instante atual, que é zerada quando volta
+    a ser usada (uma vez por volta). A consulta soma as fatias ainda dentro
+    da janela: cobre entre window_seconds - fatia e window_seconds segundos.
+    """
+
+    def __init__(self, window_seconds: float, n_slots: int,
+                 clock: Callable[[], float] = time.monotonic, **histogram_kwargs):
+        self.window_seconds = window_seconds
+        self.n_slots = n_slots
+        self.slot_seconds = window_seconds / n_slots
+        self.clock = clock
+        self._histogram_kwargs = histogram_kwargs
+        self._slots = [LogLinearHistogram(**histogram_kwargs) for _ in range(n_slots)]
+        self._epochs = [-1] * n_slots
+
+    def record(self, latency_ms: float, now: Optional[float] = None, index: Optional[int] = None) -> None:
+        epoch = int((self.clock() if now is None else now) // self.slot_seconds)
+        slot = epoch % self.n_slots
+        if self._epochs[slot] != epoch:
+            self._slots[slot].reset()
+            self._epochs[slot] = epoch
+        self._slots[slot].record(latency_ms, index)
+
+    def snapshot(self, now: Optional[float] = None) -> LogLinearHistogram:
+        """Histograma das fatias dentro da janela"""
+        epoch = int((self.clock() if now is None else now) // self.slot_seconds)
+        merged = LogLinearHistogram(**self._histogram_kwargs)
+        for slot_epoch, histogram in zip(self._epochs, self._slots):
+            if epoch - self.n_slots < slot_epoch <= epoch:
+                merged.merge(histogram)
+        return merged
+
+class WindowedLatencyHistogram:
+    """Latências de uma série (endpoint, versão) nas janelas de LATENCY_WINDOWS e desde o início"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 windows: Optional[Dict[str, Tuple[float, int]]] = None):
+        self.clock = clock
+        self.windows = {
+            name: RotatingHistogram(seconds, n_slots, clock)
+            for name, (seconds, n_slots) in (windows or LATENCY_WINDOWS).items()
+        }
+        self.lifetime = LogLinearHistogram()
+
+    def record(self, latency_ms: float) -> None:
+        now = self.clock()
+        index = self.lifetime.bucket_index(latency_ms)
+        for window in self.windows.values():
+            window.record(latency_ms, now, index)
+        self.lifetime.record(latency_ms, index)
+
+    def snapshot(self, window: str) -> LogLinearHistogram:
+        """Histograma da janela (ou "lifetime")"""
+        if window == "lifetime":
+            merged = LogLinearHistogram()
+            merged.merge(self.lifetime)
+            return merged
+        return self.windows[window].snapshot(self.clock())
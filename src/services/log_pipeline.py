@@ -0,0 +1,256 @@
+"""
+Pipeline de logging assíncrono
+QueueHandler não bloqueante no caminho do request; codificação JSON e escrita em lote numa thread de fundo
+"""
+
+import copy
+import json
+import queue
+import logging
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+QUEUE_POLICIES = ("drop", "block")
+
+def json_encoder(prefer_orjson: bool = True) -> Callable[[Any], str]:
+    """Codificador JSON: orjson quando instalado, json da biblioteca padrão como fallback"""
+    if prefer_orjson:
+        try:
+            import orjson
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+            def _orjson_encode(obj: Any) -> str:
+                return orjson.dumps(obj, default=str, option=option).decode()
+            return _orjson_encode
+        except ImportError:
+            logger.warning("orjson não instalado, logs codificados com json")
+
+    def _json_encode(obj: Any) -> str:
+        return json.dumps(obj, default=str, ensure_ascii=False)
+    return _json_encode
+
+class JsonFormatter(logging.Formatter):
+    """
+    Registro como uma linha JSON
+
+    Mensagens dict (entradas estruturadas do LoggingService) são
+    codificadas como estão; as demais viram {timestamp, level, logger,
+    message}, com o traceback em "exception".
+    """
+
+    def __init__(self, encoder: Optional[Callable[[Any], str]] = None):
+        super().__init__()
+        self.encode = encoder or json_encoder()
+
+    def format(self, record: logging.LogRecord) -> str:
+        if isinstance(record.msg, dict):
+            return self.encode(record.msg)
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            entry["request_id"] = request_id
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return self.encode(entry)
+
+class TextFormatter(logging.Formatter):
+    """Formato legível (desenvolvimento); entradas estruturadas como "evento - request_id - dados" """
+
+    def __init__(self, fmt: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+                 encoder: Optional[Callable[[Any], str]] = None):
+        super().__init__(fmt)
+        self.encode = encoder or json_encoder()
+
+    def format(self, record: logging.LogRecord) -> str:
+        if isinstance(record.msg, dict):
+            entry = record.msg
+            message = f"{entry.get('event_type')} - {entry.get('request_id', 'N/A')}"
+            if "data" in entry:
+                message += f" - {self.encode(entry['data'])}"
+            record = copy.copy(record)
+            record.msg, record.args = message, None
+        return super().format(record)
+
+class _BatchEmitMixin:
+    """Escrita de vários registros com um único write e um único flush"""
+
+    def emit_batch(self, records: Sequence[logging.LogRecord]) -> None:
+        if not records:
+            return
+        try:
+            text = "".join(self.format(record) + self.terminator for record in records)
+            with self.lock:
+                self.stream.write(text)
+                self.flush()
+        except Exception:
+            self.handleError(records[-1])
+
+class BatchStreamHandler(_BatchEmitMixin, logging.StreamHandler):
+    """StreamHandler com escrita em lote"""
+
+class BatchFileHandler(_BatchEmitMixin, logging.FileHandler):
+    """FileHandler com escrita em lote"""
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler com política de backpressure
+
+    policy="drop": fila cheia descarta o registro (o request nunca espera);
+    policy="block": espera até block_timeout segundos por espaço e só então
+    descarta. Descartes são contados em dropped.
+
+    Diferente do QueueHandler padrão, prepare não formata a mensagem: só
+    resolve %-args e traceback (que podem mudar ou prender frames) e deixa
+    a codificação JSON para a thread do listener.
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = "drop", block_timeout: float = 0.05):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Política de fila inválida: {policy} (esperado: {', '.join(QUEUE_POLICIES)})")
+        super().__init__(log_queue)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if not record.args and not record.exc_info:
+            return record
+        record = copy.copy(record)
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+class BatchQueueListener(QueueListener):
+    """
+    QueueListener que drena a fila em lotes
+
+    Cada volta pega o primeiro registro (bloqueando) e os seguintes que já
+    estiverem na fila, até batch_size; handlers com emit_batch escrevem o
+    lote de uma vez, os demais recebem registro a registro.
+    """
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler, batch_size: int = 256):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.written = 0
+        self.batches = 0
+
+    def enqueue_sentinel(self) -> None:
+        # Bloqueante: com a fila cheia, o sentinela espera o listener abrir espaço
+        self.queue.put(self._sentinel)
+
+    def _monitor(self) -> None:
+        log_queue = self.queue
+        while True:
+            batch = [log_queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [record for record in batch if record is not self._sentinel]
+            self._emit(records)
+            if len(records) != len(batch):
+                break
+
+    def _emit(self, records: List[logging.LogRecord]) -> None:
+        if not records:
+            return
+        for handler in self.handlers:
+            accepted = [record for record in records if record.levelno >= handler.level]
+            if hasattr(handler, "emit_batch"):
+                handler.emit_batch(accepted)
+            else:
+                for record in accepted:
+                    handler.handle(record)
+        self.written += len(records)
+        self.batches += 1
+
+class AsyncLogPipeline:
+    """
+    Pipeline de logging fora do caminho do request
+
+    Responsabilidades:
+    - Enfileirar registros dos loggers anexados (NonBlockingQueueHandler),
+      com fila limitada e política drop/block sob backpressure
+    - Codificar (JSON rápido ou texto) e gravar em lote numa thread de
+      fundo (BatchQueueListener)
+    - Esvaziar a fila no stop, sem perder os registros já enfileirados
+    """
+
+    def __init__(self,
+                 handlers: Sequence[logging.Handler],
+                 queue_size: int = 10000,
+                 policy: str = "drop",
+                 block_timeout: float = 0.05,
+                 batch_size: int = 256):
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.handler = NonBlockingQueueHandler(self.queue, policy, block_timeout)
+        self.handlers = list(handlers)
+        self.listener = BatchQueueListener(self.queue, *self.handlers, batch_size=batch_size)
+        self._loggers: List[logging.Logger] = []
+        self._running = False
+        self._lock = threading.Lock()
+
+    def attach(self, target: logging.Logger) -> None:
+        """Enviar os registros do logger para a fila"""
+        if target not in self._loggers:
+            target.addHandler(self.handler)
+            self._loggers.append(target)
+
+    def start(self) -> None:
+        with self._lock:
+            if not self._running:
+                self.listener.start()
+                self._running = True
+
+    def stop(self) -> None:
+        """Desanexar dos loggers, gravar o que está na fila e fechar os handlers"""
+        with self._lock:
+            for target in self._loggers:
+                target.removeHandler(self.handler)
+            self._loggers.clear()
+            if self._running:
+                self.listener.stop()
+                self._running = False
+            for handler in self.handlers:
+                handler.close()
+        if self.handler.dropped:
+            logger.warning(f"{self.handler.dropped} registros de log descartados com a fila cheia")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "policy": self.handler.policy,
+            "queue_size": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "enqueued": self.handler.enqueued,
+            "dropped": self.handler.dropped,
+            "written": self.listener.written,
+            "batches": self.listener.batches
+        }
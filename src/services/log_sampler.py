@@ -0,0 +1,174 @@
+"""
+Amostragem de logs por request
+Decisão na entrada (hash do request ID + token bucket) e na saída (erros e requests lentos acima do p99)
+"""
+
+import time
+import zlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .latency_histogram import RotatingHistogram
+
+# Motivos de um request registrado
+REASON_HEAD = "head"
+REASON_ERROR = "error"
+REASON_SLOW = "slow"
+
+class TokenBucket:
+    """Até rate registros por segundo, com rajadas de até burst"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "clock")
+
+    def __init__(self, rate: float, burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.tokens = self.burst
+        self.clock = clock
+        self.updated = clock()
+
+    def take(self) -> bool:
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+class SamplingDecision:
+    """Decisão de um request e os registros adiados enquanto ele não é amostrado"""
+
+    __slots__ = ("sampled", "reason", "pending")
+
+    def __init__(self, sampled: bool):
+        self.sampled = sampled
+        self.reason = REASON_HEAD if sampled else None
+        self.pending: List[Tuple[Callable[..., Dict[str, Any]], tuple]] = []
+
+class LogSampler:
+    """
+    Amostrador de logs por request ID
+
+    Responsabilidades:
+    - Decidir na entrada (head) se o request é registrado: fração
+      sample_rate pelo hash do request ID, limitada a max_per_second pelo
+      token bucket. O hash é o mesmo em qualquer processo: serviços que
+      repassam o X-Request-ID tomam a mesma decisão
+    - Adiar os registros dos requests não amostrados (até max_pending por
+      request) e gravá-los na saída (tail) se o request falhou ou ficou
+      acima do quantil slow_quantile das latências recentes
+    - Manter uma só decisão por request ID (middleware, endpoints e
+      LoggingService consultam a mesma), com no máximo max_requests abertas
+
+    Erros e requests lentos não passam pelo token bucket.
+    """
+
+    def __init__(self,
+                 sample_rate: float = 1.0,
+                 max_per_second: float = 100.0,
+                 burst: Optional[float] = None,
+                 slow_quantile: float = 0.99,
+                 min_slow_samples: int = 100,
+                 error_status: int = 500,
+                 max_pending: int = 32,
+                 max_requests: int = 10000,
+                 threshold_refresh_seconds: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.sample_rate = sample_rate
+        self.slow_quantile = slow_quantile
+        self.min_slow_samples = min_slow_samples
+        self.error_status = error_status
+        self.max_pending = max_pending
+        self.max_requests = max_requests
+        self.threshold_refresh_seconds = threshold_refresh_seconds
+        self.clock = clock
+
+        self._bucket = TokenBucket(max_per_second, burst, clock)
+        self._threshold = int(sample_rate * 2 ** 32)
+        self._decisions: "OrderedDict[str, SamplingDecision]" = OrderedDict()
+        self._latencies = RotatingHistogram(300.0, 5, clock)
+        self._slow_ms: Optional[float] = None
+        self._slow_refreshed = float("-inf")
+        self._lock = threading.Lock()
+        self.counts = {"requests": 0, "head": 0, "capped": 0, "error": 0, "slow": 0, "skipped": 0}
+
+    def _head_sampled(self, request_id: str) -> bool:
+        if zlib.crc32(request_id.encode()) >= self._threshold:
+            return False
+        if self._bucket.take():
+            return True
+        self.counts["capped"] += 1
+        return False
+
+    def decision(self, request_id: str) -> SamplingDecision:
+        """Decisão do request (tomada na primeira consulta)"""
+        with self._lock:
+            decision = self._decisions.get(request_id)
+            if decision is None:
+                decision = self._decisions[request_id] = SamplingDecision(self._head_sampled(request_id))
+                if len(self._decisions) > self.max_requests:
+                    self._decisions.popitem(last=False)
+            return decision
+
+    def record(self, request_id: str, build: Callable[..., Dict[str, Any]], *args: Any) -> Optional[Dict[str, Any]]:
+        """Entrada a registrar agora (request amostrado) ou None, com build(*args) adiado para a saída"""
+        decision = self.decision(request_id)
+        if decision.sampled:
+            return build(*args)
+        if len(decision.pending) < self.max_pending:
+            decision.pending.append((build, args))
+        return None
+
+    def slow_threshold_ms(self) -> Optional[float]:
+        """Quantil slow_quantile das latências dos últimos ~5 minutos (None com poucas amostras)"""
+        now = self.clock()
+        if now - self._slow_refreshed >= self.threshold_refresh_seconds:
+            histogram = self._latencies.snapshot(now)
+            self._slow_ms = (histogram.quantiles([self.slow_quantile])[0]
+                             if histogram.count >= self.min_slow_samples else None)
+            self._slow_refreshed = now
+        return self._slow_ms
+
+    def finish(self, request_id: str, status_code: int, latency_ms: float,
+               error: bool = False) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """
+        Encerrar o request: motivo do registro (head, error, slow ou None) e
+        as entradas adiadas a gravar (só quando o request foi salvo na saída)
+        """
+        with self._lock:
+            decision = self._decisions.pop(request_id, None)
+            if decision is None:
+                decision = SamplingDecision(self._head_sampled(request_id))
+            slow_ms = self.slow_threshold_ms()
+            self._latencies.record(latency_ms)
+            self.counts["requests"] += 1
+
+            if decision.sampled:
+                self.counts["head"] += 1
+                return REASON_HEAD, []
+            if error or status_code >= self.error_status:
+                reason = REASON_ERROR
+            elif slow_ms is not None and latency_ms > slow_ms:
+                reason = REASON_SLOW
+            else:
+                self.counts["skipped"] += 1
+                return None, []
+            self.counts[reason] += 1
+            pending = decision.pending
+
+        return reason, [build(*args) for build, args in pending]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self.counts["requests"]
+            logged = requests - self.counts["skipped"]
+            return {
+                **self.counts,
+                "sample_rate": self.sample_rate,
+                "effective_rate": logged / requests if requests else 0.0,
+                "slow_threshold_ms": self._slow_ms,
+                "open_requests": len(self._decisions)
+            }
@@ -3,13 +3,19 @@ Logging Service - Single Responsibility Principle
 Serviço responsável por logging estruturado
 """
 
-import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional, Sequence
 from datetime import datetime
 import uuid
 
 from src.core.interfaces import ILoggingService
+from src.services.log_pipeline import (
+    AsyncLogPipeline, BatchFileHandler, BatchStreamHandler, JsonFormatter, TextFormatter
+)
+from src.services.log_sampler import LogSampler, REASON_HEAD
+
+# Loggers dos módulos da aplicação (logging.getLogger(__name__) em src.*)
+APP_LOGGER = "src"
 
 class LoggingService(ILoggingService):
     """
@@ -20,41 +26,70 @@ class LoggingService(ILoggingService):
     - Log de responses de previsão
     - Log de erros
     - Logging estruturado para auditoria
+    
+    Os registros (deste serviço e dos loggers em app_loggers) passam por um
+    AsyncLogPipeline: o request só enfileira a entrada; codificação JSON e
+    escrita em disco acontecem em lote numa thread de fundo.
+    
+    Com um LogSampler, os registros de um request (previsão e HTTP) são
+    gravados só se ele for amostrado na entrada ou, na saída, se falhou ou
+    ficou lento; erros (log_error) são sempre gravados.
     """
     
     def __init__(self, 
                  log_level: str = "INFO",
                  log_format: str = "json",
-                 log_file: Optional[str] = None):
+                 log_file: Optional[str] = None,
+                 queue_size: int = 10000,
+                 queue_policy: str = "drop",
+                 block_timeout_ms: float = 50.0,
+                 batch_size: int = 256,
+                 app_loggers: Sequence[str] = (APP_LOGGER,),
+                 sampler: Optional[LogSampler] = None):
         self.log_level = log_level
         self.log_format = log_format
         self.log_file = log_file
+        self.sampler = sampler
         
         # Configurar logger
         self.logger = logging.getLogger("quantum_x")
         self.logger.setLevel(getattr(logging, log_level.upper()))
+        self.logger.propagate = False
         
-        # Configurar handler
+        # Configurar handler (escrita em lote, chamado só pela thread do pipeline)
         if log_file:
-            handler = logging.FileHandler(log_file)
+            handler = BatchFileHandler(log_file)
         else:
-            handler = logging.StreamHandler()
+            handler = BatchStreamHandler()
         
         # Configurar formato
         if log_format == "json":
-            formatter = logging.Formatter('%(message)s')
+            handler.setFormatter(JsonFormatter())
         else:
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
+            handler.setFormatter(TextFormatter())
         
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        self.pipeline = AsyncLogPipeline(
+            [handler],
+            queue_size=queue_size,
+            policy=queue_policy,
+            block_timeout=block_timeout_ms / 1000,
+            batch_size=batch_size
+        )
+        self.pipeline.attach(self.logger)
+        for name in app_loggers:
+            app_logger = logging.getLogger(name)
+            app_logger.setLevel(getattr(logging, log_level.upper()))
+            self.pipeline.attach(app_logger)
+        self.pipeline.start()
     
     async def log_prediction_request(self, request_id: str, request: Dict[str, Any]) -> None:
-        """Log de request de previsão"""
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
+        """Log de request de previsão (dict ou modelo pydantic; amostrado pelo request ID)"""
+        self._log_request_entry(request_id, self._prediction_request_entry, datetime.now(), request_id, request)
+    
+    def _prediction_request_entry(self, timestamp: datetime, request_id: str, request: Any) -> Dict[str, Any]:
+        request = _as_dict(request)
+        return {
+            "timestamp": timestamp.isoformat(),
             "event_type": "prediction_request",
             "request_id": request_id,
             "level": "INFO",
@@ -67,13 +102,15 @@ class LoggingService(ILoggingService):
                 "regime_hint": request.get("regime_hint")
             }
         }
-        
-        self._log_structured(log_entry)
     
     async def log_prediction_response(self, request_id: str, response: Dict[str, Any]) -> None:
-        """Log de response de previsão"""
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
+        """Log de response de previsão (dict ou modelo pydantic; amostrado pelo request ID)"""
+        self._log_request_entry(request_id, self._prediction_response_entry, datetime.now(), request_id, response)
+    
+    def _prediction_response_entry(self, timestamp: datetime, request_id: str, response: Any) -> Dict[str, Any]:
+        response = _as_dict(response)
+        return {
+            "timestamp": timestamp.isoformat(),
             "event_type": "prediction_response",
             "request_id": request_id,
             "level": "INFO",
@@ -86,8 +123,54 @@ class LoggingService(ILoggingService):
                 "cache_hit": response.get("cache_hit", False)
             }
         }
+    
+    def start_request(self, request_id: str) -> bool:
+        """Decisão de amostragem na entrada do request (True: registros gravados de imediato)"""
+        return self.sampler is None or self.sampler.decision(request_id).sampled
+    
+    async def finish_request(self,
+                             request_id: str,
+                             method: str,
+                             path: str,
+                             status_code: int,
+                             processing_time_ms: float,
+                             client_ip: Optional[str] = None,
+                             trace_id: Optional[str] = None,
+                             error: bool = False) -> bool:
+        """
+        Log HTTP do request e decisão na saída
         
-        self._log_structured(log_entry)
+        Sem amostragem na entrada, grava os registros adiados do request e
+        este se ele falhou (error ou status >= error_status do amostrador) ou
+        ficou acima do p99; retorna se o request foi registrado.
+        """
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "event_type": "http_request",
+            "request_id": request_id,
+            "level": "INFO",
+            "data": {
+                "method": method,
+                "path": path,
+                "client_ip": client_ip,
+                "status_code": status_code,
+                "processing_time_ms": round(processing_time_ms, 3),
+                "trace_id": trace_id
+            }
+        }
+        if self.sampler is None:
+            self._log_structured(entry)
+            return True
+        
+        reason, pending = self.sampler.finish(request_id, status_code, processing_time_ms, error)
+        if reason is None:
+            return False
+        for pending_entry in pending:
+            pending_entry["sampling"] = reason
+            self._log_structured(pending_entry)
+        entry["sampling"] = reason
+        self._log_structured(entry)
+        return True
     
     async def log_error(self, request_id: str, error: Exception) -> None:
         """Log de erro"""
@@ -192,20 +275,32 @@ class LoggingService(ILoggingService):
         
         self._log_structured(log_entry)
     
+    def _log_request_entry(self, request_id: Optional[str], build: Callable[..., Dict[str, Any]], *args: Any) -> None:
+        """Entrada de um request: gravada se amostrado, senão adiada até finish_request"""
+        if self.sampler is None or request_id is None:
+            self._log_structured(build(*args))
+            return
+        entry = self.sampler.record(request_id, build, *args)
+        if entry is not None:
+            entry["sampling"] = REASON_HEAD
+            self._log_structured(entry)
+    
     def _log_structured(self, log_entry: Dict[str, Any]) -> None:
-        """Log estruturado"""
-        if self.log_format == "json":
-            self.logger.info(json.dumps(log_entry, ensure_ascii=False))
-        else:
-            # Formato legível para desenvolvimento
-            message = f"{log_entry['event_type']} - {log_entry.get('request_id', 'N/A')}"
-            if 'data' in log_entry:
-                message += f" - {json.dumps(log_entry['data'], ensure_ascii=False)}"
-            self.logger.info(message)
+        """Log estruturado: a entrada é enfileirada como dict e codificada pelo formatter na thread do pipeline"""
+        self.logger.log(getattr(logging, log_entry.get("level", "INFO")), log_entry)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Fila, descartes e lotes gravados pelo pipeline, e contagens da amostragem"""
+        stats = self.pipeline.get_stats()
+        if self.sampler is not None:
+            stats["sampling"] = self.sampler.get_stats()
+        return stats
     
     async def cleanup(self):
         """Cleanup do serviço"""
-        # Fechar handlers de arquivo se necessário
-        for handler in self.logger.handlers:
-            if isinstance(handler, logging.FileHandler):
-                handler.close()
+        # Gravar a fila pendente e fechar os handlers
+        self.pipeline.stop()
+
+def _as_dict(obj: Any) -> Dict[str, Any]:
+    """Dict da entrada (modelos pydantic convertidos só quando o registro é gravado)"""
+    return obj if isinstance(obj, dict) else obj.model_dump(mode="json")
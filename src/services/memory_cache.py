@@ -0,0 +1,156 @@
+"""
+Cache em memória limitado (LRU + TTL + orçamento de bytes)
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# Custo fixo estimado por entrada (nó do OrderedDict, tupla, chave) além do valor
+ENTRY_OVERHEAD_BYTES = 96
+
+
+class LRUMemoryCache:
+    """
+    Cache em processo com valores serializados (bytes); objetos Python podem
+    ser guardados sem serialização informando o tamanho contabilizado
+
+    Responsabilidades:
+    - Despejo LRU em O(1) (OrderedDict: move_to_end/popitem)
+    - Expiração preguiçosa por TTL na leitura, sem varredura periódica
+    - Limite por número de entradas e por bytes ocupados
+    - Índice por tag (versão do modelo) para invalidação sem varredura
+    - Contadores de hits, misses, despejos e expirações
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # chave -> (valor, expira_em (monotonic), tamanho, tag)
+        self._entries: "OrderedDict[str, Tuple[bytes, float, int, Optional[str]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "sets": 0, "evictions": 0, "expirations": 0}
+
+    def _entry_size(self, key: str, value: bytes) -> int:
+        """Bytes contabilizados para a entrada"""
+        return len(value) + len(key) + ENTRY_OVERHEAD_BYTES
+
+    def _remove(self, key: str) -> None:
+        """Remover entrada, descontar seu tamanho e retirá-la do índice de tags"""
+        _, _, size, tag = self._entries.pop(key)
+        self._bytes -= size
+        if tag is not None:
+            keys = self._tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def get(self, key: str) -> Optional[Any]:
+        """Obter valor (None se ausente ou expirado)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl_seconds: float, tag: Optional[str] = None,
+            size: Optional[int] = None) -> bool:
+        """
+        Gravar valor (opcionalmente sob uma tag); False se ele sozinho excede o orçamento de bytes
+
+        size: bytes do valor quando ele não é bytes (padrão: len(value)).
+        """
+        size = self._entry_size(key, value) if size is None else size + len(key) + ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, time.monotonic() + ttl_seconds, size, tag)
+            self._bytes += size
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(key)
+            self._stats["sets"] += 1
+
+            # Despejar as entradas menos usadas até caber nos limites
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                oldest_key, (_, expires_at, _, _) = next(iter(self._entries.items()))
+                self._remove(oldest_key)
+                self._stats["expirations" if expires_at <= time.monotonic() else "evictions"] += 1
+
+            return True
+
+    def delete(self, key: str) -> bool:
+        """Remover chave"""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def delete_tag(self, tag: str) -> int:
+        """Remover todas as chaves da tag (O(chaves da tag))"""
+        with self._lock:
+            keys = list(self._tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def tags(self) -> List[str]:
+        """Tags com ao menos uma entrada (cópia)"""
+        with self._lock:
+            return list(self._tags)
+
+    def keys(self) -> Iterator[str]:
+        """Chaves presentes (cópia, inclusive as ainda não expiradas preguiçosamente)"""
+        with self._lock:
+            return iter(list(self._entries))
+
+    def purge_expired(self) -> int:
+        """Remover todas as entradas expiradas (O(n); a expiração normal é preguiçosa)"""
+        with self._lock:
+            now = time.monotonic()
+            expired = [k for k, (_, expires_at, _, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            self._stats["expirations"] += len(expired)
+            return len(expired)
+
+    def clear(self) -> None:
+        """Esvaziar o cache"""
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas do cache"""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "entries": len(self._entries),
+                "tags": len(self._tags),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hit_ratio": self._stats["hits"] / lookups if lookups else 0.0,
+                **self._stats
+            }
@@ -4,48 +4,119 @@ Serviço responsável por métricas e observabilidade
 """
 
 import time
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
-from collections import defaultdict, deque
+import logging
+from typing import Callable, Dict, Any, Optional, Tuple
+from datetime import datetime
+from collections import defaultdict
 import threading
 
 from src.core.interfaces import IMetricsService
+from src.services.latency_histogram import LogLinearHistogram, WindowedLatencyHistogram, LATENCY_WINDOWS
+
+logger = logging.getLogger(__name__)
 
 class MetricsService(IMetricsService):
     """
     Serviço de métricas e observabilidade
     
     Responsabilidades:
-    - Métricas de latência
+    - Métricas de latência (histogramas log-lineares por endpoint e versão do
+      modelo, com p50/p95/p99 em janelas de 1m/5m/1h)
     - Métricas de performance do modelo
     - Métricas de saúde do sistema
     - Observabilidade para auditoria
+    - Duração por etapa do pipeline (spans do tracing, observe_span)
+    - Exportação Prometheus (metrics_backend="prometheus"): latência, etapas,
+      leituras do cache, carga do modelo, tamanho dos lotes e rejeições do
+      rate limit, expostas em /metrics
     """
     
     def __init__(self, 
                  metrics_backend: str = "prometheus",
-                 metrics_port: int = 9090):
+                 metrics_port: int = 9090,
+                 clock: Callable[[], float] = time.monotonic):
         self.metrics_backend = metrics_backend
         self.metrics_port = metrics_port
+        self.clock = clock
         
         # Métricas em memória (para simplicidade)
-        self.latency_metrics = deque(maxlen=1000)  # Últimas 1000 latências
+        self.latency_histograms: Dict[Tuple[str, str], WindowedLatencyHistogram] = {}  # (endpoint, versão)
+        self.span_histograms: Dict[str, WindowedLatencyHistogram] = {}  # etapa (nome do span)
         self.model_performance = {}  # Performance por versão do modelo
         self.request_counts = defaultdict(int)  # Contadores de requests
         self.error_counts = defaultdict(int)  # Contadores de erros
+        self.coalescing_counts = {"leaders": 0, "coalesced": 0}  # Single-flight das previsões
+        self.cache_counts = {"hits": 0, "misses": 0}  # Leituras do cache de previsões
         self.start_time = time.time()
         
         # Thread safety
         self._lock = threading.Lock()
+        
+        # Métricas Prometheus (módulo com os coletores registrados uma vez por processo)
+        self._prometheus = self._load_prometheus() if metrics_backend == "prometheus" else None
+    
+    def _load_prometheus(self) -> Optional[Any]:
+        """Módulo de métricas Prometheus ou None se prometheus-client não estiver instalado"""
+        try:
+            from src.services import prometheus_metrics
+            return prometheus_metrics
+        except ImportError:
+            logger.warning("prometheus-client não instalado, métricas apenas em memória")
+            return None
+    
+    async def record_prediction_latency(self, request_id: str, latency_ms: float,
+                                        endpoint: str = "predict_selic",
+                                        model_version: Optional[str] = None) -> None:
+        """Registrar latência de previsão no histograma do endpoint e da versão do modelo"""
+        key = (endpoint, model_version or "default")
+        with self._lock:
+            histogram = self.latency_histograms.get(key)
+            if histogram is None:
+                histogram = self.latency_histograms[key] = WindowedLatencyHistogram(self.clock)
+            histogram.record(latency_ms)
+        if self._prometheus is not None:
+            self._prometheus.PREDICTION_LATENCY.labels(endpoint, key[1]).observe(latency_ms / 1000)
     
-    async def record_prediction_latency(self, request_id: str, latency_ms: float) -> None:
-        """Registrar latência de previsão"""
+    def observe_span(self, span: Any) -> None:
+        """Registrar a duração de um span finalizado na sua etapa (listener do Tracer)"""
+        duration_ms = span.duration_ms
         with self._lock:
-            self.latency_metrics.append({
-                'request_id': request_id,
-                'latency_ms': latency_ms,
-                'timestamp': datetime.now()
-            })
+            histogram = self.span_histograms.get(span.name)
+            if histogram is None:
+                histogram = self.span_histograms[span.name] = WindowedLatencyHistogram(self.clock)
+            histogram.record(duration_ms)
+        if self._prometheus is not None:
+            self._prometheus.SPAN_DURATION.labels(span.name).observe(duration_ms / 1000)
+    
+    async def record_cache_lookup(self, hit: bool) -> None:
+        """Registrar leitura do cache de previsões"""
+        with self._lock:
+            self.cache_counts["hits" if hit else "misses"] += 1
+        if self._prometheus is not None:
+            self._prometheus.CACHE_LOOKUPS.labels("hit" if hit else "miss").inc()
+    
+    async def record_model_load(self, operation: str, model_version: str, duration_ms: float) -> None:
+        """Registrar carga (load), treino (train) ou compilação da tabela (compile) do modelo"""
+        if self._prometheus is not None:
+            self._prometheus.MODEL_LOAD_TIME.labels(operation, model_version).observe(duration_ms / 1000)
+    
+    async def record_batch_size(self, size: int) -> None:
+        """Registrar número de cenários de um lote"""
+        if self._prometheus is not None:
+            self._prometheus.BATCH_SIZE.observe(size)
+    
+    async def record_rate_limit_rejection(self, tier: str, window: str) -> None:
+        """Registrar request rejeitado pelo rate limit"""
+        with self._lock:
+            self.error_counts["rate_limited"] += 1
+        if self._prometheus is not None:
+            self._prometheus.RATE_LIMIT_REJECTIONS.labels(tier, window).inc()
+    
+    def render_prometheus(self) -> Optional[Tuple[bytes, str]]:
+        """Exposição Prometheus (corpo, content type) ou None sem o backend"""
+        if self._prometheus is None:
+            return None
+        return self._prometheus.render_latest()
     
     async def record_model_performance(self, model_version: str, metrics: Dict[str, float]) -> None:
         """Registrar performance do modelo"""
@@ -82,26 +153,29 @@ class MetricsService(IMetricsService):
         with self._lock:
             self.error_counts[error_type] += 1
     
+    async def record_coalescing(self, coalesced: bool) -> None:
+        """Registrar previsão calculada (líder) ou coalescida com uma idêntica em andamento"""
+        with self._lock:
+            self.coalescing_counts["coalesced" if coalesced else "leaders"] += 1
+    
+    def get_coalescing_metrics(self) -> Dict[str, Any]:
+        """Contadores de coalescência das previsões"""
+        with self._lock:
+            return self._get_coalescing_summary()
+    
     async def get_health_metrics(self) -> Dict[str, Any]:
         """Obter métricas de saúde do sistema"""
         with self._lock:
             current_time = datetime.now()
             uptime_seconds = time.time() - self.start_time
             
-            # Calcular métricas de latência
-            if self.latency_metrics:
-                latencies = [m['latency_ms'] for m in self.latency_metrics]
-                latency_p50 = self._percentile(latencies, 50)
-                latency_p95 = self._percentile(latencies, 95)
-                latency_p99 = self._percentile(latencies, 99)
-                avg_latency = sum(latencies) / len(latencies)
-            else:
-                latency_p50 = latency_p95 = latency_p99 = avg_latency = 0.0
+            # Calcular métricas de latência (todas as séries, últimos 5 minutos)
+            latency = self._merged_latency("5m").summary()
+            latency_p50, latency_p95, latency_p99 = latency["p50_ms"], latency["p95_ms"], latency["p99_ms"]
+            avg_latency = latency["avg_ms"]
             
             # Calcular requests por minuto
-            recent_requests = [m for m in self.latency_metrics 
-                             if m['timestamp'] > current_time - timedelta(minutes=1)]
-            requests_per_minute = len(recent_requests)
+            requests_per_minute = self._merged_latency("1m").count
             
             # Calcular taxa de erro
             total_requests = sum(self.request_counts.values())
@@ -124,7 +198,8 @@ class MetricsService(IMetricsService):
                     "p50_ms": latency_p50,
                     "p95_ms": latency_p95,
                     "p99_ms": latency_p99,
-                    "avg_ms": avg_latency
+                    "avg_ms": avg_latency,
+                    "by_endpoint": self._get_latency_summary()
                 },
                 "throughput": {
                     "requests_per_minute": requests_per_minute,
@@ -136,6 +211,9 @@ class MetricsService(IMetricsService):
                     "error_breakdown": dict(self.error_counts)
                 },
                 "model_performance": self._get_model_performance_summary(),
+                "coalescing": self._get_coalescing_summary(),
+                "cache": self._get_cache_summary(),
+                "stages": self._get_span_summary(),
                 "timestamp": current_time.isoformat()
             }
     
@@ -160,41 +238,76 @@ class MetricsService(IMetricsService):
         
         return summary
     
+    def _get_coalescing_summary(self) -> Dict[str, Any]:
+        """Líderes, coalescidas e fração de previsões servidas por coalescência"""
+        total = self.coalescing_counts["leaders"] + self.coalescing_counts["coalesced"]
+        return {
+            **self.coalescing_counts,
+            "hit_ratio": self.coalescing_counts["coalesced"] / total if total else 0.0
+        }
+    
+    def _get_cache_summary(self) -> Dict[str, Any]:
+        """Hits, misses e taxa de acerto do cache de previsões"""
+        total = self.cache_counts["hits"] + self.cache_counts["misses"]
+        return {
+            **self.cache_counts,
+            "hit_ratio": self.cache_counts["hits"] / total if total else 0.0
+        }
+    
+    def get_latency_metrics(self) -> Dict[str, Any]:
+        """Latências por endpoint e versão do modelo em cada janela"""
+        with self._lock:
+            return self._get_latency_summary()
+    
+    def _get_latency_summary(self) -> Dict[str, Any]:
+        """{endpoint: {versão: {janela: resumo}}} para as janelas 1m/5m/1h"""
+        summary: Dict[str, Any] = {}
+        for (endpoint, model_version), histogram in self.latency_histograms.items():
+            summary.setdefault(endpoint, {})[model_version] = {
+                window: histogram.snapshot(window).summary() for window in LATENCY_WINDOWS
+            }
+        return summary
+    
+    def get_request_latency(self, window: str = "5m") -> Dict[str, float]:
+        """Resumo da latência de todas as séries na janela (count, média e quantis)"""
+        with self._lock:
+            return self._merged_latency(window).summary()
+    
+    def get_span_metrics(self) -> Dict[str, Any]:
+        """Duração por etapa do pipeline em cada janela"""
+        with self._lock:
+            return self._get_span_summary()
+    
+    def _get_span_summary(self) -> Dict[str, Any]:
+        """{etapa: {janela: resumo}} para as janelas 1m/5m/1h"""
+        return {
+            name: {window: histogram.snapshot(window).summary() for window in LATENCY_WINDOWS}
+            for name, histogram in self.span_histograms.items()
+        }
+    
+    def _merged_latency(self, window: str) -> LogLinearHistogram:
+        """Histograma da janela somando todas as séries"""
+        merged = LogLinearHistogram()
+        for histogram in self.latency_histograms.values():
+            merged.merge(histogram.snapshot(window))
+        return merged
+    
     def _safe_average(self, values: list) -> float:
         """Calcular média de forma segura"""
         if not values:
             return 0.0
         return sum(values) / len(values)
     
-    def _percentile(self, data: list, percentile: int) -> float:
-        """Calcular percentil"""
-        if not data:
-            return 0.0
-        
-        sorted_data = sorted(data)
-        index = int(len(sorted_data) * percentile / 100)
-        return sorted_data[min(index, len(sorted_data) - 1)]
-    
     async def get_latency_distribution(self, hours: int = 1) -> Dict[str, Any]:
-        """Obter distribuição de latência das últimas N horas"""
+        """Obter distribuição de latência da última hora (hours > 1: desde o início)"""
+        window = "1h" if hours <= 1 else "lifetime"
         with self._lock:
-            cutoff_time = datetime.now() - timedelta(hours=hours)
-            recent_latencies = [m['latency_ms'] for m in self.latency_metrics 
-                              if m['timestamp'] > cutoff_time]
+            merged = self._merged_latency(window)
             
-            if not recent_latencies:
+            if not merged.count:
                 return {"error": "Nenhuma métrica de latência disponível"}
             
-            return {
-                "count": len(recent_latencies),
-                "min_ms": min(recent_latencies),
-                "max_ms": max(recent_latencies),
-                "avg_ms": sum(recent_latencies) / len(recent_latencies),
-                "p50_ms": self._percentile(recent_latencies, 50),
-                "p90_ms": self._percentile(recent_latencies, 90),
-                "p95_ms": self._percentile(recent_latencies, 95),
-                "p99_ms": self._percentile(recent_latencies, 99)
-            }
+            return {"window": window, **merged.summary((0.5, 0.9, 0.95, 0.99))}
     
     async def get_model_performance_trends(self, model_version: str, 
                                          metric_name: str = "r_squared") -> Dict[str, Any]:
@@ -248,7 +361,12 @@ class MetricsService(IMetricsService):
     async def cleanup(self):
         """Cleanup do serviço"""
         with self._lock:
-            self.latency_metrics.clear()
+            self.latency_histograms.clear()
+            self.span_histograms.clear()
             self.model_performance.clear()
             self.request_counts.clear()
             self.error_counts.clear()
+            self.coalescing_counts = {"leaders": 0, "coalesced": 0}
+            self.cache_counts = {"hits": 0, "misses": 0}
+        if self._prometheus is not None:
+            self._prometheus.mark_process_dead()
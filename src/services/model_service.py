@@ -3,69 +3,148 @@ Serviço de gerenciamento de modelos
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from datetime import datetime
 import os
+import re
 import json
+import time
+import hashlib
+import shutil
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
 
 from ..api.schemas import ModelVersion
 from ..core.config import get_settings
+from ..core.interfaces import IModelService
+from ..core.exceptions import (
+    ModelError, ModelTrainingError, InsufficientDataError, ModelVersionNotFoundError,
+    ModelVersionExistsError
+)
 
 logger = logging.getLogger(__name__)
 
 class ModelService:
-    """Serviço para gerenciamento de modelos"""
+    """
+    Serviço para gerenciamento de modelos
+    
+    Registro em disco sob settings.DATA_DIR/models:
+    
+        models/
+            active.json              -> {"version": "v1.0.0"}
+            v1.0.0/
+                manifest.json        -> metadados, parâmetros e estado escalar
+                <array>.npy          -> coeficientes e draws da posterior
+    
+    Os arrays são abertos com np.load(mmap_mode="r"): workers do uvicorn que
+    carregam a mesma versão compartilham as páginas do arquivo via page cache.
+    Versões são imutáveis e publicadas atomicamente (diretório temporário + rename).
+    """
+    
+    MANIFEST_FILE = "manifest.json"
+    ACTIVE_FILE = "active.json"
     
     def __init__(self):
         self.settings = get_settings()
         self.models_dir = os.path.join(self.settings.DATA_DIR, "models")
         self._ensure_models_dir()
+        
+        # Versão ativa em memória, revalidada pelo mtime do ponteiro
+        self._active_cache: Optional[tuple] = None
     
     def _ensure_models_dir(self):
         """Garantir que o diretório de modelos existe"""
         os.makedirs(self.models_dir, exist_ok=True)
     
+    def _version_dir(self, version: str) -> str:
+        """Diretório da versão (rejeita nomes que escapem do registro)"""
+        if not re.fullmatch(r"[A-Za-z0-9][A-Za-z0-9._-]*", version or ""):
+            raise ModelVersionNotFoundError(f"Nome de versão inválido: {version}", version=version)
+        return os.path.join(self.models_dir, version)
+    
+    def _read_json(self, path: str) -> Optional[Dict[str, Any]]:
+        """Ler JSON (None se inexistente)"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+    
+    def _write_json_atomic(self, path: str, obj: Dict[str, Any]) -> None:
+        """Escrever JSON via arquivo temporário + rename"""
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    
+    def _read_manifest(self, version: str) -> Optional[Dict[str, Any]]:
+        """Ler manifest da versão"""
+        try:
+            return self._read_json(os.path.join(self._version_dir(version), self.MANIFEST_FILE))
+        except ModelVersionNotFoundError:
+            return None
+    
+    def _active_version(self) -> Optional[str]:
+        """Versão ativa registrada"""
+        path = os.path.join(self.models_dir, self.ACTIVE_FILE)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        
+        if self._active_cache is None or self._active_cache[0] != mtime_ns:
+            active = self._read_json(path)
+            self._active_cache = (mtime_ns, active.get("version") if active else None)
+        return self._active_cache[1]
+    
+    def _registered_params(self, model: IModelService, data_hash: str) -> Dict[str, Any]:
+        """
+        Parâmetros do manifest; modelos simulados sem seed recebem uma derivada
+        do data_hash, para que todo worker que carregar a versão gere as mesmas saídas
+        """
+        params = model.get_params()
+        if "seed" in params and params["seed"] is None:
+            params["seed"] = self._seed_from_data_hash(data_hash)
+        return params
+    
+    @staticmethod
+    def _seed_from_data_hash(data_hash: str) -> int:
+        """Seed determinística (32 bits) derivada do hash dos dados de treino"""
+        return int.from_bytes(hashlib.sha256(data_hash.encode()).digest()[:4], "little")
+    
+    def _to_model_version(self, manifest: Dict[str, Any], active_version: Optional[str]) -> ModelVersion:
+        """Converter manifest em ModelVersion"""
+        return ModelVersion(
+            version=manifest["version"],
+            trained_at=manifest["trained_at"],
+            data_hash=manifest["data_hash"],
+            methodology=manifest["methodology"],
+            n_observations=manifest["n_observations"],
+            r_squared=manifest["r_squared"],
+            is_active=manifest["version"] == active_version,
+            backtest_metrics=manifest.get("backtest_metrics")
+        )
+    
     async def list_versions(self, include_inactive: bool = False) -> List[ModelVersion]:
         """Listar versões de modelos"""
         try:
+            active_version = self._active_version()
             versions = []
             
-            # Simular versões (placeholder)
-            mock_versions = [
-                {
-                    "version": "v1.0.0",
-                    "trained_at": "2025-01-01T00:00:00Z",
-                    "data_hash": "sha256:abcd1234",
-                    "methodology": "LP primary, BVAR fallback",
-                    "n_observations": 20,
-                    "r_squared": 0.65,
-                    "is_active": True,
-                    "backtest_metrics": {
-                        "coverage_80": 0.85,
-                        "coverage_95": 0.92,
-                        "brier_score": 0.15
-                    }
-                },
-                {
-                    "version": "v0.9.0",
-                    "trained_at": "2024-12-01T00:00:00Z",
-                    "data_hash": "sha256:efgh5678",
-                    "methodology": "LP only",
-                    "n_observations": 18,
-                    "r_squared": 0.60,
-                    "is_active": False,
-                    "backtest_metrics": {
-                        "coverage_80": 0.82,
-                        "coverage_95": 0.89,
-                        "brier_score": 0.18
-                    }
-                }
-            ]
-            
-            for version_data in mock_versions:
-                if include_inactive or version_data["is_active"]:
-                    versions.append(ModelVersion(**version_data))
+            for entry in sorted(os.listdir(self.models_dir)):
+                if entry.startswith(".") or not os.path.isdir(os.path.join(self.models_dir, entry)):
+                    continue
+                manifest = self._read_manifest(entry)
+                if manifest is None:
+                    continue
+                
+                model_version = self._to_model_version(manifest, active_version)
+                if include_inactive or model_version.is_active:
+                    versions.append(model_version)
             
+            versions.sort(key=lambda v: v.trained_at, reverse=True)
             return versions
             
         except Exception as e:
@@ -75,13 +154,11 @@ class ModelService:
     async def get_version(self, version: str) -> Optional[ModelVersion]:
         """Obter versão específica"""
         try:
-            versions = await self.list_versions(include_inactive=True)
-            
-            for model_version in versions:
-                if model_version.version == version:
-                    return model_version
+            manifest = self._read_manifest(version)
+            if manifest is None:
+                return None
             
-            return None
+            return self._to_model_version(manifest, self._active_version())
             
         except Exception as e:
             logger.error(f"Erro ao obter versão {version}: {str(e)}", exc_info=True)
@@ -90,54 +167,128 @@ class ModelService:
     async def get_active_model(self) -> Optional[ModelVersion]:
         """Obter modelo ativo"""
         try:
-            versions = await self.list_versions(include_inactive=False)
-            
-            for model_version in versions:
-                if model_version.is_active:
-                    return model_version
+            active_version = self._active_version()
+            if active_version is None:
+                return None
             
-            return None
+            return await self.get_version(active_version)
             
         except Exception as e:
             logger.error(f"Erro ao obter modelo ativo: {str(e)}", exc_info=True)
             raise
     
+    async def resolve_version(self, version: Optional[str] = None) -> str:
+        """Resolver 'latest'/None para a versão ativa (ou a versão padrão)"""
+        if version and version != "latest":
+            return version
+        return self._active_version() or self.settings.DEFAULT_MODEL_VERSION
+    
     async def activate_version(self, version: str) -> bool:
         """Ativar versão específica"""
         try:
             # Verificar se versão existe
-            model_version = await self.get_version(version)
-            if not model_version:
+            if self._read_manifest(version) is None:
                 return False
             
-            # TODO: Implementar ativação real
-            # Por enquanto, apenas simular sucesso
-            logger.info(f"Ativando versão {version}")
+            self._write_json_atomic(
+                os.path.join(self.models_dir, self.ACTIVE_FILE),
+                {"version": version, "activated_at": datetime.utcnow().isoformat() + "Z"}
+            )
+            logger.info(f"Versão {version} ativada")
             return True
             
         except Exception as e:
             logger.error(f"Erro ao ativar versão {version}: {str(e)}", exc_info=True)
             raise
     
-    async def load_model(self, version: str) -> Any:
-        """Carregar modelo específico"""
+    async def save_model(self,
+                         version: str,
+                         model: IModelService,
+                         data_hash: str,
+                         backtest_metrics: Optional[Dict[str, float]] = None,
+                         activate: bool = False) -> ModelVersion:
+        """Registrar modelo treinado como nova versão (imutável)"""
         try:
-            # TODO: Implementar carregamento real do modelo
-            # Por enquanto, retornar objeto mock
-            logger.info(f"Carregando modelo {version}")
+            version_dir = self._version_dir(version)
+            if os.path.exists(version_dir):
+                raise ModelVersionExistsError(f"Versão {version} já registrada", version=version)
+            if not model.is_trained:
+                raise ModelError("Modelo não treinado", model_type=model.MODEL_TYPE, operation="save")
+            
+            evaluation = await model.evaluate_model()
+            manifest = {
+                "version": version,
+                "model_type": model.MODEL_TYPE,
+                "trained_at": model.trained_at.isoformat() + "Z",
+                "data_hash": data_hash,
+                "methodology": self.settings.DEFAULT_METHODOLOGY,
+                "n_observations": int(model.n_observations),
+                "r_squared": float(np.clip(evaluation["r_squared"], 0.0, 1.0)),
+                "backtest_metrics": backtest_metrics,
+                "params": self._registered_params(model, data_hash),
+                "state": {name: getattr(model, name) for name in model.ARTIFACT_STATE},
+                "arrays": {}
+            }
             
-            # Simular modelo
-            class MockModel:
-                def __init__(self, version):
-                    self.version = version
-                    self.loaded_at = datetime.utcnow()
+            # Escrever em diretório temporário e publicar com rename atômico; o
+            # diretório temporário nunca sobrevive (falha ou versão publicada por outro worker)
+            tmp_dir = os.path.join(self.models_dir, f".{version}.tmp-{os.getpid()}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            try:
+                os.makedirs(tmp_dir)
+                for name in model.ARTIFACT_ARRAYS:
+                    filename = f"{name}.npy"
+                    array = np.ascontiguousarray(getattr(model, name))
+                    np.save(os.path.join(tmp_dir, filename), array)
+                    manifest["arrays"][name] = {"file": filename, "shape": list(array.shape), "dtype": str(array.dtype)}
                 
-                def predict(self, data):
-                    # Simular previsão
-                    return {"prediction": "mock"}
+                self._write_json_atomic(os.path.join(tmp_dir, self.MANIFEST_FILE), manifest)
+                try:
+                    os.rename(tmp_dir, version_dir)
+                except OSError:
+                    if os.path.exists(version_dir):
+                        raise ModelVersionExistsError(f"Versão {version} registrada por outro worker",
+                                                      version=version)
+                    raise
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            
+            logger.info(f"Modelo {model.MODEL_TYPE} registrado como versão {version}")
+            
+            if activate:
+                await self.activate_version(version)
+            
+            return self._to_model_version(manifest, self._active_version())
+            
+        except ModelVersionExistsError:
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao registrar versão {version}: {str(e)}", exc_info=True)
+            raise
+    
+    async def load_model(self, version: str) -> IModelService:
+        """Carregar modelo específico (arrays memory-mapped, somente leitura)"""
+        try:
+            manifest = self._read_manifest(version)
+            if manifest is None:
+                raise ModelVersionNotFoundError(f"Versão {version} não encontrada", version=version)
             
-            return MockModel(version)
+            logger.info(f"Carregando modelo {version}")
+            
+            model_class = MODEL_TYPES[manifest["model_type"]]
+            model = model_class(**manifest["params"])
+            
+            version_dir = self._version_dir(version)
+            for name, spec in manifest["arrays"].items():
+                setattr(model, name, np.load(os.path.join(version_dir, spec["file"]), mmap_mode="r"))
+            for name, value in manifest["state"].items():
+                setattr(model, name, value)
+            model.trained_at = datetime.fromisoformat(manifest["trained_at"].rstrip("Z"))
+            
+            return model
             
+        except ModelVersionNotFoundError:
+            raise
         except Exception as e:
             logger.error(f"Erro ao carregar modelo {version}: {str(e)}", exc_info=True)
             raise
@@ -191,13 +342,15 @@ class ModelService:
     async def get_metadata(self) -> Dict[str, Any]:
         """Obter metadados dos modelos"""
         try:
+            versions = await self.list_versions(include_inactive=True)
+            
             return {
-                "total_models": 2,
-                "active_models": 1,
-                "methodologies": ["LP primary, BVAR fallback", "LP only"],
+                "total_models": len(versions),
+                "active_models": len([v for v in versions if v.is_active]),
+                "methodologies": sorted({v.methodology for v in versions}),
                 "data_sources": ["FRED", "BCB"],
-                "last_training": "2025-01-01T00:00:00Z",
-                "supported_versions": ["v1.0.0", "v0.9.0"]
+                "last_training": versions[0].trained_at if versions else None,
+                "supported_versions": [v.version for v in versions]
             }
             
         except Exception as e:
@@ -208,10 +361,12 @@ class ModelService:
         """Obter capacidades dos modelos"""
         try:
             return {
-                "supported_horizons": list(range(1, 13)),
-                "supported_fed_moves": list(range(-200, 201, 25)),
-                "confidence_levels": [0.80, 0.95],
-                "discretization": 25,
+                "supported_horizons": list(range(self.settings.MIN_HORIZONS, self.settings.MAX_HORIZONS + 1)),
+                "supported_fed_moves": list(range(self.settings.MIN_FED_MOVE_BPS,
+                                                  self.settings.MAX_FED_MOVE_BPS + 1,
+                                                  self.settings.DISCRETIZATION_BPS)),
+                "confidence_levels": self.settings.CONFIDENCE_LEVELS,
+                "discretization": self.settings.DISCRETIZATION_BPS,
                 "max_batch_size": self.settings.MAX_BATCH_SIZE,
                 "supported_regimes": ["normal", "stress", "crisis", "recovery"],
                 "data_requirements": {
@@ -228,4 +383,571 @@ class ModelService:
             
         except Exception as e:
             logger.error(f"Erro ao obter capacidades: {str(e)}", exc_info=True)
-            raise
\ No newline at end of file
+            raise
+
+class LocalProjectionsModelService(IModelService):
+    """
+    Local Projections (Jordà, 2005) estimadas em lote
+    
+    Para cada horizonte h = 1..max_horizon estima
+    
+        selic[t+h] - selic[t-1] = a_h + b_h * fed_change[t] + controles(lags) + e[t+h]
+    
+    Todos os horizontes usam a mesma amostra (t com dados até t+max_horizon),
+    de forma que a matriz de design X é construída uma única vez e a
+    fatoração (Cholesky com ridge, ou QR sem regularização) é compartilhada:
+    o sistema é resolvido para a matriz Y (n x H) inteira de uma só vez.
+    """
+    
+    MODEL_TYPE = "local_projections"
+    
+    # Atributos persistidos no registro de modelos (arrays em .npy, estado no manifest)
+    ARTIFACT_ARRAYS = ("coefficients", "irf", "irf_se", "resid_std", "r_squared")
+    ARTIFACT_STATE = ("n_observations", "fit_time_ms")
+    
+    def __init__(self,
+                 max_horizon: int = 12,
+                 max_lags: int = 4,
+                 alpha: float = 0.1,
+                 regularization: str = "ridge"):
+        self.max_horizon = max_horizon
+        self.max_lags = max_lags
+        self.alpha = alpha
+        self.regularization = regularization
+        
+        # Resultado do último ajuste
+        self.coefficients: Optional[np.ndarray] = None  # (k, H)
+        self.irf: Optional[np.ndarray] = None  # (H,) resposta da Selic (pp) a 1 pp do Fed
+        self.irf_se: Optional[np.ndarray] = None  # (H,) erro-padrão HAC de irf
+        self.resid_std: Optional[np.ndarray] = None  # (H,) desvio-padrão dos resíduos
+        self.r_squared: Optional[np.ndarray] = None  # (H,)
+        self.n_observations: int = 0
+        self.trained_at: Optional[datetime] = None
+        self.fit_time_ms: Optional[float] = None
+    
+    @property
+    def is_trained(self) -> bool:
+        """Indica se o modelo já foi ajustado"""
+        return self.irf is not None
+    
+    def get_params(self) -> Dict[str, Any]:
+        """Parâmetros do construtor"""
+        return {
+            "max_horizon": self.max_horizon,
+            "max_lags": self.max_lags,
+            "alpha": self.alpha,
+            "regularization": self.regularization
+        }
+    
+    def _build_design(self, fed_change: np.ndarray, selic: np.ndarray):
+        """Construir matriz de design X e respostas cumulativas Y (uma vez para todos os horizontes)"""
+        p, H = self.max_lags, self.max_horizon
+        selic_change = np.diff(selic, prepend=np.nan)
+        
+        # t precisa de p lags (t-p >= 1, pois selic_change[0] é NaN) e de y[t+H]
+        t = np.arange(p + 1, len(selic) - H)
+        if len(t) == 0:
+            raise InsufficientDataError(
+                "Dados insuficientes para Local Projections",
+                required=p + H + 2,
+                available=len(selic)
+            )
+        
+        lags = np.arange(1, p + 1)
+        columns = [
+            np.ones(len(t)),
+            fed_change[t],
+            *fed_change[t[:, None] - lags].T,
+            *selic_change[t[:, None] - lags].T
+        ]
+        X = np.column_stack(columns)
+        
+        # Y[:, h-1] = selic[t+h] - selic[t-1]
+        horizons = np.arange(1, H + 1)
+        Y = selic[t[:, None] + horizons] - selic[t - 1][:, None]
+        
+        return X, Y
+    
+    def _solve(self, X: np.ndarray, Y: np.ndarray):
+        """Resolver todos os horizontes com uma única fatoração"""
+        if self.regularization == "ridge" and self.alpha > 0:
+            penalty = np.full(X.shape[1], self.alpha)
+            penalty[0] = 0.0  # Não penalizar intercepto
+            gram = X.T @ X + np.diag(penalty)
+            factor = cho_factor(gram)
+            B = cho_solve(factor, X.T @ Y)
+            # Linha do choque em (X'X + aD)^-1 X' -> pesos do estimador de b_h
+            weights = cho_solve(factor, X.T)[1]
+        else:
+            Q, R = np.linalg.qr(X)
+            B = solve_triangular(R, Q.T @ Y)
+            weights = solve_triangular(R, Q.T)[1]
+        return B, weights
+    
+    def _hac_variance(self, weights: np.ndarray, residuals: np.ndarray) -> np.ndarray:
+        """Variância Newey-West de b_h com banda h+1 (resíduos sobrepostos), vetorizada nos horizontes"""
+        Z = weights[:, None] * residuals  # (n, H)
+        variance = (Z ** 2).sum(axis=0)
+        bandwidth = np.arange(1, self.max_horizon + 1) + 1.0
+        
+        for lag in range(1, min(self.max_horizon + 2, len(Z))):
+            bartlett = np.clip(1.0 - lag / (bandwidth + 1.0), 0.0, None)
+            variance += 2.0 * bartlett * (Z[lag:] * Z[:-lag]).sum(axis=0)
+        
+        return np.clip(variance, 0.0, None)
+    
+    async def train_model(self, data: pd.DataFrame) -> Dict[str, Any]:
+        """Ajustar as projeções locais para todos os horizontes"""
+        try:
+            for col in ("fed_rate", "selic"):
+                if col not in data.columns:
+                    raise ModelTrainingError(f"Coluna {col} não encontrada nos dados",
+                                             model_type="local_projections", stage="design")
+            
+            start = time.perf_counter()
+            
+            fed = data["fed_rate"].to_numpy(dtype=float)
+            selic = data["selic"].to_numpy(dtype=float)
+            fed_change = np.diff(fed, prepend=np.nan)
+            
+            X, Y = self._build_design(fed_change, selic)
+            n, k = X.shape
+            if n <= k:
+                raise InsufficientDataError(
+                    "Observações insuficientes para o número de regressores",
+                    required=k + 1,
+                    available=n
+                )
+            
+            B, weights = self._solve(X, Y)
+            residuals = Y - X @ B
+            
+            ss_res = (residuals ** 2).sum(axis=0)
+            ss_tot = ((Y - Y.mean(axis=0)) ** 2).sum(axis=0)
+            
+            self.coefficients = B
+            self.irf = B[1]
+            self.irf_se = np.sqrt(self._hac_variance(weights, residuals))
+            self.resid_std = np.sqrt(ss_res / (n - k))
+            self.r_squared = np.where(ss_tot > 0, 1.0 - ss_res / np.where(ss_tot > 0, ss_tot, 1.0), 0.0)
+            self.n_observations = n
+            self.trained_at = datetime.utcnow()
+            self.fit_time_ms = (time.perf_counter() - start) * 1000
+            
+            logger.info(f"Local Projections ajustadas: {n} obs, {self.max_horizon} horizontes, "
+                        f"{self.fit_time_ms:.2f}ms")
+            
+            return {
+                "model_type": "local_projections",
+                "n_observations": n,
+                "n_regressors": k,
+                "max_horizon": self.max_horizon,
+                "irf": self.irf.tolist(),
+                "irf_se": self.irf_se.tolist(),
+                "r_squared": self.r_squared.tolist(),
+                "fit_time_ms": self.fit_time_ms
+            }
+            
+        except (ModelTrainingError, InsufficientDataError):
+            raise
+        except Exception as e:
+            raise ModelTrainingError(f"Erro no ajuste das Local Projections: {str(e)}",
+                                     model_type="local_projections", stage="fit")
+    
+    def response_moments(self, fed_shock: float, horizons: np.ndarray) -> tuple:
+        """
+        Média e desvio-padrão preditivos (bps) da variação acumulada da Selic
+        para um choque do Fed em pontos percentuais
+        """
+        if not self.is_trained:
+            raise ModelError("Modelo Local Projections não treinado",
+                             model_type="local_projections", operation="predict")
+        
+        idx = np.asarray(horizons, dtype=int) - 1
+        if np.any(idx < 0) or np.any(idx >= self.max_horizon):
+            raise ModelError(f"Horizontes devem estar em [1, {self.max_horizon}]",
+                             model_type="local_projections", operation="predict")
+        
+        mean = self.irf[idx] * fed_shock * 100
+        std = np.sqrt((fed_shock * self.irf_se[idx]) ** 2 + self.resid_std[idx] ** 2) * 100
+        return mean, std
+    
+    def response_moments_many(self, fed_shocks: np.ndarray, horizons: np.ndarray) -> tuple:
+        """
+        Média e desvio-padrão (bps) para N choques do Fed (pp) em um único
+        broadcast sobre os coeficientes: arrays (N, n_horizons)
+        """
+        if not self.is_trained:
+            raise ModelError("Modelo Local Projections não treinado",
+                             model_type="local_projections", operation="predict")
+        
+        idx = np.asarray(horizons, dtype=int) - 1
+        if np.any(idx < 0) or np.any(idx >= self.max_horizon):
+            raise ModelError(f"Horizontes devem estar em [1, {self.max_horizon}]",
+                             model_type="local_projections", operation="predict")
+        
+        shocks = np.asarray(fed_shocks, dtype=float)[:, None]
+        mean = shocks * self.irf[idx] * 100
+        std = np.sqrt((shocks * self.irf_se[idx]) ** 2 + self.resid_std[idx] ** 2) * 100
+        return mean, std
+    
+    async def predict(self, fed_shock: float, horizon_months: List[int]) -> Dict[str, Any]:
+        """Prever resposta da Selic (bps) por horizonte"""
+        horizons = np.asarray(horizon_months, dtype=int)
+        mean, std = self.response_moments(fed_shock, horizons)
+        
+        return {
+            f"horizon_{h}": {
+                "point_forecast": float(m),
+                "std_error": float(s),
+                "ci_lower": float(m - 1.96 * s),
+                "ci_upper": float(m + 1.96 * s)
+            }
+            for h, m, s in zip(horizons.tolist(), mean, std)
+        }
+    
+    async def evaluate_model(self) -> Dict[str, Any]:
+        """Avaliar ajuste por horizonte"""
+        if not self.is_trained:
+            raise ModelError("Modelo Local Projections não treinado",
+                             model_type="local_projections", operation="evaluate")
+        
+        return {
+            "model_type": "local_projections",
+            "n_observations": self.n_observations,
+            "r_squared": float(np.mean(self.r_squared)),
+            "r_squared_by_horizon": self.r_squared.tolist(),
+            "irf_t_stats": np.divide(self.irf, self.irf_se, out=np.zeros_like(self.irf),
+                                     where=self.irf_se > 0).tolist(),
+            "fit_time_ms": self.fit_time_ms,
+            "trained_at": self.trained_at.isoformat() if self.trained_at else None
+        }
+
+class BVARMinnesotaModelService(IModelService):
+    """
+    BVAR com prior Minnesota conjugada Normal-Inverse-Wishart (Kadiyala & Karlsson, 1997)
+    
+    VAR(p) em primeiras diferenças [fed_change, selic_change]. Na forma conjugada
+    a covariância a priori dos coeficientes é Kronecker (Sigma ⊗ Omega0), portanto a
+    tightness cruzada lambda2 fica implicitamente igual a 1.
+    
+    As n_simulations amostras da posterior (B, Sigma) e os caminhos de previsão
+    condicional são gerados como operações em arrays 3-D (draws x linhas x colunas),
+    sem laços Python por draw; o único laço é sobre os horizontes da simulação.
+    """
+    
+    MODEL_TYPE = "bvar_minnesota"
+    VARIABLES = ["fed_change", "selic_change"]
+    
+    # Atributos persistidos no registro de modelos (arrays em .npy, estado no manifest)
+    ARTIFACT_ARRAYS = ("B_post", "omega_post_chol", "S_post", "B_draws", "sigma_draws",
+                       "sigma_chol_draws", "r_squared")
+    ARTIFACT_STATE = ("nu_post", "n_observations")
+    
+    def __init__(self,
+                 n_lags: int = 2,
+                 n_vars: int = 2,
+                 minnesota_params: Optional[Dict[str, float]] = None,
+                 n_simulations: int = 1000,
+                 seed: Optional[int] = None):
+        if n_vars != len(self.VARIABLES):
+            raise ModelError(f"BVAR suporta apenas {len(self.VARIABLES)} variáveis: {self.VARIABLES}",
+                             model_type="bvar_minnesota", operation="init")
+        
+        params = minnesota_params or {}
+        self.n_lags = n_lags
+        self.n_vars = n_vars
+        self.n_simulations = n_simulations
+        self.lambda1 = params.get("lambda1", 0.1)
+        self.lambda2 = params.get("lambda2", 0.5)
+        self.lambda3 = params.get("lambda3", 1.0)
+        self.lambda4 = params.get("lambda4", 0.1)
+        self.mu = params.get("mu", 0.0)
+        self.sigma = params.get("sigma", 1.0)
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
+        
+        # Posterior
+        self.B_post: Optional[np.ndarray] = None  # (k, n)
+        self.omega_post_chol: Optional[np.ndarray] = None  # (k, k)
+        self.S_post: Optional[np.ndarray] = None  # (n, n)
+        self.nu_post: Optional[float] = None
+        
+        # Amostras da posterior
+        self.B_draws: Optional[np.ndarray] = None  # (N, k, n)
+        self.sigma_draws: Optional[np.ndarray] = None  # (N, n, n)
+        self.sigma_chol_draws: Optional[np.ndarray] = None  # (N, n, n)
+        
+        self.r_squared: Optional[np.ndarray] = None
+        self.n_observations: int = 0
+        self.trained_at: Optional[datetime] = None
+    
+    @property
+    def is_trained(self) -> bool:
+        """Indica se a posterior já foi amostrada"""
+        return self.B_draws is not None
+    
+    def get_params(self) -> Dict[str, Any]:
+        """Parâmetros do construtor"""
+        return {
+            "n_lags": self.n_lags,
+            "n_vars": self.n_vars,
+            "minnesota_params": {
+                "lambda1": self.lambda1,
+                "lambda2": self.lambda2,
+                "lambda3": self.lambda3,
+                "lambda4": self.lambda4,
+                "mu": self.mu,
+                "sigma": self.sigma
+            },
+            "n_simulations": self.n_simulations,
+            "seed": self.seed
+        }
+    
+    def _build_var(self, Z: np.ndarray):
+        """Construir Y (T-p x n) e X (T-p x 1+n*p) = [1, y_{t-1}, ..., y_{t-p}]"""
+        p = self.n_lags
+        T = len(Z)
+        Y = Z[p:]
+        X = np.column_stack([np.ones(T - p)] + [Z[p - l:T - l] for l in range(1, p + 1)])
+        return Y, X
+    
+    def _minnesota_prior(self, Z: np.ndarray):
+        """Prior conjugada: média B0, covariância Omega0 (diagonal), escala S0 e graus de liberdade nu0"""
+        n, p = self.n_vars, self.n_lags
+        k = 1 + n * p
+        
+        # Escala por variável: desvio-padrão dos resíduos de um AR(1) univariado
+        y, y_lag = Z[1:], Z[:-1]
+        y_lag_c = np.column_stack([np.ones(len(y_lag)), y_lag])
+        scales = np.empty(n)
+        for i in range(n):
+            coef, *_ = np.linalg.lstsq(y_lag_c[:, [0, i + 1]], y[:, i], rcond=None)
+            resid = y[:, i] - y_lag_c[:, [0, i + 1]] @ coef
+            scales[i] = max(resid.std(ddof=2), 1e-6)
+        
+        B0 = np.zeros((k, n))
+        B0[1:1 + n, :] = np.eye(n) * self.mu
+        
+        omega0 = np.empty(k)
+        omega0[0] = (self.lambda1 * self.lambda4) ** 2
+        for l in range(1, p + 1):
+            omega0[1 + (l - 1) * n:1 + l * n] = (self.lambda1 / (l ** self.lambda3 * scales)) ** 2
+        
+        nu0 = n + 2
+        S0 = np.diag(scales ** 2) * self.sigma * (nu0 - n - 1)
+        return B0, omega0, S0, nu0
+    
+    async def train_model(self, data: pd.DataFrame) -> Dict[str, Any]:
+        """Calcular a posterior NIW e amostrar n_simulations draws"""
+        try:
+            if "fed_change" in data.columns and "selic_change" in data.columns:
+                Z = data[self.VARIABLES].to_numpy(dtype=float)
+            elif "fed_rate" in data.columns and "selic" in data.columns:
+                Z = np.diff(data[["fed_rate", "selic"]].to_numpy(dtype=float), axis=0)
+            else:
+                raise ModelTrainingError("Colunas fed/selic não encontradas nos dados",
+                                         model_type="bvar_minnesota", stage="design")
+            Z = Z[~np.isnan(Z).any(axis=1)]
+            
+            k = 1 + self.n_vars * self.n_lags
+            if len(Z) <= self.n_lags + 2:
+                raise InsufficientDataError("Dados insuficientes para o BVAR",
+                                            required=self.n_lags + 3, available=len(Z))
+            
+            Y, X = self._build_var(Z)
+            B0, omega0, S0, nu0 = self._minnesota_prior(Z)
+            
+            # Posterior conjugada
+            omega0_inv = np.diag(1.0 / omega0)
+            precision = omega0_inv + X.T @ X
+            factor = cho_factor(precision, lower=True)
+            B_post = cho_solve(factor, omega0_inv @ B0 + X.T @ Y)
+            S_post = S0 + Y.T @ Y + B0.T @ omega0_inv @ B0 - B_post.T @ precision @ B_post
+            S_post = (S_post + S_post.T) / 2
+            
+            self.B_post = B_post
+            self.omega_post_chol = np.linalg.cholesky(cho_solve(factor, np.eye(k)))
+            self.S_post = S_post
+            self.nu_post = nu0 + len(Y)
+            
+            self.B_draws, self.sigma_draws = self.sample_posterior(self.n_simulations)
+            self.sigma_chol_draws = np.linalg.cholesky(self.sigma_draws)
+            
+            resid = Y - X @ B_post
+            ss_tot = ((Y - Y.mean(axis=0)) ** 2).sum(axis=0)
+            self.r_squared = 1.0 - (resid ** 2).sum(axis=0) / np.where(ss_tot > 0, ss_tot, 1.0)
+            self.n_observations = len(Y)
+            self.trained_at = datetime.utcnow()
+            
+            logger.info(f"BVAR Minnesota ajustado: {len(Y)} obs, {self.n_simulations} draws")
+            
+            return {
+                "model_type": "bvar_minnesota",
+                "n_observations": len(Y),
+                "n_lags": self.n_lags,
+                "n_simulations": self.n_simulations,
+                "r_squared": self.r_squared.tolist()
+            }
+            
+        except (ModelTrainingError, InsufficientDataError):
+            raise
+        except Exception as e:
+            raise ModelTrainingError(f"Erro no ajuste do BVAR: {str(e)}",
+                                     model_type="bvar_minnesota", stage="posterior")
+    
+    def sample_posterior(self, n_draws: int, rng: Optional[np.random.Generator] = None):
+        """
+        Amostrar (B, Sigma) da posterior NIW em lote
+        
+        Sigma ~ IW(S_post, nu_post) via decomposição de Bartlett de Sigma^-1 ~ W(S_post^-1, nu_post);
+        vec(B) | Sigma ~ N(vec(B_post), Sigma ⊗ Omega_post).
+        """
+        rng = rng or self._rng
+        n, k = self.n_vars, self.B_post.shape[0]
+        
+        # Bartlett: A triangular inferior com qui-quadrado na diagonal
+        A = np.tril(rng.standard_normal((n_draws, n, n)), k=-1)
+        chi = np.sqrt(rng.chisquare(self.nu_post - np.arange(n), size=(n_draws, n)))
+        A[:, np.arange(n), np.arange(n)] = chi
+        
+        L = np.linalg.cholesky(np.linalg.inv(self.S_post))
+        LA = L @ A
+        sigma_draws = np.linalg.inv(LA @ LA.transpose(0, 2, 1))
+        sigma_draws = (sigma_draws + sigma_draws.transpose(0, 2, 1)) / 2
+        
+        Zb = rng.standard_normal((n_draws, k, n))
+        B_draws = self.B_post + self.omega_post_chol @ Zb @ np.linalg.cholesky(sigma_draws).transpose(0, 2, 1)
+        
+        return B_draws, sigma_draws
+    
+    def simulate_paths(self, fed_shock: float, horizon: int,
+                       n_paths: Optional[int] = None,
+                       seed: Optional[int] = None) -> np.ndarray:
+        """
+        Simular caminhos da variação acumulada da Selic (bps) condicionados a um
+        movimento do Fed de fed_shock pontos percentuais no impacto
+        
+        Caminhos são desvios em relação à trajetória sem choque: no impacto a
+        inovação do Fed é fixada no choque e a da Selic segue a distribuição
+        condicional (Cholesky, Fed ordenado primeiro); depois inovações livres.
+        Retorna array (n_paths, horizon).
+        """
+        if not self.is_trained:
+            raise ModelError("Modelo BVAR não treinado", model_type="bvar_minnesota", operation="simulate")
+        
+        rng = np.random.default_rng(seed) if seed is not None else self._rng
+        n_paths = n_paths or self.n_simulations
+        return self._simulate_block(fed_shock, horizon, np.arange(n_paths) % len(self.B_draws), rng)
+    
+    def iter_paths(self, fed_shock: float, horizon: int, n_paths: int,
+                   chunk_size: int = 65536,
+                   seed: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        Simular n_paths caminhos em blocos de até chunk_size (arrays (m, horizon))
+        
+        Percorre os draws da posterior em sequência entre os blocos; a memória
+        fica limitada ao bloco, para alimentar ProbabilityEngineService.convert_paths.
+        """
+        if not self.is_trained:
+            raise ModelError("Modelo BVAR não treinado", model_type="bvar_minnesota", operation="simulate")
+        
+        rng = np.random.default_rng(seed) if seed is not None else self._rng
+        for start in range(0, n_paths, chunk_size):
+            draw_idx = np.arange(start, min(start + chunk_size, n_paths)) % len(self.B_draws)
+            yield self._simulate_block(fed_shock, horizon, draw_idx, rng)
+    
+    def _simulate_block(self, fed_shock: float, horizon: int,
+                        draw_idx: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Caminhos para os draws da posterior em draw_idx: array (len(draw_idx), horizon)"""
+        n, p = self.n_vars, self.n_lags
+        n_paths = len(draw_idx)
+        
+        # Coeficientes de lag: (N, p, n, n) com A_l[i, j] = efeito de y_{t-l, i} em y_{t, j}
+        lag_coefs = self.B_draws[draw_idx, 1:, :].reshape(n_paths, p, n, n)
+        chol = self.sigma_chol_draws[draw_idx]
+        
+        eps = rng.standard_normal((horizon, n_paths, n))
+        eps[0, :, 0] = fed_shock / chol[:, 0, 0]
+        
+        history = np.zeros((n_paths, p, n))  # history[:, l-1] = y_{t-l}
+        selic = np.empty((n_paths, horizon))
+        for h in range(horizon):
+            y = np.einsum("npi,npij->nj", history, lag_coefs) + np.einsum("nij,nj->ni", chol, eps[h])
+            history = np.concatenate([y[:, None, :], history[:, :-1]], axis=1)
+            selic[:, h] = y[:, 1]
+        
+        return np.cumsum(selic, axis=1) * 100
+    
+    def response_moments(self, fed_shock: float, horizons: np.ndarray) -> tuple:
+        """Média e desvio-padrão (bps) da variação acumulada da Selic a partir dos caminhos simulados"""
+        horizons = np.asarray(horizons, dtype=int)
+        paths = self.simulate_paths(fed_shock, int(horizons.max()), seed=self.seed)
+        selected = paths[:, horizons - 1]
+        return selected.mean(axis=0), selected.std(axis=0)
+    
+    def response_moments_many(self, fed_shocks: np.ndarray, horizons: np.ndarray) -> tuple:
+        """
+        Média e desvio-padrão (bps) para N choques do Fed (pp): arrays (N, n_horizons)
+        
+        Com os mesmos draws e inovações, os caminhos são lineares no choque:
+        caminho(s) = s * resposta_unitária + ruído. Basta simular s=0 e s=1 uma
+        vez e combinar os momentos amostrais (média, variâncias e covariância)
+        em broadcast, sem simular N x n_paths caminhos.
+        
+        Com seed definida (versões registradas), cada chamada reinicia o gerador:
+        os momentos dependem só da versão, não da ordem das chamadas no worker.
+        """
+        horizons = np.asarray(horizons, dtype=int)
+        horizon = int(horizons.max())
+        seed = self.seed if self.seed is not None else int(self._rng.integers(2 ** 32))
+        
+        noise = self.simulate_paths(0.0, horizon, seed=seed)[:, horizons - 1]
+        unit = self.simulate_paths(1.0, horizon, seed=seed)[:, horizons - 1] - noise
+        
+        unit_centered = unit - unit.mean(axis=0)
+        noise_centered = noise - noise.mean(axis=0)
+        var_unit = np.mean(unit_centered ** 2, axis=0)
+        var_noise = np.mean(noise_centered ** 2, axis=0)
+        cov = np.mean(unit_centered * noise_centered, axis=0)
+        
+        shocks = np.asarray(fed_shocks, dtype=float)[:, None]
+        mean = shocks * unit.mean(axis=0) + noise.mean(axis=0)
+        var = shocks ** 2 * var_unit + 2 * shocks * cov + var_noise
+        return mean, np.sqrt(np.maximum(var, 0.0))
+    
+    async def predict(self, fed_shock: float, horizon_months: List[int]) -> Dict[str, Any]:
+        """Prever resposta da Selic (bps) por horizonte a partir dos caminhos simulados"""
+        horizons = np.asarray(horizon_months, dtype=int)
+        paths = self.simulate_paths(fed_shock, int(horizons.max()), seed=self.seed)[:, horizons - 1]
+        lower, upper = np.percentile(paths, [2.5, 97.5], axis=0)
+        
+        return {
+            f"horizon_{h}": {
+                "point_forecast": float(m),
+                "std_error": float(s),
+                "ci_lower": float(lo),
+                "ci_upper": float(hi)
+            }
+            for h, m, s, lo, hi in zip(horizons.tolist(), paths.mean(axis=0), paths.std(axis=0), lower, upper)
+        }
+    
+    async def evaluate_model(self) -> Dict[str, Any]:
+        """Avaliar ajuste na média da posterior"""
+        if not self.is_trained:
+            raise ModelError("Modelo BVAR não treinado", model_type="bvar_minnesota", operation="evaluate")
+        
+        return {
+            "model_type": "bvar_minnesota",
+            "n_observations": self.n_observations,
+            "r_squared": float(np.mean(self.r_squared)),
+            "r_squared_by_equation": dict(zip(self.VARIABLES, self.r_squared.tolist())),
+            "n_simulations": self.n_simulations,
+            "trained_at": self.trained_at.isoformat() if self.trained_at else None
+        }
+
+# Classes de modelo por tipo registrado no manifest
+MODEL_TYPES = {
+    LocalProjectionsModelService.MODEL_TYPE: LocalProjectionsModelService,
+    BVARMinnesotaModelService.MODEL_TYPE: BVARMinnesotaModelService
+}
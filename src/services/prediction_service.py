@@ -2,34 +2,106 @@
 Serviço de previsão da Selic
 """
 
+import asyncio
+import functools
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+import os
+import time
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
+from scipy.special import ndtr, ndtri
 
+from config import MODEL_CONFIG
 from ..api.schemas import (
     PredictionRequest, PredictionResponse, CopomMeeting, DistributionPoint, ModelMetadata
 )
 from ..core.config import get_settings
-from .model_service import ModelService
+from ..core.exceptions import (
+    CacheError, InsufficientDataError, ModelTrainingError, ModelVersionNotFoundError,
+    ModelVersionExistsError, ValidationError
+)
+from .model_service import ModelService, LocalProjectionsModelService, BVARMinnesotaModelService
 from .data_service import DataService
+from .response_table import ImpulseResponseTable, ScenarioPredictions
+from .batch_executor import BatchExecutor
+from .cache_service import RedisCacheService, generate_cache_key
+from .metrics_service import MetricsService
+from .single_flight import SingleFlight
+from .copom_calendar import CopomCalendarService
+from .tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
+# Probabilidades simuladas das próximas reuniões do Copom após a decisão do Fed
+COPOM_MEETING_PROBABILITIES = [0.41, 0.21, 0.15, 0.10]
+
 class PredictionService:
     """Serviço para previsões da Selic"""
     
-    def __init__(self):
+    def __init__(self,
+                 model_service: Optional[ModelService] = None,
+                 data_service: Optional[DataService] = None,
+                 batch_executor: Optional[BatchExecutor] = None,
+                 cache_service: Optional[RedisCacheService] = None,
+                 metrics_service: Optional[MetricsService] = None,
+                 copom_calendar: Optional[CopomCalendarService] = None):
         self.settings = get_settings()
-        self.model_service = ModelService()
-        self.data_service = DataService()
+        self.model_service = model_service or ModelService()
+        self.data_service = data_service or DataService()
+        self.batch_executor = batch_executor or BatchExecutor(
+            kind=self.settings.BATCH_EXECUTOR,
+            max_workers=self.settings.BATCH_MAX_WORKERS
+        )
+        self.cache_service = cache_service
+        self.metrics_service = metrics_service
+        self.copom_calendar = copom_calendar or CopomCalendarService(
+            calendar_path=os.path.join(self.settings.DATA_DIR, self.settings.COPOM_CALENDAR_PATH)
+        )
+        self._regime_scales = MODEL_CONFIG["regime_uncertainty_scale"]
+        
+        # Requests idênticos concorrentes aguardam a mesma computação
+        self._single_flight = SingleFlight()
         
         # Cache de modelos
         self._model_cache = {}
         self._last_model_load = None
+        
+        # Tabelas de resposta compiladas por versão
+        self._response_tables: Dict[str, ImpulseResponseTable] = {}
+        self._activation_lock = asyncio.Lock()
     
     async def validate_request(self, request: PredictionRequest) -> Dict[str, Any]:
+        """Validar request de previsão (falhas repetidas servidas pelo cache negativo)"""
+        with get_tracer().span("validation") as span:
+            if self.cache_service is None:
+                result = await self._validate_request(request)
+                span.set_attribute("valid", result["valid"])
+                return result
+            
+            negative_key = self._negative_key(request)
+            cached = self.cache_service.get_validation_failure(negative_key)
+            if cached is not None:
+                span.set_attribute("valid", False)
+                span.set_attribute("negative_cache_hit", True)
+                return cached
+            
+            result = await self._validate_request(request)
+            if not result["valid"]:
+                self.cache_service.cache_validation_failure(negative_key, result)
+            span.set_attribute("valid", result["valid"])
+            return result
+    
+    def _negative_key(self, request: PredictionRequest) -> str:
+        """Chave do cache negativo: hash dos campos (cache local, o hash do processo basta)"""
+        fields = (request.fed_decision_date, request.fed_move_bps, request.fed_move_dir,
+                  request.fed_surprise_bps, tuple(request.horizons_months or ()),
+                  request.model_version, request.regime_hint)
+        return f"invalid:{hash(fields)}"
+    
+    async def _validate_request(self, request: PredictionRequest) -> Dict[str, Any]:
         """Validar request de previsão"""
         try:
             # Validar data
@@ -102,35 +174,303 @@ class PredictionService:
     
     async def predict_selic(self, request: PredictionRequest) -> PredictionResponse:
         """Fazer previsão da Selic"""
+        tracer = get_tracer()
         try:
-            # Obter modelo
-            model = await self._get_model(request.model_version)
-            
-            # Obter dados
-            data = await self.data_service.get_prediction_data()
+            start = time.perf_counter()
+            with tracer.span("predict_selic", fed_move_bps=request.fed_move_bps) as span:
+                with tracer.span("resolve_version"):
+                    version = await self.model_service.resolve_version(request.model_version)
+                span.set_attribute("model_version", version)
+                
+                # Uma computação por chave em andamento (cache + modelo), mesmo sob rajada
+                cache_key = self._cache_key(request, version)
+                response, coalesced = await self._single_flight.do(
+                    cache_key, lambda: self._predict_cached(cache_key, request, version)
+                )
+                span.set_attribute("coalesced", coalesced)
+            if self.metrics_service is not None:
+                await self.metrics_service.record_coalescing(coalesced)
+                await self.metrics_service.record_prediction_latency(
+                    getattr(request, "request_id", None), (time.perf_counter() - start) * 1000, "predict_selic", version
+                )
             
-            # Fazer previsão usando o modelo
-            prediction_result = await self._make_prediction(model, request, data)
+            return response
             
-            # Construir resposta
+        except ModelVersionNotFoundError:
+            raise
+        except Exception as e:
+            logger.error(f"Erro na previsão: {str(e)}", exc_info=True)
+            raise
+    
+    def _cache_key(self, request: PredictionRequest, version: str,
+                   next_meeting: Optional[np.datetime64] = None) -> str:
+        """
+        Chave da previsão (a mesma do cache), com a versão já resolvida
+        
+        A data do Fed só altera a resposta pelas próximas reuniões do Copom, então a
+        chave usa a próxima reunião: decisões na mesma janela entre reuniões
+        compartilham a entrada (e o aquecimento cobre a janela inteira).
+        """
+        if next_meeting is None:
+            next_meeting = self._next_copom_meetings([request])[0, 0]
+        return generate_cache_key(
+            request.fed_decision_date if np.isnat(next_meeting) else f"copom:{next_meeting}",
+            request.fed_move_bps,
+            request.horizons_months,
+            version,
+            fed_surprise_bps=request.fed_surprise_bps,
+            regime_hint=self._regime_key(request)
+        )
+    
+    async def _predict_cached(self, cache_key: str, request: PredictionRequest, version: str) -> PredictionResponse:
+        """Previsão do cache ou calculada pela tabela (e gravada no cache)"""
+        tracer = get_tracer()
+        if self.cache_service is not None:
+            try:
+                with tracer.span("cache_lookup") as span:
+                    cached = await self.cache_service.get_cached_prediction(cache_key)
+                    span.set_attribute("hit", cached is not None)
+                if self.metrics_service is not None:
+                    await self.metrics_service.record_cache_lookup(cached is not None)
+                if cached is not None:
+                    return PredictionResponse(**cached)
+            except CacheError as e:
+                logger.warning(f"Cache indisponível na leitura: {e.message}")
+        
+        # Obter tabela de resposta compilada na ativação do modelo
+        with tracer.span("model_fetch", model_version=version):
+            table = await self._get_response_table(version)
+        
+        # Fazer previsão usando a tabela
+        with tracer.span("prediction"):
+            prediction_result = self._make_prediction(table, request)
+        
+        # Construir resposta
+        with tracer.span("response_build"):
             response = self._build_response(prediction_result, request)
+        
+        if self.cache_service is not None:
+            try:
+                with tracer.span("cache_write"):
+                    await self.cache_service.cache_prediction(
+                        cache_key, response.model_dump(mode="json"), self.cache_service.default_ttl
+                    )
+            except CacheError as e:
+                logger.warning(f"Cache indisponível na escrita: {e.message}")
+        
+        return response
+    
+    async def precompute(self, requests: Sequence[PredictionRequest], version: str) -> Dict[str, int]:
+        """
+        Calcular e gravar no cache as previsões ausentes de um bloco de cenários
+        
+        Uma leitura (get_many) e uma escrita (set_many) por bloco; as entradas
+        são as mesmas que predict_selic gravaria. Retorna contagens de
+        previsões calculadas e já presentes no cache.
+        """
+        meetings = self._next_copom_meetings(requests)
+        keys = [self._cache_key(request, version, meeting_dates[0])
+                for request, meeting_dates in zip(requests, meetings)]
+        cached = await self.cache_service.get_many(keys)
+        
+        table = await self._get_response_table(version)
+        computed = {}
+        for key, request, hit, meeting_dates in zip(keys, requests, cached, meetings):
+            if hit is None and key not in computed:
+                response = self._build_response(self._make_prediction(table, request, meeting_dates), request)
+                computed[key] = response.model_dump(mode="json")
+        
+        await self.cache_service.set_many(computed, self.cache_service.default_ttl)
+        return {"computed": len(computed), "cached": len(keys) - len(computed)}
+    
+    async def predict_batch(self, scenarios: Sequence[PredictionRequest]) -> List[Union[PredictionResponse, Dict[str, Any]]]:
+        """
+        Prever um lote de cenários no executor limitado
+        
+        Retorna uma entrada por cenário, na ordem recebida: a previsão ou um
+        dicionário de erro ({"error", "details"}). Cenários idênticos sobre a
+        mesma versão e snapshot de dados (data_hash) são calculados uma vez.
+        """
+        start = time.perf_counter()
+        if self.metrics_service is not None:
+            await self.metrics_service.record_batch_size(len(scenarios))
+        results: List[Union[PredictionResponse, Dict[str, Any], None]] = [None] * len(scenarios)
+        tables: Dict[Optional[str], Union[ImpulseResponseTable, Dict[str, Any]]] = {}
+        unique: Dict[Tuple[str, Optional[str], str], List[int]] = {}
+        
+        for i, scenario in enumerate(scenarios):
+            validation_result = await self.validate_request(scenario)
+            if not validation_result["valid"]:
+                results[i] = {"error": validation_result["message"], "details": validation_result.get("details")}
+                continue
             
-            return response
+            # Resolver versão e tabela uma vez por model_version distinto do lote
+            if scenario.model_version not in tables:
+                try:
+                    version = await self.model_service.resolve_version(scenario.model_version)
+                    tables[scenario.model_version] = await self._get_response_table(version)
+                except Exception as e:
+                    tables[scenario.model_version] = self._batch_error(e)
             
+            table = tables[scenario.model_version]
+            if isinstance(table, dict):
+                results[i] = table
+                continue
+            
+            key = (table.version, table.data_hash, scenario.model_dump_json(exclude={"model_version"}))
+            unique.setdefault(key, []).append(i)
+        
+        keys = list(unique)
+        if self.batch_executor.kind == "process":
+            # Workers mantêm sua própria tabela por versão (arrays do registro via mmap)
+            items = [(key[0], scenarios[unique[key][0]].model_dump()) for key in keys]
+            worker = functools.partial(_predict_chunk_in_worker, self.settings.DATA_DIR)
+        else:
+            by_version = {table.version: table for table in tables.values() if not isinstance(table, dict)}
+            items = [(by_version[key[0]], scenarios[unique[key][0]]) for key in keys]
+            worker = self._predict_chunk
+        
+        predictions = await self.batch_executor.map_chunks(worker, items)
+        
+        for key, prediction in zip(keys, predictions):
+            for i in unique[key]:
+                results[i] = prediction
+        
+        if self.metrics_service is not None:
+            # Uma latência por lote, na versão do lote ("mixed" se houver mais de uma)
+            versions = {table.version for table in tables.values() if not isinstance(table, dict)}
+            await self.metrics_service.record_prediction_latency(
+                None, (time.perf_counter() - start) * 1000, "predict_batch",
+                versions.pop() if len(versions) == 1 else ("mixed" if versions else None)
+            )
+        
+        logger.debug(f"Lote de {len(scenarios)} cenários: {len(keys)} previsões distintas")
+        return results
+    
+    async def predict_many(self,
+                           fed_moves_bps: Sequence[int],
+                           surprises_bps: Optional[Sequence[int]] = None,
+                           regimes: Optional[Sequence[str]] = None,
+                           horizons: Optional[Sequence[int]] = None,
+                           model_version: Optional[str] = None) -> ScenarioPredictions:
+        """
+        Prever N cenários (movimento, surpresa, regime) em um único broadcast
+        
+        Os N choques efetivos passam juntos pelos coeficientes (LP) ou pela
+        resposta unitária e ruído simulados uma vez (BVAR); horizontes são
+        comuns a todos os cenários. Uma grade movimento x surpresa x regime de
+        1.000 cenários custa o mesmo que poucas previsões individuais.
+        """
+        try:
+            start = time.perf_counter()
+            moves = np.asarray(fed_moves_bps, dtype=int).ravel()
+            n = len(moves)
+            surprises = np.zeros(n, dtype=int) if surprises_bps is None else np.asarray(surprises_bps, dtype=int).ravel()
+            regime_names = np.full(n, "normal", dtype=object) if regimes is None else np.asarray(regimes, dtype=object).ravel()
+            horizons = np.unique(np.asarray([1, 3, 6, 12] if horizons is None else horizons, dtype=int))
+            self._validate_scenarios(moves, surprises, regime_names, horizons)
+            
+            version = await self.model_service.resolve_version(model_version)
+            table = await self._get_response_table(version)
+            
+            shocks = moves + surprises
+            mean, std = table.response_model.response_moments_many(shocks / 100, horizons)
+            scales = np.array([self._regime_scales[r] for r in regime_names], dtype=float)
+            std = std * scales[:, None]
+            
+            last_mean, last_std = mean[:, -1], std[:, -1]
+            distribution_bps, distribution_probs = self._discretize_distributions(last_mean, last_std)
+            
+            return ScenarioPredictions(
+                version=table.version,
+                model_type=table.model_type,
+                fed_moves_bps=moves,
+                surprises_bps=surprises,
+                shocks_bps=shocks,
+                regimes=regime_names,
+                horizons=horizons,
+                mean_bps=mean,
+                std_bps=std,
+                prob_move=self._prob_move(mean, std),
+                expected_move_bps=self._discretize_array(last_mean),
+                ci80_bps=self._normal_intervals(last_mean, last_std, 0.80),
+                ci95_bps=self._normal_intervals(last_mean, last_std, 0.95),
+                distribution_bps=distribution_bps,
+                distribution_probs=distribution_probs,
+                trained_at=table.trained_at,
+                data_hash=table.data_hash,
+                compute_time_ms=(time.perf_counter() - start) * 1000
+            )
+            
+        except (ModelVersionNotFoundError, ValidationError):
+            raise
         except Exception as e:
-            logger.error(f"Erro na previsão: {str(e)}", exc_info=True)
+            logger.error(f"Erro na previsão de múltiplos cenários: {str(e)}", exc_info=True)
             raise
     
+    def _validate_scenarios(self, moves: np.ndarray, surprises: np.ndarray,
+                            regimes: np.ndarray, horizons: np.ndarray) -> None:
+        """Validar arrays de cenários de predict_many"""
+        if len(moves) == 0:
+            raise ValidationError("Nenhum cenário informado", field="fed_moves_bps")
+        if len(surprises) != len(moves) or len(regimes) != len(moves):
+            raise ValidationError("fed_moves_bps, surprises_bps e regimes devem ter o mesmo tamanho",
+                                  field="surprises_bps", value=(len(moves), len(surprises), len(regimes)))
+        if np.any(moves % 25 != 0):
+            raise ValidationError("fed_moves_bps deve conter múltiplos de 25", field="fed_moves_bps")
+        unknown = set(regimes.tolist()) - set(self._regime_scales)
+        if unknown:
+            raise ValidationError(f"Regimes desconhecidos: {sorted(unknown)}", field="regimes")
+        if horizons[0] < self.settings.MIN_HORIZONS or horizons[-1] > self.settings.MAX_HORIZONS:
+            raise ValidationError(
+                f"horizons deve estar no intervalo [{self.settings.MIN_HORIZONS}, {self.settings.MAX_HORIZONS}]",
+                field="horizons", value=horizons.tolist()
+            )
+    
+    def _predict_chunk(self, items: Sequence[Tuple[ImpulseResponseTable, PredictionRequest]]) -> List[Union[PredictionResponse, Dict[str, Any]]]:
+        """Prever um bloco de cenários já resolvidos (executado em thread do pool)"""
+        predictions = []
+        meetings = self._next_copom_meetings([scenario for _, scenario in items])
+        for (table, scenario), meeting_dates in zip(items, meetings):
+            try:
+                predictions.append(self._build_response(self._make_prediction(table, scenario, meeting_dates), scenario))
+            except Exception as e:
+                logger.error(f"Erro na previsão em lote: {str(e)}", exc_info=True)
+                predictions.append(self._batch_error(e))
+        return predictions
+    
+    @staticmethod
+    def _batch_error(error: Exception) -> Dict[str, Any]:
+        """Erro por cenário no formato do endpoint de lote"""
+        message = error.message if isinstance(error, ModelVersionNotFoundError) else str(error)
+        return {"error": message, "details": {"exception_type": type(error).__name__}}
+    
+    async def preload_model(self, version: Optional[str] = None) -> ImpulseResponseTable:
+        """Carregar o modelo e compilar sua tabela antes do primeiro request"""
+        version = await self.model_service.resolve_version(version)
+        return await self._get_response_table(version)
+    
     async def _get_model(self, version: Optional[str] = None) -> Any:
-        """Obter modelo (com cache)"""
+        """Obter modelo do registro (com cache)"""
         version = version or self.settings.DEFAULT_MODEL_VERSION
         
         # Verificar cache
         if version in self._model_cache:
             return self._model_cache[version]
         
-        # Carregar modelo
-        model = await self.model_service.load_model(version)
+        # Carregar modelo; a versão padrão é treinada e registrada se ainda não existir
+        start = time.perf_counter()
+        try:
+            with get_tracer().span("model_load", model_version=version):
+                model = await self.model_service.load_model(version)
+            operation = "load"
+        except ModelVersionNotFoundError:
+            if version != self.settings.DEFAULT_MODEL_VERSION:
+                raise
+            model = await self._train_and_register(version)
+            operation = "train"
+        if self.metrics_service is not None:
+            await self.metrics_service.record_model_load(operation, version, (time.perf_counter() - start) * 1000)
         self._model_cache[version] = model
         
         # Limpar cache se necessário
@@ -138,110 +478,324 @@ class PredictionService:
             # Remover modelo mais antigo
             oldest_version = min(self._model_cache.keys())
             del self._model_cache[oldest_version]
+            self._response_tables.pop(oldest_version, None)
         
         return model
     
-    async def _make_prediction(self, model: Any, request: PredictionRequest, data: pd.DataFrame) -> Dict[str, Any]:
-        """Fazer previsão usando o modelo"""
-        # TODO: Implementar previsão real com LP/BVAR
-        # Por enquanto, retornar previsão simulada
+    async def _train_and_register(self, version: str) -> Any:
+        """Treinar o modelo de resposta nos dados atuais e registrá-lo"""
+        tracer = get_tracer()
+        with tracer.span("data_load"):
+            data = await self.data_service.get_prediction_data()
+        with tracer.span("model_train", model_version=version):
+            response_model = await self._select_response_model(data)
+        data_hash = hashlib.sha256(pd.util.hash_pandas_object(data, index=True).values.tobytes()).hexdigest()
         
-        fed_shock = request.fed_move_bps / 100  # Converter para decimal
+        activate = await self.model_service.get_active_model() is None
+        try:
+            await self.model_service.save_model(version, response_model, f"sha256:{data_hash}", activate=activate)
+        except ModelVersionExistsError:
+            # Outro worker publicou a versão primeiro: servir a versão registrada
+            logger.info(f"Versão {version} registrada por outro worker; carregando do registro")
         
-        # Simular resposta da Selic (placeholder)
-        expected_move = int(fed_shock * 100)  # Mesmo movimento em bps
+        # Servir a partir dos arrays memory-mapped, como os demais workers
+        return await self.model_service.load_model(version)
+    
+    async def _get_response_table(self, version: str) -> ImpulseResponseTable:
+        """Obter tabela de resposta da versão, compilando-a na primeira ativação"""
+        table = self._response_tables.get(version)
+        if table is not None:
+            return table
         
-        # Simular distribuição de probabilidade
-        distribution = self._simulate_distribution(fed_shock)
+        async with self._activation_lock:
+            if version not in self._response_tables:
+                await self.activate_response_model(version)
+            return self._response_tables[version]
+    
+    async def activate_response_model(self, version: str,
+                                      response_model: Optional[Any] = None) -> ImpulseResponseTable:
+        """Compilar a tabela (fed_move x horizonte x regime) do modelo de resposta da versão"""
+        try:
+            start = time.perf_counter()
+            if response_model is None:
+                response_model = await self._get_model(version)
+            compile_start = time.perf_counter()
+            with get_tracer().span("model_compile", model_version=version):
+                table = self._compile_response_table(version, response_model)
+            if self.metrics_service is not None:
+                await self.metrics_service.record_model_load(
+                    "compile", version, (time.perf_counter() - compile_start) * 1000
+                )
+            
+            model_version = await self.model_service.get_version(version)
+            if model_version is not None:
+                table.trained_at = model_version.trained_at
+                table.data_hash = model_version.data_hash
+            
+            table.build_time_ms = (time.perf_counter() - start) * 1000
+            self._response_tables[version] = table
+            
+            logger.info(
+                f"Tabela de resposta da versão {version} compilada: {table.n_cells} células "
+                f"({table.model_type}) em {table.build_time_ms:.1f}ms"
+            )
+            return table
+            
+        except ModelVersionNotFoundError:
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao ativar modelo de resposta {version}: {str(e)}", exc_info=True)
+            raise
+    
+    async def _select_response_model(self, data: pd.DataFrame) -> Any:
+        """Local Projections como modelo principal; BVAR quando a amostra não comporta as LPs"""
+        lp_model = LocalProjectionsModelService(**MODEL_CONFIG["local_projections"])
+        try:
+            await lp_model.train_model(data)
+            return lp_model
+        except (InsufficientDataError, ModelTrainingError) as e:
+            logger.warning(f"Local Projections indisponível, usando BVAR Minnesota: {str(e)}")
+            bvar_model = BVARMinnesotaModelService(**MODEL_CONFIG["bvar_minnesota"])
+            await bvar_model.train_model(data)
+            return bvar_model
+    
+    def _compile_response_table(self, version: str, response_model: Any) -> ImpulseResponseTable:
+        """Pré-computar a distribuição preditiva de todas as células da grade"""
+        step = self.settings.DISCRETIZATION_BPS
+        moves = np.arange(self.settings.MIN_FED_MOVE_BPS, self.settings.MAX_FED_MOVE_BPS + 1, step)
+        horizons = np.arange(self.settings.MIN_HORIZONS, self.settings.MAX_HORIZONS + 1)
+        regimes = tuple(self._regime_scales)
+        scales = np.array([self._regime_scales[r] for r in regimes])
+        
+        # Média e desvio por (movimento, horizonte); regime escala a incerteza
+        moments = [response_model.response_moments(move / 100, horizons) for move in moves]
+        mean = np.repeat(np.stack([m for m, _ in moments])[:, :, None], len(regimes), axis=2)
+        std = np.stack([s for _, s in moments])[:, :, None] * scales
+        
+        shape = mean.shape
+        ci80 = np.empty(shape + (2,), dtype=int)
+        ci95 = np.empty(shape + (2,), dtype=int)
+        distributions = np.empty(shape, dtype=object)
+        for idx in np.ndindex(shape):
+            ci80[idx] = self._normal_interval(mean[idx], std[idx], 0.80)
+            ci95[idx] = self._normal_interval(mean[idx], std[idx], 0.95)
+            distributions[idx] = self._discretize_distribution(mean[idx], std[idx])
+        
+        return ImpulseResponseTable(
+            version=version,
+            model_type=response_model.MODEL_TYPE,
+            fed_moves_bps=moves,
+            horizons=horizons,
+            regimes=regimes,
+            mean_bps=mean,
+            std_bps=std,
+            prob_move=self._prob_move(mean, std),
+            expected_move_bps=(np.round(mean / step) * step).astype(int),
+            ci80_bps=ci80,
+            ci95_bps=ci95,
+            distributions=distributions,
+            r_squared=self._model_r_squared(response_model, horizons),
+            n_observations=response_model.n_observations,
+            response_model=response_model
+        )
+    
+    def _make_prediction(self, table: ImpulseResponseTable, request: PredictionRequest,
+                         meeting_dates: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """
+        Fazer previsão por indexação da tabela (cálculo direto fora da grade)
         
-        # Simular previsões por reunião do Copom
-        per_meeting = self._simulate_copom_predictions(request)
+        meeting_dates: próximas reuniões do Copom já consultadas em lote
+        (_next_copom_meetings); sem elas, consulta o calendário para o request.
+        """
+        shock_bps = self._effective_shock_bps(request)
+        horizons = np.array(sorted(set(request.horizons_months or [1, 3, 6, 12])))
+        regime = self._regime_key(request)
         
-        # Simular intervalos de confiança
-        ci80, ci95 = self._simulate_confidence_intervals(expected_move)
+        move_idx = table.move_index(shock_bps)
+        regime_idx = table.regime_index(regime)
+        
+        if move_idx is not None and regime_idx is not None and table.covers(horizons):
+            cell = (move_idx, slice(None), regime_idx)
+            prob_move = table.prob_move[cell]
+            target = (move_idx, horizons[-1] - table.horizons[0], regime_idx)
+            expected_move = int(table.expected_move_bps[target])
+            ci80 = table.ci80_bps[target].tolist()
+            ci95 = table.ci95_bps[target].tolist()
+            distribution = table.distributions[target]
+            prob_offset = table.horizons[0]
+        else:
+            # Choque fora da grade (ex.: surpresa não múltipla de 25 bps)
+            eval_horizons = np.arange(1, horizons[-1] + 1)
+            mean, std = table.response_model.response_moments(shock_bps / 100, eval_horizons)
+            std = std * self._regime_scales.get(regime, 1.0)
+            prob_move = self._prob_move(mean, std)
+            expected_move = self._discretize(mean[-1])
+            ci80 = self._normal_interval(mean[-1], std[-1], 0.80)
+            ci95 = self._normal_interval(mean[-1], std[-1], 0.95)
+            distribution = self._discretize_distribution(mean[-1], std[-1])
+            prob_offset = 1
+        
+        # Horizontes com maior probabilidade de movimento
+        requested = prob_move[horizons - prob_offset]
+        top = horizons[np.argsort(-requested, kind="stable")[:2]]
+        horizon_range = "-".join(str(h) for h in sorted(top.tolist()))
+        
+        with get_tracer().span("simulation"):
+            per_meeting = self._simulate_copom_predictions(request, meeting_dates)
         
         return {
             "expected_move_bps": expected_move,
-            "horizon_months": "1-3",
-            "prob_move_within_next_copom": 0.62,
+            "horizon_months": horizon_range,
+            "prob_move_within_next_copom": round(float(prob_move[1 - prob_offset]), 3),
             "ci80_bps": ci80,
             "ci95_bps": ci95,
             "per_meeting": per_meeting,
             "distribution": distribution,
-            "rationale": f"Resposta estimada ao choque de {request.fed_move_bps} bps do Fed; maior massa de probabilidade no próximo Copom, alta incerteza devido à amostra curta."
+            "n_observations": table.n_observations,
+            "r_squared": float(table.r_squared[horizons[-1] - table.horizons[0]]),
+            "version": table.version,
+            "trained_at": table.trained_at,
+            "data_hash": table.data_hash,
+            "rationale": self._build_rationale(table, shock_bps, expected_move, int(horizons[-1]))
         }
     
-    def _simulate_distribution(self, fed_shock: float) -> List[DistributionPoint]:
-        """Simular distribuição de probabilidade"""
-        # Distribuição centrada no movimento esperado
-        expected_bps = int(fed_shock * 100)
-        
-        # Valores possíveis (múltiplos de 25 bps)
-        possible_values = list(range(-100, 101, 25))
-        
-        # Probabilidades (distribuição normal centrada no esperado)
-        probabilities = []
-        for value in possible_values:
-            prob = np.exp(-((value - expected_bps) ** 2) / (2 * 25 ** 2))
-            probabilities.append(prob)
-        
-        # Normalizar
-        total_prob = sum(probabilities)
-        probabilities = [p / total_prob for p in probabilities]
-        
-        # Criar pontos da distribuição
-        distribution = []
-        for value, prob in zip(possible_values, probabilities):
-            if prob > 0.01:  # Só incluir probabilidades > 1%
-                distribution.append(DistributionPoint(
-                    delta_bps=value,
-                    probability=round(prob, 3)
-                ))
-        
-        return distribution
-    
-    def _simulate_copom_predictions(self, request: PredictionRequest) -> List[CopomMeeting]:
-        """Simular previsões por reunião do Copom"""
-        # Datas simuladas de reuniões do Copom
-        copom_dates = [
-            "2025-02-05", "2025-03-19", "2025-05-07", "2025-06-18",
-            "2025-08-06", "2025-09-17", "2025-11-05", "2025-12-17"
-        ]
+    def _regime_key(self, request: PredictionRequest) -> str:
+        """Regime solicitado (normal por padrão)"""
+        regime = request.regime_hint
+        return regime.value if regime is not None else "normal"
+    
+    def _model_r_squared(self, response_model: Any, horizons: np.ndarray) -> np.ndarray:
+        """R² por horizonte: LP no próprio horizonte, BVAR na equação da Selic"""
+        if isinstance(response_model, BVARMinnesotaModelService):
+            r_squared = np.full(len(horizons), response_model.r_squared[response_model.VARIABLES.index("selic_change")])
+        else:
+            r_squared = response_model.r_squared[horizons - 1]
+        return np.clip(r_squared, 0.0, 1.0)
+    
+    def _build_rationale(self, table: ImpulseResponseTable, shock_bps: int, expected_move: int, horizon: int) -> str:
+        """Texto explicativo da previsão"""
+        if table.model_type == "bvar_minnesota":
+            return (
+                f"Resposta simulada por BVAR Minnesota ao choque de {shock_bps} bps do Fed: "
+                f"{expected_move} bps em {horizon} meses; intervalos refletem "
+                f"{table.response_model.n_simulations} draws da posterior e choques futuros."
+            )
+        return (
+            f"Resposta estimada por Local Projections ao choque de {shock_bps} bps do Fed: "
+            f"{expected_move} bps em {horizon} meses; "
+            f"intervalos refletem a incerteza dos coeficientes (HAC) e dos resíduos."
+        )
+    
+    def _effective_shock_bps(self, request: PredictionRequest) -> int:
+        """Choque efetivo: movimento do Fed mais componente surpresa (não antecipado)"""
+        return request.fed_move_bps + (request.fed_surprise_bps or 0)
+    
+    def _discretize(self, value: float) -> int:
+        """Discretizar para múltiplo de 25 bps"""
+        step = self.settings.DISCRETIZATION_BPS
+        return int(round(value / step) * step)
+    
+    def _prob_move(self, mean: np.ndarray, std: np.ndarray) -> np.ndarray:
+        """Probabilidade de |movimento| >= meio passo de discretização"""
+        half_step = self.settings.DISCRETIZATION_BPS / 2
+        std = np.maximum(std, 1e-9)
+        return ndtr((mean - half_step) / std) + ndtr((-half_step - mean) / std)
+    
+    def _discretize_distribution(self, mean: float, std: float) -> List[DistributionPoint]:
+        """Distribuição normal preditiva integrada em faixas de 25 bps"""
+        step = self.settings.DISCRETIZATION_BPS
+        std = max(std, 1e-9)
         
-        # Probabilidades simuladas
-        probabilities = [0.41, 0.21, 0.15, 0.10, 0.08, 0.03, 0.01, 0.01]
+        # Faixas cobrindo +-4 desvios-padrão
+        low = self._discretize(mean - 4 * std)
+        high = self._discretize(mean + 4 * std)
+        centers = np.arange(low, high + step, step)
+        edges = np.append(centers - step / 2, centers[-1] + step / 2)
         
-        per_meeting = []
-        for date, prob in zip(copom_dates[:4], probabilities[:4]):  # Primeiras 4 reuniões
-            per_meeting.append(CopomMeeting(
-                copom_date=date,
-                delta_bps=request.fed_move_bps,
-                probability=prob
-            ))
+        cdf = ndtr((edges - mean) / std)
+        cdf[0], cdf[-1] = 0.0, 1.0  # Caudas incorporadas nas faixas extremas
+        probabilities = np.diff(cdf)
         
-        return per_meeting
+        return [
+            DistributionPoint(delta_bps=int(value), probability=round(float(prob), 3))
+            for value, prob in zip(centers, probabilities)
+            if prob > 0.01  # Só incluir probabilidades > 1%
+        ]
     
-    def _simulate_confidence_intervals(self, expected_move: int) -> tuple:
-        """Simular intervalos de confiança"""
-        # Intervalos baseados no movimento esperado
-        margin_80 = 25
-        margin_95 = 50
+    def _discretize_array(self, values: np.ndarray) -> np.ndarray:
+        """Discretizar array para múltiplos de 25 bps"""
+        step = self.settings.DISCRETIZATION_BPS
+        return (np.round(values / step) * step).astype(int)
+    
+    def _discretize_distributions(self, mean: np.ndarray, std: np.ndarray) -> tuple:
+        """
+        Distribuições normais de N cenários integradas em faixas de 25 bps
+        
+        Cada cenário cobre sua própria janela de +-4 desvios-padrão, como na
+        previsão individual; as janelas são alinhadas em W colunas, e as faixas
+        além da janela de um cenário têm probabilidade zero. Retorna
+        (centros (N, W), probabilidades (N, W)).
+        """
+        step = self.settings.DISCRETIZATION_BPS
+        std = np.maximum(std, 1e-9)
         
-        ci80 = [max(-100, expected_move - margin_80), min(100, expected_move + margin_80)]
-        ci95 = [max(-100, expected_move - margin_95), min(100, expected_move + margin_95)]
+        low = self._discretize_array(mean - 4 * std)
+        n_bands = (self._discretize_array(mean + 4 * std) - low) // step + 1
+        offsets = np.arange(int(n_bands.max()) + 1)
         
-        return ci80, ci95
+        edges = low[:, None] + step * offsets - step / 2
+        cdf = (edges - mean[:, None]) / std[:, None]
+        ndtr(cdf, out=cdf)
+        # Caudas incorporadas nas faixas extremas de cada janela
+        cdf[:, 0] = 0.0
+        np.putmask(cdf, offsets >= n_bands[:, None], 1.0)
+        return edges[:, :-1] + step / 2, np.diff(cdf, axis=1)
+    
+    def _normal_intervals(self, mean: np.ndarray, std: np.ndarray, level: float) -> np.ndarray:
+        """Intervalos normais discretizados de N cenários: array (N, 2)"""
+        z = ndtri(0.5 + level / 2)
+        return np.stack([self._discretize_array(mean - z * std), self._discretize_array(mean + z * std)], axis=1)
+    
+    def _normal_interval(self, mean: float, std: float, level: float) -> List[int]:
+        """Intervalo de confiança normal discretizado em 25 bps"""
+        z = ndtri(0.5 + level / 2)
+        return [self._discretize(mean - z * std), self._discretize(mean + z * std)]
+    
+    def _next_copom_meetings(self, requests: Sequence[PredictionRequest]) -> np.ndarray:
+        """Próximas reuniões do Copom a partir da decisão do Fed de cada request (uma busca em lote)"""
+        if not requests:
+            return np.empty((0, len(COPOM_MEETING_PROBABILITIES)), dtype="datetime64[D]")
+        return self.copom_calendar.next_meetings(
+            [request.fed_decision_date for request in requests], len(COPOM_MEETING_PROBABILITIES)
+        )
+    
+    def _simulate_copom_predictions(self, request: PredictionRequest,
+                                    meeting_dates: Optional[np.ndarray] = None) -> List[CopomMeeting]:
+        """Simular previsões para as próximas reuniões do Copom após a decisão do Fed"""
+        if meeting_dates is None:
+            meeting_dates = self._next_copom_meetings([request])[0]
+        
+        # Probabilidades simuladas
+        return [
+            CopomMeeting(
+                copom_date=str(date),
+                delta_bps=request.fed_move_bps,
+                probability=prob
+            )
+            for date, prob in zip(meeting_dates, COPOM_MEETING_PROBABILITIES)
+            if not np.isnat(date)
+        ]
     
     def _build_response(self, prediction_result: Dict[str, Any], request: PredictionRequest) -> PredictionResponse:
         """Construir resposta da previsão"""
         # Metadados do modelo
         model_metadata = ModelMetadata(
-            version=request.model_version or self.settings.DEFAULT_MODEL_VERSION,
-            trained_at="2025-01-01T00:00:00Z",
-            data_hash="sha256:placeholder",
+            version=prediction_result.get("version") or request.model_version or self.settings.DEFAULT_MODEL_VERSION,
+            trained_at=prediction_result.get("trained_at") or "2025-01-01T00:00:00Z",
+            data_hash=prediction_result.get("data_hash") or "sha256:placeholder",
             methodology=self.settings.DEFAULT_METHODOLOGY,
-            n_observations=20,
-            r_squared=0.65
+            n_observations=prediction_result.get("n_observations", 20),
+            r_squared=prediction_result.get("r_squared", 0.65)
         )
         
         return PredictionResponse(
@@ -256,4 +810,33 @@ class PredictionService:
             rationale=prediction_result["rationale"],
             confidence_level="medium",
             limitations="Alta incerteza devido à amostra pequena (~20 observações)"
-        )
\ No newline at end of file
+        )
+
+# Serviço de previsão dos processos do pool de lotes (um por processo e DATA_DIR)
+_worker_services: Dict[str, PredictionService] = {}
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _predict_chunk_in_worker(data_dir: str, items: Sequence[Tuple[str, Dict[str, Any]]]) -> List[Union[PredictionResponse, Dict[str, Any]]]:
+    """Prever um bloco de cenários em um processo do pool (tabelas compiladas uma vez por processo)"""
+    global _worker_loop
+    if _worker_loop is None:
+        _worker_loop = asyncio.new_event_loop()
+    
+    service = _worker_services.get(data_dir)
+    if service is None:
+        get_settings().DATA_DIR = data_dir
+        service = PredictionService(batch_executor=BatchExecutor(kind="thread", max_workers=1))
+        _worker_services[data_dir] = service
+    
+    async def run() -> List[Union[PredictionResponse, Dict[str, Any]]]:
+        predictions = []
+        for version, payload in items:
+            try:
+                table = await service._get_response_table(version)
+            except Exception as e:
+                predictions.append(service._batch_error(e))
+                continue
+            predictions.extend(service._predict_chunk([(table, PredictionRequest(**payload))]))
+        return predictions
+    
+    return _worker_loop.run_until_complete(run())
@@ -3,14 +3,101 @@ Probability Engine - Single Responsibility Principle
 Engine responsável por conversão de previsões em probabilidades
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Sequence, Tuple, Union
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from src.core.interfaces import IProbabilityEngine
 from src.core.exceptions import ProbabilityEngineError
 from src.core.models import SelicPrediction, CopomMeeting, PredictionConfidence
+from src.services.copom_calendar import CopomCalendarService, DAYS_PER_MONTH
+from src.services.tracing import get_tracer
+
+# Calendário do Copom: DataFrame com coluna 'date', array datetime64 já ordenado (parse_calendar)
+# ou CopomCalendarService (datas indexadas uma vez)
+CopomCalendar = Union[pd.DataFrame, np.ndarray, CopomCalendarService, None]
+
+# Caminhos simulados: array (n_paths, n_horizons) ou iterável de blocos nesse formato
+Paths = Union[np.ndarray, Iterable[np.ndarray]]
+
+class MoveHistogram:
+    """
+    Histograma acumulado de caminhos da Selic em faixas de 25 bps
+    
+    Responsabilidades:
+    - Acumular contagens por horizonte e faixa, bloco a bloco
+    - Contar o horizonte do primeiro movimento de cada caminho
+    - Manter soma e soma dos quadrados para média e variância
+    
+    A memória é (n_horizons x n_faixas), independente do número de caminhos;
+    movimentos além de ±max_move_bps ficam na faixa extrema.
+    """
+    
+    def __init__(self, n_horizons: int, step: int = 25, max_move_bps: int = 2000):
+        self.step = step
+        self.max_move_bps = max_move_bps - max_move_bps % step
+        self.zero_bin = self.max_move_bps // step
+        self.n_bins = 2 * self.zero_bin + 1
+        self.counts = np.zeros((n_horizons, self.n_bins), dtype=np.int64)
+        self.first_move = np.zeros(n_horizons, dtype=np.int64)
+        self.total = np.zeros(n_horizons)
+        self.total_sq = np.zeros(n_horizons)
+        self.n_paths = 0
+    
+    @property
+    def n_horizons(self) -> int:
+        return self.counts.shape[0]
+    
+    def update(self, paths: np.ndarray) -> None:
+        """Acumular um bloco de caminhos (n_paths, n_horizons) em bps"""
+        paths = np.atleast_2d(np.asarray(paths, dtype=float))
+        if paths.shape[1] != self.n_horizons:
+            raise ValueError(f"caminhos com {paths.shape[1]} horizontes, esperado {self.n_horizons}")
+        
+        # Faixa de cada valor (arredondamento half-even); uma bincount para todos os horizontes
+        bins = np.rint(np.clip(paths, -self.max_move_bps, self.max_move_bps) / self.step).astype(np.int64) + self.zero_bin
+        offsets = np.arange(self.n_horizons) * self.n_bins
+        self.counts += np.bincount((bins + offsets).ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        
+        moved = bins != self.zero_bin
+        any_moved = moved.any(axis=1)
+        self.first_move += np.bincount(moved.argmax(axis=1)[any_moved], minlength=self.n_horizons)
+        
+        self.total += paths.sum(axis=0)
+        self.total_sq += np.square(paths).sum(axis=0)
+        self.n_paths += len(paths)
+    
+    def mean(self) -> np.ndarray:
+        """Média por horizonte (bps, sem discretizar)"""
+        return self.total / max(self.n_paths, 1)
+    
+    def variance(self) -> np.ndarray:
+        """Variância por horizonte (bps²)"""
+        mean = self.mean()
+        return np.maximum(self.total_sq / max(self.n_paths, 1) - mean ** 2, 0.0)
+    
+    def first_move_probabilities(self) -> np.ndarray:
+        """Probabilidade de o primeiro movimento (faixa diferente de zero) ocorrer em cada horizonte"""
+        return self.first_move / max(self.n_paths, 1)
+    
+    def quantiles(self, q: Sequence[float]) -> np.ndarray:
+        """Quantis por horizonte (inversa da distribuição acumulada): array (n_horizons, len(q)) em bps"""
+        cumulative = np.cumsum(self.counts, axis=1)
+        targets = np.asarray(q, dtype=float) * self.n_paths
+        idx = (cumulative[:, :, None] >= targets).argmax(axis=1)
+        return (idx - self.zero_bin) * self.step
+    
+    def distribution(self, horizon_index: int = -1) -> List[Dict[str, Any]]:
+        """Distribuição do horizonte: faixas de 25 bps presentes, em ordem"""
+        counts = self.counts[horizon_index]
+        present = np.flatnonzero(counts)
+        probabilities = np.round(counts[present] / max(self.n_paths, 1), 3)
+        
+        return [
+            {"delta_bps": int((i - self.zero_bin) * self.step), "probability": float(p)}
+            for i, p in zip(present, probabilities)
+        ]
 
 class ProbabilityEngineService(IProbabilityEngine):
     """
@@ -21,108 +108,177 @@ class ProbabilityEngineService(IProbabilityEngine):
     - Discretizar movimentos em 25 bps
     - Mapear para calendário do Copom
     - Calcular intervalos de confiança
+    
+    Opera sobre arrays: previsões pontuais por horizonte (convert_to_probabilities)
+    ou draws da posterior (n_draws x n_horizons, convert_draws) são discretizados,
+    contados em faixas de 25 bps (bincount) e resumidos por percentis em uma
+    passada. Caminhos simulados em grande número (convert_paths) são acumulados
+    em blocos num MoveHistogram, com memória limitada. As reuniões do Copom saem
+    de np.searchsorted sobre o calendário convertido uma vez para datetime64.
     """
     
     def __init__(self, 
                  discretization_step: int = 25,
-                 confidence_levels: List[float] = None):
+                 confidence_levels: List[float] = None,
+                 max_move_bps: int = 2000,
+                 chunk_size: int = 65536):
         self.discretization_step = discretization_step
         self.confidence_levels = confidence_levels or [0.8, 0.95]
+        self.max_move_bps = max_move_bps
+        self.chunk_size = chunk_size
     
     async def convert_to_probabilities(self, 
                                      forecasts: Dict[str, Any], 
-                                     copom_calendar: pd.DataFrame) -> SelicPrediction:
-        """Converter previsões em probabilidades"""
-        try:
-            # Processar previsões por horizonte
-            per_meeting = []
-            distribution_points = []
-            all_movements = []
+                                     copom_calendar: CopomCalendar,
+                                     reference_date: Optional[datetime] = None) -> SelicPrediction:
+        """Converter previsões pontuais por horizonte ({"horizon_<h>": {...}}) em probabilidades"""
+        with get_tracer().span("probability_conversion", method="forecasts"):
+            try:
+                horizons, point, lower, upper = self._forecast_arrays(forecasts)
+                intervals = np.stack([lower, upper], axis=1)
             
-            for horizon, forecast in forecasts.items():
-                if not isinstance(forecast, dict):
-                    continue
-                
-                # Obter previsão pontual e intervalos
-                point_forecast = forecast.get('point_forecast', 0)
-                ci_lower = forecast.get('ci_lower', point_forecast)
-                ci_upper = forecast.get('ci_upper', point_forecast)
-                
-                # Discretizar movimento
-                discretized_movement = self._discretize_movement(point_forecast)
-                all_movements.append(discretized_movement)
-                
-                # Calcular probabilidade para este horizonte
-                probability = self._calculate_horizon_probability(forecast)
-                
-                # Encontrar reunião do Copom correspondente
-                copom_meeting = self._find_copom_meeting(horizon, copom_calendar)
-                
-                if copom_meeting:
-                    per_meeting.append(CopomMeeting(
-                        date=copom_meeting['date'],
-                        expected_move_bps=discretized_movement,
-                        probability=probability,
-                        confidence_interval_80=(ci_lower, ci_upper),
-                        confidence_interval_95=(ci_lower, ci_upper)
-                    ))
+                # Cada horizonte contribui com um movimento discretizado para a distribuição
+                movements = self._discretize_array(point)
+                per_meeting = self._build_meetings(
+                    self.find_copom_meetings(horizons, copom_calendar, reference_date),
+                    movements,
+                    self._point_probabilities(point),
+                    intervals,
+                    intervals
+                )
+                distribution_points = await self.discretize_movements(movements)
             
-            # Criar distribuição de probabilidade
-            distribution_points = await self.discretize_movements(all_movements)
-            
-            # Calcular estatísticas gerais
-            expected_move = self._calculate_expected_move(distribution_points)
-            horizon_range = self._calculate_horizon_range(per_meeting)
-            prob_next_copom = self._calculate_prob_next_copom(per_meeting)
-            confidence_intervals = self._calculate_confidence_intervals(all_movements)
+                return self._build_prediction(
+                    distribution_points,
+                    per_meeting,
+                    self._calculate_confidence_intervals(movements),
+                    self._determine_confidence_level(forecasts),
+                    forecasts
+                )
+        
+            except Exception as e:
+                raise ProbabilityEngineError(f"Erro na conversão para probabilidades: {str(e)}")
+    
+    async def convert_draws(self,
+                            draws: np.ndarray,
+                            horizons: Sequence[int],
+                            copom_calendar: CopomCalendar,
+                            reference_date: Optional[datetime] = None) -> SelicPrediction:
+        """
+        Converter draws da variação acumulada da Selic (bps) em probabilidades
+        
+        draws: array (n_draws, n_horizons), ex.: BVARMinnesotaModelService.simulate_paths.
+        Por horizonte: movimento esperado, probabilidade de movimento (draw
+        discretizado diferente de zero) e intervalos por percentis; a distribuição
+        e os intervalos gerais são os do último horizonte.
+        """
+        with get_tracer().span("probability_conversion", method="draws"):
+            try:
+                draws = np.atleast_2d(np.asarray(draws, dtype=float))
+                horizons = np.asarray(horizons, dtype=int)
+                if draws.shape[1] != len(horizons):
+                    raise ValueError(f"draws com {draws.shape[1]} horizontes, esperado {len(horizons)}")
             
-            # Determinar nível de confiança
-            confidence_level = self._determine_confidence_level(forecasts)
+                moves = self._discretize_array(draws)
+                ci80, ci95 = self._percentile_intervals(draws)
+                per_meeting = self._build_meetings(
+                    self.find_copom_meetings(horizons, copom_calendar, reference_date),
+                    self._discretize_array(draws.mean(axis=0)),
+                    np.round((moves != 0).mean(axis=0), 3),
+                    ci80,
+                    ci95
+                )
             
-            # Criar rationale
-            rationale = self._generate_rationale(forecasts, expected_move, confidence_level)
+                return self._build_prediction(
+                    self._histogram(moves[:, -1]),
+                    per_meeting,
+                    {"ci80_bps": ci80[-1].tolist(), "ci95_bps": ci95[-1].tolist()},
+                    self._confidence_from_variance(float(np.var(draws[:, -1]))),
+                    {}
+                )
+        
+            except Exception as e:
+                raise ProbabilityEngineError(f"Erro na conversão de draws para probabilidades: {str(e)}")
+    
+    async def convert_paths(self,
+                            paths: Paths,
+                            horizons: Sequence[int],
+                            copom_calendar: CopomCalendar,
+                            reference_date: Optional[datetime] = None) -> SelicPrediction:
+        """
+        Converter caminhos simulados da variação acumulada da Selic (bps) em probabilidades
+        
+        paths: array (n_paths, n_horizons) ou iterável de blocos, ex.:
+        BVARMinnesotaModelService.iter_paths, acumulados sem materializar todos
+        os caminhos. Por horizonte: movimento esperado, probabilidade de o
+        primeiro movimento ocorrer nele e intervalos pelos quantis do
+        histograma; a distribuição e os intervalos gerais são os do último horizonte.
+        """
+        with get_tracer().span("probability_conversion", method="paths"):
+            try:
+                horizons = np.asarray(horizons, dtype=int)
+                histogram = MoveHistogram(len(horizons), self.discretization_step, self.max_move_bps)
+                for chunk in self._iter_chunks(paths):
+                    histogram.update(chunk)
+                if histogram.n_paths == 0:
+                    raise ValueError("nenhum caminho simulado")
             
-            return SelicPrediction(
-                expected_move_bps=expected_move,
-                horizon_months=horizon_range,
-                prob_move_within_next_copom=prob_next_copom,
-                confidence_level=confidence_level,
-                per_meeting=per_meeting,
-                distribution=distribution_points,
-                confidence_intervals=confidence_intervals,
-                rationale=rationale,
-                limitations="Alta incerteza devido à amostra pequena (~20 observações)"
-            )
+                q = histogram.quantiles([0.1, 0.9, 0.025, 0.975])
+                ci80, ci95 = q[:, :2], q[:, 2:]
+                per_meeting = self._build_meetings(
+                    self.find_copom_meetings(horizons, copom_calendar, reference_date),
+                    self._discretize_array(histogram.mean()),
+                    np.round(histogram.first_move_probabilities(), 3),
+                    ci80,
+                    ci95
+                )
             
-        except Exception as e:
-            raise ProbabilityEngineError(f"Erro na conversão para probabilidades: {str(e)}")
+                return self._build_prediction(
+                    histogram.distribution(-1),
+                    per_meeting,
+                    {"ci80_bps": ci80[-1].tolist(), "ci95_bps": ci95[-1].tolist()},
+                    self._confidence_from_variance(float(histogram.variance()[-1])),
+                    {}
+                )
+        
+            except Exception as e:
+                raise ProbabilityEngineError(f"Erro na conversão de caminhos para probabilidades: {str(e)}")
+    
+    def _iter_chunks(self, paths: Paths) -> Iterator[np.ndarray]:
+        """Blocos de até chunk_size caminhos (arrays são fatiados; iteráveis passam como estão)"""
+        if isinstance(paths, np.ndarray):
+            paths = np.atleast_2d(paths)
+            for start in range(0, len(paths), self.chunk_size):
+                yield paths[start:start + self.chunk_size]
+        else:
+            yield from paths
+    
+    def _build_prediction(self,
+                          distribution_points: List[Dict[str, Any]],
+                          per_meeting: List[CopomMeeting],
+                          confidence_intervals: Dict[str, List[int]],
+                          confidence_level: PredictionConfidence,
+                          forecasts: Dict[str, Any]) -> SelicPrediction:
+        """Estatísticas gerais e rationale a partir da distribuição e das reuniões"""
+        expected_move = self._calculate_expected_move(distribution_points)
+        
+        return SelicPrediction(
+            expected_move_bps=expected_move,
+            horizon_months=self._calculate_horizon_range(per_meeting),
+            prob_move_within_next_copom=self._calculate_prob_next_copom(per_meeting),
+            confidence_level=confidence_level,
+            per_meeting=per_meeting,
+            distribution=distribution_points,
+            confidence_intervals=confidence_intervals,
+            rationale=self._generate_rationale(forecasts, expected_move, confidence_level),
+            limitations="Alta incerteza devido à amostra pequena (~20 observações)"
+        )
     
-    async def discretize_movements(self, movements: List[float]) -> List[Dict[str, Any]]:
+    async def discretize_movements(self, movements: Sequence[float]) -> List[Dict[str, Any]]:
         """Discretizar movimentos em múltiplos de 25 bps"""
         try:
-            # Agrupar movimentos por valor discretizado
-            discretized_counts = {}
-            
-            for movement in movements:
-                discretized = self._discretize_movement(movement)
-                discretized_counts[discretized] = discretized_counts.get(discretized, 0) + 1
-            
-            # Calcular probabilidades
-            total_count = len(movements)
-            distribution = []
-            
-            for movement_bps, count in discretized_counts.items():
-                probability = count / total_count
-                distribution.append({
-                    "delta_bps": movement_bps,
-                    "probability": round(probability, 3)
-                })
-            
-            # Ordenar por movimento
-            distribution.sort(key=lambda x: x["delta_bps"])
-            
-            return distribution
-            
+            return self._histogram(self._discretize_array(np.asarray(movements, dtype=float).ravel()))
+        
         except Exception as e:
             raise ProbabilityEngineError(f"Erro na discretização: {str(e)}")
     
@@ -130,42 +286,110 @@ class ProbabilityEngineService(IProbabilityEngine):
         """Discretizar movimento para múltiplo de 25 bps"""
         return round(movement / self.discretization_step) * self.discretization_step
     
-    def _calculate_horizon_probability(self, forecast: Dict[str, Any]) -> float:
-        """Calcular probabilidade para horizonte específico"""
-        # Lógica simplificada baseada na magnitude da previsão
-        point_forecast = abs(forecast.get('point_forecast', 0))
+    def _discretize_array(self, movements: np.ndarray) -> np.ndarray:
+        """Discretizar array de movimentos (arredondamento half-even, como round)"""
+        return (np.rint(np.asarray(movements, dtype=float) / self.discretization_step) * self.discretization_step).astype(int)
+    
+    def _histogram(self, moves: np.ndarray) -> List[Dict[str, Any]]:
+        """Distribuição dos movimentos discretizados: faixas de 25 bps presentes, em ordem"""
+        if moves.size == 0:
+            return []
         
-        if point_forecast == 0:
-            return 0.1  # Baixa probabilidade para movimento zero
-        elif point_forecast <= 25:
-            return 0.3  # Probabilidade média para movimentos pequenos
-        elif point_forecast <= 50:
-            return 0.6  # Alta probabilidade para movimentos médios
-        else:
-            return 0.8  # Muito alta probabilidade para movimentos grandes
+        low = int(moves.min())
+        counts = np.bincount((moves - low) // self.discretization_step)
+        present = np.flatnonzero(counts)
+        probabilities = np.round(counts[present] / moves.size, 3)
+        
+        return [
+            {"delta_bps": int(low + i * self.discretization_step), "probability": float(p)}
+            for i, p in zip(present, probabilities)
+        ]
+    
+    def _forecast_arrays(self, forecasts: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Horizontes (-1 se a chave não segue horizon_<h>), previsão pontual e limites"""
+        items = [(key, f) for key, f in forecasts.items() if isinstance(f, dict)]
+        horizons = np.array([self._horizon_months(key) for key, _ in items], dtype=int)
+        point = np.array([f.get('point_forecast', 0) for _, f in items], dtype=float)
+        lower = np.array([f.get('ci_lower', p) for (_, f), p in zip(items, point)], dtype=float)
+        upper = np.array([f.get('ci_upper', p) for (_, f), p in zip(items, point)], dtype=float)
+        return horizons, point, lower, upper
     
-    def _find_copom_meeting(self, horizon: str, copom_calendar: pd.DataFrame) -> Optional[Dict[str, Any]]:
-        """Encontrar reunião do Copom para horizonte específico"""
+    @staticmethod
+    def _horizon_months(key: str) -> int:
+        """Meses do horizonte na chave horizon_<h>"""
         try:
-            horizon_months = int(horizon.split('_')[1])
-            
-            # Calcular data alvo
-            target_date = datetime.now() + timedelta(days=horizon_months * 30)
-            
-            # Encontrar reunião mais próxima
-            if not copom_calendar.empty and 'date' in copom_calendar.columns:
-                copom_dates = pd.to_datetime(copom_calendar['date'])
-                closest_meeting = copom_calendar.iloc[copom_dates.sub(target_date).abs().idxmin()]
-                
-                return {
-                    'date': closest_meeting['date'],
-                    'meeting_number': closest_meeting.get('meeting_number', 1)
-                }
+            return int(key.split('_')[1])
+        except (IndexError, ValueError):
+            return -1
+    
+    def _point_probabilities(self, point: np.ndarray) -> np.ndarray:
+        """Probabilidade por horizonte a partir da magnitude da previsão pontual"""
+        # Lógica simplificada baseada na magnitude da previsão
+        magnitude = np.abs(point)
+        return np.select(
+            [magnitude == 0, magnitude <= 25, magnitude <= 50],
+            [0.1, 0.3, 0.6],
+            default=0.8
+        )
+    
+    def _percentile_intervals(self, draws: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Intervalos 80% e 95% por horizonte, discretizados: arrays (n_horizons, 2)"""
+        q = np.percentile(draws, [10, 90, 2.5, 97.5], axis=0)
+        return self._discretize_array(q[:2].T), self._discretize_array(q[2:].T)
+    
+    def parse_calendar(self, copom_calendar: CopomCalendar) -> np.ndarray:
+        """Datas do calendário do Copom em datetime64[D] ordenado (converter uma vez e reutilizar)"""
+        if copom_calendar is None:
+            return np.array([], dtype="datetime64[D]")
+        if isinstance(copom_calendar, CopomCalendarService):
+            return copom_calendar.dates
+        if isinstance(copom_calendar, np.ndarray):
+            return np.sort(copom_calendar.astype("datetime64[D]"))
+        if copom_calendar.empty or 'date' not in copom_calendar.columns:
+            return np.array([], dtype="datetime64[D]")
+        return np.sort(pd.to_datetime(copom_calendar['date']).to_numpy().astype("datetime64[D]"))
+    
+    def find_copom_meetings(self,
+                            horizons: Sequence[int],
+                            copom_calendar: CopomCalendar,
+                            reference_date: Optional[datetime] = None) -> np.ndarray:
+        """Reunião mais próxima de cada horizonte (referência + DAYS_PER_MONTH dias por mês); NaT sem reunião"""
+        with get_tracer().span("copom_lookup"):
+            horizons = np.asarray(horizons, dtype=int)
+            calendar = self.parse_calendar(copom_calendar)
+            meetings = np.full(len(horizons), np.datetime64("NaT"), dtype="datetime64[D]")
+            valid = horizons >= 0
+            if len(calendar) == 0 or not valid.any():
+                return meetings
             
-            return None
+            reference = np.datetime64(reference_date or datetime.now(), "D")
+            targets = reference + (horizons[valid] * DAYS_PER_MONTH).astype("timedelta64[D]")
             
-        except Exception:
-            return None
+            # Vizinhas à esquerda e à direita do ponto de inserção; empate fica com a anterior
+            right = np.minimum(np.searchsorted(calendar, targets), len(calendar) - 1)
+            left = np.maximum(right - 1, 0)
+            closer_right = np.abs(calendar[right] - targets) < np.abs(targets - calendar[left])
+            meetings[valid] = calendar[np.where(closer_right, right, left)]
+            return meetings
+    
+    def _build_meetings(self,
+                        meeting_dates: np.ndarray,
+                        expected_moves: np.ndarray,
+                        probabilities: np.ndarray,
+                        ci80: np.ndarray,
+                        ci95: np.ndarray) -> List[CopomMeeting]:
+        """Uma CopomMeeting por horizonte com reunião encontrada"""
+        found = np.flatnonzero(~np.isnat(meeting_dates))
+        return [
+            CopomMeeting(
+                date=pd.Timestamp(meeting_dates[i]).to_pydatetime(),
+                expected_move_bps=int(expected_moves[i]),
+                probability=float(probabilities[i]),
+                confidence_interval_80=tuple(ci80[i].tolist()),
+                confidence_interval_95=tuple(ci95[i].tolist())
+            )
+            for i in found
+        ]
     
     def _calculate_expected_move(self, distribution: List[Dict[str, Any]]) -> int:
         """Calcular movimento esperado"""
@@ -197,23 +421,13 @@ class ProbabilityEngineService(IProbabilityEngine):
         next_meeting = min(per_meeting, key=lambda x: x.date)
         return next_meeting.probability
     
-    def _calculate_confidence_intervals(self, movements: List[float]) -> Dict[str, List[int]]:
+    def _calculate_confidence_intervals(self, movements: np.ndarray) -> Dict[str, List[int]]:
         """Calcular intervalos de confiança"""
-        if not movements:
+        if len(movements) == 0:
             return {"ci80_bps": [0, 0], "ci95_bps": [0, 0]}
         
-        movements_array = np.array(movements)
-        
-        # Calcular percentis
-        ci80_lower = np.percentile(movements_array, 10)
-        ci80_upper = np.percentile(movements_array, 90)
-        ci95_lower = np.percentile(movements_array, 2.5)
-        ci95_upper = np.percentile(movements_array, 97.5)
-        
-        return {
-            "ci80_bps": [self._discretize_movement(ci80_lower), self._discretize_movement(ci80_upper)],
-            "ci95_bps": [self._discretize_movement(ci95_lower), self._discretize_movement(ci95_upper)]
-        }
+        ci80, ci95 = self._percentile_intervals(np.asarray(movements, dtype=float)[:, None])
+        return {"ci80_bps": ci80[0].tolist(), "ci95_bps": ci95[0].tolist()}
     
     def _determine_confidence_level(self, forecasts: Dict[str, Any]) -> PredictionConfidence:
         """Determinar nível de confiança da previsão"""
@@ -227,8 +441,10 @@ class ProbabilityEngineService(IProbabilityEngine):
         if not predictions:
             return PredictionConfidence.LOW
         
-        variance = np.var(predictions)
-        
+        return self._confidence_from_variance(float(np.var(predictions)))
+    
+    def _confidence_from_variance(self, variance: float) -> PredictionConfidence:
+        """Nível de confiança pela variância (bps²) das previsões ou dos draws"""
         if variance < 100:  # Baixa variância
             return PredictionConfidence.HIGH
         elif variance < 400:  # Variância média
@@ -0,0 +1,72 @@
+"""
+Métricas Prometheus
+Histogramas e contadores exportados em /metrics, somados entre workers em modo multiprocesso
+"""
+
+import os
+from typing import Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+# Modo multiprocesso: cada worker grava seus valores em arquivos mmap neste
+# diretório (a variável precisa existir antes do import de prometheus_client)
+# e a exposição soma os arquivos de todos os workers do nó
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Latências em segundos: do cache L1 (sub-ms) à compilação da tabela
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MODEL_LOAD_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+PREDICTION_LATENCY = Histogram(
+    "selic_prediction_latency_seconds",
+    "Latência das previsões por endpoint e versão do modelo",
+    ["endpoint", "model_version"],
+    buckets=LATENCY_BUCKETS
+)
+SPAN_DURATION = Histogram(
+    "selic_span_duration_seconds",
+    "Duração das etapas do pipeline de previsão (spans do tracing)",
+    ["span"],
+    buckets=LATENCY_BUCKETS
+)
+CACHE_LOOKUPS = Counter(
+    "selic_prediction_cache_lookups_total",
+    "Leituras do cache de previsões por resultado (hit, miss)",
+    ["result"]
+)
+MODEL_LOAD_TIME = Histogram(
+    "selic_model_load_seconds",
+    "Tempo de carga (load), treino (train) e compilação da tabela (compile) do modelo",
+    ["operation", "model_version"],
+    buckets=MODEL_LOAD_BUCKETS
+)
+BATCH_SIZE = Histogram(
+    "selic_prediction_batch_size",
+    "Cenários por lote de previsões",
+    buckets=BATCH_SIZE_BUCKETS
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "selic_rate_limit_rejections_total",
+    "Requests rejeitados pelo rate limit por tier e janela",
+    ["tier", "window"]
+)
+
+def multiprocess_dir() -> Optional[str]:
+    """Diretório do modo multiprocesso (None em processo único)"""
+    return os.environ.get(MULTIPROC_ENV) or None
+
+def render_latest() -> Tuple[bytes, str]:
+    """Exposição em formato texto: do processo ou, em modo multiprocesso, de todos os workers"""
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Remover os arquivos de gauges vivos do worker ao encerrar (modo multiprocesso)"""
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(pid or os.getpid())
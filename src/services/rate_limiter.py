@@ -0,0 +1,168 @@
+"""
+Rate limiter GCRA particionado por chave
+Estado O(1) por chave, partições com lock próprio e remoção de chaves ociosas
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Janelas aplicadas a cada chave (segundos); limites requests_per_minute e requests_per_day do tier
+MINUTE_SECONDS = 60.0
+DAY_SECONDS = 86400.0
+
+# Folga de ponto flutuante na comparação com o fim da janela
+EPSILON = 1e-9
+
+class RateLimitConfig:
+    """Configuração de rate limiting"""
+
+    def __init__(self,
+                 key_tiers: Optional[Dict[str, str]] = None,
+                 default_tier: Optional[str] = None,
+                 anonymous_tier: str = "free"):
+        settings = get_settings()
+        self.limits = {
+            "free": {
+                "requests_per_minute": 10,
+                "requests_per_day": 100
+            },
+            "premium": {
+                "requests_per_minute": 100,
+                "requests_per_day": 1000
+            },
+            "enterprise": {
+                "requests_per_minute": 1000,
+                "requests_per_day": 10000
+            }
+        }
+        self.key_tiers = settings.RATE_LIMIT_KEY_TIERS if key_tiers is None else key_tiers
+        self.default_tier = default_tier or settings.RATE_LIMIT_DEFAULT_TIER
+        self.anonymous_tier = anonymous_tier
+
+    def get_tier_for_key(self, api_key: Optional[str]) -> str:
+        """Tier da chave: mapeamento explícito, anônimo sem chave, senão o tier padrão"""
+        if not api_key or api_key.startswith("anonymous"):
+            return self.anonymous_tier
+        return self.key_tiers.get(api_key, self.default_tier)
+
+    def get_limits_for_key(self, api_key: Optional[str]) -> Dict[str, int]:
+        """Obter limites para chave de API específica"""
+        return self.limits[self.get_tier_for_key(api_key)]
+
+class RateLimitDecision(NamedTuple):
+    """Resultado de uma verificação de rate limit"""
+    allowed: bool
+    limit: int                 # limite da janela mais restritiva
+    remaining: int             # requests ainda disponíveis nessa janela
+    reset_after: float         # segundos até a janela voltar ao limite cheio
+    retry_after: float         # segundos até o próximo request ser aceito (0 se aceito)
+    window: str                # janela mais restritiva (ou a que rejeitou)
+
+class _Shard:
+    """Partição de chaves com lock próprio"""
+    __slots__ = ("lock", "keys", "last_sweep")
+
+    def __init__(self, now: float):
+        self.lock = threading.Lock()
+        # chave -> [TAT por minuto, TAT por dia, intervalo por minuto, intervalo por dia, limite por minuto, limite por dia]
+        self.keys: Dict[str, list] = {}
+        self.last_sweep = now
+
+class ShardedRateLimiter:
+    """
+    Rate limiter GCRA (generic cell rate algorithm) por chave
+
+    Responsabilidades:
+    - Aplicar os limites por minuto e por dia do tier da chave (RateLimitConfig)
+    - Calcular restante, reset e retry-after para os headers
+    - Remover chaves ociosas
+
+    Cada chave guarda só o instante teórico de chegada (TAT) de cada janela:
+    um request é aceito se TAT + intervalo - agora não passa da janela, o que
+    equivale à janela deslizante com rajada do limite inteiro, em memória e
+    tempo O(1). As chaves ficam em n_shards partições com lock próprio; a
+    verificação não aguarda nada, então no event loop nunca disputa lock.
+    Uma chave cujo TAT já passou está com o limite cheio e é removida sem
+    mudar o comportamento; cada partição é varrida no máximo a cada
+    sweep_interval segundos.
+    """
+
+    def __init__(self,
+                 config: Optional[RateLimitConfig] = None,
+                 n_shards: int = 64,
+                 sweep_interval: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.config = config or RateLimitConfig()
+        self.n_shards = n_shards
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        now = clock()
+        self._shards = [_Shard(now) for _ in range(n_shards)]
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return sum(len(shard.keys) for shard in self._shards)
+
+    def check(self, key: str) -> RateLimitDecision:
+        """Registrar um request da chave se couber nas janelas por minuto e por dia"""
+        shard = self._shards[hash(key) % self.n_shards]
+
+        with shard.lock:
+            now = self.clock()
+            state = shard.keys.get(key)
+            if state is None:
+                limits = self.config.get_limits_for_key(key)
+                per_minute, per_day = limits["requests_per_minute"], limits["requests_per_day"]
+                state = [now, now, MINUTE_SECONDS / per_minute, DAY_SECONDS / per_day, per_minute, per_day]
+                shard.keys[key] = state
+            minute_tat, day_tat, minute_interval, day_interval, per_minute, per_day = state
+
+            # TAT de cada janela após este request e quanto passaria do fim da janela
+            new_minute_tat = (minute_tat if minute_tat > now else now) + minute_interval
+            new_day_tat = (day_tat if day_tat > now else now) + day_interval
+            minute_excess = new_minute_tat - now - MINUTE_SECONDS
+            day_excess = new_day_tat - now - DAY_SECONDS
+
+            if minute_excess <= EPSILON and day_excess <= EPSILON:
+                state[0] = minute_tat = new_minute_tat
+                state[1] = day_tat = new_day_tat
+                minute_remaining = int(-minute_excess / minute_interval + EPSILON)
+                day_remaining = int(-day_excess / day_interval + EPSILON)
+                if minute_remaining <= day_remaining:
+                    decision = RateLimitDecision(True, per_minute, minute_remaining, minute_tat - now, 0.0, "minute")
+                else:
+                    decision = RateLimitDecision(True, per_day, day_remaining, day_tat - now, 0.0, "day")
+            elif minute_excess >= day_excess:
+                decision = RateLimitDecision(False, per_minute, 0, minute_tat - now, minute_excess, "minute")
+            else:
+                decision = RateLimitDecision(False, per_day, 0, day_tat - now, day_excess, "day")
+
+            if now - shard.last_sweep >= self.sweep_interval:
+                self._sweep(shard, now)
+
+        return decision
+
+    def _sweep(self, shard: _Shard, now: float) -> int:
+        """Remover chaves da partição com todas as janelas cheias (lock já adquirido)"""
+        idle = [key for key, state in shard.keys.items() if state[0] <= now and state[1] <= now]
+        for key in idle:
+            del shard.keys[key]
+        shard.last_sweep = now
+        self.evicted += len(idle)
+        return len(idle)
+
+    def evict_idle(self) -> int:
+        """Varrer todas as partições agora; retorna chaves removidas"""
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                removed += self._sweep(shard, self.clock())
+        if removed:
+            logger.debug(f"Rate limiter: {removed} chaves ociosas removidas")
+        return removed
@@ -0,0 +1,106 @@
+"""
+Tabela pré-computada de resposta ao impulso para serving O(1)
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class ImpulseResponseTable:
+    """
+    Artefato compilado na ativação do modelo com a distribuição preditiva de
+    cada célula (fed_move_bps, horizonte, regime)
+
+    Arrays numéricos têm forma (n_moves, n_horizons, n_regimes); os intervalos
+    têm um eixo final [inferior, superior] e `distributions` guarda, por célula,
+    a lista de DistributionPoint já discretizada. Uma previsão sobre a grade é
+    apenas indexação destes arrays.
+    """
+
+    version: str
+    model_type: str
+    fed_moves_bps: np.ndarray
+    horizons: np.ndarray
+    regimes: Tuple[str, ...]
+    mean_bps: np.ndarray
+    std_bps: np.ndarray
+    prob_move: np.ndarray
+    expected_move_bps: np.ndarray
+    ci80_bps: np.ndarray
+    ci95_bps: np.ndarray
+    distributions: np.ndarray
+    r_squared: np.ndarray
+    n_observations: int
+    response_model: Any = None
+    trained_at: Optional[str] = None
+    data_hash: Optional[str] = None
+    build_time_ms: float = 0.0
+    built_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def step_bps(self) -> int:
+        """Passo da grade de movimentos do Fed"""
+        return int(self.fed_moves_bps[1] - self.fed_moves_bps[0]) if len(self.fed_moves_bps) > 1 else 1
+
+    @property
+    def n_cells(self) -> int:
+        """Número de células pré-computadas"""
+        return int(self.mean_bps.size)
+
+    def move_index(self, shock_bps: int) -> Optional[int]:
+        """Índice do choque na grade (None se fora da grade)"""
+        offset = shock_bps - int(self.fed_moves_bps[0])
+        index, remainder = divmod(offset, self.step_bps)
+        if remainder or not 0 <= index < len(self.fed_moves_bps):
+            return None
+        return index
+
+    def regime_index(self, regime: str) -> Optional[int]:
+        """Índice do regime (None se desconhecido)"""
+        try:
+            return self.regimes.index(regime)
+        except ValueError:
+            return None
+
+    def covers(self, horizons: np.ndarray) -> bool:
+        """Indica se os horizontes solicitados estão na tabela"""
+        return bool(horizons[0] >= self.horizons[0] and horizons[-1] <= self.horizons[-1])
+
+
+@dataclass
+class ScenarioPredictions:
+    """
+    Previsões de N cenários calculadas em um único broadcast (predict_many)
+    
+    Arrays por cenário têm N linhas; momentos e probabilidade de movimento têm
+    uma coluna por horizonte, e intervalos/distribuição referem-se ao último
+    horizonte, como na previsão individual. A distribuição discretizada de
+    cada cenário ocupa uma linha de `distribution_bps`/`distribution_probs`
+    (N, W): centro de cada faixa de 25 bps e sua probabilidade.
+    """
+
+    version: str
+    model_type: str
+    fed_moves_bps: np.ndarray
+    surprises_bps: np.ndarray
+    shocks_bps: np.ndarray
+    regimes: np.ndarray
+    horizons: np.ndarray
+    mean_bps: np.ndarray
+    std_bps: np.ndarray
+    prob_move: np.ndarray
+    expected_move_bps: np.ndarray
+    ci80_bps: np.ndarray
+    ci95_bps: np.ndarray
+    distribution_bps: np.ndarray
+    distribution_probs: np.ndarray
+    trained_at: Optional[str] = None
+    data_hash: Optional[str] = None
+    compute_time_ms: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.shocks_bps)
@@ -5,7 +5,7 @@ Serviço para gerenciar dados da Selic
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union, Tuple
+from typing import Any, Callable, Dict, List, Optional, Union, Tuple
 import os
 import json
 
@@ -13,6 +13,8 @@ from src.types.selic_types import (
     SelicData, SelicAccessor, SelicRateType, CopomMeeting, 
     CopomDecision, SelicCycle, SELIC_HISTORICAL_PERIODS
 )
+from src.services.dataset_cache import get_dataset_cache
+from src.services.columnar_snapshot import read_dataset
 
 class SelicService:
     """Serviço para gerenciar dados da Selic"""
@@ -23,39 +25,56 @@ class SelicService:
         self._accessor: Optional[SelicAccessor] = None
     
     def load_data(self) -> SelicData:
-        """Carregar dados da Selic"""
-        if self._data is not None:
-            return self._data
+        """Carregar dados da Selic (reorganizados apenas quando o arquivo muda)"""
+        data = self.get_derived("selic_data", self._build_selic_data)
         
-        print("🇧🇷 Carregando dados da Selic...")
+        if data is not self._data:
+            self._data = data
+            self._accessor = None
         
-        # Carregar dados combinados
-        combined_data = self._load_combined_data()
+        return self._data
+    
+    def _build_selic_data(self, combined_data: pd.DataFrame) -> SelicData:
+        """Organizar dados combinados em SelicData"""
+        print("🇧🇷 Carregando dados da Selic...")
         
-        # Organizar dados
-        self._data = self._organize_selic_data(combined_data)
+        data = self._organize_selic_data(combined_data)
         
-        print(f"✅ Dados da Selic carregados: {len(self._data.selic)} observações")
-        print(f"   Período: {self._data.selic.index[0].date()} a {self._data.selic.index[-1].date()}")
+        print(f"✅ Dados da Selic carregados: {len(data.selic)} observações")
+        print(f"   Período: {data.selic.index[0].date()} a {data.selic.index[-1].date()}")
         
-        return self._data
+        return data
     
     def get_accessor(self) -> SelicAccessor:
         """Obter interface de acesso aos dados"""
+        data = self.load_data()
         if self._accessor is None:
-            data = self.load_data()
             self._accessor = SelicAccessor(data)
         
         return self._accessor
     
+    @property
+    def combined_path(self) -> str:
+        """Caminho do CSV combinado Fed-Selic"""
+        return os.path.join(self.data_dir, "raw", "fed_selic_combined.csv")
+    
     def _load_combined_data(self) -> pd.DataFrame:
-        """Carregar dados combinados Fed-Selic"""
-        combined_path = os.path.join(self.data_dir, "raw", "fed_selic_combined.csv")
-        
-        if not os.path.exists(combined_path):
-            raise FileNotFoundError(f"Dados combinados não encontrados: {combined_path}")
-        
-        df = pd.read_csv(combined_path, index_col=0, parse_dates=True)
+        """Carregar dados combinados Fed-Selic (parse único por mudança do arquivo)"""
+        try:
+            return get_dataset_cache().load(self.combined_path, self._read_combined_data)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Dados combinados não encontrados: {self.combined_path}")
+    
+    def get_derived(self, name: str, builder: Callable[[pd.DataFrame], Any]) -> Any:
+        """Obter frame derivado dos dados combinados, memoizado junto ao dataset"""
+        try:
+            return get_dataset_cache().derive(self.combined_path, name, builder, self._read_combined_data)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Dados combinados não encontrados: {self.combined_path}")
+    
+    def _read_combined_data(self, path: str) -> pd.DataFrame:
+        """Ler dados combinados (snapshot colunar, com fallback para o CSV)"""
+        df = read_dataset(path)
         
         if 'selic' not in df.columns:
             raise ValueError("Coluna 'selic' não encontrada nos dados")
@@ -0,0 +1,58 @@
+"""
+Coalescência de chamadas concorrentes idênticas (single-flight)
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Uma computação em andamento por chave
+
+    Responsabilidades:
+    - Chamadas concorrentes com a mesma chave aguardam a mesma tarefa
+      (a primeira é a líder; as demais são coalescidas)
+    - Erros da líder são propagados a todas as chamadas da chave
+    - Cancelar uma chamada não cancela a computação compartilhada
+    - Nada é retido após a conclusão: chamadas seguintes recomputam (ou
+      encontram o resultado no cache)
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._stats = {"leaders": 0, "coalesced": 0, "errors": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Executar fn uma vez por chave em andamento; retorna (resultado, coalescida)"""
+        task = self._in_flight.get(key)
+        shared = task is not None
+        if shared:
+            self._stats["coalesced"] += 1
+        else:
+            self._stats["leaders"] += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+
+        # shield: o cancelamento de quem espera não interrompe os demais
+        return await asyncio.shield(task), shared
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        """Liberar a chave ao fim da tarefa"""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self._stats["errors"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de líderes, chamadas coalescidas e chaves em andamento"""
+        calls = self._stats["leaders"] + self._stats["coalesced"]
+        return {
+            **self._stats,
+            "in_flight": len(self._in_flight),
+            "coalesced_ratio": self._stats["coalesced"] / calls if calls else 0.0
+        }
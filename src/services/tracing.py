@@ -0,0 +1,279 @@
+"""
+Tracing leve por etapa
+Spans aninhados por contextvars, exportados em OTLP/JSON (OpenTelemetry) e resumidos por etapa
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import threading
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+SCOPE_NAME = "quantum-x.tracing"
+
+# Códigos de status do OTLP
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+class _Trace:
+    """Spans finalizados de um trace (compartilhado pelos spans filhos, inclusive em outras tasks)"""
+    __slots__ = ("trace_id", "sampled", "spans")
+
+    def __init__(self, trace_id: int, sampled: bool):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.spans: List["Span"] = []
+
+class Span:
+    """Etapa cronometrada de um trace (tempos em ns desde a época, como no OTLP)"""
+    __slots__ = ("name", "span_id", "parent", "trace", "start_ns", "end_ns", "attributes",
+                 "status", "status_message", "_tracer", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], trace: _Trace,
+                 attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.parent = parent
+        self.trace = trace
+        self.span_id = random.getrandbits(64) or 1
+        self.attributes = attributes
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        self.start_ns = 0
+        self.end_ns = 0
+        self._token = None
+
+    @property
+    def trace_id(self) -> str:
+        return f"{self.trace.trace_id:032x}"
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def update_name(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end_ns = time.time_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.status = STATUS_ERROR
+            self.status_message = f"{exc_type.__name__}: {exc}"
+        self._tracer._finish(self)
+
+class _NoopSpan:
+    """Span sem efeito (tracing desativado)"""
+    __slots__ = ()
+    trace_id = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def update_name(self, name: str) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def to_otlp(spans: Sequence[Span], service_name: str) -> Dict[str, Any]:
+    """Spans no formato OTLP/JSON (ExportTraceServiceRequest), aceito por coletores OpenTelemetry"""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{
+                "scope": {"name": SCOPE_NAME},
+                "spans": [
+                    {
+                        "traceId": span.trace_id,
+                        "spanId": f"{span.span_id:016x}",
+                        "parentSpanId": f"{span.parent.span_id:016x}" if span.parent is not None else "",
+                        "name": span.name,
+                        "kind": 2 if span.parent is None else 1,  # SERVER na raiz, INTERNAL nas etapas
+                        "startTimeUnixNano": str(span.start_ns),
+                        "endTimeUnixNano": str(span.end_ns),
+                        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+                        "status": {"code": span.status, "message": span.status_message}
+                        if span.status == STATUS_ERROR else {"code": span.status}
+                    }
+                    for span in spans
+                ]
+            }]
+        }]
+    }
+
+class InMemorySpanExporter:
+    """Coletor local: mantém os últimos max_traces traces exportados"""
+
+    def __init__(self, max_traces: int = 256):
+        self.traces: deque = deque(maxlen=max_traces)
+
+    def export(self, spans: List[Span]) -> None:
+        self.traces.append(spans)
+
+    def get_finished_spans(self) -> List[Span]:
+        return [span for trace in list(self.traces) for span in trace]
+
+    def clear(self) -> None:
+        self.traces.clear()
+
+    def shutdown(self) -> None:
+        pass
+
+class JsonFileSpanExporter:
+    """
+    Grava traces em arquivo OTLP/JSON, uma linha (ExportTraceServiceRequest) por lote
+
+    Os spans são acumulados e gravados a cada batch_size spans ou no
+    shutdown; o arquivo pode ser enviado a um coletor OpenTelemetry
+    (receptor OTLP/JSON) ou lido diretamente.
+    """
+
+    def __init__(self, path: str, service_name: str, batch_size: int = 256):
+        self.path = path
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self._buffer: List[Span] = []
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Span]) -> None:
+        with self._lock:
+            self._buffer.extend(spans)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        line = json.dumps(to_otlp(self._buffer, self.service_name), separators=(",", ":"))
+        self._buffer = []
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.warning(f"Falha ao gravar traces em {self.path}: {e}")
+
+    def shutdown(self) -> None:
+        self.flush()
+
+class Tracer:
+    """
+    Tracer de etapas do pipeline de previsão
+
+    Responsabilidades:
+    - Abrir spans aninhados (with tracer.span("etapa")), com o span atual em
+      contextvars: tasks criadas dentro de um span herdam o pai
+    - Entregar cada span finalizado aos listeners (ex.: MetricsService, que
+      resume a duração por etapa)
+    - Exportar o trace completo quando a raiz termina, para os traces
+      amostrados (sample_rate)
+
+    Desativado, span() devolve um span sem efeito.
+    """
+
+    def __init__(self,
+                 service_name: str = "quantum-x-api",
+                 exporters: Optional[Sequence[Any]] = None,
+                 sample_rate: float = 1.0,
+                 enabled: bool = True):
+        self.service_name = service_name
+        self.exporters = list(exporters or [])
+        self.sample_rate = sample_rate
+        self.enabled = enabled
+        self._listeners: List[Callable[[Span], None]] = []
+
+    def add_listener(self, listener: Callable[[Span], None]) -> None:
+        """Registrar função chamada com cada span finalizado"""
+        self._listeners.append(listener)
+
+    def span(self, name: str, **attributes: Any):
+        """Span filho do span atual (ou raiz de um novo trace)"""
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = _current_span.get()
+        if parent is not None:
+            trace = parent.trace
+        else:
+            trace = _Trace(random.getrandbits(128) or 1, random.random() < self.sample_rate)
+        return Span(self, name, parent, trace, attributes)
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    def _finish(self, span: Span) -> None:
+        for listener in self._listeners:
+            try:
+                listener(span)
+            except Exception as e:
+                logger.warning(f"Listener de spans falhou: {e}")
+
+        trace = span.trace
+        if not trace.sampled:
+            return
+        trace.spans.append(span)
+        if span.parent is None:
+            for exporter in self.exporters:
+                try:
+                    exporter.export(trace.spans)
+                except Exception as e:
+                    logger.warning(f"Exportação de spans falhou: {e}")
+
+    def shutdown(self) -> None:
+        """Gravar spans pendentes dos exportadores"""
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+    async def cleanup(self):
+        """Cleanup do tracer"""
+        self.shutdown()
+
+# Tracer global (substituído pelo configurado em ServiceFactory.create_tracer)
+_tracer = Tracer(enabled=False)
+
+def get_tracer() -> Tracer:
+    """Obter tracer da aplicação"""
+    return _tracer
+
+def set_tracer(tracer: Tracer) -> None:
+    """Definir tracer da aplicação"""
+    global _tracer
+    _tracer = tracer
@@ -0,0 +1,32 @@
+"""
+Pacote de benchmarks de performance para a API FED-Selic
+"""
+
+# Importar subpacotes
+from . import local_projections
+from . import bvar_minnesota
+from . import response_table
+from . import model_registry
+from . import service_container
+from . import dataset_cache
+from . import columnar_snapshot
+from . import batch_prediction
+from . import predict_many
+from . import memory_cache
+from . import cache_invalidation
+from . import async_redis
+from . import cache_codecs
+from . import single_flight
+from . import tiered_cache
+from . import cache_warmup
+from . import probability_engine
+from . import draw_distributions
+from . import copom_calendar
+from . import rate_limiter
+from . import latency_metrics
+from . import prometheus_metrics
+from . import tracing
+from . import async_logging
+from . import log_sampling
+
+__all__ = ["local_projections", "bvar_minnesota", "response_table", "model_registry", "service_container", "dataset_cache", "columnar_snapshot", "batch_prediction", "predict_many", "memory_cache", "cache_invalidation", "async_redis", "cache_codecs", "single_flight", "tiered_cache", "cache_warmup", "probability_engine", "draw_distributions", "copom_calendar", "rate_limiter", "latency_metrics", "prometheus_metrics", "tracing", "async_logging", "log_sampling"]
@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para o logging assíncrono (fila, escrita em lote e backpressure)
+"""
+
+from .test_async_logging import (
+    run_benchmark,
+    LegacyLoggingService,
+    SlowStream
+)
+
+__all__ = [
+    "run_benchmark",
+    "LegacyLoggingService",
+    "SlowStream"
+]
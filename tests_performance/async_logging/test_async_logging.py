@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do logging por request: LoggingService anterior (json.dumps e
+FileHandler síncronos no caminho do request, mais as duas linhas do
+RequestLoggingMiddleware) contra o pipeline assíncrono (QueueHandler não
+bloqueante, codificação orjson e escrita em lote numa thread de fundo).
+Mede o tempo de logging no caminho do request com arquivo local (requests
+espaçados, fila com folga) e, à parte, o backpressure com a fila padrão
+saturada por um laço sem pausa; com um destino lento (disco saturado),
+descartes nas políticas drop e block, perda de registros no encerramento e
+o custo dos codificadores JSON.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import logging
+import argparse
+import tempfile
+from datetime import datetime
+from typing import Dict, Any
+
+import numpy as np
+
+from src.core.config import get_settings
+from src.services.logging_service import LoggingService
+from src.services.log_pipeline import AsyncLogPipeline, BatchStreamHandler, JsonFormatter, json_encoder
+
+# ---------- Dados ----------
+def make_request(i: int) -> Dict[str, Any]:
+    return {"fed_decision_date": "2025-01-29", "fed_move_bps": 25 * (i % 4), "fed_move_dir": 1,
+            "horizons_months": [1, 3, 6, 12], "model_version": "v1.0.0", "regime_hint": None}
+
+def make_response(i: int) -> Dict[str, Any]:
+    return {"expected_move_bps": 25, "horizon_months": "1-3", "prob_move_within_next_copom": 0.41,
+            "model_metadata": {"version": "v1.0.0"}, "processing_time_ms": 1.8 + i % 7, "cache_hit": i % 3 == 0}
+
+class SlowStream:
+    """Destino com latência fixa por write (disco ou coletor saturado)"""
+
+    def __init__(self, delay_ms: float):
+        self.delay = delay_ms / 1000
+        self.lines = 0
+
+    def write(self, text: str) -> None:
+        time.sleep(self.delay)
+        self.lines += text.count("\n")
+
+    def flush(self) -> None:
+        pass
+
+class LegacyLoggingService:
+    """Cópia do caminho anterior: json.dumps e handler síncrono a cada registro"""
+
+    def __init__(self, handler: logging.Handler):
+        self.logger = logging.getLogger("bench_legacy")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.logger.addHandler(handler)
+        self.handler = handler
+
+    async def log_request(self, request_id: str, i: int) -> None:
+        self.logger.info(f"Request {request_id}: POST /predict/selic-from-fed from 127.0.0.1")
+        self.logger.info(json.dumps({"timestamp": datetime.now().isoformat(), "event_type": "prediction_request",
+                                     "request_id": request_id, "level": "INFO", "data": make_request(i)},
+                                    ensure_ascii=False))
+        self.logger.info(json.dumps({"timestamp": datetime.now().isoformat(), "event_type": "prediction_response",
+                                     "request_id": request_id, "level": "INFO", "data": make_response(i)},
+                                    ensure_ascii=False))
+        self.logger.info(f"Response {request_id}: 200 in 0.002s")
+
+    def close(self) -> None:
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+async def pipeline_request(service: LoggingService, request_id: str, i: int) -> None:
+    """Registros de um request no caminho novo: request, response e a linha do RequestLoggingMiddleware"""
+    await service.log_prediction_request(request_id, make_request(i))
+    await service.log_prediction_response(request_id, make_response(i))
+    service.logger.info({"timestamp": datetime.now().isoformat(), "event_type": "http_request",
+                         "request_id": request_id, "level": "INFO",
+                         "data": {"method": "POST", "path": "/predict/selic-from-fed", "client_ip": "127.0.0.1",
+                                  "status_code": 200, "processing_time_ms": 2.1}})
+
+# ---------- Benchmarks ----------
+async def timed_requests(log_request, n_requests: int, interval_us: float = 0.0) -> np.ndarray:
+    """µs de logging no caminho de cada request (interval_us: resto do request entre um e outro)"""
+    times = np.empty(n_requests)
+    for i in range(n_requests):
+        start = time.perf_counter()
+        await log_request(f"req-{i}", i)
+        times[i] = (time.perf_counter() - start) * 1e6
+        if interval_us:
+            await asyncio.sleep(interval_us / 1e6)
+    return times
+
+def summarize(times: np.ndarray) -> Dict[str, float]:
+    return {"mean_us": float(times.mean()), "p50_us": float(np.percentile(times, 50)),
+            "p99_us": float(np.percentile(times, 99)), "max_us": float(times.max())}
+
+def count_lines(path: str) -> int:
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for _ in f)
+
+async def pipeline_file_run(n_requests: int, path: str, queue_size: int, interval_us: float) -> Dict[str, Any]:
+    """Pipeline com arquivo local (policy=block): tempos por request e registros gravados após o stop"""
+    service = LoggingService(log_file=path, queue_size=queue_size, queue_policy="block",
+                             block_timeout_ms=1000.0, app_loggers=())
+    times = await timed_requests(lambda rid, i: pipeline_request(service, rid, i), n_requests, interval_us)
+    await service.cleanup()
+    stats = service.get_stats()
+
+    lines = count_lines(path)
+    return {**summarize(times), "queue_size": queue_size, "interval_us": interval_us, "records": lines,
+            "batches": stats["batches"], "dropped": stats["dropped"],
+            "no_loss": lines == 3 * n_requests and stats["dropped"] == 0}
+
+async def file_sink(n_requests: int, queue_size: int, interval_us: float, directory: str) -> Dict[str, Any]:
+    """
+    Arquivo local. Caminho do request: requests espaçados por interval_us, como num
+    worker real, e fila que comporta a rodada. Backpressure: laço sem pausa contra a
+    fila padrão, que satura e faz o request esperar o writer (policy=block)
+    """
+    legacy_path = os.path.join(directory, "legacy.log")
+    legacy = LegacyLoggingService(logging.FileHandler(legacy_path))
+    legacy_times = await timed_requests(legacy.log_request, n_requests, interval_us)
+    legacy.close()
+
+    return {
+        "legacy": summarize(legacy_times),
+        "legacy_records": count_lines(legacy_path),
+        "pipeline": await pipeline_file_run(n_requests, os.path.join(directory, "pipeline.log"),
+                                            3 * n_requests, interval_us),
+        "backpressure": await pipeline_file_run(n_requests, os.path.join(directory, "backpressure.log"),
+                                                queue_size, 0.0)
+    }
+
+async def slow_sink(n_requests: int, delay_ms: float, queue_size: int) -> Dict[str, Any]:
+    """Destino lento: legado espera cada write; pipeline drop descarta, block espera até o timeout"""
+    n_requests = min(n_requests, int(2000 / delay_ms))  # legado leva ~4 writes x delay por request
+    legacy = LegacyLoggingService(logging.StreamHandler(SlowStream(delay_ms)))
+    legacy_times = await timed_requests(legacy.log_request, n_requests)
+    legacy.close()
+
+    results = {"n_requests": n_requests, "delay_ms": delay_ms, "legacy": summarize(legacy_times)}
+    for policy in ("drop", "block"):
+        stream = SlowStream(delay_ms)
+        handler = BatchStreamHandler(stream)
+        handler.setFormatter(JsonFormatter())
+        pipeline = AsyncLogPipeline([handler], queue_size=queue_size, policy=policy,
+                                    block_timeout=delay_ms / 1000, batch_size=256)
+        target = logging.getLogger(f"bench_pipeline_{policy}")
+        target.setLevel(logging.INFO)
+        target.propagate = False
+        pipeline.attach(target)
+        pipeline.start()
+
+        async def log_request(request_id: str, i: int) -> None:
+            target.info({"event_type": "prediction_request", "request_id": request_id, "data": make_request(i)})
+            target.info({"event_type": "prediction_response", "request_id": request_id, "data": make_response(i)})
+            target.info({"event_type": "http_request", "request_id": request_id, "data": {"status_code": 200}})
+
+        times = await timed_requests(log_request, n_requests)
+        pipeline.stop()
+        stats = pipeline.get_stats()
+        results[policy] = {**summarize(times), "dropped": stats["dropped"], "written": stream.lines,
+                           "batches": stats["batches"], "consistent": stream.lines == stats["enqueued"]}
+    return results
+
+def encoder_cost(n_entries: int) -> Dict[str, float]:
+    """µs por entrada: json.dumps (anterior) contra o codificador do pipeline"""
+    entries = [{"timestamp": datetime.now().isoformat(), "event_type": "prediction_request",
+                "request_id": f"req-{i}", "level": "INFO", "data": make_request(i)} for i in range(n_entries)]
+    costs = {}
+    for name, encode in (("json", lambda e: json.dumps(e, ensure_ascii=False)), ("pipeline", json_encoder())):
+        start = time.perf_counter()
+        for entry in entries:
+            encode(entry)
+        costs[f"{name}_us"] = (time.perf_counter() - start) / n_entries * 1e6
+    return costs
+
+def run_benchmark(n_requests: int, delay_ms: float, queue_size: int,
+                  file_queue_size: int, interval_us: float) -> Dict[str, Any]:
+    directory = tempfile.mkdtemp(prefix="async_logging_")
+    try:
+        results = {
+            "file": asyncio.run(file_sink(n_requests, file_queue_size, interval_us, directory)),
+            "slow_sink": asyncio.run(slow_sink(n_requests, delay_ms, queue_size)),
+            "encoder": encoder_cost(n_requests)
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {"config": {"n_requests": n_requests, "delay_ms": delay_ms, "queue_size": queue_size,
+                       "file_queue_size": file_queue_size, "interval_us": interval_us},
+            "results": results}
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do logging assíncrono (fila, lote e backpressure)")
+    ap.add_argument("--n-requests", type=int, default=20000)
+    ap.add_argument("--delay-ms", type=float, default=2.0)
+    ap.add_argument("--queue-size", type=int, default=1000)
+    ap.add_argument("--file-queue-size", type=int, default=get_settings().LOG_QUEUE_SIZE)
+    ap.add_argument("--interval-us", type=float, default=500.0)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.n_requests, args.delay_ms, args.queue_size, args.file_queue_size, args.interval_us)
+
+    r = res["results"]
+    f, s, e = r["file"], r["slow_sink"], r["encoder"]
+    fp, bp = f["pipeline"], f["backpressure"]
+    print(f"[ASYNC LOGGING] arquivo local, {args.n_requests} requests a cada {args.interval_us:.0f}µs: "
+          f"síncrono {f['legacy']['mean_us']:.1f}µs (p99 {f['legacy']['p99_us']:.1f}µs), "
+          f"pipeline {fp['mean_us']:.1f}µs (p99 {fp['p99_us']:.1f}µs) por request")
+    print(f"[ASYNC LOGGING] pipeline: {fp['records']} registros em {fp['batches']} lotes, sem perda: {fp['no_loss']}")
+    print(f"[ASYNC LOGGING] backpressure (fila de {bp['queue_size']} saturada por laço sem pausa, block): "
+          f"{bp['mean_us']:.1f}µs (p99 {bp['p99_us']:.1f}µs) por request, sem perda: {bp['no_loss']}")
+    print(f"[ASYNC LOGGING] destino lento ({s['delay_ms']}ms por write, {s['n_requests']} requests): "
+          f"síncrono p99 {s['legacy']['p99_us']:.0f}µs")
+    for policy in ("drop", "block"):
+        p = s[policy]
+        print(f"[ASYNC LOGGING]   {policy}: p99 {p['p99_us']:.1f}µs, máx {p['max_us']:.0f}µs, "
+              f"{p['dropped']} descartados, {p['written']} gravados em {p['batches']} lotes")
+    print(f"[ASYNC LOGGING] codificação: json {e['json_us']:.2f}µs, pipeline {e['pipeline_us']:.2f}µs por entrada")
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "async_logging_results.json"))
+
+    failed = (not fp["no_loss"] or not bp["no_loss"]
+              or fp["mean_us"] >= f["legacy"]["mean_us"]
+              or s["drop"]["p99_us"] > 1000
+              or not s["drop"]["consistent"] or not s["block"]["consistent"])
+    if args.check_gate and failed:
+        print("[ASYNC LOGGING] FALHOU: perda no encerramento, pipeline mais lento que o síncrono "
+              "ou destino lento no caminho do request (p99 > 1ms com drop)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
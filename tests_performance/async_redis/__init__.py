@@ -0,0 +1,17 @@
+"""
+Pacote de benchmarks de performance para o cliente Redis assíncrono
+"""
+
+from .test_async_redis import (
+    run_benchmark,
+    bench_sync_client,
+    bench_async_service,
+    bench_get_many
+)
+
+__all__ = [
+    "run_benchmark",
+    "bench_sync_client",
+    "bench_async_service",
+    "bench_get_many"
+]
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do RedisCacheService assíncrono: atraso do event loop sob carga
+concorrente com o cliente síncrono chamado dentro de corrotinas
+(comportamento anterior) contra o cliente asyncio com pool compartilhado, e
+get_many (um MGET) contra N leituras sequenciais. O Redis local substituto é
+um servidor TCP do fakeredis em processo separado.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import multiprocessing as mp
+from typing import Dict, Any, List
+
+import numpy as np
+import redis
+
+from src.services.cache_service import RedisCacheService
+
+PAYLOAD = {"expected_move_bps": 25, "distribution": [{"delta_bps": d, "probability": 0.1} for d in range(-100, 125, 25)]}
+TICK_SECONDS = 0.001
+
+# ---------- Servidor ----------
+def _serve(port: int) -> None:
+    from fakeredis import TcpFakeServer
+    TcpFakeServer(("127.0.0.1", port), server_type="redis").serve_forever()
+
+def start_server() -> tuple:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    proc = mp.get_context("spawn").Process(target=_serve, args=(port,), daemon=True)
+    proc.start()
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            redis.Redis(port=port).ping()
+            return proc, f"redis://127.0.0.1:{port}"
+        except redis.ConnectionError:
+            time.sleep(0.05)
+    proc.terminate()
+    raise RuntimeError("servidor fakeredis não subiu")
+
+# ---------- Benchmarks ----------
+async def ticker(lags: List[float], stop: asyncio.Event) -> None:
+    # Atraso do event loop: quanto um sleep de 1ms passa do prazo
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+async def run_load(worker, concurrency: int) -> Dict[str, Any]:
+    lags: List[float] = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(0)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    wall_ms = (time.perf_counter() - start) * 1000
+    stop.set()
+    await tick
+    
+    lags_ms = np.array(lags or [0.0]) * 1000
+    return {
+        "wall_ms": wall_ms,
+        "ticks": len(lags),
+        "lag_p50_ms": float(np.percentile(lags_ms, 50)),
+        "lag_p99_ms": float(np.percentile(lags_ms, 99)),
+        "lag_max_ms": float(lags_ms.max())
+    }
+
+async def bench_sync_client(url: str, concurrency: int, ops: int) -> Dict[str, Any]:
+    # Comportamento anterior: redis.from_url síncrono dentro de async def
+    client = redis.from_url(url)
+    body = json.dumps(PAYLOAD)
+    
+    async def worker(i: int) -> None:
+        for j in range(ops):
+            key = f"prediction:v1.0.0:sync{i}-{j}"
+            client.setex(key, 3600, body)
+            json.loads(client.get(key))
+    
+    try:
+        return await run_load(worker, concurrency)
+    finally:
+        client.close()
+
+async def bench_async_service(url: str, concurrency: int, ops: int, max_connections: int) -> Dict[str, Any]:
+    # L1 desativado: toda operação vai ao Redis
+    service = RedisCacheService(redis_url=url, max_connections=max_connections, l1_max_entries=0)
+    
+    async def worker(i: int) -> None:
+        for j in range(ops):
+            key = f"prediction:v1.0.0:async{i}-{j}"
+            await service.cache_prediction(key, PAYLOAD, 3600)
+            await service.get_cached_prediction(key)
+    
+    try:
+        res = await run_load(worker, concurrency)
+        # fakeredis não implementa INFO; o backend é conferido pelo cliente conectado
+        res["backend"] = "redis" if service.redis_client is not None else "memory"
+        res["pool_max_connections"] = service._connection_pool.max_connections if service._connection_pool else None
+        return res
+    finally:
+        await service.cleanup()
+
+async def bench_get_many(url: str, batch_size: int, repeats: int) -> Dict[str, Any]:
+    service = RedisCacheService(redis_url=url, l1_max_entries=0)
+    try:
+        keys = [f"prediction:v2.0.0:batch{i}" for i in range(batch_size)]
+        await service.set_many({key: {**PAYLOAD, "i": i} for i, key in enumerate(keys)}, 3600)
+        
+        seq_ms, many_ms = [], []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            sequential = [await service.get_cached_prediction(key) for key in keys]
+            seq_ms.append((time.perf_counter() - start) * 1000)
+            
+            start = time.perf_counter()
+            batched = await service.get_many(keys)
+            many_ms.append((time.perf_counter() - start) * 1000)
+        
+        missing = await service.get_many([keys[0], "prediction:v2.0.0:ausente"])
+        return {
+            "sequential_ms": float(np.median(seq_ms)),
+            "get_many_ms": float(np.median(many_ms)),
+            "same_results": sequential == batched,
+            "missing_is_none": missing[0] is not None and missing[1] is None
+        }
+    finally:
+        await service.cleanup()
+
+def run_benchmark(concurrency: int, ops: int, batch_size: int, max_connections: int) -> Dict[str, Any]:
+    proc, url = start_server()
+    try:
+        return {
+            "config": {"concurrency": concurrency, "ops": ops, "batch_size": batch_size,
+                       "max_connections": max_connections},
+            "results": {
+                "sync_client": asyncio.run(bench_sync_client(url, concurrency, ops)),
+                "async_service": asyncio.run(bench_async_service(url, concurrency, ops, max_connections)),
+                "get_many": asyncio.run(bench_get_many(url, batch_size, repeats=5))
+            }
+        }
+    finally:
+        proc.terminate()
+        proc.join()
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do cliente Redis assíncrono (event loop e get_many)")
+    ap.add_argument("--concurrency", type=int, default=50)
+    ap.add_argument("--ops", type=int, default=20)
+    ap.add_argument("--batch-size", type=int, default=100)
+    ap.add_argument("--max-connections", type=int, default=20)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.concurrency, args.ops, args.batch_size, args.max_connections)
+    
+    s, a, g = res["results"]["sync_client"], res["results"]["async_service"], res["results"]["get_many"]
+    print(f"[ASYNC REDIS] {args.concurrency} corrotinas x {args.ops} set+get")
+    print(f"[ASYNC REDIS] cliente síncrono: atraso do loop p50 {s['lag_p50_ms']:.2f}ms, "
+          f"p99 {s['lag_p99_ms']:.2f}ms, máx {s['lag_max_ms']:.1f}ms ({s['ticks']} ticks, {s['wall_ms']:.0f}ms)")
+    print(f"[ASYNC REDIS] cliente asyncio ({a['backend']}): atraso do loop p50 {a['lag_p50_ms']:.2f}ms, "
+          f"p99 {a['lag_p99_ms']:.2f}ms, máx {a['lag_max_ms']:.1f}ms ({a['ticks']} ticks, {a['wall_ms']:.0f}ms)")
+    print(f"[ASYNC REDIS] {args.batch_size} chaves: sequencial {g['sequential_ms']:.1f}ms, "
+          f"get_many {g['get_many_ms']:.1f}ms ({g['sequential_ms'] / g['get_many_ms']:.1f}x), "
+          f"mesmos resultados: {g['same_results']}")
+    
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "async_redis_results.json"))
+    
+    if args.check_gate and (a["backend"] != "redis" or a["lag_max_ms"] >= s["lag_max_ms"]
+                            or g["get_many_ms"] >= g["sequential_ms"]
+                            or not g["same_results"] or not g["missing_is_none"]):
+        print("[ASYNC REDIS] FALHOU: cliente asyncio bloqueou o loop ou get_many não reduziu idas ao Redis")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
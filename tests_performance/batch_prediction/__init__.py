@@ -0,0 +1,17 @@
+"""
+Pacote de benchmarks de performance para previsões em lote
+"""
+
+from .test_batch_prediction import (
+    run_benchmark,
+    make_scenarios,
+    time_serial,
+    time_batch
+)
+
+__all__ = [
+    "run_benchmark",
+    "make_scenarios",
+    "time_serial",
+    "time_batch"
+]
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do lote de previsões: laço serial (validate_request + predict_selic
+por cenário, comportamento anterior do endpoint) contra PredictionService.predict_batch
+no executor limitado de threads e de processos, com cenários fora da grade
+(simulação BVAR por cenário) e duplicatas deduplicadas.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from typing import Dict, Any, List
+
+import numpy as np
+
+from config import MODEL_CONFIG
+from src.api.schemas import PredictionRequest, PredictionResponse
+from src.core.config import get_settings
+from src.services.batch_executor import BatchExecutor
+from src.services.model_service import ModelService, BVARMinnesotaModelService
+from src.services.prediction_service import PredictionService
+from tests_performance.synthetic_data import generate_prediction_data, write_data_dir
+
+VERSION = "bench-bvar"
+
+# ---------- Dados ----------
+def make_scenarios(n_scenarios: int, duplicate_share: float, seed: int) -> List[PredictionRequest]:
+    """Cenários fora da grade (surpresa não múltipla de 25 bps), com uma fração de duplicatas"""
+    rng = np.random.default_rng(seed)
+    n_unique = max(1, int(round(n_scenarios * (1 - duplicate_share))))
+    unique = [
+        PredictionRequest(
+            fed_decision_date="2025-10-29",
+            fed_move_bps=int(move),
+            fed_surprise_bps=int(surprise),
+            model_version=VERSION
+        )
+        for move, surprise in zip(rng.choice(np.arange(-100, 101, 25), n_unique),
+                                  rng.choice([s for s in range(-24, 25) if s % 25], n_unique))
+    ]
+    return unique + [unique[i] for i in rng.integers(0, n_unique, n_scenarios - n_unique)]
+
+async def register_bvar(T: int, seed: int) -> None:
+    model = BVARMinnesotaModelService(**{**MODEL_CONFIG["bvar_minnesota"], "seed": seed})
+    await model.train_model(generate_prediction_data(T=T, seed=seed))
+    await ModelService().save_model(VERSION, model, "sha256:bench", activate=True)
+
+# ---------- Benchmarks ----------
+async def time_serial(service: PredictionService, scenarios: List[PredictionRequest]) -> float:
+    start = time.perf_counter()
+    for scenario in scenarios:
+        if (await service.validate_request(scenario))["valid"]:
+            await service.predict_selic(scenario)
+    return (time.perf_counter() - start) * 1000
+
+async def time_batch(service: PredictionService, scenarios: List[PredictionRequest], n_runs: int) -> Dict[str, Any]:
+    results = await service.predict_batch(scenarios)  # aquecimento: workers e tabelas
+    timings = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        results = await service.predict_batch(scenarios)
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    # Ordem preservada: a justificativa cita o choque efetivo de cada cenário
+    ordered = all(
+        isinstance(r, PredictionResponse) and f"choque de {s.fed_move_bps + s.fed_surprise_bps} bps" in r.rationale
+        for s, r in zip(scenarios, results)
+    )
+    return {"p50_ms": float(np.percentile(timings, 50)), "ordered": ordered}
+
+async def run_all(scenarios: List[PredictionRequest], max_workers: int, n_runs: int) -> Dict[str, Any]:
+    serial_service = PredictionService(batch_executor=BatchExecutor("thread", 1))
+    await serial_service.preload_model(VERSION)
+    serial_ms = float(np.median([await time_serial(serial_service, scenarios) for _ in range(n_runs)]))
+    
+    results: Dict[str, Any] = {"serial_ms": serial_ms}
+    for kind in ("thread", "process"):
+        executor = BatchExecutor(kind, max_workers)
+        service = PredictionService(batch_executor=executor)
+        try:
+            batch = await time_batch(service, scenarios, n_runs)
+        finally:
+            await executor.cleanup()
+        batch["speedup"] = serial_ms / batch["p50_ms"]
+        results[kind] = batch
+    return results
+
+def run_benchmark(T: int, n_scenarios: int, duplicate_share: float, max_workers: int,
+                  n_runs: int, seed: int) -> Dict[str, Any]:
+    settings = get_settings()
+    original_data_dir = settings.DATA_DIR
+    scenarios = make_scenarios(n_scenarios, duplicate_share, seed)
+    
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_data_dir(data_dir, T=T, seed=seed)
+        settings.DATA_DIR = data_dir
+        try:
+            asyncio.run(register_bvar(T, seed))
+            results = asyncio.run(run_all(scenarios, max_workers, n_runs))
+        finally:
+            settings.DATA_DIR = original_data_dir
+    
+    return {
+        "config": {"T": T, "n_scenarios": n_scenarios, "duplicate_share": duplicate_share,
+                   "max_workers": max_workers, "cpu_count": os.cpu_count(), "n_runs": n_runs, "seed": seed},
+        "results": results
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark de previsões em lote no executor limitado")
+    ap.add_argument("--T", type=int, default=240)
+    ap.add_argument("--n-scenarios", type=int, default=get_settings().MAX_BATCH_SIZE)
+    ap.add_argument("--duplicate-share", type=float, default=0.2)
+    ap.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--n-runs", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--target-efficiency", type=float, default=0.7)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.T, args.n_scenarios, args.duplicate_share, args.max_workers, args.n_runs, args.seed)
+    
+    r = res["results"]
+    print(f"[BATCH] serial ({args.n_scenarios} cenários): {r['serial_ms']:.1f}ms")
+    for kind in ("thread", "process"):
+        print(f"[BATCH] {kind} ({args.max_workers} workers): p50 {r[kind]['p50_ms']:.1f}ms, "
+              f"speedup {r[kind]['speedup']:.2f}x, ordem preservada: {r[kind]['ordered']}")
+    
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "batch_prediction_results.json"))
+    
+    # Escala quase linear: speedup do pool de processos proporcional aos núcleos utilizáveis
+    usable = min(args.max_workers, os.cpu_count() or 1)
+    target = args.target_efficiency * usable
+    if args.check_gate and (not r["thread"]["ordered"] or not r["process"]["ordered"]
+                            or r["process"]["speedup"] < target):
+        print(f"[BATCH] FALHOU: ordem não preservada ou speedup abaixo de {target:.2f}x")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para o BVAR Minnesota
+"""
+
+from .test_bvar_minnesota import (
+    run_benchmark,
+    time_posterior_sampling,
+    time_path_simulation
+)
+
+__all__ = [
+    "run_benchmark",
+    "time_posterior_sampling",
+    "time_path_simulation"
+]
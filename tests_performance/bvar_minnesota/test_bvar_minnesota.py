@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do amostrador NIW em lote do BVAR Minnesota: draws da posterior
+(Bartlett) e simulação vetorizada de caminhos condicionais ao choque do Fed.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Dict, Any
+
+import numpy as np
+
+from config import MODEL_CONFIG
+from src.services.model_service import BVARMinnesotaModelService
+from tests_performance.synthetic_data import generate_prediction_data
+
+# ---------- Benchmarks ----------
+def build_model(data, n_simulations: int, seed: int) -> BVARMinnesotaModelService:
+    params = dict(MODEL_CONFIG["bvar_minnesota"], n_simulations=n_simulations, seed=seed)
+    model = BVARMinnesotaModelService(**params)
+    asyncio.run(model.train_model(data))
+    return model
+
+def time_posterior_sampling(model: BVARMinnesotaModelService, n_draws: int, n_runs: int) -> Dict[str, Any]:
+    timings = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        _, sigma_draws = model.sample_posterior(n_draws)
+        timings.append(time.perf_counter() - start)
+    
+    # Média da Inverse-Wishart: S / (nu - n - 1)
+    expected_sigma = model.S_post / (model.nu_post - model.n_vars - 1)
+    rel_error = np.abs(sigma_draws.mean(axis=0) - expected_sigma) / np.abs(expected_sigma).max()
+    
+    median = float(np.median(timings))
+    return {
+        "n_draws": n_draws,
+        "median_ms": median * 1000,
+        "draws_per_second": n_draws / median,
+        "max_rel_error_sigma_mean": float(rel_error.max())
+    }
+
+def time_path_simulation(model: BVARMinnesotaModelService, fed_shock: float, horizon: int,
+                         n_paths: int, n_runs: int, seed: int) -> Dict[str, Any]:
+    model.simulate_paths(fed_shock, horizon, n_paths=1000)  # aquecimento
+    
+    timings = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        paths = model.simulate_paths(fed_shock, horizon, n_paths=n_paths)
+        timings.append(time.perf_counter() - start)
+    
+    reproducible = np.array_equal(model.simulate_paths(fed_shock, horizon, n_paths=1000, seed=seed),
+                                  model.simulate_paths(fed_shock, horizon, n_paths=1000, seed=seed))
+    
+    median = float(np.median(timings))
+    return {
+        "n_paths": n_paths,
+        "horizon": horizon,
+        "median_ms": median * 1000,
+        "paths_per_second": n_paths / median,
+        "mean_path_bps": paths.mean(axis=0).tolist(),
+        "reproducible_with_seed": bool(reproducible)
+    }
+
+def run_benchmark(T: int, n_simulations: int, n_paths: int, horizon: int, fed_shock_bps: int,
+                  n_runs: int, seed: int) -> Dict[str, Any]:
+    data = generate_prediction_data(T=T, seed=seed)
+    model = build_model(data, n_simulations, seed)
+    
+    return {
+        "config": {"T": T, "n_simulations": n_simulations, "n_paths": n_paths, "horizon": horizon,
+                   "fed_shock_bps": fed_shock_bps, "n_runs": n_runs, "seed": seed},
+        "results": {
+            "posterior_sampling": time_posterior_sampling(model, n_paths, n_runs),
+            "path_simulation": time_path_simulation(model, fed_shock_bps / 100, horizon, n_paths, n_runs, seed)
+        }
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do amostrador em lote do BVAR Minnesota")
+    ap.add_argument("--T", type=int, default=240)
+    ap.add_argument("--n-simulations", type=int, default=MODEL_CONFIG["bvar_minnesota"]["n_simulations"])
+    ap.add_argument("--n-paths", type=int, default=100_000)
+    ap.add_argument("--horizon", type=int, default=12)
+    ap.add_argument("--fed-shock-bps", type=int, default=25)
+    ap.add_argument("--n-runs", type=int, default=10)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--target-paths-per-second", type=float, default=100_000)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.T, args.n_simulations, args.n_paths, args.horizon, args.fed_shock_bps,
+                        args.n_runs, args.seed)
+    
+    sampling = res["results"]["posterior_sampling"]
+    simulation = res["results"]["path_simulation"]
+    print(f"[BVAR] posterior: {sampling['n_draws']} draws em {sampling['median_ms']:.1f}ms "
+          f"({sampling['draws_per_second']:,.0f} draws/s, erro rel. média Sigma {sampling['max_rel_error_sigma_mean']:.2e})")
+    print(f"[BVAR] caminhos: {simulation['n_paths']} x {simulation['horizon']} em {simulation['median_ms']:.1f}ms "
+          f"({simulation['paths_per_second']:,.0f} caminhos/s, reprodutível: {simulation['reproducible_with_seed']})")
+    
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "bvar_minnesota_results.json"))
+    
+    if args.check_gate and (simulation["paths_per_second"] < args.target_paths_per_second
+                            or not simulation["reproducible_with_seed"]):
+        print(f"[BVAR] FALHOU: abaixo de {args.target_paths_per_second:,.0f} caminhos/s ou não reprodutível")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
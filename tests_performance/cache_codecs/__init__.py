@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para os codecs do cache de previsões
+"""
+
+from .test_cache_codecs import (
+    run_benchmark,
+    bench_codec,
+    make_payloads
+)
+
+__all__ = [
+    "run_benchmark",
+    "bench_codec",
+    "make_payloads"
+]
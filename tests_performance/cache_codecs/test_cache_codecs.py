@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark dos codecs do cache de previsões: json.dumps/json.loads
+(comportamento anterior) contra orjson, msgpack e o layout empacotado
+(distribution/per_meeting em float32), com e sem compressão, sobre
+PredictionResponse reais do PredictionService. Cada linha informa a fração
+das previsões efetivamente comprimidas (abaixo do limiar o corpo sai cru).
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from typing import Dict, Any, List
+
+import numpy as np
+
+from config import MODEL_CONFIG
+from src.api.schemas import PredictionRequest, PredictionResponse
+from src.core.config import get_settings
+from src.services.cache_codecs import CacheSerializer, FRAME_HEADER, COMPRESSION_IDS
+from src.services.model_service import ModelService, LocalProjectionsModelService
+from src.services.prediction_service import PredictionService
+from tests_performance.synthetic_data import generate_prediction_data, write_data_dir
+
+VERSION = "bench-lp"
+REGIMES = ["normal", "stress", "crisis", "recovery"]
+
+# (codec, compressão); json sem compressão é o formato anterior
+CONFIGS = [
+    ("json", "none"),
+    ("orjson", "none"),
+    ("msgpack", "none"),
+    ("packed", "none"),
+    ("orjson", "zlib"),
+    ("orjson", "zstd"),
+    ("packed", "zlib"),
+    ("packed", "zstd")
+]
+
+# ---------- Dados ----------
+async def make_payloads(T: int, seed: int) -> List[Dict[str, Any]]:
+    """Previsões reais (modelo LP em dados sintéticos), como o endpoint as cacheia"""
+    lp = LocalProjectionsModelService(**MODEL_CONFIG["local_projections"])
+    await lp.train_model(generate_prediction_data(T=T, seed=seed))
+    await ModelService().save_model(VERSION, lp, "sha256:bench", activate=True)
+    
+    service = PredictionService()
+    payloads = []
+    for move in range(-100, 101, 25):
+        for surprise in (0, 7, -13):
+            for regime in REGIMES:
+                response = await service.predict_selic(PredictionRequest(
+                    fed_decision_date="2025-10-29",
+                    fed_move_bps=move,
+                    fed_surprise_bps=surprise,
+                    regime_hint=regime,
+                    model_version=VERSION
+                ))
+                payloads.append(response.model_dump(mode="json"))
+    return payloads
+
+# ---------- Benchmarks ----------
+def bench_codec(payloads: List[Dict[str, Any]], codec: str, compression: str,
+                compress_min_bytes: int, n_runs: int) -> Dict[str, Any]:
+    serializer = CacheSerializer(codec=codec, compression=compression, compress_min_bytes=compress_min_bytes)
+    
+    encode, decode = [], []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        blobs = [serializer.dumps(p) for p in payloads]
+        encode.append((time.perf_counter() - start) / len(payloads) * 1e6)
+        
+        start = time.perf_counter()
+        decoded = [serializer.loads(b) for b in blobs]
+        decode.append((time.perf_counter() - start) / len(payloads) * 1e6)
+    
+    return {
+        # Codec efetivo (msgpack/zstd ausentes caem para orjson/zlib)
+        "codec": serializer.codec,
+        "compression": serializer.compression,
+        "mean_bytes": float(np.mean([len(b) for b in blobs])),
+        "compressed_fraction": float(np.mean([
+            FRAME_HEADER.unpack_from(b)[2] != COMPRESSION_IDS["none"] for b in blobs
+        ])),
+        "encode_us": float(np.median(encode)),
+        "decode_us": float(np.median(decode)),
+        "roundtrip_exact": decoded == payloads,
+        "valid_responses": all(PredictionResponse(**d) == PredictionResponse(**p) for d, p in zip(decoded, payloads))
+    }
+
+def run_benchmark(T: int, compress_min_bytes: int, n_runs: int, seed: int) -> Dict[str, Any]:
+    settings = get_settings()
+    original_data_dir = settings.DATA_DIR
+    
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_data_dir(data_dir, T=T, seed=seed)
+        settings.DATA_DIR = data_dir
+        try:
+            payloads = asyncio.run(make_payloads(T, seed))
+        finally:
+            settings.DATA_DIR = original_data_dir
+    
+    results = {
+        f"{codec}+{compression}": bench_codec(payloads, codec, compression, compress_min_bytes, n_runs)
+        for codec, compression in CONFIGS
+    }
+    return {
+        "config": {"T": T, "compress_min_bytes": compress_min_bytes,
+                   "default": f"{settings.CACHE_CODEC}+{settings.CACHE_COMPRESSION}", "n_runs": n_runs, "seed": seed,
+                   "n_payloads": len(payloads),
+                   "mean_distribution_points": float(np.mean([len(p["distribution"]) for p in payloads]))},
+        "results": results
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Micro-benchmark dos codecs do cache de previsões")
+    ap.add_argument("--T", type=int, default=240)
+    ap.add_argument("--compress-min-bytes", type=int, default=get_settings().CACHE_COMPRESS_MIN_BYTES)
+    ap.add_argument("--n-runs", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.T, args.compress_min_bytes, args.n_runs, args.seed)
+    
+    cfg = res["config"]
+    print(f"[CACHE CODECS] {cfg['n_payloads']} previsões, {cfg['mean_distribution_points']:.1f} pontos de distribuição em média")
+    baseline = res["results"]["json+none"]
+    for name, r in res["results"].items():
+        print(f"[CACHE CODECS] {name:<14} ({r['codec']}+{r['compression']}): {r['mean_bytes']:.0f} bytes "
+              f"({r['mean_bytes'] / baseline['mean_bytes']:.0%}), comprimidas {r['compressed_fraction']:.0%}, "
+              f"encode {r['encode_us']:.1f}us, decode {r['decode_us']:.1f}us, "
+              f"ida e volta exata: {r['roundtrip_exact']}")
+    
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "cache_codecs_results.json"))
+    
+    # Padrão: o menor em bytes entre as linhas, com compressão efetivamente aplicada, e
+    # nenhuma outra configuração menor e mais barata em CPU ao mesmo tempo
+    default = res["results"][cfg["default"]]
+    cpu = lambda r: r["encode_us"] + r["decode_us"]
+    not_compressed = [name for name, r in res["results"].items()
+                      if r["compression"] != "none" and r["compressed_fraction"] == 0]
+    dominated_by = [name for name, r in res["results"].items()
+                    if r["mean_bytes"] < default["mean_bytes"] and cpu(r) < cpu(default)]
+    if not_compressed:
+        print(f"[CACHE CODECS] linhas com compressão configurada mas não aplicada: {', '.join(not_compressed)}")
+    if dominated_by:
+        print(f"[CACHE CODECS] padrão ({cfg['default']}) superado em bytes e CPU por: {', '.join(dominated_by)}")
+    if args.check_gate and (not all(r["roundtrip_exact"] and r["valid_responses"] for r in res["results"].values())
+                            or default["compressed_fraction"] < 1.0
+                            or not_compressed or dominated_by
+                            or default["mean_bytes"] >= baseline["mean_bytes"]):
+        print("[CACHE CODECS] FALHOU: codec padrão sem compressão, superado por outro codec ou alterou a previsão")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
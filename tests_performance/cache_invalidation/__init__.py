@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para a invalidação de cache por versão
+"""
+
+from .test_cache_invalidation import (
+    run_benchmark,
+    bench_redis,
+    bench_memory
+)
+
+__all__ = [
+    "run_benchmark",
+    "bench_redis",
+    "bench_memory"
+]
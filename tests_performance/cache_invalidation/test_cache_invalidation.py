@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark da invalidação de cache por versão: varredura KEYS do keyspace
+(comportamento anterior) contra o índice de chaves por versão do
+RedisCacheService, sobre um Redis local substituto (fakeredis) e sobre o
+cache em memória.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Dict, Any
+
+import fakeredis
+
+from src.services.cache_service import RedisCacheService
+
+PAYLOAD = {"expected_move_bps": 25, "distribution": [{"delta_bps": 0, "probability": 0.5}]}
+
+# ---------- Benchmarks ----------
+async def populate(service: RedisCacheService, n_versions: int, keys_per_version: int) -> None:
+    for v in range(n_versions):
+        for i in range(keys_per_version):
+            key = service.generate_cache_key("2025-10-29", 25 * (i % 17 - 8), [1, 3, 6, i % 12 + 1], f"v{v}.0.0")
+            await service.cache_prediction(f"{key[:-8]}{i:08d}", PAYLOAD, 3600)
+
+async def count_version_keys(client: fakeredis.FakeAsyncRedis, version: str) -> int:
+    return len([key async for key in client.scan_iter(match=f"prediction:{version}:*", count=10000)])
+
+async def bench_redis(n_versions: int, keys_per_version: int, noise_keys: int) -> Dict[str, Any]:
+    client = fakeredis.FakeAsyncRedis()
+    service = RedisCacheService(redis_client=client)
+    await populate(service, n_versions, keys_per_version)
+    
+    # Demais chaves do Redis (rate limiting, sessões) que a varredura também percorre
+    async with client.pipeline(transaction=False) as pipe:
+        for i in range(noise_keys):
+            pipe.set(f"ratelimit:{i}", 1)
+        await pipe.execute()
+    keyspace = await client.dbsize()
+    
+    # Comportamento anterior: KEYS sobre todo o keyspace
+    start = time.perf_counter()
+    keys = await client.keys("prediction:v0.0.0:*")
+    if keys:
+        await client.delete(*keys)
+    keys_scan_ms = (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    removed = await service.invalidate_model_cache("v1.0.0")
+    index_ms = (time.perf_counter() - start) * 1000
+    
+    return {
+        "keyspace": keyspace,
+        "keys_scan_ms": keys_scan_ms,
+        "index_ms": index_ms,
+        "removed": removed,
+        "remaining_invalidated": await count_version_keys(client, "v1.0.0"),
+        "remaining_other": await count_version_keys(client, "v2.0.0"),
+        "index_removed": not await client.exists("prediction:index:v1.0.0")
+    }
+
+async def bench_memory(n_versions: int, keys_per_version: int) -> Dict[str, Any]:
+    service = RedisCacheService(redis_url="redis://127.0.0.1:1", memory_max_entries=n_versions * keys_per_version)
+    await populate(service, n_versions, keys_per_version)
+    
+    start = time.perf_counter()
+    removed = await service.invalidate_model_cache("v1.0.0")
+    index_ms = (time.perf_counter() - start) * 1000
+    
+    stats = await service.get_cache_stats()
+    return {"index_ms": index_ms, "removed": removed, "total_keys": stats["total_keys"]}
+
+def run_benchmark(n_versions: int, keys_per_version: int, noise_keys: int) -> Dict[str, Any]:
+    return {
+        "config": {"n_versions": n_versions, "keys_per_version": keys_per_version, "noise_keys": noise_keys},
+        "results": {
+            "redis": asyncio.run(bench_redis(n_versions, keys_per_version, noise_keys)),
+            "memory": asyncio.run(bench_memory(n_versions, keys_per_version))
+        }
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark da invalidação de cache indexada por versão")
+    ap.add_argument("--n-versions", type=int, default=5)
+    ap.add_argument("--keys-per-version", type=int, default=2000)
+    ap.add_argument("--noise-keys", type=int, default=50000)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.n_versions, args.keys_per_version, args.noise_keys)
+    
+    r, m = res["results"]["redis"], res["results"]["memory"]
+    print(f"[CACHE INVALIDATION] redis ({r['keyspace']} chaves): KEYS {r['keys_scan_ms']:.1f}ms, "
+          f"índice {r['index_ms']:.1f}ms ({r['removed']} chaves removidas)")
+    print(f"[CACHE INVALIDATION] redis: restantes da versão {r['remaining_invalidated']}, "
+          f"outra versão intacta {r['remaining_other']}")
+    print(f"[CACHE INVALIDATION] memória: índice {m['index_ms']:.1f}ms ({m['removed']} chaves removidas, "
+          f"{m['total_keys']} restantes)")
+    
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "cache_invalidation_results.json"))
+    
+    expected_other = (args.n_versions - 1) * args.keys_per_version
+    if args.check_gate and (r["removed"] != args.keys_per_version or r["remaining_invalidated"] != 0
+                            or r["remaining_other"] != args.keys_per_version or not r["index_removed"]
+                            or m["removed"] != args.keys_per_version or m["total_keys"] != expected_other):
+        print("[CACHE INVALIDATION] FALHOU: invalidação removeu chaves erradas ou deixou chaves da versão")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
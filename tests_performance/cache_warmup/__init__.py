@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para o aquecimento do cache na ativação do modelo
+"""
+
+from .test_cache_warmup import (
+    run_benchmark,
+    run_scenario,
+    make_burst
+)
+
+__all__ = [
+    "run_benchmark",
+    "run_scenario",
+    "make_burst"
+]
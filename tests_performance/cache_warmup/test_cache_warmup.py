@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do aquecimento do cache na ativação: rajada pós-FOMC sobre a grade
+canônica (movimentos x regimes) com o cache frio (comportamento anterior)
+contra o cache aquecido pelo CacheWarmupService, com a duração do
+aquecimento, o atraso do event loop enquanto ele roda e o número máximo de
+blocos simultâneos. O aquecimento usa as datas padrão (próximas janelas do
+Copom) e a rajada traz a data do FOMC, diferente de qualquer data da grade.
+Cache fakeredis.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from datetime import date
+from typing import Dict, Any, List
+
+import fakeredis
+import numpy as np
+
+from src.api.schemas import PredictionRequest
+from src.core.config import get_settings
+from src.services.cache_service import RedisCacheService
+from src.services.cache_warmup import CacheWarmupService
+from src.services.prediction_service import PredictionService
+from tests_performance.synthetic_data import write_data_dir
+
+TICK_SECONDS = 0.001
+
+# ---------- Dados ----------
+def fomc_date(service: PredictionService) -> str:
+    """Data do FOMC na segunda janela do Copom: véspera da segunda reunião a partir de hoje"""
+    meetings = service.copom_calendar.next_meetings(date.today(), 2)[0]
+    return str(meetings[1] - np.timedelta64(1, "D"))
+
+def make_burst(grid: List[PredictionRequest], fed_date: str, n_requests: int, seed: int) -> List[PredictionRequest]:
+    """Requests da rajada sorteados da grade, na data do FOMC (sem horizons_months: os horizontes padrão)"""
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(grid), size=n_requests)
+    return [
+        PredictionRequest(fed_decision_date=fed_date, fed_move_bps=grid[i].fed_move_bps,
+                          regime_hint=grid[i].regime_hint)
+        for i in picks
+    ]
+
+def instrument(service: PredictionService) -> Dict[str, int]:
+    """Contar computações do modelo e blocos simultâneos do aquecimento"""
+    counts = {"computations": 0, "in_flight": 0, "max_in_flight": 0}
+    make_prediction, precompute = service._make_prediction, service.precompute
+
+    def counted_make_prediction(*args, **kwargs):
+        counts["computations"] += 1
+        return make_prediction(*args, **kwargs)
+
+    async def counted_precompute(*args, **kwargs):
+        counts["in_flight"] += 1
+        counts["max_in_flight"] = max(counts["max_in_flight"], counts["in_flight"])
+        try:
+            return await precompute(*args, **kwargs)
+        finally:
+            counts["in_flight"] -= 1
+
+    service._make_prediction = counted_make_prediction
+    service.precompute = counted_precompute
+    return counts
+
+# ---------- Benchmarks ----------
+async def ticker(lags: List[float], stop: asyncio.Event) -> None:
+    # Atraso do event loop: quanto um sleep de 1ms passa do prazo
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+async def run_burst(service: PredictionService, burst: List[PredictionRequest], concurrency: int) -> Dict[str, Any]:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def call(request: PredictionRequest) -> float:
+        async with slots:
+            start = time.perf_counter()
+            await service.predict_selic(request)
+            return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(call(request) for request in burst))
+    return {
+        "wall_ms": (time.perf_counter() - start) * 1000,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99))
+    }
+
+async def run_scenario(warm: bool, n_requests: int, concurrency: int,
+                       warmup_concurrency: int, chunk_size: int, seed: int) -> Dict[str, Any]:
+    service = PredictionService(cache_service=RedisCacheService(redis_client=fakeredis.FakeAsyncRedis()))
+    warmup = CacheWarmupService(service, concurrency=warmup_concurrency, chunk_size=chunk_size, copom_windows=2)
+    # Versão recém-ativada: tabela de resposta ainda não compilada neste worker
+    version = await service.model_service.resolve_version()
+    grid = await warmup.build_grid(version)
+    burst_date = fomc_date(service)
+    counts = instrument(service)
+
+    result: Dict[str, Any] = {"grid_size": len(grid), "grid_dates": sorted({r.fed_decision_date for r in grid}),
+                              "burst_fed_date": burst_date}
+    if warm:
+        lags: List[float] = []
+        stop = asyncio.Event()
+        tick = asyncio.create_task(ticker(lags, stop))
+        await warmup.start(version)
+        await warmup.wait()
+        stop.set()
+        await tick
+        status = warmup.get_status(version)
+        result["warmup"] = {
+            "status": status["status"],
+            "duration_ms": status["duration_ms"],
+            "computed": status["computed"],
+            "failed": status["failed"],
+            "max_in_flight": counts["max_in_flight"],
+            "loop_lag_max_ms": float(max(lags or [0.0]) * 1000)
+        }
+        counts["computations"] = 0
+
+    result["burst"] = await run_burst(service, make_burst(grid, burst_date, n_requests, seed), concurrency)
+    result["burst"]["computations"] = counts["computations"]
+    await warmup.cleanup()
+    await service.cache_service.cleanup()
+    return result
+
+def run_benchmark(n_requests: int, concurrency: int, warmup_concurrency: int,
+                  chunk_size: int, T: int, seed: int) -> Dict[str, Any]:
+    settings = get_settings()
+    original_data_dir = settings.DATA_DIR
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_data_dir(data_dir, T=T, seed=seed)
+        settings.DATA_DIR = data_dir
+        try:
+            async def run() -> Dict[str, Any]:
+                args = (n_requests, concurrency, warmup_concurrency, chunk_size, seed)
+                return {
+                    "cold": await run_scenario(False, *args),
+                    "warm": await run_scenario(True, *args)
+                }
+            results = asyncio.run(run())
+        finally:
+            settings.DATA_DIR = original_data_dir
+
+    return {
+        "config": {"n_requests": n_requests, "concurrency": concurrency, "warmup_concurrency": warmup_concurrency,
+                   "chunk_size": chunk_size, "T": T, "seed": seed},
+        "results": results
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do aquecimento do cache na ativação do modelo")
+    ap.add_argument("--n-requests", type=int, default=500)
+    ap.add_argument("--concurrency", type=int, default=100)
+    ap.add_argument("--warmup-concurrency", type=int, default=4)
+    ap.add_argument("--chunk-size", type=int, default=32)
+    ap.add_argument("--T", type=int, default=240)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.n_requests, args.concurrency, args.warmup_concurrency,
+                        args.chunk_size, args.T, args.seed)
+
+    cold, warm = res["results"]["cold"], res["results"]["warm"]
+    w = warm["warmup"]
+    print(f"[CACHE WARMUP] grade canônica: {warm['grid_size']} cenários; rajada de {args.n_requests} requests "
+          f"({args.concurrency} simultâneos)")
+    print(f"[CACHE WARMUP] datas aquecidas (padrão): {', '.join(warm['grid_dates'])}; "
+          f"data da rajada (FOMC): {warm['burst_fed_date']}")
+    print(f"[CACHE WARMUP] aquecimento: {w['status']} em {w['duration_ms']:.0f}ms, {w['computed']} calculadas, "
+          f"máx {w['max_in_flight']} blocos simultâneos, atraso máx do loop {w['loop_lag_max_ms']:.1f}ms")
+    for label, r in (("cache frio", cold), ("cache aquecido", warm)):
+        b = r["burst"]
+        print(f"[CACHE WARMUP] {label}: p50 {b['p50_ms']:.1f}ms, p99 {b['p99_ms']:.1f}ms, "
+              f"{b['computations']} computações, rajada {b['wall_ms']:.0f}ms")
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "cache_warmup_results.json"))
+
+    if args.check_gate and (w["status"] != "completed" or w["computed"] != warm["grid_size"]
+                            or w["max_in_flight"] > args.warmup_concurrency
+                            or warm["burst_fed_date"] in warm["grid_dates"]
+                            or warm["burst"]["computations"] != 0
+                            or warm["burst"]["p99_ms"] >= cold["burst"]["p99_ms"]):
+        print("[CACHE WARMUP] FALHOU: aquecimento incompleto, concorrência excedida ou rajada ainda calculando")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para o snapshot colunar dos datasets
+"""
+
+from .test_columnar_snapshot import (
+    run_benchmark,
+    bench_dataset,
+    generate_fed_detailed
+)
+
+__all__ = [
+    "run_benchmark",
+    "bench_dataset",
+    "generate_fed_detailed"
+]
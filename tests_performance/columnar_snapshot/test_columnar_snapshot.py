@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do snapshot colunar: cold start dos datasets brutos lendo o CSV
+(parse de texto e de datas) contra o bundle .npy gerado pelos scripts de download.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from typing import Dict, Any, List
+
+import numpy as np
+import pandas as pd
+
+from src.services.columnar_snapshot import read_dataset, write_snapshot
+from tests_performance.synthetic_data import generate_fed_selic
+
+# ---------- Dados ----------
+FED_DETAILED_COLUMNS = ["fedfunds", "dff", "dgs1mo", "dgs3mo", "dgs6mo", "dgs1", "dgs2",
+                        "dgs3", "dgs5", "dgs7", "dgs10", "dgs20", "dgs30"]
+
+def generate_fed_detailed(n_days: int, seed: int) -> pd.DataFrame:
+    """Gerar DataFrame diário no formato de data/raw/fed_detailed_data.csv"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("1990-01-01", periods=n_days, freq="D", name="date")
+    walks = 3.0 + np.cumsum(rng.normal(0.0, 0.02, (n_days, len(FED_DETAILED_COLUMNS))), axis=0)
+    return pd.DataFrame(walks, index=index, columns=FED_DETAILED_COLUMNS)
+
+# ---------- Benchmarks ----------
+def time_reader(reader, path: str, n_runs: int) -> Dict[str, Any]:
+    timings: List[float] = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        reader(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99))
+    }
+
+def read_csv(path: str) -> pd.DataFrame:
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+def bench_dataset(df: pd.DataFrame, path: str, n_runs: int) -> Dict[str, Any]:
+    df.to_csv(path)
+    write_snapshot(df, path)
+    
+    # O snapshot precisa reproduzir o frame lido do CSV
+    pd.testing.assert_frame_equal(read_dataset(path), read_csv(path), check_freq=False)
+    
+    csv = time_reader(read_csv, path, n_runs)
+    snapshot = time_reader(read_dataset, path, n_runs)
+    return {
+        "rows": len(df),
+        "columns": df.shape[1],
+        "csv": csv,
+        "snapshot": snapshot,
+        "speedup": csv["p50_ms"] / snapshot["p50_ms"]
+    }
+
+def run_benchmark(T: int, n_days: int, n_runs: int, seed: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as data_dir:
+        results = {
+            "fed_selic_combined": bench_dataset(
+                generate_fed_selic(T=T, seed=seed), os.path.join(data_dir, "fed_selic_combined.csv"), n_runs),
+            "fed_detailed_data": bench_dataset(
+                generate_fed_detailed(n_days, seed), os.path.join(data_dir, "fed_detailed_data.csv"), n_runs)
+        }
+    
+    return {
+        "config": {"T": T, "n_days": n_days, "n_runs": n_runs, "seed": seed},
+        "results": results
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do snapshot colunar contra o parse de CSV")
+    ap.add_argument("--T", type=int, default=240)
+    ap.add_argument("--n-days", type=int, default=12000)
+    ap.add_argument("--n-runs", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--target-speedup", type=float, default=10.0)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.T, args.n_days, args.n_runs, args.seed)
+    
+    for name, r in res["results"].items():
+        print(f"[COLUMNAR SNAPSHOT] {name} ({r['rows']}x{r['columns']}): "
+              f"CSV p50 {r['csv']['p50_ms']:.3f}ms, snapshot p50 {r['snapshot']['p50_ms']:.3f}ms, "
+              f"speedup {r['speedup']:.1f}x")
+    
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "columnar_snapshot_results.json"))
+    
+    if args.check_gate and res["results"]["fed_detailed_data"]["speedup"] < args.target_speedup:
+        print("[COLUMNAR SNAPSHOT] FALHOU: speedup do cold start abaixo da meta")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para o calendário do Copom indexado
+"""
+
+from .test_copom_calendar import (
+    run_benchmark,
+    legacy_next_meetings,
+    make_dates
+)
+
+__all__ = [
+    "run_benchmark",
+    "legacy_next_meetings",
+    "make_dates"
+]
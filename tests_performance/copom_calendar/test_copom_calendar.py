@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do calendário do Copom indexado: próximas reuniões após N datas de
+decisão do Fed com o comportamento anterior (gerar o calendário mês a mês a
+cada consulta, como SelicDataRepository.get_copom_calendar, e varrer todas as
+datas) contra CopomCalendarService (datetime64 ordenado carregado uma vez,
+np.searchsorted por consulta ou em lote), conferindo que os resultados coincidem.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timedelta
+from typing import Dict, Any, List
+
+import numpy as np
+
+from src.services.copom_calendar import CopomCalendarService
+
+CALENDAR_START = datetime(2000, 1, 1)
+CALENDAR_END = datetime(2031, 12, 31)
+
+# ---------- Dados ----------
+def make_dates(n: int, seed: int) -> List[str]:
+    """Datas de decisão do Fed (ISO-8601) entre 2001 e 2029"""
+    rng = np.random.default_rng(seed)
+    days = np.datetime64("2001-01-01") + rng.integers(0, 29 * 365, size=n).astype("timedelta64[D]")
+    return [str(d) for d in days]
+
+# ---------- Benchmarks ----------
+def legacy_generate(start_date: datetime, end_date: datetime) -> List[datetime]:
+    """SelicDataRepository._generate_copom_dates anterior: terceira quarta-feira, mês a mês"""
+    copom_dates = []
+    current_date = start_date.replace(day=1)
+    while current_date <= end_date:
+        first_day = current_date.replace(day=1)
+        first_wednesday = first_day + timedelta(days=(2 - first_day.weekday()) % 7)
+        third_wednesday = first_wednesday + timedelta(weeks=2)
+        if start_date <= third_wednesday <= end_date:
+            copom_dates.append(third_wednesday)
+        if current_date.month == 12:
+            current_date = current_date.replace(year=current_date.year + 1, month=1)
+        else:
+            current_date = current_date.replace(month=current_date.month + 1)
+    return copom_dates
+
+def legacy_next_meetings(day: str, count: int) -> List[str]:
+    """Calendário gerado a cada consulta e varrido por inteiro"""
+    reference = datetime.fromisoformat(day)
+    meetings = [d for d in legacy_generate(CALENDAR_START, CALENDAR_END) if d >= reference]
+    return [d.strftime("%Y-%m-%d") for d in meetings[:count]]
+
+def best_of(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(min(times))
+
+def run_benchmark(n_queries: int, count: int, repeats: int, seed: int) -> Dict[str, Any]:
+    dates = make_dates(n_queries, seed)
+    calendar = CopomCalendarService()
+
+    build_ms = best_of(lambda: CopomCalendarService().dates, repeats)
+    calendar.dates
+
+    start = time.perf_counter()
+    legacy = [legacy_next_meetings(d, count) for d in dates]
+    legacy_ms = (time.perf_counter() - start) * 1000
+    bulk = calendar.next_meetings(dates, count)
+    single = [calendar.next_meetings(d, count)[0] for d in dates]
+
+    return {
+        "config": {"n_queries": n_queries, "count": count, "repeats": repeats, "seed": seed,
+                   "calendar_meetings": len(calendar.dates), "calendar_source": calendar.source},
+        "results": {
+            "build_ms": build_ms,
+            "legacy_ms": legacy_ms,
+            "single_ms": best_of(lambda: [calendar.next_meetings(d, count) for d in dates], repeats),
+            "bulk_ms": best_of(lambda: calendar.next_meetings(dates, count), repeats),
+            "same_results": legacy == [[str(m) for m in row] for row in bulk]
+                            and all((row == s).all() for row, s in zip(bulk, single))
+        }
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do calendário do Copom indexado (np.searchsorted)")
+    ap.add_argument("--n-queries", type=int, default=2000)
+    ap.add_argument("--count", type=int, default=4)
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.n_queries, args.count, args.repeats, args.seed)
+
+    c, r = res["config"], res["results"]
+    print(f"[COPOM CALENDAR] calendário {c['calendar_source']}: {c['calendar_meetings']} reuniões, "
+          f"indexado em {r['build_ms']:.2f}ms")
+    print(f"[COPOM CALENDAR] {args.n_queries} consultas das próximas {args.count} reuniões:")
+    print(f"[COPOM CALENDAR]   gerar e varrer por consulta: {r['legacy_ms']:.1f}ms "
+          f"({r['legacy_ms'] * 1000 / args.n_queries:.1f}µs/consulta)")
+    print(f"[COPOM CALENDAR]   searchsorted por consulta: {r['single_ms']:.1f}ms "
+          f"({r['single_ms'] * 1000 / args.n_queries:.1f}µs/consulta)")
+    print(f"[COPOM CALENDAR]   searchsorted em lote: {r['bulk_ms']:.2f}ms "
+          f"({r['legacy_ms'] / r['bulk_ms']:.0f}x)")
+    print(f"[COPOM CALENDAR] mesmos resultados: {r['same_results']}")
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "copom_calendar_results.json"))
+
+    if args.check_gate and (not r["same_results"] or r["single_ms"] * 10 > r["legacy_ms"]
+                            or r["bulk_ms"] >= r["single_ms"]):
+        print("[COPOM CALENDAR] FALHOU: resultados divergentes, consulta indexada < 10x ou lote sem ganho")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
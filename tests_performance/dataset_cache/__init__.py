@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para o cache de datasets
+"""
+
+from .test_dataset_cache import (
+    run_benchmark,
+    time_uncached_parse,
+    time_cached_calls
+)
+
+__all__ = [
+    "run_benchmark",
+    "time_uncached_parse",
+    "time_cached_calls"
+]
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do cache de datasets em processo: parse do CSV combinado a cada
+chamada (comportamento anterior) contra o cache invalidado por
+(path, mtime, size) com frames derivados memoizados.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from typing import Dict, Any, List
+
+import numpy as np
+import pandas as pd
+
+from src.core.config import get_settings
+from src.services.data_service import DataService
+from src.services.dataset_cache import get_dataset_cache
+from tests_performance.synthetic_data import write_data_dir
+
+# ---------- Benchmarks ----------
+def summarize(timings: List[float]) -> Dict[str, Any]:
+    return {
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99))
+    }
+
+def time_uncached_parse(path: str, n_calls: int) -> Dict[str, Any]:
+    data_service = DataService()
+    timings = []
+    for _ in range(n_calls):
+        start = time.perf_counter()
+        data_service._prepare_prediction_data(pd.read_csv(path, index_col=0, parse_dates=True))
+        timings.append((time.perf_counter() - start) * 1000)
+    return summarize(timings)
+
+def time_cached_calls(n_calls: int) -> Dict[str, Any]:
+    async def run() -> Dict[str, List[float]]:
+        timings = {"prediction_data": [], "data_quality": []}
+        for _ in range(n_calls):
+            start = time.perf_counter()
+            await DataService().get_prediction_data()
+            timings["prediction_data"].append((time.perf_counter() - start) * 1000)
+            
+            # Health check: nova instância a cada chamada, como antes do container
+            start = time.perf_counter()
+            await DataService().validate_data_quality()
+            timings["data_quality"].append((time.perf_counter() - start) * 1000)
+        return timings
+    
+    timings = asyncio.run(run())
+    return {name: summarize(values) for name, values in timings.items()}
+
+def run_benchmark(T: int, n_calls: int, seed: int) -> Dict[str, Any]:
+    settings = get_settings()
+    original_data_dir = settings.DATA_DIR
+    cache = get_dataset_cache()
+    
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = write_data_dir(data_dir, T=T, seed=seed)
+        settings.DATA_DIR = data_dir
+        cache.invalidate()
+        try:
+            uncached = time_uncached_parse(path, n_calls)
+            
+            start = time.perf_counter()
+            asyncio.run(DataService().get_prediction_data())
+            cold_ms = (time.perf_counter() - start) * 1000
+            
+            cached = time_cached_calls(n_calls)
+            stats = cache.get_stats()
+            
+            # Mudança no arquivo: exatamente um novo parse
+            os.utime(path, ns=(time.time_ns(), time.time_ns()))
+            cache.revalidate_seconds, revalidate_seconds = 0.0, cache.revalidate_seconds
+            asyncio.run(DataService().get_prediction_data())
+            asyncio.run(DataService().get_prediction_data())
+            cache.revalidate_seconds = revalidate_seconds
+            reloads = cache.get_stats()["reloads"]
+        finally:
+            settings.DATA_DIR = original_data_dir
+            cache.invalidate()
+    
+    return {
+        "config": {"T": T, "n_calls": n_calls, "seed": seed},
+        "results": {
+            "uncached_parse": uncached,
+            "cold_load_ms": cold_ms,
+            "cached": cached,
+            "loads": stats["loads"],
+            "reloads_after_change": reloads
+        }
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do cache de datasets com detecção de mudança")
+    ap.add_argument("--T", type=int, default=240)
+    ap.add_argument("--n-calls", type=int, default=500)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--target-p99-ms", type=float, default=0.5)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.T, args.n_calls, args.seed)
+    
+    r = res["results"]
+    print(f"[DATASET CACHE] parse por chamada: p50 {r['uncached_parse']['p50_ms']:.3f}ms, "
+          f"p99 {r['uncached_parse']['p99_ms']:.3f}ms")
+    print(f"[DATASET CACHE] primeira carga: {r['cold_load_ms']:.3f}ms")
+    for name, vals in r["cached"].items():
+        print(f"[DATASET CACHE] {name} em cache: p50 {vals['p50_ms']:.3f}ms, p99 {vals['p99_ms']:.3f}ms")
+    print(f"[DATASET CACHE] parses: {r['loads']} em {2 * args.n_calls + 1} chamadas, "
+          f"{r['reloads_after_change']} após mudança do arquivo")
+    
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "dataset_cache_results.json"))
+    
+    if args.check_gate and (r["loads"] != 1 or r["reloads_after_change"] != 1
+                            or r["cached"]["prediction_data"]["p99_ms"] > args.target_p99_ms):
+        print("[DATASET CACHE] FALHOU: parse repetido ou latência em cache acima da meta")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para distribuições a partir de caminhos simulados
+"""
+
+from .test_draw_distributions import (
+    run_benchmark,
+    reference_summary,
+    train_model
+)
+
+__all__ = [
+    "run_benchmark",
+    "reference_summary",
+    "train_model"
+]
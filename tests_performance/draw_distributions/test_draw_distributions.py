@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark das distribuições a partir de caminhos simulados: convert_paths
+acumulando blocos de BVARMinnesotaModelService.iter_paths num MoveHistogram
+(memória limitada) contra materializar todos os caminhos, com o pico de
+memória (tracemalloc) por número de caminhos e a conferência dos quantis e
+das probabilidades de primeiro movimento contra o cálculo em memória.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tracemalloc
+from datetime import datetime
+from typing import Dict, Any, List
+
+import numpy as np
+
+from config import MODEL_CONFIG
+from src.services.model_service import BVARMinnesotaModelService
+from src.services.probability_engine import ProbabilityEngineService
+from tests_performance.probability_engine.test_probability_engine import make_calendar
+from tests_performance.synthetic_data import generate_prediction_data
+
+FED_SHOCK = 0.25
+REFERENCE_DATE = datetime(2025, 1, 1)
+
+# ---------- Dados ----------
+async def train_model(T: int, seed: int) -> BVARMinnesotaModelService:
+    model = BVARMinnesotaModelService(**{**MODEL_CONFIG["bvar_minnesota"], "seed": seed})
+    await model.train_model(generate_prediction_data(T=T, seed=seed))
+    return model
+
+# ---------- Benchmarks ----------
+def reference_summary(engine: ProbabilityEngineService, paths: np.ndarray) -> Dict[str, Any]:
+    """Cálculo em memória sobre todos os caminhos discretizados"""
+    moves = engine._discretize_array(paths)
+    moved = moves != 0
+    first = moved.argmax(axis=1)[moved.any(axis=1)]
+    q = np.percentile(moves, [10, 90, 2.5, 97.5], axis=0, method="inverted_cdf").T.astype(int)
+    return {
+        "first_move": np.round(np.bincount(first, minlength=paths.shape[1]) / len(paths), 3).tolist(),
+        "ci80": q[:, :2].tolist(),
+        "ci95": q[:, 2:].tolist(),
+        "distribution": engine._histogram(moves[:, -1])
+    }
+
+def engine_summary(prediction) -> Dict[str, Any]:
+    return {
+        "first_move": [m.probability for m in prediction.per_meeting],
+        "ci80": [list(m.confidence_interval_80) for m in prediction.per_meeting],
+        "ci95": [list(m.confidence_interval_95) for m in prediction.per_meeting],
+        "distribution": prediction.distribution
+    }
+
+def measure(fn) -> Dict[str, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"ms": elapsed, "peak_mb": peak / 1e6}
+
+def run_benchmark(sizes: List[int], horizon: int, chunk_size: int, materialize_max: int,
+                  check_paths: int, T: int, seed: int) -> Dict[str, Any]:
+    model = asyncio.run(train_model(T, seed))
+    engine = ProbabilityEngineService(chunk_size=chunk_size)
+    horizons = np.arange(1, horizon + 1)
+    calendar = engine.parse_calendar(make_calendar(30))
+
+    def streaming(n_paths: int):
+        paths = model.iter_paths(FED_SHOCK, horizon, n_paths, chunk_size=chunk_size, seed=seed)
+        return asyncio.run(engine.convert_paths(paths, horizons, calendar, reference_date=REFERENCE_DATE))
+
+    def materialized(n_paths: int):
+        paths = model.simulate_paths(FED_SHOCK, horizon, n_paths=n_paths, seed=seed)
+        return asyncio.run(engine.convert_draws(paths, horizons, calendar, reference_date=REFERENCE_DATE))
+
+    runs = []
+    for n_paths in sizes:
+        run = {"n_paths": n_paths, "streaming": measure(lambda: streaming(n_paths))}
+        if n_paths <= materialize_max:
+            run["materialized"] = measure(lambda: materialized(n_paths))
+        runs.append(run)
+
+    paths = model.simulate_paths(FED_SHOCK, horizon, n_paths=check_paths, seed=seed)
+    reference = reference_summary(engine, paths)
+    streamed = engine_summary(asyncio.run(engine.convert_paths(
+        iter(np.array_split(paths, 7)), horizons, calendar, reference_date=REFERENCE_DATE)))
+    point = asyncio.run(engine.convert_to_probabilities(
+        {f"horizon_{h}": {"point_forecast": float(v)} for h, v in zip((1, 3, 6, 12), paths[:, [0, 2, 5, 11]].mean(axis=0))},
+        calendar, reference_date=REFERENCE_DATE))
+
+    return {
+        "config": {"sizes": sizes, "horizon": horizon, "chunk_size": chunk_size, "materialize_max": materialize_max,
+                   "check_paths": check_paths, "T": T, "seed": seed},
+        "results": {
+            "runs": runs,
+            "same_results": reference == streamed,
+            "mismatched_fields": [k for k in reference if reference[k] != streamed[k]],
+            "distribution_bins": {"point_forecasts": len(point.distribution), "paths": len(streamed["distribution"])}
+        }
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark das distribuições a partir de caminhos simulados com memória limitada")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    ap.add_argument("--horizon", type=int, default=12)
+    ap.add_argument("--chunk-size", type=int, default=50000)
+    ap.add_argument("--materialize-max", type=int, default=100000)
+    ap.add_argument("--check-paths", type=int, default=20000)
+    ap.add_argument("--T", type=int, default=240)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.sizes, args.horizon, args.chunk_size, args.materialize_max,
+                        args.check_paths, args.T, args.seed)
+
+    r = res["results"]
+    for run in r["runs"]:
+        s = run["streaming"]
+        line = f"[DRAW DISTRIBUTIONS] {run['n_paths']} caminhos: em blocos {s['ms']:.0f}ms, pico {s['peak_mb']:.1f}MB"
+        if "materialized" in run:
+            m = run["materialized"]
+            line += f"; materializados {m['ms']:.0f}ms, pico {m['peak_mb']:.1f}MB"
+        print(line)
+    bins = r["distribution_bins"]
+    print(f"[DRAW DISTRIBUTIONS] faixas na distribuição: {bins['point_forecasts']} (previsões pontuais) vs {bins['paths']} (caminhos)")
+    print(f"[DRAW DISTRIBUTIONS] mesmos resultados que o cálculo em memória: {r['same_results']} {r['mismatched_fields'] or ''}")
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "draw_distributions_results.json"))
+
+    # Memória limitada: o pico com o maior número de caminhos não cresce além do bloco
+    peaks = [run["streaming"]["peak_mb"] for run in r["runs"] if run["n_paths"] >= args.chunk_size]
+    if args.check_gate and (not r["same_results"] or (peaks and max(peaks) > 1.5 * min(peaks))):
+        print("[DRAW DISTRIBUTIONS] FALHOU: resultados divergentes ou memória crescendo com o número de caminhos")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para as métricas de latência (histogramas log-lineares)
+"""
+
+from .test_latency_metrics import (
+    run_benchmark,
+    LegacyLatencyMetrics,
+    make_latencies
+)
+
+__all__ = [
+    "run_benchmark",
+    "LegacyLatencyMetrics",
+    "make_latencies"
+]
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark das métricas de latência do MetricsService: deque das últimas
+1000 latências com ordenação a cada percentil e varredura de timestamps
+para requests/minuto (comportamento anterior) contra histogramas
+log-lineares por endpoint e versão em janelas rotativas de 1m/5m/1h.
+Mede custo do registro e da coleta (get_health_metrics), erro dos quantis
+contra a ordenação exata, memória com o volume de registros e a rotação
+das janelas com relógio simulado.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+import tracemalloc
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Any
+
+import numpy as np
+
+from src.services.latency_histogram import LogLinearHistogram, SUB_BUCKET_BITS
+from src.services.metrics_service import MetricsService
+from src.services.health_service import HealthService
+
+ENDPOINTS = ["predict_selic", "predict_batch"]
+VERSIONS = ["v1.0.0", "v1.1.0"]
+QUANTILES = (0.5, 0.95, 0.99)
+
+# ---------- Dados ----------
+def make_latencies(n: int, seed: int) -> np.ndarray:
+    """Latências log-normais (ms) com cauda de requests lentos"""
+    rng = np.random.default_rng(seed)
+    latencies = rng.lognormal(mean=2.5, sigma=0.8, size=n)
+    slow = rng.random(n) < 0.01
+    latencies[slow] *= rng.uniform(10, 50, slow.sum())
+    return latencies
+
+class FakeClock:
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+class LegacyLatencyMetrics:
+    """Cópia do comportamento anterior do MetricsService para latências"""
+
+    def __init__(self):
+        self.latency_metrics = deque(maxlen=1000)
+        self._lock = threading.Lock()
+
+    async def record_prediction_latency(self, request_id: str, latency_ms: float) -> None:
+        with self._lock:
+            self.latency_metrics.append({
+                'request_id': request_id,
+                'latency_ms': latency_ms,
+                'timestamp': datetime.now()
+            })
+
+    def _percentile(self, data: list, percentile: int) -> float:
+        if not data:
+            return 0.0
+        sorted_data = sorted(data)
+        index = int(len(sorted_data) * percentile / 100)
+        return sorted_data[min(index, len(sorted_data) - 1)]
+
+    async def get_health_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            current_time = datetime.now()
+            latencies = [m['latency_ms'] for m in self.latency_metrics]
+            recent = [m for m in self.latency_metrics if m['timestamp'] > current_time - timedelta(minutes=1)]
+            return {
+                "p50_ms": self._percentile(latencies, 50),
+                "p95_ms": self._percentile(latencies, 95),
+                "p99_ms": self._percentile(latencies, 99),
+                "avg_ms": sum(latencies) / len(latencies),
+                "requests_per_minute": len(recent)
+            }
+
+# ---------- Benchmarks ----------
+async def fill_service(latencies: np.ndarray, clock: FakeClock, rate_per_second: float) -> MetricsService:
+    service = MetricsService(clock=clock)
+    for i, latency in enumerate(latencies):
+        clock.now = i / rate_per_second
+        await service.record_prediction_latency(None, float(latency), ENDPOINTS[i % 2], VERSIONS[(i // 2) % 2])
+    return service
+
+async def record_cost(latencies: np.ndarray, rate_per_second: float) -> Dict[str, float]:
+    legacy = LegacyLatencyMetrics()
+    start = time.perf_counter()
+    for latency in latencies:
+        await legacy.record_prediction_latency(None, float(latency))
+    legacy_us = (time.perf_counter() - start) / len(latencies) * 1e6
+
+    start = time.perf_counter()
+    await fill_service(latencies, FakeClock(), rate_per_second)
+    histogram_us = (time.perf_counter() - start) / len(latencies) * 1e6
+    return {"legacy_record_us": legacy_us, "histogram_record_us": histogram_us}
+
+async def scrape_cost(latencies: np.ndarray, rate_per_second: float, repeats: int) -> Dict[str, float]:
+    legacy = LegacyLatencyMetrics()
+    for latency in latencies[-1000:]:
+        await legacy.record_prediction_latency(None, float(latency))
+    service = await fill_service(latencies, FakeClock(), rate_per_second)
+
+    async def best_of(fn) -> float:
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            await fn()
+            times.append((time.perf_counter() - start) * 1000)
+        return float(min(times))
+
+    return {
+        "legacy_scrape_ms": await best_of(legacy.get_health_metrics),
+        "histogram_scrape_ms": await best_of(service.get_health_metrics),
+        "series": len(service.latency_histograms)
+    }
+
+def quantile_error(latencies: np.ndarray) -> Dict[str, Any]:
+    """Quantis do histograma contra sorted[int(n * q)] sobre as mesmas latências"""
+    histogram = LogLinearHistogram()
+    for latency in latencies:
+        histogram.record(float(latency))
+    ordered = np.sort(latencies)
+    exact = [float(ordered[min(int(len(ordered) * q), len(ordered) - 1)]) for q in QUANTILES]
+    estimated = histogram.quantiles(QUANTILES)
+    errors = [abs(e - x) / x for e, x in zip(estimated, exact)]
+    return {"exact_ms": exact, "histogram_ms": estimated, "max_relative_error": max(errors),
+            "error_bound": 1 / 2 ** (SUB_BUCKET_BITS - 1), "buckets": len(histogram.counts)}
+
+async def memory_growth(latencies: np.ndarray, rate_per_second: float) -> Dict[str, float]:
+    """Memória do serviço com 1/10 e com todas as latências"""
+    sizes = {}
+    for label, subset in (("tenth", latencies[:len(latencies) // 10]), ("all", latencies)):
+        tracemalloc.start()
+        service = await fill_service(subset, FakeClock(), rate_per_second)
+        sizes[f"{label}_mb"] = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+        del service
+    return sizes
+
+async def window_rotation() -> Dict[str, Any]:
+    """Contagens por janela após 1000 registros em t=0 e com o relógio avançado"""
+    clock = FakeClock(1000.0)
+    service = MetricsService(clock=clock)
+    for _ in range(1000):
+        await service.record_prediction_latency(None, 10.0, "predict_selic", "v1.0.0")
+
+    counts = {}
+    for label, advance in (("t0", 0), ("t+90s", 90), ("t+10m", 600), ("t+2h", 7200)):
+        clock.now = 1000.0 + advance
+        windows = service.get_latency_metrics()["predict_selic"]["v1.0.0"]
+        counts[label] = {window: summary["count"] for window, summary in windows.items()}
+    expected = {
+        "t0": {"1m": 1000, "5m": 1000, "1h": 1000},
+        "t+90s": {"1m": 0, "5m": 1000, "1h": 1000},
+        "t+10m": {"1m": 0, "5m": 0, "1h": 1000},
+        "t+2h": {"1m": 0, "5m": 0, "1h": 0}
+    }
+    return {"counts": counts, "ok": counts == expected}
+
+async def health_report(latencies: np.ndarray) -> Dict[str, Any]:
+    """Quantis do health check contra os quantis exatos das latências dos últimos 5 minutos"""
+    service = MetricsService(clock=FakeClock(1000.0))
+    for latency in latencies:
+        await service.record_prediction_latency(None, float(latency), "predict_selic", "v1.0.0")
+    health = HealthService(metrics_service=service)
+
+    reported = {key: health._get_latency_quantile(key) for key in ("p50_ms", "p95_ms", "p99_ms")}
+    exact = {f"p{int(q * 100)}_ms": float(np.quantile(latencies, q)) for q in QUANTILES}
+    errors = [abs(reported[key] - exact[key]) / exact[key] for key in exact]
+    empty = HealthService(metrics_service=MetricsService())
+    return {
+        "reported": reported, "exact": exact,
+        "requests_per_minute": health._get_requests_per_minute(),
+        "ok": (max(errors) <= 1 / 32 and health._get_requests_per_minute() == len(latencies)
+               and empty._get_latency_quantile("p99_ms") is None)
+    }
+
+def run_benchmark(n_records: int, rate_per_second: float, repeats: int, seed: int) -> Dict[str, Any]:
+    latencies = make_latencies(n_records, seed)
+    return {
+        "config": {"n_records": n_records, "rate_per_second": rate_per_second,
+                   "repeats": repeats, "seed": seed, "sub_bucket_bits": SUB_BUCKET_BITS},
+        "results": {
+            **asyncio.run(record_cost(latencies, rate_per_second)),
+            **asyncio.run(scrape_cost(latencies, rate_per_second, repeats)),
+            "quantiles": quantile_error(latencies),
+            "memory": asyncio.run(memory_growth(latencies, rate_per_second)),
+            "windows": asyncio.run(window_rotation()),
+            "health": asyncio.run(health_report(latencies[:5000]))
+        }
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark das métricas de latência (histogramas log-lineares)")
+    ap.add_argument("--n-records", type=int, default=200000)
+    ap.add_argument("--rate-per-second", type=float, default=200.0)
+    ap.add_argument("--repeats", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.n_records, args.rate_per_second, args.repeats, args.seed)
+
+    r = res["results"]
+    q, mem = r["quantiles"], r["memory"]
+    print(f"[LATENCY METRICS] {args.n_records} latências, {r['series']} séries (endpoint x versão), "
+          f"{q['buckets']} buckets por histograma")
+    print(f"[LATENCY METRICS] registro: deque {r['legacy_record_us']:.2f}µs, histogramas {r['histogram_record_us']:.2f}µs")
+    print(f"[LATENCY METRICS] coleta: deque (1000 amostras) {r['legacy_scrape_ms']:.2f}ms, "
+          f"histogramas (1m/5m/1h por série) {r['histogram_scrape_ms']:.2f}ms")
+    print(f"[LATENCY METRICS] erro relativo máximo p50/p95/p99: {q['max_relative_error']:.4f} "
+          f"(limite {q['error_bound']:.4f})")
+    print(f"[LATENCY METRICS] memória: {mem['tenth_mb']:.2f}MB com 1/10, {mem['all_mb']:.2f}MB com todas")
+    print(f"[LATENCY METRICS] rotação das janelas: {r['windows']['ok']} {r['windows']['counts']}")
+    h = r["health"]
+    print(f"[LATENCY METRICS] health check p50/p95/p99: "
+          f"{h['reported']['p50_ms']:.2f}/{h['reported']['p95_ms']:.2f}/{h['reported']['p99_ms']:.2f}ms "
+          f"(exatos {h['exact']['p50_ms']:.2f}/{h['exact']['p95_ms']:.2f}/{h['exact']['p99_ms']:.2f}ms), "
+          f"{h['requests_per_minute']:.0f} requests/min")
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "latency_metrics_results.json"))
+
+    failed = (q["max_relative_error"] > q["error_bound"]
+              or mem["all_mb"] > mem["tenth_mb"] * 1.1
+              or not r["windows"]["ok"]
+              or not r["health"]["ok"]
+              or r["histogram_scrape_ms"] > 50)
+    if args.check_gate and failed:
+        print("[LATENCY METRICS] FALHOU: erro acima do limite, memória crescente, janelas incorretas, "
+              "health check sem os quantis medidos ou coleta > 50ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para Local Projections
+"""
+
+from .test_local_projections import (
+    run_benchmark,
+    time_batched_fit,
+    time_statsmodels_loop
+)
+
+__all__ = [
+    "run_benchmark",
+    "time_batched_fit",
+    "time_statsmodels_loop"
+]
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do ajuste em lote das Local Projections (todos os horizontes
+com uma única fatoração) contra o laço de OLS do statsmodels por horizonte.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Dict, Any
+
+import numpy as np
+
+from src.services.model_service import LocalProjectionsModelService
+from tests_performance.synthetic_data import generate_prediction_data
+
+# ---------- Benchmarks ----------
+def time_batched_fit(data, max_horizon: int, max_lags: int, alpha: float,
+                     regularization: str, n_runs: int) -> Dict[str, Any]:
+    model = LocalProjectionsModelService(max_horizon=max_horizon, max_lags=max_lags,
+                                         alpha=alpha, regularization=regularization)
+    asyncio.run(model.train_model(data))  # aquecimento
+    
+    timings = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        asyncio.run(model.train_model(data))
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    return {
+        "median_ms": float(np.median(timings)),
+        "p95_ms": float(np.percentile(timings, 95)),
+        "irf": model.irf.tolist()
+    }
+
+def time_statsmodels_loop(data, max_horizon: int, max_lags: int, n_runs: int) -> Dict[str, Any]:
+    import statsmodels.api as sm
+    
+    fed_change = data["fed_rate"].diff().to_numpy()
+    selic = data["selic"].to_numpy()
+    selic_change = np.diff(selic, prepend=np.nan)
+    
+    def fit_all():
+        irf = []
+        for h in range(1, max_horizon + 1):
+            t = np.arange(max_lags + 1, len(selic) - max_horizon)
+            lags = np.arange(1, max_lags + 1)
+            X = np.column_stack([fed_change[t], *fed_change[t[:, None] - lags].T,
+                                 *selic_change[t[:, None] - lags].T])
+            y = selic[t + h] - selic[t - 1]
+            irf.append(sm.OLS(y, sm.add_constant(X)).fit(cov_type="HAC", cov_kwds={"maxlags": h + 1}).params[1])
+        return irf
+    
+    fit_all()
+    timings = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        irf = fit_all()
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    return {"median_ms": float(np.median(timings)), "p95_ms": float(np.percentile(timings, 95)), "irf": irf}
+
+def run_benchmark(T: int, max_horizon: int, max_lags: int, alpha: float, n_runs: int,
+                  seed: int, compare: bool) -> Dict[str, Any]:
+    data = generate_prediction_data(T=T, seed=seed)
+    results = {
+        "batched_ridge": time_batched_fit(data, max_horizon, max_lags, alpha, "ridge", n_runs),
+        "batched_ols": time_batched_fit(data, max_horizon, max_lags, 0.0, "none", n_runs)
+    }
+    if compare:
+        results["statsmodels_loop"] = time_statsmodels_loop(data, max_horizon, max_lags, n_runs)
+        results["max_irf_diff_ols"] = float(np.max(np.abs(
+            np.array(results["batched_ols"]["irf"]) - np.array(results["statsmodels_loop"]["irf"]))))
+    
+    return {
+        "config": {"T": T, "max_horizon": max_horizon, "max_lags": max_lags, "alpha": alpha,
+                   "n_runs": n_runs, "seed": seed},
+        "results": results
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do ajuste em lote das Local Projections")
+    ap.add_argument("--T", type=int, default=240)
+    ap.add_argument("--max-horizon", type=int, default=12)
+    ap.add_argument("--max-lags", type=int, default=4)
+    ap.add_argument("--alpha", type=float, default=0.1)
+    ap.add_argument("--n-runs", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--compare-statsmodels", action="store_true")
+    ap.add_argument("--target-ms", type=float, default=10.0)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.T, args.max_horizon, args.max_lags, args.alpha, args.n_runs,
+                        args.seed, args.compare_statsmodels)
+    
+    for name, vals in res["results"].items():
+        if isinstance(vals, dict):
+            print(f"[LOCAL PROJECTIONS] {name}: mediana {vals['median_ms']:.3f}ms, p95 {vals['p95_ms']:.3f}ms")
+    if "max_irf_diff_ols" in res["results"]:
+        print(f"[LOCAL PROJECTIONS] diferença máxima IRF vs statsmodels: {res['results']['max_irf_diff_ols']:.2e}")
+    
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "local_projections_results.json"))
+    
+    if args.check_gate and res["results"]["batched_ridge"]["median_ms"] > args.target_ms:
+        print(f"[LOCAL PROJECTIONS] FALHOU: mediana acima de {args.target_ms}ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para a amostragem de logs por request
+"""
+
+from .test_log_sampling import (
+    run_benchmark,
+    make_traffic,
+    FakeClock
+)
+
+__all__ = [
+    "run_benchmark",
+    "make_traffic",
+    "FakeClock"
+]
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark da amostragem de logs por request: LoggingService registrando
+todos os requests (request e response da previsão mais a linha HTTP)
+contra o LogSampler (fração pelo hash do request ID, teto por token bucket,
+erros e requests acima do p99 sempre registrados). Um relógio simulado
+avança no ritmo de --rps; mede o custo por request, o volume gravado, a
+taxa efetiva contra o teto, a cobertura de erros e de requests lentos, a
+completude dos requests registrados e a mesma decisão entre processos.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+from collections import defaultdict
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from src.services.logging_service import LoggingService
+from src.services.log_sampler import LogSampler
+
+EVENTS_PER_REQUEST = 3
+
+# ---------- Dados ----------
+class FakeClock:
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+def make_traffic(n_requests: int, error_rate: float, seed: int) -> Dict[str, np.ndarray]:
+    """Latências log-normais (ms) com cauda lenta e requests com erro 500"""
+    rng = np.random.default_rng(seed)
+    latencies = rng.lognormal(mean=1.0, sigma=0.5, size=n_requests)
+    slow = rng.random(n_requests) < 0.01
+    latencies[slow] *= rng.uniform(5, 20, slow.sum())
+    status = np.where(rng.random(n_requests) < error_rate, 500, 200)
+    return {"latency_ms": latencies, "status": status}
+
+REQUEST = {"fed_decision_date": "2025-01-29", "fed_move_bps": 25, "fed_move_dir": 1,
+           "horizons_months": [1, 3, 6, 12], "model_version": "v1.0.0", "regime_hint": None}
+RESPONSE = {"expected_move_bps": 25, "horizon_months": "1-3", "prob_move_within_next_copom": 0.41,
+            "model_metadata": {"version": "v1.0.0"}, "processing_time_ms": 1.8, "cache_hit": False}
+
+# ---------- Benchmarks ----------
+async def run_traffic(traffic: Dict[str, np.ndarray], path: str, rps: float,
+                      sampler: Optional[LogSampler], clock: FakeClock) -> Dict[str, Any]:
+    service = LoggingService(log_file=path, queue_size=1 << 20, queue_policy="block",
+                             block_timeout_ms=1000.0, app_loggers=(), sampler=sampler)
+    latencies, status = traffic["latency_ms"], traffic["status"]
+    start = time.perf_counter()
+    for i in range(len(latencies)):
+        clock.now = i / rps
+        request_id = f"req-{i}"
+        service.start_request(request_id)
+        await service.log_prediction_request(request_id, REQUEST)
+        if status[i] == 200:
+            await service.log_prediction_response(request_id, RESPONSE)
+        await service.finish_request(request_id, "POST", "/predict/selic-from-fed",
+                                     int(status[i]), float(latencies[i]), client_ip="127.0.0.1")
+    elapsed = time.perf_counter() - start
+    await service.cleanup()
+    stats = service.get_stats()
+    return {"request_us": elapsed / len(latencies) * 1e6, "stats": stats, "bytes": os.path.getsize(path)}
+
+def read_log(path: str) -> Dict[str, Dict[str, Any]]:
+    """Eventos e motivo da amostragem por request ID"""
+    requests = defaultdict(lambda: {"events": set(), "sampling": set()})
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            if "request_id" in entry:
+                requests[entry["request_id"]]["events"].add(entry["event_type"])
+                requests[entry["request_id"]]["sampling"].add(entry.get("sampling"))
+    return requests
+
+def coverage(traffic: Dict[str, np.ndarray], logged: Dict[str, Dict[str, Any]], warmup: int) -> Dict[str, Any]:
+    latencies, status = traffic["latency_ms"], traffic["status"]
+    ids = np.array([f"req-{i}" in logged for i in range(len(latencies))])
+    errors = status != 200
+    p99 = float(np.percentile(latencies[warmup:], 99))
+    slow = (latencies > p99 * 1.1) & ~errors
+    slow[:warmup] = False
+    complete = all(
+        entry["events"] == ({"prediction_request", "http_request"} if status[int(rid[4:])] != 200
+                            else {"prediction_request", "prediction_response", "http_request"})
+        for rid, entry in logged.items()
+    )
+    return {
+        "logged_requests": int(ids.sum()),
+        "errors_logged": float(ids[errors].mean()) if errors.any() else 1.0,
+        "slow_logged": float(ids[slow].mean()) if slow.any() else 1.0,
+        "p99_ms": p99,
+        "complete": complete,
+        "by_reason": {reason: sum(1 for e in logged.values() if reason in e["sampling"])
+                      for reason in ("head", "error", "slow")}
+    }
+
+def cross_process_agreement(n_ids: int, sample_rate: float) -> Dict[str, Any]:
+    """Dois amostradores sem teto (ex.: dois serviços com o mesmo X-Request-ID) decidem igual"""
+    a = LogSampler(sample_rate=sample_rate, max_per_second=1e12)
+    b = LogSampler(sample_rate=sample_rate, max_per_second=1e12)
+    ids = [f"upstream-{i}" for i in range(n_ids)]
+    decisions_a = [a.decision(rid).sampled for rid in ids]
+    decisions_b = [b.decision(rid).sampled for rid in reversed(ids)][::-1]
+    return {"agree": decisions_a == decisions_b, "fraction": sum(decisions_a) / n_ids}
+
+def run_benchmark(n_requests: int, rps: float, sample_rate: float, max_per_second: float,
+                  error_rate: float, seed: int) -> Dict[str, Any]:
+    traffic = make_traffic(n_requests, error_rate, seed)
+    directory = tempfile.mkdtemp(prefix="log_sampling_")
+    try:
+        full = asyncio.run(run_traffic(traffic, os.path.join(directory, "full.log"), rps, None, FakeClock()))
+
+        clock = FakeClock()
+        sampler = LogSampler(sample_rate=sample_rate, max_per_second=max_per_second, clock=clock)
+        sampled_path = os.path.join(directory, "sampled.log")
+        sampled = asyncio.run(run_traffic(traffic, sampled_path, rps, sampler, clock))
+        cov = coverage(traffic, read_log(sampled_path), warmup=int(rps * 2))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    duration = n_requests / rps
+    head_cap = max_per_second * duration + max(max_per_second, 1.0)
+    return {
+        "config": {"n_requests": n_requests, "rps": rps, "sample_rate": sample_rate,
+                   "max_per_second": max_per_second, "error_rate": error_rate, "seed": seed},
+        "results": {
+            "full": {"request_us": full["request_us"], "records": full["stats"]["written"], "bytes": full["bytes"]},
+            "sampled": {"request_us": sampled["request_us"], "records": sampled["stats"]["written"],
+                        "bytes": sampled["bytes"], "sampling": sampled["stats"]["sampling"]},
+            "coverage": cov,
+            "head_cap": head_cap,
+            "agreement": cross_process_agreement(20000, sample_rate)
+        }
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark da amostragem de logs por request")
+    ap.add_argument("--n-requests", type=int, default=100000)
+    ap.add_argument("--rps", type=float, default=5000.0)
+    ap.add_argument("--sample-rate", type=float, default=0.05)
+    ap.add_argument("--max-per-second", type=float, default=100.0)
+    ap.add_argument("--error-rate", type=float, default=0.002)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.n_requests, args.rps, args.sample_rate, args.max_per_second,
+                        args.error_rate, args.seed)
+
+    r = res["results"]
+    full, sampled, cov, s = r["full"], r["sampled"], r["coverage"], r["sampled"]["sampling"]
+    print(f"[LOG SAMPLING] {args.n_requests} requests a {args.rps:.0f} rps, taxa {args.sample_rate}, "
+          f"teto {args.max_per_second:.0f}/s")
+    print(f"[LOG SAMPLING] todos: {full['request_us']:.1f}µs por request, {full['records']} registros, "
+          f"{full['bytes'] / 1e6:.1f}MB")
+    print(f"[LOG SAMPLING] amostrado: {sampled['request_us']:.1f}µs por request, {sampled['records']} registros, "
+          f"{sampled['bytes'] / 1e6:.2f}MB, taxa efetiva {s['effective_rate']:.4f}")
+    print(f"[LOG SAMPLING] entrada {s['head']} (limite {r['head_cap']:.0f}, {s['capped']} barrados pelo teto), "
+          f"erros {s['error']}, lentos {s['slow']} (p99 {s['slow_threshold_ms']:.1f}ms)")
+    print(f"[LOG SAMPLING] cobertura: erros {cov['errors_logged']:.3f}, lentos {cov['slow_logged']:.3f}, "
+          f"requests completos: {cov['complete']}")
+    print(f"[LOG SAMPLING] mesma decisão entre processos: {r['agreement']['agree']} "
+          f"(fração {r['agreement']['fraction']:.4f})")
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "log_sampling_results.json"))
+
+    failed = (cov["errors_logged"] < 1.0 or cov["slow_logged"] < 0.9 or not cov["complete"]
+              or s["head"] > r["head_cap"] or not r["agreement"]["agree"]
+              or abs(r["agreement"]["fraction"] - args.sample_rate) > 0.01
+              or sampled["request_us"] >= full["request_us"])
+    if args.check_gate and failed:
+        print("[LOG SAMPLING] FALHOU: erro ou request lento sem registro, request incompleto, teto excedido, "
+              "decisão divergente ou amostragem mais cara que registrar tudo")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para o cache em memória limitado
+"""
+
+from .test_memory_cache import (
+    run_benchmark,
+    run_sweep,
+    make_prediction
+)
+
+__all__ = [
+    "run_benchmark",
+    "run_sweep",
+    "make_prediction"
+]
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do cache em memória do RedisCacheService (fallback sem Redis):
+varredura longa de cenários com chaves únicas contra o orçamento de bytes,
+latência de get/set, reuso de chaves quentes e expiração preguiçosa por TTL.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Dict, Any, List
+
+import numpy as np
+
+from src.services.cache_service import RedisCacheService
+
+# ---------- Dados ----------
+def make_prediction(i: int) -> Dict[str, Any]:
+    """Payload no formato de PredictionResponse (distribuição e reuniões do Copom)"""
+    return {
+        "expected_move_bps": 25 * (i % 9 - 4),
+        "horizon_months": "3-6",
+        "prob_move_within_next_copom": 0.41,
+        "ci80_bps": [-25, 75],
+        "ci95_bps": [-50, 100],
+        "per_meeting": [
+            {"copom_date": f"2025-0{m}-1{m}", "delta_bps": 25, "probability": 0.1 * m} for m in range(1, 5)
+        ],
+        "distribution": [
+            {"delta_bps": d, "probability": round(0.05 + 0.001 * (i % 7), 3)} for d in range(-100, 125, 25)
+        ],
+        "model_metadata": {"version": "v1.0.0", "trained_at": "2025-01-01T00:00:00Z",
+                           "data_hash": f"sha256:{i:064x}", "n_observations": 240, "r_squared": 0.42},
+        "rationale": "Resposta estimada por Local Projections ao choque do Fed"
+    }
+
+# ---------- Benchmarks ----------
+def summarize(timings: List[float]) -> Dict[str, Any]:
+    return {
+        "p50_us": float(np.percentile(timings, 50)),
+        "p99_us": float(np.percentile(timings, 99))
+    }
+
+async def run_sweep(n_keys: int, hot_keys: int, max_bytes: int, ttl_seconds: int) -> Dict[str, Any]:
+    service = RedisCacheService(redis_url="redis://127.0.0.1:1", memory_max_bytes=max_bytes,
+                                memory_max_entries=n_keys)
+    payloads = [make_prediction(i) for i in range(64)]
+    
+    set_timings, get_timings, peak_bytes = [], [], 0
+    for i in range(n_keys):
+        key = service.generate_cache_key("2025-10-29", 25 * (i % 17 - 8), [1, 3, 6, i % 12 + 1], f"sweep-{i}")
+        start = time.perf_counter()
+        await service.cache_prediction(key, payloads[i % len(payloads)], ttl_seconds)
+        set_timings.append((time.perf_counter() - start) * 1e6)
+        
+        # Chaves quentes (cenários canônicos) lidas continuamente durante a varredura
+        hot = service.generate_cache_key("2025-10-29", 25, [1, 3, 6, 12], f"hot-{i % hot_keys}")
+        start = time.perf_counter()
+        if await service.get_cached_prediction(hot) is None:
+            await service.cache_prediction(hot, payloads[0], ttl_seconds)
+        get_timings.append((time.perf_counter() - start) * 1e6)
+        
+        if i % 1000 == 0:
+            peak_bytes = max(peak_bytes, (await service.get_cache_stats())["bytes"])
+    
+    stats = await service.get_cache_stats()
+    
+    # Expiração preguiçosa: entrada com TTL vencido é descartada na leitura
+    await service.cache_prediction("ttl-probe", payloads[0], 0)
+    expired_on_read = await service.get_cached_prediction("ttl-probe") is None
+    
+    await service.cleanup()
+    return {
+        "set": summarize(set_timings),
+        "get_hot": summarize(get_timings),
+        "peak_bytes": max(peak_bytes, stats["bytes"]),
+        "stats": stats,
+        "expired_on_read": expired_on_read
+    }
+
+def run_benchmark(n_keys: int, hot_keys: int, max_bytes: int, ttl_seconds: int) -> Dict[str, Any]:
+    results = asyncio.run(run_sweep(n_keys, hot_keys, max_bytes, ttl_seconds))
+    return {
+        "config": {"n_keys": n_keys, "hot_keys": hot_keys, "max_bytes": max_bytes, "ttl_seconds": ttl_seconds},
+        "results": results
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do cache em memória limitado (LRU + TTL)")
+    ap.add_argument("--n-keys", type=int, default=50000)
+    ap.add_argument("--hot-keys", type=int, default=50)
+    ap.add_argument("--max-bytes", type=int, default=4 * 1024 * 1024)
+    ap.add_argument("--ttl-seconds", type=int, default=3600)
+    ap.add_argument("--target-p99-us", type=float, default=100.0)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.n_keys, args.hot_keys, args.max_bytes, args.ttl_seconds)
+    
+    r = res["results"]
+    s = r["stats"]
+    print(f"[MEMORY CACHE] {args.n_keys} chaves únicas: pico {r['peak_bytes'] / 1024:.0f}KiB "
+          f"(orçamento {args.max_bytes / 1024:.0f}KiB), {s['total_keys']} entradas, {s['evictions']} despejos")
+    print(f"[MEMORY CACHE] set: p50 {r['set']['p50_us']:.1f}us, p99 {r['set']['p99_us']:.1f}us")
+    print(f"[MEMORY CACHE] get (chaves quentes): p50 {r['get_hot']['p50_us']:.1f}us, "
+          f"p99 {r['get_hot']['p99_us']:.1f}us, hit ratio {s['hit_ratio']:.3f}")
+    print(f"[MEMORY CACHE] TTL vencido descartado na leitura: {r['expired_on_read']}")
+    
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "memory_cache_results.json"))
+    
+    if args.check_gate and (r["peak_bytes"] > args.max_bytes or not r["expired_on_read"]
+                            or r["get_hot"]["p99_us"] > args.target_p99_us):
+        print("[MEMORY CACHE] FALHOU: orçamento de bytes excedido, TTL ignorado ou latência acima da meta")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para o registro de modelos
+"""
+
+from .test_model_registry import (
+    run_benchmark,
+    time_load,
+    time_eager_load
+)
+
+__all__ = [
+    "run_benchmark",
+    "time_load",
+    "time_eager_load"
+]
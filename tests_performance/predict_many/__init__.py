@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para o kernel vetorizado de múltiplos cenários
+"""
+
+from .test_predict_many import (
+    run_benchmark,
+    make_grid,
+    time_model
+)
+
+__all__ = [
+    "run_benchmark",
+    "make_grid",
+    "time_model"
+]
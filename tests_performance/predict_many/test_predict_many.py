@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do kernel vetorizado PredictionService.predict_many: grade
+movimento x surpresa x regime em um único broadcast contra previsões
+individuais (predict_selic), para Local Projections e BVAR Minnesota.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from typing import Dict, Any
+
+import numpy as np
+
+from config import MODEL_CONFIG
+from src.api.schemas import PredictionRequest
+from src.core.config import get_settings
+from src.services.model_service import ModelService, LocalProjectionsModelService, BVARMinnesotaModelService
+from src.services.prediction_service import PredictionService
+from tests_performance.synthetic_data import generate_prediction_data, write_data_dir
+
+REGIMES = ("normal", "stress", "crisis", "recovery")
+
+# ---------- Dados ----------
+def make_grid(surprise_step: int) -> Dict[str, np.ndarray]:
+    """Grade completa movimento x surpresa x regime"""
+    settings = get_settings()
+    moves = np.arange(settings.MIN_FED_MOVE_BPS, settings.MAX_FED_MOVE_BPS + 1, settings.DISCRETIZATION_BPS)
+    surprises = np.arange(-14, 15, surprise_step)
+    M, S, R = np.meshgrid(moves, surprises, np.array(REGIMES, dtype=object), indexing="ij")
+    return {"fed_moves_bps": M.ravel(), "surprises_bps": S.ravel(), "regimes": R.ravel()}
+
+async def register_models(T: int, seed: int) -> None:
+    data = generate_prediction_data(T=T, seed=seed)
+    registry = ModelService()
+    lp = LocalProjectionsModelService(**MODEL_CONFIG["local_projections"])
+    await lp.train_model(data)
+    await registry.save_model("bench-lp", lp, "sha256:bench")
+    bvar = BVARMinnesotaModelService(**{**MODEL_CONFIG["bvar_minnesota"], "seed": seed})
+    await bvar.train_model(data)
+    await registry.save_model("bench-bvar", bvar, "sha256:bench")
+
+# ---------- Benchmarks ----------
+async def time_model(service: PredictionService, version: str, grid: Dict[str, np.ndarray],
+                     n_single: int, n_runs: int) -> Dict[str, Any]:
+    await service.preload_model(version)
+    
+    single = []
+    for i in range(n_single):
+        request = PredictionRequest(
+            fed_decision_date="2025-10-29",
+            fed_move_bps=int(grid["fed_moves_bps"][i]),
+            fed_surprise_bps=int(grid["surprises_bps"][i]),
+            regime_hint=grid["regimes"][i],
+            model_version=version
+        )
+        start = time.perf_counter()
+        await service.predict_selic(request)
+        single.append((time.perf_counter() - start) * 1000)
+    
+    many = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        result = await service.predict_many(**grid, model_version=version)
+        many.append((time.perf_counter() - start) * 1000)
+    
+    single_p50 = float(np.percentile(single, 50))
+    many_p50 = float(np.percentile(many, 50))
+    return {
+        "n_scenarios": len(result),
+        "single_p50_ms": single_p50,
+        "many_p50_ms": many_p50,
+        "loop_estimate_ms": single_p50 * len(result),
+        "cost_in_single_predictions": many_p50 / single_p50
+    }
+
+def run_benchmark(T: int, surprise_step: int, n_single: int, n_runs: int, seed: int) -> Dict[str, Any]:
+    settings = get_settings()
+    original_data_dir = settings.DATA_DIR
+    grid = make_grid(surprise_step)
+    
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_data_dir(data_dir, T=T, seed=seed)
+        settings.DATA_DIR = data_dir
+        try:
+            async def run() -> Dict[str, Any]:
+                await register_models(T, seed)
+                service = PredictionService()
+                return {
+                    "local_projections": await time_model(service, "bench-lp", grid, n_single, n_runs),
+                    "bvar_minnesota": await time_model(service, "bench-bvar", grid, n_single, n_runs)
+                }
+            results = asyncio.run(run())
+        finally:
+            settings.DATA_DIR = original_data_dir
+    
+    return {
+        "config": {"T": T, "surprise_step": surprise_step, "n_single": n_single, "n_runs": n_runs, "seed": seed},
+        "results": results
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do kernel vetorizado de múltiplos cenários")
+    ap.add_argument("--T", type=int, default=240)
+    ap.add_argument("--surprise-step", type=int, default=2)
+    ap.add_argument("--n-single", type=int, default=200)
+    ap.add_argument("--n-runs", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--max-cost", type=float, default=15.0, help="Custo máximo da grade em previsões individuais")
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.T, args.surprise_step, args.n_single, args.n_runs, args.seed)
+    
+    for name, r in res["results"].items():
+        print(f"[PREDICT MANY] {name}: {r['n_scenarios']} cenários em {r['many_p50_ms']:.2f}ms "
+              f"(individual p50 {r['single_p50_ms']:.3f}ms, laço estimado {r['loop_estimate_ms']:.0f}ms) "
+              f"= {r['cost_in_single_predictions']:.1f} previsões individuais")
+    
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "predict_many_results.json"))
+    
+    if args.check_gate and any(r["cost_in_single_predictions"] > args.max_cost for r in res["results"].values()):
+        print("[PREDICT MANY] FALHOU: grade custa mais que a meta em previsões individuais")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para o ProbabilityEngineService sobre arrays
+"""
+
+from .test_probability_engine import (
+    run_benchmark,
+    legacy_summary,
+    make_calendar
+)
+
+__all__ = [
+    "run_benchmark",
+    "legacy_summary",
+    "make_calendar"
+]
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do ProbabilityEngineService sobre arrays: resumo de draws da
+posterior do BVAR (n_draws x n_horizons) com o laço anterior por horizonte
+(pd.to_datetime e varredura do calendário a cada horizonte, contagem em
+dict) contra convert_draws (discretização, bincount, percentis e
+np.searchsorted em uma passada), conferindo que os resultados coincidem.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+from typing import Dict, Any
+
+import numpy as np
+import pandas as pd
+
+from config import MODEL_CONFIG
+from src.services.model_service import BVARMinnesotaModelService
+from src.services.probability_engine import ProbabilityEngineService
+from tests_performance.synthetic_data import generate_prediction_data
+
+STEP = 25
+REFERENCE_DATE = datetime(2025, 1, 1)
+
+# ---------- Dados ----------
+def make_calendar(n_years: int) -> pd.DataFrame:
+    """Oito reuniões por ano desde 2000 (datas em texto, como no repositório)"""
+    dates = pd.date_range("2000-01-20", periods=8 * n_years, freq="46D")
+    return pd.DataFrame({"date": dates.strftime("%Y-%m-%d"), "meeting_number": np.arange(1, len(dates) + 1)})
+
+async def simulate_draws(n_draws: int, horizon: int, T: int, seed: int) -> np.ndarray:
+    model = BVARMinnesotaModelService(**{**MODEL_CONFIG["bvar_minnesota"], "seed": seed})
+    await model.train_model(generate_prediction_data(T=T, seed=seed))
+    return model.simulate_paths(0.25, horizon, n_paths=n_draws, seed=seed)
+
+# ---------- Benchmarks ----------
+def legacy_summary(draws: np.ndarray, horizons: np.ndarray, calendar: pd.DataFrame) -> Dict[str, Any]:
+    """Comportamento anterior aplicado a draws: um horizonte por vez"""
+    meetings, expected, prob_move, ci80, ci95 = [], [], [], [], []
+    for j, h in enumerate(horizons):
+        # _find_copom_meeting: parse e varredura do calendário a cada horizonte
+        target = REFERENCE_DATE + timedelta(days=int(h) * 30)
+        copom_dates = pd.to_datetime(calendar["date"])
+        meetings.append(pd.Timestamp(calendar.iloc[copom_dates.sub(target).abs().idxmin()]["date"]))
+
+        # discretize_movements: contagem em dict
+        counts: Dict[int, int] = {}
+        for value in draws[:, j]:
+            move = round(value / STEP) * STEP
+            counts[move] = counts.get(move, 0) + 1
+        expected.append(round(float(np.mean(draws[:, j])) / STEP) * STEP)
+        prob_move.append(round((len(draws) - counts.get(0, 0)) / len(draws), 3))
+        ci80.append([round(np.percentile(draws[:, j], q) / STEP) * STEP for q in (10, 90)])
+        ci95.append([round(np.percentile(draws[:, j], q) / STEP) * STEP for q in (2.5, 97.5)])
+
+    distribution = [{"delta_bps": int(m), "probability": round(c / len(draws), 3)} for m, c in sorted(counts.items())]
+    return {"meetings": meetings, "expected": expected, "prob_move": prob_move,
+            "ci80": ci80, "ci95": ci95, "distribution": distribution}
+
+def engine_summary(prediction) -> Dict[str, Any]:
+    return {
+        "meetings": [pd.Timestamp(m.date) for m in prediction.per_meeting],
+        "expected": [m.expected_move_bps for m in prediction.per_meeting],
+        "prob_move": [m.probability for m in prediction.per_meeting],
+        "ci80": [list(m.confidence_interval_80) for m in prediction.per_meeting],
+        "ci95": [list(m.confidence_interval_95) for m in prediction.per_meeting],
+        "distribution": prediction.distribution
+    }
+
+def best_of(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(min(times))
+
+def run_benchmark(n_draws: int, horizon: int, n_years: int, repeats: int, T: int, seed: int) -> Dict[str, Any]:
+    draws = asyncio.run(simulate_draws(n_draws, horizon, T, seed))
+    horizons = np.arange(1, horizon + 1)
+    calendar = make_calendar(n_years)
+    engine = ProbabilityEngineService()
+    parsed = engine.parse_calendar(calendar)
+
+    def convert(cal):
+        return asyncio.run(engine.convert_draws(draws, horizons, cal, reference_date=REFERENCE_DATE))
+
+    legacy = legacy_summary(draws, horizons, calendar)
+    vectorized = engine_summary(convert(calendar))
+    return {
+        "config": {"n_draws": n_draws, "horizon": horizon, "calendar_meetings": len(calendar),
+                   "repeats": repeats, "T": T, "seed": seed},
+        "results": {
+            "legacy_ms": best_of(lambda: legacy_summary(draws, horizons, calendar), repeats),
+            "vectorized_ms": best_of(lambda: convert(calendar), repeats),
+            "vectorized_parsed_calendar_ms": best_of(lambda: convert(parsed), repeats),
+            "same_results": legacy == vectorized,
+            "mismatched_fields": [k for k in legacy if legacy[k] != vectorized[k]]
+        }
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do ProbabilityEngineService sobre draws (n_draws x n_horizons)")
+    ap.add_argument("--n-draws", type=int, default=20000)
+    ap.add_argument("--horizon", type=int, default=24)
+    ap.add_argument("--n-years", type=int, default=30)
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--T", type=int, default=240)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.n_draws, args.horizon, args.n_years, args.repeats, args.T, args.seed)
+
+    r = res["results"]
+    print(f"[PROBABILITY ENGINE] {args.n_draws} draws x {args.horizon} horizontes (BVAR), "
+          f"calendário de {res['config']['calendar_meetings']} reuniões")
+    print(f"[PROBABILITY ENGINE] laço por horizonte: {r['legacy_ms']:.1f}ms")
+    print(f"[PROBABILITY ENGINE] convert_draws: {r['vectorized_ms']:.1f}ms "
+          f"({r['legacy_ms'] / r['vectorized_ms']:.1f}x), calendário já convertido {r['vectorized_parsed_calendar_ms']:.1f}ms")
+    print(f"[PROBABILITY ENGINE] mesmos resultados: {r['same_results']} {r['mismatched_fields'] or ''}")
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "probability_engine_results.json"))
+
+    if args.check_gate and (not r["same_results"] or r["vectorized_ms"] * 5 > r["legacy_ms"]):
+        print("[PROBABILITY ENGINE] FALHOU: resultados divergentes ou ganho < 5x")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para a exposição Prometheus em modo multiprocesso
+"""
+
+from .test_prometheus_metrics import (
+    run_benchmark,
+    expected_counts,
+    parse_exposition
+)
+
+__all__ = [
+    "run_benchmark",
+    "expected_counts",
+    "parse_exposition"
+]
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark da exposição Prometheus do MetricsService em modo multiprocesso:
+N workers (processos, como os do uvicorn --workers) registram previsões,
+leituras do cache, cargas de modelo, lotes e rejeições do rate limit com
+PROMETHEUS_MULTIPROC_DIR definido; a exposição do processo coletor deve
+somar exatamente os valores de todos os workers. Mede também o custo por
+registro (processo único e multiprocesso) e o tempo de uma coleta.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, Any, List
+
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# ---------- Dados ----------
+def expected_counts(n_workers: int, n_predictions: int, hit_every: int, batch_size: int) -> Dict[str, float]:
+    """Valores esperados na exposição somada de todos os workers"""
+    hits = len(range(0, n_predictions, hit_every))
+    return {
+        'selic_prediction_latency_seconds_count{endpoint="predict_selic",model_version="v1.0.0"}':
+            float(n_workers * n_predictions),
+        'selic_span_duration_seconds_count{span="cache_lookup"}': float(n_workers * n_predictions),
+        'selic_prediction_cache_lookups_total{result="hit"}': float(n_workers * hits),
+        'selic_prediction_cache_lookups_total{result="miss"}': float(n_workers * (n_predictions - hits)),
+        'selic_model_load_seconds_count{model_version="v1.0.0",operation="compile"}': float(n_workers),
+        'selic_prediction_batch_size_sum': float(n_workers * batch_size),
+        'selic_rate_limit_rejections_total{tier="free",window="minute"}': float(n_workers)
+    }
+
+# ---------- Benchmarks ----------
+async def record_worker(n_predictions: int, hit_every: int, batch_size: int) -> float:
+    """Carga de um worker; retorna µs por previsão registrada (latência + span da etapa + cache)"""
+    from src.services.metrics_service import MetricsService
+    from src.services.tracing import Tracer
+
+    service = MetricsService()
+    tracer = Tracer()
+    tracer.add_listener(service.observe_span)
+    await service.record_model_load("compile", "v1.0.0", 120.0)
+    await service.record_batch_size(batch_size)
+    await service.record_rate_limit_rejection("free", "minute")
+
+    start = time.perf_counter()
+    for i in range(n_predictions):
+        with tracer.span("cache_lookup"):
+            pass
+        await service.record_cache_lookup(i % hit_every == 0)
+        await service.record_prediction_latency(None, 2.5, "predict_selic", "v1.0.0")
+    return (time.perf_counter() - start) / n_predictions * 1e6
+
+def parse_exposition(text: str) -> Dict[str, float]:
+    values = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            values[name] = float(value)
+    return values
+
+def spawn_workers(n_workers: int, n_predictions: int, hit_every: int, batch_size: int, directory: str) -> List[float]:
+    """Processos independentes gravando no diretório multiprocesso"""
+    env = {**os.environ, MULTIPROC_ENV: directory}
+    args = [sys.executable, "-m", "tests_performance.prometheus_metrics.test_prometheus_metrics", "--worker",
+            "--n-predictions", str(n_predictions), "--hit-every", str(hit_every), "--batch-size", str(batch_size)]
+    procs = [subprocess.Popen(args, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+             for _ in range(n_workers)]
+    return [float(proc.communicate()[0].strip().splitlines()[-1]) for proc in procs]
+
+def collect(directory: str, repeats: int) -> Dict[str, Any]:
+    """Exposição somada lida por um processo coletor (como o worker que atende /metrics)"""
+    env = {**os.environ, MULTIPROC_ENV: directory}
+    args = [sys.executable, "-m", "tests_performance.prometheus_metrics.test_prometheus_metrics", "--collect",
+            "--repeats", str(repeats)]
+    out = subprocess.run(args, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def collect_in_process(repeats: int) -> Dict[str, Any]:
+    from src.services.prometheus_metrics import render_latest
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        body, content_type = render_latest()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"scrape_ms": min(times), "content_type": content_type, "values": parse_exposition(body.decode())}
+
+def run_benchmark(n_workers: int, n_predictions: int, hit_every: int, batch_size: int, repeats: int) -> Dict[str, Any]:
+    single_us = float(subprocess.run(
+        [sys.executable, "-m", "tests_performance.prometheus_metrics.test_prometheus_metrics", "--worker",
+         "--n-predictions", str(n_predictions), "--hit-every", str(hit_every), "--batch-size", str(batch_size)],
+        env={k: v for k, v in os.environ.items() if k != MULTIPROC_ENV},
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True
+    ).stdout.strip().splitlines()[-1])
+
+    directory = tempfile.mkdtemp(prefix="prometheus_multiproc_")
+    try:
+        worker_us = spawn_workers(n_workers, n_predictions, hit_every, batch_size, directory)
+        collected = collect(directory, repeats)
+        n_files = len(os.listdir(directory))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    expected = expected_counts(n_workers, n_predictions, hit_every, batch_size)
+    mismatched = {k: [v, collected["values"].get(k)] for k, v in expected.items() if collected["values"].get(k) != v}
+    return {
+        "config": {"n_workers": n_workers, "n_predictions": n_predictions, "hit_every": hit_every,
+                   "batch_size": batch_size, "repeats": repeats},
+        "results": {
+            "single_process_record_us": single_us,
+            "multiprocess_record_us": sum(worker_us) / len(worker_us),
+            "scrape_ms": collected["scrape_ms"],
+            "content_type": collected["content_type"],
+            "multiprocess_files": n_files,
+            "aggregated": {k: collected["values"].get(k) for k in expected},
+            "aggregated_ok": not mismatched,
+            "mismatched": mismatched
+        }
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark da exposição Prometheus em modo multiprocesso")
+    ap.add_argument("--n-workers", type=int, default=4)
+    ap.add_argument("--n-predictions", type=int, default=20000)
+    ap.add_argument("--hit-every", type=int, default=3)
+    ap.add_argument("--batch-size", type=int, default=50)
+    ap.add_argument("--repeats", type=int, default=5)
+    ap.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--collect", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    if args.worker:
+        print(asyncio.run(record_worker(args.n_predictions, args.hit_every, args.batch_size)))
+        return
+    if args.collect:
+        print(json.dumps(collect_in_process(args.repeats)))
+        return
+
+    res = run_benchmark(args.n_workers, args.n_predictions, args.hit_every, args.batch_size, args.repeats)
+
+    r = res["results"]
+    print(f"[PROMETHEUS] {args.n_workers} workers x {args.n_predictions} previsões registradas")
+    print(f"[PROMETHEUS] registro por previsão: processo único {r['single_process_record_us']:.2f}µs, "
+          f"multiprocesso {r['multiprocess_record_us']:.2f}µs")
+    print(f"[PROMETHEUS] coleta somada de {r['multiprocess_files']} arquivos: {r['scrape_ms']:.2f}ms ({r['content_type']})")
+    print(f"[PROMETHEUS] soma dos workers exata: {r['aggregated_ok']} {r['mismatched'] or ''}")
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "prometheus_metrics_results.json"))
+
+    if args.check_gate and (not r["aggregated_ok"] or r["scrape_ms"] > 100):
+        print("[PROMETHEUS] FALHOU: exposição diverge da soma dos workers ou coleta > 100ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para o rate limiter GCRA particionado
+"""
+
+from .test_rate_limiter import (
+    run_benchmark,
+    LegacyRateLimiter,
+    make_traffic
+)
+
+__all__ = [
+    "run_benchmark",
+    "LegacyRateLimiter",
+    "make_traffic"
+]
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do rate limiter: N chaves de API concorrentes (10k por padrão) com
+o limitador anterior (deque com o horário de cada request por minuto e por
+dia, limpeza por chave e asyncio.Lock global) contra o ShardedRateLimiter
+(GCRA, estado O(1) por chave, partições com lock próprio), com vazão,
+memória do estado por chave, rajada aceita por tier e remoção de chaves
+ociosas (relógio simulado).
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tracemalloc
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Dict, Any, List
+
+import numpy as np
+
+from src.services.rate_limiter import RateLimitConfig, ShardedRateLimiter
+
+# ---------- Dados ----------
+def make_keys(n_keys: int) -> List[str]:
+    return [f"key-{i:06d}" for i in range(n_keys)]
+
+def make_traffic(keys: List[str], n_requests: int, seed: int) -> List[str]:
+    """Sequência de requests com chaves sorteadas (algumas chaves muito mais ativas)"""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, len(keys) + 1) ** 0.8
+    picks = rng.choice(len(keys), size=n_requests, p=weights / weights.sum())
+    return [keys[i] for i in picks]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+# ---------- Benchmarks ----------
+class LegacyRateLimiter:
+    """RateLimitMiddleware anterior: deque de horários por chave e lock global"""
+
+    def __init__(self, max_requests_per_minute: int, max_requests_per_day: int):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_requests_per_day = max_requests_per_day
+        self.requests_per_minute: Dict[str, deque] = defaultdict(lambda: deque())
+        self.requests_per_day: Dict[str, deque] = defaultdict(lambda: deque())
+        self._lock = asyncio.Lock()
+
+    async def check(self, api_key: str) -> bool:
+        async with self._lock:
+            now = datetime.now()
+            minute_ago = now - timedelta(minutes=1)
+            while self.requests_per_minute[api_key] and self.requests_per_minute[api_key][0] < minute_ago:
+                self.requests_per_minute[api_key].popleft()
+            day_ago = now - timedelta(days=1)
+            while self.requests_per_day[api_key] and self.requests_per_day[api_key][0] < day_ago:
+                self.requests_per_day[api_key].popleft()
+            if len(self.requests_per_minute[api_key]) >= self.max_requests_per_minute:
+                return False
+            if len(self.requests_per_day[api_key]) >= self.max_requests_per_day:
+                return False
+            self.requests_per_minute[api_key].append(now)
+            self.requests_per_day[api_key].append(now)
+            return True
+
+async def drive(check, traffic: List[str], concurrency: int) -> Dict[str, float]:
+    """concurrency clientes consumindo a sequência de requests"""
+    position = iter(traffic)
+    accepted = 0
+
+    async def client():
+        nonlocal accepted
+        for key in position:
+            accepted += bool(await check(key))
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "checks_per_s": len(traffic) / elapsed, "accepted": accepted}
+
+def per_check_us(check, traffic: List[str]) -> float:
+    """Custo de uma verificação sem o agendamento dos clientes (µs)"""
+    async def run() -> float:
+        start = time.perf_counter()
+        for key in traffic:
+            await check(key)
+        return (time.perf_counter() - start) / len(traffic) * 1e6
+    return asyncio.run(run())
+
+def state_memory(build) -> float:
+    """Memória alocada (MB) pelo estado após aplicar o tráfego"""
+    tracemalloc.start()
+    limiter = build()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del limiter
+    return current / 1e6
+
+def burst_check(config: RateLimitConfig) -> Dict[str, Any]:
+    """Por tier: rajada aceita no mesmo instante, retry-after e recuperação após o intervalo"""
+    results = {}
+    for tier, limits in config.limits.items():
+        clock = FakeClock()
+        limiter = ShardedRateLimiter(RateLimitConfig(key_tiers={"k": tier}), clock=clock)
+        accepted = sum(limiter.check("k").allowed for _ in range(limits["requests_per_minute"] + 5))
+        rejected = limiter.check("k")
+        clock.now += rejected.retry_after
+        results[tier] = {
+            "limit_per_minute": limits["requests_per_minute"],
+            "burst_accepted": accepted,
+            "retry_after_s": rejected.retry_after,
+            "accepted_after_retry": limiter.check("k").allowed
+        }
+    return results
+
+def eviction_check(traffic: List[str], sweep_interval: float) -> Dict[str, Any]:
+    """Chaves mantidas enquanto alguma janela está consumida e removidas quando voltam ao limite cheio"""
+    clock = FakeClock()
+    limiter = ShardedRateLimiter(RateLimitConfig(), sweep_interval=sweep_interval, clock=clock)
+    for key in traffic:
+        limiter.check(key)
+    tracked = len(limiter)
+    clock.now += sweep_interval
+    evicted_early = limiter.evict_idle()
+
+    # Um dia depois todas as janelas estão cheias; cada partição é varrida no
+    # próximo request que chega a ela (chaves novas, que ficam rastreadas)
+    clock.now += 86400
+    probes = [f"probe-{i}" for i in range(limiter.n_shards * 16)]
+    for key in probes:
+        limiter.check(key)
+    return {"tracked": tracked, "evicted_with_consumed_windows": evicted_early,
+            "tracked_after_day": len(limiter) - len(probes)}
+
+def run_benchmark(n_keys: int, n_requests: int, concurrency: int, n_shards: int, seed: int) -> Dict[str, Any]:
+    config = RateLimitConfig(key_tiers={}, default_tier="enterprise")
+    limits = config.get_limits_for_key("key")
+    keys = make_keys(n_keys)
+    traffic = make_traffic(keys, n_requests, seed)
+
+    def build_legacy():
+        legacy = LegacyRateLimiter(limits["requests_per_minute"], limits["requests_per_day"])
+        asyncio.run(drive(legacy.check, traffic, concurrency))
+        return legacy
+
+    def build_sharded():
+        sharded = ShardedRateLimiter(config, n_shards=n_shards, clock=FakeClock())
+        asyncio.run(drive(lambda key: _async_check(sharded, key), traffic, concurrency))
+        return sharded
+
+    # Relógio do GCRA parado: a rodada cabe em um minuto do limitador anterior, e os aceitos devem coincidir
+    legacy = LegacyRateLimiter(limits["requests_per_minute"], limits["requests_per_day"])
+    sharded = ShardedRateLimiter(config, n_shards=n_shards, clock=FakeClock())
+    legacy_run = asyncio.run(drive(legacy.check, traffic, concurrency))
+    sharded_run = asyncio.run(drive(lambda key: _async_check(sharded, key), traffic, concurrency))
+
+    legacy_us = per_check_us(LegacyRateLimiter(limits["requests_per_minute"], limits["requests_per_day"]).check, traffic)
+    fresh = ShardedRateLimiter(config, n_shards=n_shards, clock=FakeClock())
+    sharded_us = per_check_us(lambda key: _async_check(fresh, key), traffic)
+
+    return {
+        "config": {"n_keys": n_keys, "n_requests": n_requests, "concurrency": concurrency,
+                   "n_shards": n_shards, "limits": limits, "seed": seed},
+        "results": {
+            "legacy": {**legacy_run, "state_mb": state_memory(build_legacy), "check_us": legacy_us},
+            "sharded": {**sharded_run, "state_mb": state_memory(build_sharded), "tracked_keys": len(sharded),
+                        "check_us": sharded_us},
+            "burst": burst_check(config),
+            "eviction": eviction_check(traffic[:20000], sweep_interval=60.0)
+        }
+    }
+
+async def _async_check(limiter: ShardedRateLimiter, key: str) -> bool:
+    return limiter.check(key).allowed
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do rate limiter GCRA particionado com muitas chaves concorrentes")
+    ap.add_argument("--n-keys", type=int, default=10000)
+    ap.add_argument("--n-requests", type=int, default=200000)
+    ap.add_argument("--concurrency", type=int, default=500)
+    ap.add_argument("--n-shards", type=int, default=64)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.n_keys, args.n_requests, args.concurrency, args.n_shards, args.seed)
+
+    r = res["results"]
+    legacy, sharded = r["legacy"], r["sharded"]
+    print(f"[RATE LIMITER] {args.n_requests} requests, {args.n_keys} chaves, {args.concurrency} clientes concorrentes")
+    print(f"[RATE LIMITER] deque + lock global: {legacy['checks_per_s']:,.0f} verificações/s, "
+          f"{legacy['check_us']:.2f}µs por verificação, estado {legacy['state_mb']:.1f}MB, {legacy['accepted']} aceitos")
+    print(f"[RATE LIMITER] GCRA particionado: {sharded['checks_per_s']:,.0f} verificações/s, "
+          f"{sharded['check_us']:.2f}µs por verificação, estado {sharded['state_mb']:.1f}MB, {sharded['accepted']} aceitos")
+    for tier, b in r["burst"].items():
+        print(f"[RATE LIMITER] tier {tier}: rajada {b['burst_accepted']}/{b['limit_per_minute']} aceita, "
+              f"retry-after {b['retry_after_s']:.2f}s, aceito após espera: {b['accepted_after_retry']}")
+    e = r["eviction"]
+    print(f"[RATE LIMITER] chaves ociosas: {e['tracked']} rastreadas, {e['evicted_with_consumed_windows']} removidas "
+          f"com janelas ainda consumidas, {e['tracked_after_day']} após um dia")
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "rate_limiter_results.json"))
+
+    burst_ok = all(b["burst_accepted"] == b["limit_per_minute"] and b["accepted_after_retry"] for b in r["burst"].values())
+    if args.check_gate and (not burst_ok or sharded["accepted"] != legacy["accepted"]
+                            or sharded["check_us"] >= legacy["check_us"]
+                            or sharded["state_mb"] >= legacy["state_mb"]
+                            or e["evicted_with_consumed_windows"] > 0 or e["tracked_after_day"] > 0):
+        print("[RATE LIMITER] FALHOU: limites divergentes, sem ganho de vazão/memória ou chaves ociosas retidas")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
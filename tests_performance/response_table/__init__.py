@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para a tabela de resposta ao impulso
+"""
+
+from .test_response_table import (
+    run_benchmark,
+    time_table_build,
+    time_predictions
+)
+
+__all__ = [
+    "run_benchmark",
+    "time_table_build",
+    "time_predictions"
+]
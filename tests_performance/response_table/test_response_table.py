@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do serving por tabela pré-computada: compilação na ativação e
+latência de PredictionService.predict_selic para células da grade
+(fed_move_bps x horizonte x regime) e para choques fora da grade.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Dict, Any, List
+
+import numpy as np
+
+from src.api.schemas import PredictionRequest
+from src.services.prediction_service import PredictionService
+from tests_performance.synthetic_data import generate_prediction_data
+
+VERSION = "benchmark"
+
+# ---------- Requests ----------
+def grid_requests(service: PredictionService, n_requests: int, seed: int) -> List[PredictionRequest]:
+    rng = np.random.default_rng(seed)
+    settings = service.settings
+    moves = np.arange(settings.MIN_FED_MOVE_BPS, settings.MAX_FED_MOVE_BPS + 1, settings.DISCRETIZATION_BPS)
+    regimes = list(service._regime_scales)
+    
+    requests = []
+    for _ in range(n_requests):
+        n_horizons = rng.integers(1, 5)
+        horizons = rng.choice(np.arange(1, settings.MAX_HORIZONS + 1), size=n_horizons, replace=False)
+        requests.append(PredictionRequest(
+            fed_decision_date="2025-10-29",
+            fed_move_bps=int(rng.choice(moves)),
+            horizons_months=sorted(horizons.tolist()),
+            regime_hint=regimes[rng.integers(len(regimes))],
+            model_version=VERSION
+        ))
+    return requests
+
+def off_grid_requests(requests: List[PredictionRequest]) -> List[PredictionRequest]:
+    # Surpresa não múltipla de 25 bps força o cálculo direto
+    return [r.model_copy(update={"fed_surprise_bps": 10}) for r in requests]
+
+# ---------- Benchmarks ----------
+def time_table_build(service: PredictionService, data) -> Dict[str, Any]:
+    response_model = asyncio.run(service._select_response_model(data))
+    table = asyncio.run(service.activate_response_model(VERSION, response_model=response_model))
+    return {
+        "build_time_ms": table.build_time_ms,
+        "n_cells": table.n_cells,
+        "model_type": table.model_type
+    }
+
+def time_predictions(service: PredictionService, requests: List[PredictionRequest]) -> Dict[str, Any]:
+    async def run() -> List[float]:
+        for request in requests[:100]:  # aquecimento
+            await service.predict_selic(request)
+        
+        timings = []
+        for request in requests:
+            start = time.perf_counter()
+            await service.predict_selic(request)
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+    
+    timings = asyncio.run(run())
+    return {
+        "n_requests": len(timings),
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "max_ms": float(np.max(timings))
+    }
+
+def run_benchmark(T: int, n_requests: int, seed: int) -> Dict[str, Any]:
+    service = PredictionService()
+    data = generate_prediction_data(T=T, seed=seed)
+    requests = grid_requests(service, n_requests, seed)
+    
+    return {
+        "config": {"T": T, "n_requests": n_requests, "seed": seed},
+        "results": {
+            "build": time_table_build(service, data),
+            "table_hit": time_predictions(service, requests),
+            "off_grid": time_predictions(service, off_grid_requests(requests))
+        }
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do serving por tabela de resposta pré-computada")
+    ap.add_argument("--T", type=int, default=240)
+    ap.add_argument("--n-requests", type=int, default=10_000)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--target-p99-ms", type=float, default=1.0)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.T, args.n_requests, args.seed)
+    
+    build = res["results"]["build"]
+    print(f"[RESPONSE TABLE] compilação: {build['n_cells']} células ({build['model_type']}) "
+          f"em {build['build_time_ms']:.1f}ms")
+    for name in ("table_hit", "off_grid"):
+        vals = res["results"][name]
+        print(f"[RESPONSE TABLE] {name}: p50 {vals['p50_ms']:.3f}ms, p99 {vals['p99_ms']:.3f}ms, "
+              f"máx {vals['max_ms']:.3f}ms")
+    
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "response_table_results.json"))
+    
+    if args.check_gate and res["results"]["table_hit"]["p99_ms"] > args.target_p99_ms:
+        print(f"[RESPONSE TABLE] FALHOU: p99 acima de {args.target_p99_ms}ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
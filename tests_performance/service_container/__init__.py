@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para o container de serviços
+"""
+
+from .test_service_container import (
+    run_benchmark,
+    time_per_request_construction,
+    time_container
+)
+
+__all__ = [
+    "run_benchmark",
+    "time_per_request_construction",
+    "time_container"
+]
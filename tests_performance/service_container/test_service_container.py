@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do PredictionService singleton (ServiceFactory no lifespan) contra
+a construção de um PredictionService novo por request, que descarta modelo
+carregado, tabela de resposta e dados memoizados a cada chamada.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from typing import Dict, Any, List
+
+import numpy as np
+
+from src.api.schemas import PredictionRequest
+from src.core.config import get_settings
+from src.factories.service_factory import ServiceFactory
+from src.services.prediction_service import PredictionService
+from tests_performance.synthetic_data import write_data_dir
+
+# ---------- Benchmarks ----------
+def summarize(timings: List[float]) -> Dict[str, Any]:
+    return {
+        "n_requests": len(timings),
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "mean_ms": float(np.mean(timings))
+    }
+
+async def time_per_request_construction(request: PredictionRequest, n_requests: int) -> Dict[str, Any]:
+    construction, total = [], []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        service = PredictionService()
+        construction.append((time.perf_counter() - start) * 1000)
+        await service.predict_selic(request)
+        total.append((time.perf_counter() - start) * 1000)
+    
+    return {"construction": summarize(construction), "total": summarize(total)}
+
+async def time_container(request: PredictionRequest, n_requests: int) -> Dict[str, Any]:
+    factory = ServiceFactory(config={})
+    await (await factory.create_prediction_service()).predict_selic(request)  # startup (lifespan)
+    
+    lookup, total = [], []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        service = await factory.create_prediction_service()
+        lookup.append((time.perf_counter() - start) * 1000)
+        await service.predict_selic(request)
+        total.append((time.perf_counter() - start) * 1000)
+    
+    return {"construction": summarize(lookup), "total": summarize(total)}
+
+def run_benchmark(T: int, n_requests: int, seed: int) -> Dict[str, Any]:
+    request = PredictionRequest(fed_decision_date="2025-10-29", fed_move_bps=25)
+    settings = get_settings()
+    original_data_dir = settings.DATA_DIR
+    
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_data_dir(data_dir, T=T, seed=seed)
+        settings.DATA_DIR = data_dir
+        try:
+            results = {
+                "container": asyncio.run(time_container(request, n_requests)),
+                "per_request": asyncio.run(time_per_request_construction(request, n_requests))
+            }
+        finally:
+            settings.DATA_DIR = original_data_dir
+    
+    results["speedup_p50"] = results["per_request"]["total"]["p50_ms"] / results["container"]["total"]["p50_ms"]
+    return {
+        "config": {"T": T, "n_requests": n_requests, "seed": seed},
+        "results": results
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do PredictionService singleton vs construção por request")
+    ap.add_argument("--T", type=int, default=240)
+    ap.add_argument("--n-requests", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--target-lookup-ms", type=float, default=0.05)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.T, args.n_requests, args.seed)
+    
+    for name in ("per_request", "container"):
+        vals = res["results"][name]
+        print(f"[SERVICE CONTAINER] {name}: obtenção do serviço p50 {vals['construction']['p50_ms']:.3f}ms, "
+              f"request completo p50 {vals['total']['p50_ms']:.3f}ms / p99 {vals['total']['p99_ms']:.3f}ms")
+    print(f"[SERVICE CONTAINER] speedup p50: {res['results']['speedup_p50']:.0f}x")
+    
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "service_container_results.json"))
+    
+    if args.check_gate and res["results"]["container"]["construction"]["p99_ms"] > args.target_lookup_ms:
+        print(f"[SERVICE CONTAINER] FALHOU: obtenção do singleton acima de {args.target_lookup_ms}ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
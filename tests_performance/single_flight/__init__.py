@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para a coalescência (single-flight) de previsões
+"""
+
+from .test_single_flight import (
+    run_benchmark,
+    run_bursts,
+    make_bursts
+)
+
+__all__ = [
+    "run_benchmark",
+    "run_bursts",
+    "make_bursts"
+]
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark da coalescência de previsões: rajadas de requests idênticos
+concorrentes (a decisão do Fed saiu) sem single-flight, onde cada request
+consulta o cache, erra e calcula (comportamento anterior), contra
+PredictionService.predict_selic com single-flight, sobre cache fakeredis e
+cenários fora da grade (simulação BVAR).
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from typing import Dict, Any, List
+
+import fakeredis
+import numpy as np
+
+from config import MODEL_CONFIG
+from src.api.schemas import PredictionRequest
+from src.core.config import get_settings
+from src.services.cache_service import RedisCacheService
+from src.services.metrics_service import MetricsService
+from src.services.model_service import ModelService, BVARMinnesotaModelService
+from src.services.prediction_service import PredictionService
+from tests_performance.synthetic_data import generate_prediction_data, write_data_dir
+
+VERSION = "bench-bvar"
+
+# ---------- Dados ----------
+def make_bursts(n_bursts: int) -> List[PredictionRequest]:
+    """Um cenário fora da grade por rajada (cache frio no início de cada uma)"""
+    surprises = [s for s in range(-24, 25) if s % 25]
+    return [
+        PredictionRequest(
+            fed_decision_date="2025-10-29",
+            fed_move_bps=25 * (i % 5 - 2),
+            fed_surprise_bps=surprises[i % len(surprises)],
+            model_version=VERSION
+        )
+        for i in range(n_bursts)
+    ]
+
+async def register_bvar(T: int, seed: int) -> None:
+    model = BVARMinnesotaModelService(**{**MODEL_CONFIG["bvar_minnesota"], "seed": seed})
+    await model.train_model(generate_prediction_data(T=T, seed=seed))
+    await ModelService().save_model(VERSION, model, "sha256:bench", activate=True)
+
+def instrument(service: PredictionService) -> Dict[str, int]:
+    """Contar computações do modelo e leituras do cache"""
+    counts = {"computations": 0, "cache_reads": 0}
+    make_prediction, get_cached = service._make_prediction, service.cache_service.get_cached_prediction
+    
+    def counted_make_prediction(*args, **kwargs):
+        counts["computations"] += 1
+        return make_prediction(*args, **kwargs)
+    
+    async def counted_get_cached(*args, **kwargs):
+        counts["cache_reads"] += 1
+        return await get_cached(*args, **kwargs)
+    
+    service._make_prediction = counted_make_prediction
+    service.cache_service.get_cached_prediction = counted_get_cached
+    return counts
+
+# ---------- Benchmarks ----------
+async def run_bursts(bursts: List[PredictionRequest], concurrency: int, coalesce: bool) -> Dict[str, Any]:
+    metrics = MetricsService()
+    service = PredictionService(cache_service=RedisCacheService(redis_client=fakeredis.FakeAsyncRedis()),
+                                metrics_service=metrics)
+    await service.preload_model(VERSION)
+    counts = instrument(service)
+    
+    async def call(request: PredictionRequest):
+        if coalesce:
+            return await service.predict_selic(request)
+        # Comportamento anterior: cada request consulta o cache e calcula por conta própria
+        version = await service.model_service.resolve_version(request.model_version)
+        return await service._predict_cached(service._cache_key(request, version), request, version)
+    
+    latencies, identical = [], True
+    for request in bursts:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(call(request) for _ in range(concurrency)))
+        latencies.append((time.perf_counter() - start) * 1000)
+        identical &= all(r == responses[0] for r in responses)
+    
+    return {
+        **counts,
+        "burst_p50_ms": float(np.percentile(latencies, 50)),
+        "identical_responses": identical,
+        "coalescing": metrics.get_coalescing_metrics()
+    }
+
+def run_benchmark(n_bursts: int, concurrency: int, T: int, seed: int) -> Dict[str, Any]:
+    settings = get_settings()
+    original_data_dir = settings.DATA_DIR
+    bursts = make_bursts(n_bursts)
+    
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_data_dir(data_dir, T=T, seed=seed)
+        settings.DATA_DIR = data_dir
+        try:
+            async def run() -> Dict[str, Any]:
+                await register_bvar(T, seed)
+                return {
+                    "stampede": await run_bursts(bursts, concurrency, coalesce=False),
+                    "single_flight": await run_bursts(bursts, concurrency, coalesce=True)
+                }
+            results = asyncio.run(run())
+        finally:
+            settings.DATA_DIR = original_data_dir
+    
+    return {
+        "config": {"n_bursts": n_bursts, "concurrency": concurrency, "T": T, "seed": seed},
+        "results": results
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark da coalescência (single-flight) de previsões idênticas")
+    ap.add_argument("--n-bursts", type=int, default=10)
+    ap.add_argument("--concurrency", type=int, default=50)
+    ap.add_argument("--T", type=int, default=240)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.n_bursts, args.concurrency, args.T, args.seed)
+    
+    s, f = res["results"]["stampede"], res["results"]["single_flight"]
+    print(f"[SINGLE FLIGHT] {args.n_bursts} rajadas de {args.concurrency} requests idênticos")
+    print(f"[SINGLE FLIGHT] sem coalescência: {s['computations']} computações, {s['cache_reads']} leituras do cache, "
+          f"rajada p50 {s['burst_p50_ms']:.1f}ms")
+    print(f"[SINGLE FLIGHT] single-flight: {f['computations']} computações, {f['cache_reads']} leituras do cache, "
+          f"rajada p50 {f['burst_p50_ms']:.1f}ms")
+    print(f"[SINGLE FLIGHT] métricas: {f['coalescing']['leaders']} líderes, {f['coalescing']['coalesced']} coalescidas "
+          f"(hit ratio {f['coalescing']['hit_ratio']:.3f}); respostas idênticas: {f['identical_responses']}")
+    
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "single_flight_results.json"))
+    
+    if args.check_gate and (f["computations"] != args.n_bursts or f["cache_reads"] != args.n_bursts
+                            or f["coalescing"]["coalesced"] != args.n_bursts * (args.concurrency - 1)
+                            or not f["identical_responses"] or f["burst_p50_ms"] >= s["burst_p50_ms"]):
+        print("[SINGLE FLIGHT] FALHOU: requests idênticos concorrentes não foram coalescidos")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Séries sintéticas Fed-Selic para benchmarks de performance.
+A Selic responde aos movimentos do Fed com defasagem (spillover conhecido).
+"""
+
+from __future__ import annotations
+import os
+
+import numpy as np
+import pandas as pd
+
+def generate_fed_selic(T: int = 240, spillover: float = 0.6, persistence: float = 0.3,
+                       noise: float = 0.1, seed: int = 42) -> pd.DataFrame:
+    """Gerar DataFrame mensal com colunas fed_rate e selic"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2005-01-01", periods=T, freq="MS", name="date")
+    
+    fed = 1.0 + np.clip(np.cumsum(rng.choice([-0.25, 0.0, 0.0, 0.0, 0.25], T)), -1.0, None)
+    fed_change = np.diff(fed, prepend=fed[0])
+    
+    selic = np.empty(T)
+    selic[:2] = 12.0
+    for t in range(2, T):
+        selic[t] = (selic[t - 1] + spillover * fed_change[t - 1]
+                    + persistence * (selic[t - 1] - selic[t - 2]) + rng.normal(0.0, noise))
+    
+    return pd.DataFrame({"fed_rate": fed, "selic": selic}, index=index)
+
+def generate_prediction_data(T: int = 240, seed: int = 42) -> pd.DataFrame:
+    """Gerar dados no formato de DataService.get_prediction_data"""
+    data = generate_fed_selic(T=T, seed=seed)
+    data["fed_change"] = data["fed_rate"].diff()
+    data["selic_change"] = data["selic"].diff()
+    data["spillover"] = data["fed_rate"] - data["selic"]
+    data["spillover_change"] = data["spillover"].diff()
+    return data.dropna()
+
+def write_data_dir(data_dir: str, T: int = 240, seed: int = 42) -> str:
+    """Gravar raw/fed_selic_combined.csv sintético em data_dir (layout de settings.DATA_DIR)"""
+    raw_dir = os.path.join(data_dir, "raw")
+    os.makedirs(raw_dir, exist_ok=True)
+    path = os.path.join(raw_dir, "fed_selic_combined.csv")
+    generate_fed_selic(T=T, seed=seed).to_csv(path)
+    return path
@@ -0,0 +1,19 @@
+"""
+Pacote de benchmarks de performance para o cache em dois níveis (L1 por worker + Redis)
+"""
+
+from .test_tiered_cache import (
+    run_benchmark,
+    bench_reads,
+    bench_invalidation,
+    bench_negative,
+    make_workload
+)
+
+__all__ = [
+    "run_benchmark",
+    "bench_reads",
+    "bench_invalidation",
+    "bench_negative",
+    "make_workload"
+]
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do cache em dois níveis: leituras com chaves quentes (Zipf) só no
+Redis (L2) contra L1 por worker na frente do Redis, tempo de propagação das
+invalidações publicadas entre dois workers, e cache negativo de falhas de
+validação. O Redis local substituto é um servidor TCP do fakeredis em
+processo separado.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Dict, Any, List
+
+import numpy as np
+
+from src.api.schemas import PredictionRequest
+from src.services.cache_service import RedisCacheService
+from src.services.prediction_service import PredictionService
+from tests_performance.async_redis.test_async_redis import start_server
+
+PAYLOAD = {"expected_move_bps": 25, "distribution": [{"delta_bps": d, "probability": 0.1} for d in range(-100, 125, 25)]}
+VERSION = "v1.0.0"
+
+# ---------- Dados ----------
+def make_workload(n_keys: int, n_reads: int, zipf_a: float, seed: int = 7) -> List[str]:
+    # Popularidade Zipf: poucas chaves concentram a maior parte das leituras
+    rng = np.random.default_rng(seed)
+    ranks = rng.zipf(zipf_a, size=n_reads * 2)
+    ranks = ranks[ranks <= n_keys][:n_reads] - 1
+    return [f"prediction:{VERSION}:hot{i}" for i in ranks]
+
+# ---------- Benchmarks ----------
+async def bench_reads(url: str, workload: List[str], l1_max_entries: int) -> Dict[str, Any]:
+    service = RedisCacheService(redis_url=url, l1_max_entries=l1_max_entries)
+    try:
+        keys = sorted(set(workload))
+        # Escrita por outro worker: o L1 deste começa frio
+        writer = RedisCacheService(redis_url=url, l1_max_entries=0)
+        await writer.set_many({key: PAYLOAD for key in keys}, 3600)
+        await writer.cleanup()
+
+        latencies = []
+        for key in workload:
+            start = time.perf_counter()
+            value = await service.get_cached_prediction(key)
+            latencies.append(time.perf_counter() - start)
+            assert value is not None
+
+        lat_us = np.array(latencies) * 1e6
+        l1 = service._l1.get_stats() if service._l1 is not None else None
+        return {
+            "backend": "redis" if service.redis_client is not None else "memory",
+            "reads": len(workload),
+            "distinct_keys": len(keys),
+            "p50_us": float(np.percentile(lat_us, 50)),
+            "p99_us": float(np.percentile(lat_us, 99)),
+            "total_ms": float(lat_us.sum() / 1000),
+            # Sem L1 toda leitura vai ao Redis; com L1 só os misses
+            "redis_round_trips": l1["misses"] if l1 else len(workload),
+            "l1_hit_ratio": l1["hit_ratio"] if l1 else 0.0
+        }
+    finally:
+        await service.cleanup()
+
+async def wait_dropped(service: RedisCacheService, version: str, start: float) -> float:
+    # Até o L1 do outro worker descartar a versão (limite de 1s)
+    while version in service._l1.tags() and time.perf_counter() - start < 1.0:
+        await asyncio.sleep(0.0005)
+    return (time.perf_counter() - start) * 1000
+
+async def bench_invalidation(url: str, trials: int, n_keys: int) -> Dict[str, Any]:
+    publisher = RedisCacheService(redis_url=url)
+    subscriber = RedisCacheService(redis_url=url)
+    try:
+        await publisher._get_client()
+        await subscriber._get_client()
+        # Aguardar a inscrição no canal
+        await asyncio.sleep(0.2)
+
+        activation_ms, invalidation_ms, call_ms, stale_reads = [], [], [], 0
+        for trial in range(trials):
+            old = [f"prediction:{VERSION}:t{trial}-{i}" for i in range(n_keys)]
+            new = [f"prediction:v2.0.0:t{trial}-{i}" for i in range(n_keys)]
+            await publisher.set_many({key: PAYLOAD for key in old + new}, 3600)
+            await subscriber.get_many(old + new)
+
+            # Ativação: só a publicação; o outro worker descarta as demais versões
+            start = time.perf_counter()
+            await publisher.notify_model_activation("v2.0.0")
+            activation_ms.append(await wait_dropped(subscriber, VERSION, start))
+            assert subscriber._l1.tags() == ["v2.0.0"]
+
+            # Invalidação: remoção no Redis (índice + UNLINK) e publicação
+            start = time.perf_counter()
+            await publisher.invalidate_model_cache("v2.0.0")
+            call_ms.append((time.perf_counter() - start) * 1000)
+            invalidation_ms.append(await wait_dropped(subscriber, "v2.0.0", start))
+            # Ativar não remove do Redis (v1 segue legível); a versão invalidada some dos dois níveis
+            stale_reads += sum(v is not None for v in await subscriber.get_many(new))
+
+        return {
+            "trials": trials,
+            "keys_per_trial": 2 * n_keys,
+            "activation_p50_ms": float(np.percentile(activation_ms, 50)),
+            "activation_max_ms": float(max(activation_ms)),
+            "invalidate_call_p50_ms": float(np.percentile(call_ms, 50)),
+            "invalidation_p50_ms": float(np.percentile(invalidation_ms, 50)),
+            "invalidation_max_ms": float(max(invalidation_ms)),
+            "stale_reads": stale_reads,
+            "invalidated_in_l1": "v2.0.0" in subscriber._l1.tags()
+        }
+    finally:
+        await publisher.cleanup()
+        await subscriber.cleanup()
+
+async def bench_negative(url: str, repeats: int) -> Dict[str, Any]:
+    # Falha detectada no serviço (não no schema): direção incompatível com o movimento
+    request = PredictionRequest(fed_decision_date="2025-01-01", fed_move_bps=25, fed_move_dir="-1")
+    results = {}
+    for label, cache in (("without_cache", None), ("with_cache", RedisCacheService(redis_url=url))):
+        service = PredictionService(cache_service=cache)
+        first = await service.validate_request(request)
+        # Melhor de 5 rodadas: as duas variantes diferem em ~1-2us por chamada
+        rounds = []
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                result = await service.validate_request(request)
+            rounds.append((time.perf_counter() - start) / repeats * 1e6)
+        results[label] = {
+            "us_per_call": min(rounds),
+            "same_result": result == first,
+            "valid": result["valid"]
+        }
+        if cache is not None:
+            results[label]["negative"] = cache._negative_cache.get_stats()
+            await cache.cleanup()
+    return results
+
+async def run_all(url: str, workload: List[str], trials: int, n_keys: int, repeats: int) -> Dict[str, Any]:
+    return {
+        "l2_only": await bench_reads(url, workload, l1_max_entries=0),
+        "tiered": await bench_reads(url, workload, l1_max_entries=2048),
+        "invalidation": await bench_invalidation(url, trials, n_keys),
+        "negative": await bench_negative(url, repeats)
+    }
+
+def run_benchmark(n_keys: int, n_reads: int, zipf_a: float, trials: int, repeats: int) -> Dict[str, Any]:
+    proc, url = start_server()
+    try:
+        workload = make_workload(n_keys, n_reads, zipf_a)
+        return {
+            "config": {"n_keys": n_keys, "n_reads": n_reads, "zipf_a": zipf_a, "trials": trials, "repeats": repeats},
+            "results": asyncio.run(run_all(url, workload, trials, n_keys=20, repeats=repeats))
+        }
+    finally:
+        proc.terminate()
+        proc.join()
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do cache em dois níveis (L1 por worker + Redis)")
+    ap.add_argument("--n-keys", type=int, default=500)
+    ap.add_argument("--n-reads", type=int, default=5000)
+    ap.add_argument("--zipf-a", type=float, default=1.2)
+    ap.add_argument("--trials", type=int, default=20)
+    ap.add_argument("--repeats", type=int, default=20000)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.n_keys, args.n_reads, args.zipf_a, args.trials, args.repeats)
+
+    r = res["results"]
+    l2, tiered, inv, neg = r["l2_only"], r["tiered"], r["invalidation"], r["negative"]
+    print(f"[TIERED CACHE] {l2['reads']} leituras Zipf(a={args.zipf_a}) sobre {l2['distinct_keys']} chaves ({tiered['backend']})")
+    print(f"[TIERED CACHE] só Redis: p50 {l2['p50_us']:.0f}us, p99 {l2['p99_us']:.0f}us, "
+          f"{l2['redis_round_trips']} idas ao Redis, total {l2['total_ms']:.0f}ms")
+    print(f"[TIERED CACHE] L1 + Redis: p50 {tiered['p50_us']:.0f}us, p99 {tiered['p99_us']:.0f}us, "
+          f"{tiered['redis_round_trips']} idas ao Redis (hit L1 {tiered['l1_hit_ratio']:.1%}), "
+          f"total {tiered['total_ms']:.0f}ms")
+    print(f"[TIERED CACHE] ativação propagada ao outro worker: p50 {inv['activation_p50_ms']:.1f}ms, "
+          f"máx {inv['activation_max_ms']:.1f}ms")
+    print(f"[TIERED CACHE] invalidação até o outro worker: p50 {inv['invalidation_p50_ms']:.1f}ms, "
+          f"máx {inv['invalidation_max_ms']:.1f}ms (chamada p50 {inv['invalidate_call_p50_ms']:.1f}ms), "
+          f"leituras obsoletas {inv['stale_reads']}")
+    print(f"[TIERED CACHE] validação inválida repetida: sem cache {neg['without_cache']['us_per_call']:.1f}us, "
+          f"cache negativo {neg['with_cache']['us_per_call']:.1f}us "
+          f"({neg['with_cache']['negative']['hits']} hits)")
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "tiered_cache_results.json"))
+
+    if args.check_gate and (tiered["backend"] != "redis" or tiered["p50_us"] >= l2["p50_us"]
+                            or tiered["redis_round_trips"] > tiered["distinct_keys"]
+                            or inv["stale_reads"] or inv["invalidated_in_l1"]
+                            or inv["activation_max_ms"] >= 100 or inv["invalidation_max_ms"] >= 250
+                            or neg["with_cache"]["negative"]["hits"] < 5 * args.repeats
+                            or neg["with_cache"]["us_per_call"] > neg["without_cache"]["us_per_call"]
+                            or not neg["with_cache"]["same_result"]):
+        print("[TIERED CACHE] FALHOU: L1 não evitou idas ao Redis, invalidação não propagou ou cache negativo "
+              "inativo ou mais lento que revalidar")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
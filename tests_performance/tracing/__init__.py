@@ -0,0 +1,15 @@
+"""
+Pacote de benchmarks de performance para o tracing por etapa (spans e export OTLP/JSON)
+"""
+
+from .test_tracing import (
+    run_benchmark,
+    synthetic_request,
+    make_tracer
+)
+
+__all__ = [
+    "run_benchmark",
+    "synthetic_request",
+    "make_tracer"
+]
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do tracing por etapa: um request sintético percorre as etapas
+de predict_selic (validação, leitura do cache, carga de dados, busca do
+modelo, simulação, conversão em probabilidades, montagem da resposta) com
+o tracer desativado, ativo só com o resumo por etapa no MetricsService e
+ativo exportando para memória e para arquivo OTLP/JSON. Mede o custo por
+span, confere o arquivo exportado (ids, hierarquia e contagem), a
+amostragem e se o resumo por etapa aponta a etapa que concentra o p99.
+Confere também que os nomes dos spans raiz (template da rota com o prefixo
+do router) são únicos entre as rotas da API.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import tempfile
+from typing import Dict, Any, List
+
+from src.services.metrics_service import MetricsService
+from src.services.tracing import Tracer, InMemorySpanExporter, JsonFileSpanExporter
+
+# Etapas do request sintético (filhas da raiz "predict_selic")
+STAGES = ["validation", "cache_lookup", "data_load", "model_fetch", "simulation",
+          "probability_conversion", "response_build"]
+SLOW_STAGE = "simulation"
+
+# ---------- Dados ----------
+def busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+async def synthetic_request(tracer: Tracer, rng: random.Random, slow_every: int, slow_ms: float) -> None:
+    """Request com uma span por etapa; SLOW_STAGE fica lenta em 1 de cada slow_every requests"""
+    with tracer.span("predict_selic", fed_move_bps=25):
+        for stage in STAGES:
+            with tracer.span(stage):
+                if stage == SLOW_STAGE and rng.randrange(slow_every) == 0:
+                    busy_wait(slow_ms / 1000)
+        await asyncio.sleep(0)
+
+def make_tracer(mode: str, directory: str, sample_rate: float = 1.0, max_traces: int = 256) -> tuple:
+    """Tracer e MetricsService (listener) para o modo: off, metrics, memory, file"""
+    service = MetricsService(metrics_backend="memory")
+    exporters: List[Any] = []
+    if mode in ("memory", "file"):
+        exporters.append(InMemorySpanExporter(max_traces))
+    if mode == "file":
+        exporters.append(JsonFileSpanExporter(os.path.join(directory, "spans.jsonl"), "quantum-x-bench"))
+    tracer = Tracer(service_name="quantum-x-bench", exporters=exporters,
+                    sample_rate=sample_rate, enabled=mode != "off")
+    tracer.add_listener(service.observe_span)
+    return tracer, service
+
+# ---------- Benchmarks ----------
+async def run_requests(tracer: Tracer, n_requests: int, seed: int, slow_every: int, slow_ms: float) -> float:
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        await synthetic_request(tracer, rng, slow_every, slow_ms)
+    return time.perf_counter() - start
+
+async def span_overhead(n_requests: int, repeats: int, directory: str) -> Dict[str, float]:
+    """µs por span em cada modo, descontado o request sem tracing (sem etapas lentas)"""
+    spans_per_request = len(STAGES) + 1
+    best = {}
+    for mode in ("off", "metrics", "memory", "file"):
+        times = []
+        for _ in range(repeats):
+            tracer, _ = make_tracer(mode, directory)
+            times.append(await run_requests(tracer, n_requests, 0, 1 << 30, 0.0))
+            tracer.shutdown()
+        best[mode] = min(times)
+    return {
+        "off_request_us": best["off"] / n_requests * 1e6,
+        **{f"{mode}_span_us": (best[mode] - best["off"]) / (n_requests * spans_per_request) * 1e6
+           for mode in ("metrics", "memory", "file")}
+    }
+
+async def otlp_export(n_requests: int, directory: str) -> Dict[str, Any]:
+    """Arquivo OTLP/JSON: uma linha por lote, spans com ids válidos e pai dentro do mesmo trace"""
+    path = os.path.join(directory, "spans.jsonl")
+    if os.path.exists(path):
+        os.remove(path)
+    tracer, _ = make_tracer("file", directory)
+    await run_requests(tracer, n_requests, 0, 1 << 30, 0.0)
+    tracer.shutdown()
+
+    spans, lines = [], 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            lines += 1
+            for resource in json.loads(line)["resourceSpans"]:
+                for scope in resource["scopeSpans"]:
+                    spans.extend(scope["spans"])
+
+    by_id = {span["spanId"]: span for span in spans}
+    roots = [span for span in spans if not span["parentSpanId"]]
+    ids_ok = all(len(span["traceId"]) == 32 and len(span["spanId"]) == 16 for span in spans)
+    parents_ok = all(
+        span["parentSpanId"] in by_id and by_id[span["parentSpanId"]]["traceId"] == span["traceId"]
+        for span in spans if span["parentSpanId"]
+    )
+    times_ok = all(int(span["startTimeUnixNano"]) <= int(span["endTimeUnixNano"]) for span in spans)
+    expected = n_requests * (len(STAGES) + 1)
+    return {
+        "lines": lines,
+        "spans": len(spans),
+        "expected_spans": expected,
+        "traces": len({span["traceId"] for span in spans}),
+        "bytes": os.path.getsize(path),
+        "ok": len(spans) == expected and len(roots) == n_requests and ids_ok and parents_ok and times_ok
+    }
+
+async def sampling(n_requests: int, sample_rate: float, directory: str) -> Dict[str, Any]:
+    """Fração dos traces exportados; o resumo por etapa conta todos os requests"""
+    tracer, service = make_tracer("memory", directory, sample_rate, max_traces=n_requests)
+    await run_requests(tracer, n_requests, 0, 1 << 30, 0.0)
+    exported = len(tracer.exporters[0].traces)
+    counted = service.get_span_metrics()["predict_selic"]["1m"]["count"]
+    return {"sample_rate": sample_rate, "exported_fraction": exported / n_requests,
+            "stage_count": counted, "ok": counted == n_requests
+            and abs(exported / n_requests - sample_rate) < 0.05}
+
+async def p99_attribution(n_requests: int, slow_every: int, slow_ms: float, seed: int) -> Dict[str, Any]:
+    """O p99 por etapa aponta SLOW_STAGE como a etapa que concentra a cauda"""
+    tracer, service = make_tracer("metrics", "")
+    await run_requests(tracer, n_requests, seed, slow_every, slow_ms)
+    stages = service.get_span_metrics()
+    p99 = {stage: stages[stage]["1m"]["p99_ms"] for stage in STAGES}
+    return {"p99_ms": p99, "root_p99_ms": stages["predict_selic"]["1m"]["p99_ms"],
+            "slowest_stage": max(p99, key=p99.get),
+            "ok": max(p99, key=p99.get) == SLOW_STAGE and p99[SLOW_STAGE] >= slow_ms}
+
+async def task_propagation() -> Dict[str, Any]:
+    """Tasks criadas dentro de um span (asyncio.gather) herdam o pai e o trace"""
+    tracer, _ = make_tracer("memory", "")
+
+    async def stage(name: str) -> None:
+        with tracer.span(name):
+            await asyncio.sleep(0)
+
+    with tracer.span("predict_batch"):
+        await asyncio.gather(*(stage(f"scenario_{i}") for i in range(8)))
+    spans = tracer.exporters[0].get_finished_spans()
+    root = next(span for span in spans if span.parent is None)
+    children = [span for span in spans if span.parent is root]
+    return {"children": len(children),
+            "ok": len(children) == 8 and all(span.trace is root.trace for span in children)}
+
+def route_names() -> Dict[str, Any]:
+    """Nome do span raiz de cada rota da API: rotas com o mesmo path relativo em routers distintos não colidem"""
+    from fastapi.routing import APIRoute
+    from src.api.main import app, ROUTERS, route_span_name
+
+    routes = [route for route in app.routes if isinstance(route, APIRoute)]
+    routes += [route for router, _, _ in ROUTERS for route in router.routes]
+    names = [route_span_name(method, route) for route in routes for method in sorted(route.methods)]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    expected = {"GET /metrics", "GET /health/metrics", "GET /", "GET /health/",
+                "POST /predict/selic-from-fed/batch"}
+    return {"routes": len(names), "duplicates": duplicates, "missing": sorted(expected - set(names)),
+            "ok": not duplicates and expected <= set(names)}
+
+def run_benchmark(n_requests: int, repeats: int, slow_every: int, slow_ms: float,
+                  sample_rate: float, seed: int) -> Dict[str, Any]:
+    directory = tempfile.mkdtemp(prefix="tracing_bench_")
+    try:
+        results = {
+            **asyncio.run(span_overhead(n_requests, repeats, directory)),
+            "otlp": asyncio.run(otlp_export(n_requests, directory)),
+            "sampling": asyncio.run(sampling(n_requests, sample_rate, directory)),
+            "p99": asyncio.run(p99_attribution(n_requests, slow_every, slow_ms, seed)),
+            "propagation": asyncio.run(task_propagation()),
+            "route_names": route_names()
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {
+        "config": {"n_requests": n_requests, "repeats": repeats, "slow_every": slow_every,
+                   "slow_ms": slow_ms, "sample_rate": sample_rate, "seed": seed, "stages": STAGES},
+        "results": results
+    }
+
+# ---------- Export ----------
+def write_json(obj: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# ---------- CLI ----------
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Benchmark do tracing por etapa (spans, OTLP/JSON e resumo por etapa)")
+    ap.add_argument("--n-requests", type=int, default=5000)
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--slow-every", type=int, default=50)
+    ap.add_argument("--slow-ms", type=float, default=5.0)
+    ap.add_argument("--sample-rate", type=float, default=0.1)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--check-gate", action="store_true")
+    ap.add_argument("--out-dir", type=str, default="")
+    return ap.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    res = run_benchmark(args.n_requests, args.repeats, args.slow_every, args.slow_ms, args.sample_rate, args.seed)
+
+    r = res["results"]
+    otlp, p99 = r["otlp"], r["p99"]
+    print(f"[TRACING] {args.n_requests} requests x {len(STAGES) + 1} spans")
+    print(f"[TRACING] request sem tracing: {r['off_request_us']:.2f}µs")
+    print(f"[TRACING] custo por span: resumo por etapa {r['metrics_span_us']:.2f}µs, "
+          f"+memória {r['memory_span_us']:.2f}µs, +arquivo OTLP {r['file_span_us']:.2f}µs")
+    print(f"[TRACING] OTLP/JSON: {otlp['spans']}/{otlp['expected_spans']} spans em {otlp['lines']} linhas "
+          f"({otlp['bytes'] / 1e6:.2f}MB), válido: {otlp['ok']}")
+    print(f"[TRACING] amostragem {r['sampling']['sample_rate']}: {r['sampling']['exported_fraction']:.3f} "
+          f"exportados, {r['sampling']['stage_count']} contados por etapa, ok: {r['sampling']['ok']}")
+    print(f"[TRACING] p99 por etapa: {', '.join(f'{k} {v:.3f}ms' for k, v in p99['p99_ms'].items())}")
+    print(f"[TRACING] etapa mais lenta no p99: {p99['slowest_stage']} (esperado {SLOW_STAGE}), ok: {p99['ok']}")
+    print(f"[TRACING] propagação entre tasks: {r['propagation']['children']} filhos, ok: {r['propagation']['ok']}")
+    print(f"[TRACING] nomes dos spans raiz: {r['route_names']['routes']} rotas, "
+          f"duplicados {r['route_names']['duplicates']}, ausentes {r['route_names']['missing']}, "
+          f"ok: {r['route_names']['ok']}")
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        write_json(res, os.path.join(args.out_dir, "tracing_results.json"))
+
+    failed = (not otlp["ok"] or not r["sampling"]["ok"] or not p99["ok"] or not r["propagation"]["ok"]
+              or not r["route_names"]["ok"] or r["file_span_us"] > 50)
+    if args.check_gate and failed:
+        print("[TRACING] FALHOU: export, amostragem, atribuição do p99, propagação ou nomes de rota incorretos, "
+              "ou span > 50µs")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()